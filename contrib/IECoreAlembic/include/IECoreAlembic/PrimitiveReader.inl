@@ -111,8 +111,11 @@ void PrimitiveReader::readGeomParam( const T &param, const Alembic::Abc::ISample
 	}
 
 	typename DataType::Ptr data = new DataType();
-	data->writable().resize( sample->size() );
-	std::copy( sample->get(), sample->get() + sample->size(), data->writable().begin() );
+	data->writable().insert(
+		data->writable().end(),
+		sample->get(),
+		sample->get() + sample->size()
+	);
 
 	Private::ApplyGeometricInterpretation<DataType, T>::apply( data.get() );
 
@@ -123,8 +126,11 @@ void PrimitiveReader::readGeomParam( const T &param, const Alembic::Abc::ISample
 	if( param.isIndexed() )
 	{
 		IECore::IntVectorDataPtr indexData = new IECore::IntVectorData();
-		indexData->writable().resize( indices->size() );
-		std::copy( indices->get(), indices->get() + indices->size(), indexData->writable().begin() );
+		indexData->writable().insert(
+			indexData->writable().end(),
+			indices->get(),
+			indices->get() + indices->size()
+		);
 		pv.indices = indexData;
 	}
 
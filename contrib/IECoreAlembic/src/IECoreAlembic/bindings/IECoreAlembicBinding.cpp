@@ -37,14 +37,26 @@
 #include "IECoreAlembic/AlembicScene.h"
 
 #include "IECorePython/RunTimeTypedBinding.h"
+#include "IECorePython/ScopedGILRelease.h"
 
 using namespace boost::python;
 
+namespace
+{
+
+IECoreAlembic::AlembicScenePtr constructor( const std::string &fileName, IECore::IndexedIO::OpenMode mode )
+{
+	IECorePython::ScopedGILRelease gilRelease;
+	return new IECoreAlembic::AlembicScene( fileName, mode );
+}
+
+} // namespace
+
 BOOST_PYTHON_MODULE( _IECoreAlembic )
 {
 
 	IECorePython::RunTimeTypedClass<IECoreAlembic::AlembicScene>()
-		.def( init<const std::string &, IECore::IndexedIO::OpenMode>() )
+		.def( "__init__", make_constructor( &constructor ) )
 	;
 
 }
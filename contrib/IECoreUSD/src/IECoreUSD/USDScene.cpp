@@ -325,15 +325,8 @@ void convert( pxr::GfMatrix4d& dst, const Imath::M44d& src)
 template<>
 void convert( IECore::IntVectorDataPtr &dst, const pxr::VtIntArray &data )
 {
-	IECore::IntVectorDataPtr newData = new IECore::IntVectorData();
-
-	std::vector<int> &writable = newData->writable();
-	writable.resize( data.size() );
-	for( size_t i = 0; i < data.size(); ++i )
-	{
-		writable[i] = data[i];
-	}
-	dst = newData;
+	dst = new IECore::IntVectorData();
+	dst->writable().assign( data.begin(), data.end() );
 }
 
 template<>
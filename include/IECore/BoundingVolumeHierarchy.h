@@ -0,0 +1,192 @@
+//////////////////////////////////////////////////////////////////////////
+//
+//  Copyright (c) 2019, Image Engine Design Inc. All rights reserved.
+//
+//  Redistribution and use in source and binary forms, with or without
+//  modification, are permitted provided that the following conditions are
+//  met:
+//
+//     * Redistributions of source code must retain the above copyright
+//       notice, this list of conditions and the following disclaimer.
+//
+//     * Redistributions in binary form must reproduce the above copyright
+//       notice, this list of conditions and the following disclaimer in the
+//       documentation and/or other materials provided with the distribution.
+//
+//     * Neither the name of Image Engine Design nor the names of any
+//       other contributors to this software may be used to endorse or
+//       promote products derived from this software without specific prior
+//       written permission.
+//
+//  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS
+//  IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+//  THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+//  PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR
+//  CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+//  EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+//  PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+//  PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+//  LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+//  NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+//  SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+//
+//////////////////////////////////////////////////////////////////////////
+
+#ifndef IECORE_BOUNDINGVOLUMEHIERARCHY_H
+#define IECORE_BOUNDINGVOLUMEHIERARCHY_H
+
+#include "IECore/BoxTraits.h"
+#include "IECore/Export.h"
+#include "IECore/RefCounted.h"
+
+IECORE_PUSH_DEFAULT_VISIBILITY
+#include "OpenEXR/ImathBox.h"
+IECORE_POP_DEFAULT_VISIBILITY
+
+#include <cstdint>
+#include <vector>
+
+namespace IECore
+{
+
+/// A bounding volume hierarchy built using a binned surface area heuristic,
+/// providing fast intersection and proximity queries against a set of bounds.
+/// Unlike BoundedKDTree, the hierarchy doesn't reference the bounds it was
+/// built from, and refers to them only by index. This allows a single hierarchy
+/// to be shared between several sets of bounds with the same ordering, using
+/// refit() to update the node bounds when the primitives move.
+///
+/// Nodes are stored in a single flat array, with the two children of a branch
+/// stored adjacently and always after their parent. Construction is
+/// multithreaded.
+/// \ingroup mathGroup
+template<class BoundType>
+class BoundingVolumeHierarchy : public RefCounted
+{
+	public:
+
+		IE_CORE_DECLAREMEMBERPTR( BoundingVolumeHierarchy );
+
+		typedef BoundType Bound;
+		typedef typename BoxTraits<Bound>::BaseType BaseType;
+		class Node;
+		typedef std::vector<Node> NodeVector;
+		typedef uint32_t NodeIndex;
+		typedef std::vector<uint32_t> PrimitiveIndices;
+
+		/// The maximum depth of the hierarchy. This bounds the size of the
+		/// stack required to traverse the tree, and is guaranteed not to be
+		/// exceeded even for degenerate inputs.
+		static const unsigned maxDepth = 64;
+
+		/// Creates a hierarchy for the bounds in the range [first, last), which
+		/// must be random access iterators. The bounds are not referenced after
+		/// construction.
+		template<typename BoundIterator>
+		BoundingVolumeHierarchy( BoundIterator first, BoundIterator last, unsigned maxLeafSize = 4 );
+
+		/// Creates a hierarchy with the same structure as `other`, fitted
+		/// to the bounds in the range [first, last). This is equivalent to
+		/// copying `other` and calling refit(), and is useful when several
+		/// sets of bounds share the same topology.
+		template<typename BoundIterator>
+		BoundingVolumeHierarchy( const BoundingVolumeHierarchy &other, BoundIterator first, BoundIterator last );
+
+		~BoundingVolumeHierarchy() override;
+
+		/// Updates the node bounds to match a new set of primitive bounds,
+		/// without changing the structure of the tree. This is much cheaper
+		/// than building a new hierarchy, but the tree quality will degrade
+		/// if the primitives have moved significantly. The range must have the
+		/// same number of bounds as the one used in construction.
+		/// \threading This can't be called while other threads are making queries.
+		template<typename BoundIterator>
+		void refit( BoundIterator first, BoundIterator last );
+
+		/// Populates the passed vector with the indices of all the bounds which intersect
+		/// "b", returning the number of bounds found. The bounds must be those used to
+		/// construct the hierarchy, or the last call to refit().
+		/// \threading May be called by multiple concurrent threads provided they each use a different vector for the result.
+		template<typename BoundIterator, typename S>
+		size_t intersectingBounds( BoundIterator first, const S &b, std::vector<size_t> &indices ) const;
+
+		/// Returns the number of primitives in the hierarchy.
+		size_t numPrimitives() const;
+
+		/// Returns the indices of the primitives, sorted such that each
+		/// leaf node references a contiguous range.
+		const PrimitiveIndices &primitiveIndices() const;
+
+		/// Returns the number of nodes in the tree.
+		NodeIndex numNodes() const;
+
+		/// Retrieve the node associated with a given index
+		const Node &node( NodeIndex index ) const;
+
+		/// Returns the index for the root node
+		static NodeIndex rootIndex();
+
+		/// Returns the approximate memory usage of the hierarchy in bytes.
+		size_t memoryUsage() const;
+
+	private:
+
+		class Builder;
+
+		NodeVector m_nodes;
+		PrimitiveIndices m_primitiveIndices;
+
+};
+
+template<class BoundType>
+class BoundingVolumeHierarchy<BoundType>::Node
+{
+	public :
+
+		Node();
+
+		inline bool isLeaf() const;
+		inline bool isBranch() const;
+
+		inline const Bound &bound() const;
+
+		/// Valid for branch nodes only. The second child
+		/// is always at `firstChildIndex() + 1`.
+		inline NodeIndex firstChildIndex() const;
+		inline NodeIndex secondChildIndex() const;
+
+		/// Valid for leaf nodes only. Returns the range of
+		/// entries in primitiveIndices() for this leaf.
+		inline uint32_t primitivesBegin() const;
+		inline uint32_t primitivesEnd() const;
+
+	private :
+
+		friend class BoundingVolumeHierarchy<BoundType>;
+		friend class BoundingVolumeHierarchy<BoundType>::Builder;
+
+		Bound m_bound;
+		// For branches, the index of the first child. For leaves,
+		// the index of the first primitive in m_primitiveIndices.
+		uint32_t m_offset;
+		// The number of primitives for leaves, 0 for branches.
+		// An empty tree consists of a single empty leaf, which
+		// is distinguished from a branch by having a zero offset.
+		uint32_t m_count;
+};
+
+typedef BoundingVolumeHierarchy<Imath::Box2f> Box2fBVH;
+typedef BoundingVolumeHierarchy<Imath::Box2d> Box2dBVH;
+typedef BoundingVolumeHierarchy<Imath::Box3f> Box3fBVH;
+typedef BoundingVolumeHierarchy<Imath::Box3d> Box3dBVH;
+
+IE_CORE_DECLAREPTR( Box2fBVH );
+IE_CORE_DECLAREPTR( Box2dBVH );
+IE_CORE_DECLAREPTR( Box3fBVH );
+IE_CORE_DECLAREPTR( Box3dBVH );
+
+} // namespace IECore
+
+#include "IECore/BoundingVolumeHierarchy.inl"
+
+#endif // IECORE_BOUNDINGVOLUMEHIERARCHY_H
@@ -0,0 +1,630 @@
+//////////////////////////////////////////////////////////////////////////
+//
+//  Copyright (c) 2019, Image Engine Design Inc. All rights reserved.
+//
+//  Redistribution and use in source and binary forms, with or without
+//  modification, are permitted provided that the following conditions are
+//  met:
+//
+//     * Redistributions of source code must retain the above copyright
+//       notice, this list of conditions and the following disclaimer.
+//
+//     * Redistributions in binary form must reproduce the above copyright
+//       notice, this list of conditions and the following disclaimer in the
+//       documentation and/or other materials provided with the distribution.
+//
+//     * Neither the name of Image Engine Design nor the names of any
+//       other contributors to this software may be used to endorse or
+//       promote products derived from this software without specific prior
+//       written permission.
+//
+//  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS
+//  IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+//  THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+//  PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR
+//  CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+//  EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+//  PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+//  PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+//  LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+//  NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+//  SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+//
+//////////////////////////////////////////////////////////////////////////
+
+#include "IECore/BoxOps.h"
+#include "IECore/Exception.h"
+#include "IECore/VectorTraits.h"
+
+#include "tbb/blocked_range.h"
+#include "tbb/concurrent_vector.h"
+#include "tbb/parallel_for.h"
+#include "tbb/parallel_invoke.h"
+#include "tbb/parallel_reduce.h"
+
+#include <algorithm>
+#include <cassert>
+#include <limits>
+
+namespace IECore
+{
+
+namespace Detail
+{
+
+// The measure used by the surface area heuristic - proportional
+// to the surface area for 3d bounds and the perimeter for 2d bounds.
+template<typename Bound>
+inline double bvhArea( const Bound &bound )
+{
+	typedef typename BoxTraits<Bound>::BaseType BaseType;
+	typedef VectorTraits<BaseType> Traits;
+
+	if( BoxTraits<Bound>::isEmpty( bound ) )
+	{
+		return 0.0;
+	}
+
+	const BaseType size = boxSize( bound );
+	if( Traits::dimensions() == 3 )
+	{
+		return
+			(double)Traits::get( size, 0 ) * Traits::get( size, 1 ) +
+			(double)Traits::get( size, 1 ) * Traits::get( size, 2 ) +
+			(double)Traits::get( size, 2 ) * Traits::get( size, 0 )
+		;
+	}
+
+	double result = 0;
+	for( unsigned i = 0; i < Traits::dimensions(); ++i )
+	{
+		result += Traits::get( size, i );
+	}
+	return result;
+}
+
+} // namespace Detail
+
+//////////////////////////////////////////////////////////////////////////
+// Node
+//////////////////////////////////////////////////////////////////////////
+
+template<class BoundType>
+BoundingVolumeHierarchy<BoundType>::Node::Node()
+	:	m_offset( 0 ), m_count( 0 )
+{
+	BoxTraits<Bound>::makeEmpty( m_bound );
+}
+
+template<class BoundType>
+bool BoundingVolumeHierarchy<BoundType>::Node::isLeaf() const
+{
+	return m_count || !m_offset;
+}
+
+template<class BoundType>
+bool BoundingVolumeHierarchy<BoundType>::Node::isBranch() const
+{
+	return !isLeaf();
+}
+
+template<class BoundType>
+const typename BoundingVolumeHierarchy<BoundType>::Bound &BoundingVolumeHierarchy<BoundType>::Node::bound() const
+{
+	return m_bound;
+}
+
+template<class BoundType>
+typename BoundingVolumeHierarchy<BoundType>::NodeIndex BoundingVolumeHierarchy<BoundType>::Node::firstChildIndex() const
+{
+	assert( isBranch() );
+	return m_offset;
+}
+
+template<class BoundType>
+typename BoundingVolumeHierarchy<BoundType>::NodeIndex BoundingVolumeHierarchy<BoundType>::Node::secondChildIndex() const
+{
+	assert( isBranch() );
+	return m_offset + 1;
+}
+
+template<class BoundType>
+uint32_t BoundingVolumeHierarchy<BoundType>::Node::primitivesBegin() const
+{
+	assert( isLeaf() );
+	return m_offset;
+}
+
+template<class BoundType>
+uint32_t BoundingVolumeHierarchy<BoundType>::Node::primitivesEnd() const
+{
+	assert( isLeaf() );
+	return m_offset + m_count;
+}
+
+//////////////////////////////////////////////////////////////////////////
+// Builder
+//////////////////////////////////////////////////////////////////////////
+
+template<class BoundType>
+class BoundingVolumeHierarchy<BoundType>::Builder
+{
+
+	public :
+
+		template<typename BoundIterator>
+		Builder( BoundIterator first, BoundIterator last, unsigned maxLeafSize, PrimitiveIndices &primitiveIndices )
+			:	m_maxLeafSize( std::max( 1u, maxLeafSize ) ), m_primitiveIndices( primitiveIndices )
+		{
+			const size_t size = last - first;
+			if( size >= std::numeric_limits<uint32_t>::max() )
+			{
+				throw InvalidArgumentException( "BoundingVolumeHierarchy : Too many bounds" );
+			}
+
+			m_bounds.resize( size );
+			m_centroids.resize( size );
+			m_primitiveIndices.resize( size );
+
+			tbb::task_group_context taskGroupContext( tbb::task_group_context::isolated );
+			tbb::parallel_for(
+				tbb::blocked_range<size_t>( 0, size, 1000 ),
+				[this, &first]( const tbb::blocked_range<size_t> &range )
+				{
+					for( size_t i = range.begin(); i != range.end(); ++i )
+					{
+						m_bounds[i] = *( first + i );
+						m_centroids[i] = boxCenter( m_bounds[i] );
+						m_primitiveIndices[i] = i;
+					}
+				},
+				taskGroupContext
+			);
+		}
+
+		void build( NodeVector &nodes )
+		{
+			m_nodes.grow_by( 1 );
+			if( m_bounds.size() )
+			{
+				buildWalk( rootIndex(), 0, m_bounds.size(), rangeInfo( 0, m_bounds.size() ), 0 );
+			}
+			nodes.assign( m_nodes.begin(), m_nodes.end() );
+		}
+
+	private :
+
+		// Number of bins used to evaluate candidate splits on each axis.
+		static const unsigned numBins = 16;
+		// Ranges of primitives larger than this are processed in parallel.
+		static const size_t parallelThreshold = 4096;
+		// Ranges larger than this consider splits on all axes.
+		static const size_t allAxesThreshold = 1024;
+
+		struct RangeInfo
+		{
+			RangeInfo()
+			{
+				BoxTraits<Bound>::makeEmpty( bound );
+				BoxTraits<Bound>::makeEmpty( centroidBound );
+			}
+
+			void merge( const RangeInfo &other )
+			{
+				boxExtend( bound, other.bound );
+				boxExtend( centroidBound, other.centroidBound );
+			}
+
+			Bound bound;
+			Bound centroidBound;
+		};
+
+		struct Bins
+		{
+			Bins()
+			{
+				for( unsigned axis = 0; axis < 3; ++axis )
+				{
+					for( unsigned i = 0; i < numBins; ++i )
+					{
+						counts[axis][i] = 0;
+					}
+				}
+			}
+
+			void merge( const Bins &other )
+			{
+				for( unsigned axis = 0; axis < 3; ++axis )
+				{
+					for( unsigned i = 0; i < numBins; ++i )
+					{
+						info[axis][i].merge( other.info[axis][i] );
+						counts[axis][i] += other.counts[axis][i];
+					}
+				}
+			}
+
+			// Bounds of the primitives and their centroids,
+			// so that the RangeInfo for each child can be
+			// derived without another pass over the primitives.
+			RangeInfo info[3][numBins];
+			size_t counts[3][numBins];
+		};
+
+		// Maps centroid positions to bins along each axis.
+		struct Binner
+		{
+			Binner( const Bound &centroidBound )
+				:	min( BoxTraits<Bound>::min( centroidBound ) )
+			{
+				const BaseType size = boxSize( centroidBound );
+				for( unsigned axis = 0; axis < VectorTraits<BaseType>::dimensions(); ++axis )
+				{
+					const double extent = VectorTraits<BaseType>::get( size, axis );
+					scale[axis] = extent > 0 ? numBins * ( 1.0 - 1e-6 ) / extent : 0.0;
+				}
+			}
+
+			unsigned operator()( const BaseType &centroid, unsigned axis ) const
+			{
+				const double offset = VectorTraits<BaseType>::get( centroid, axis ) - VectorTraits<BaseType>::get( min, axis );
+				return std::min( (unsigned)std::max( 0.0, offset * scale[axis] ), numBins - 1 );
+			}
+
+			BaseType min;
+			double scale[3];
+		};
+
+		// Calls `f( primitiveIndex, accumulator )` for all the primitives in
+		// the range, in parallel for large ranges.
+		template<typename Accumulator, typename F>
+		Accumulator accumulate( size_t begin, size_t end, F f ) const
+		{
+			if( end - begin < parallelThreshold )
+			{
+				Accumulator result;
+				for( size_t i = begin; i < end; ++i )
+				{
+					f( m_primitiveIndices[i], result );
+				}
+				return result;
+			}
+
+			tbb::task_group_context taskGroupContext( tbb::task_group_context::isolated );
+			return tbb::parallel_reduce(
+				tbb::blocked_range<size_t>( begin, end, parallelThreshold / 4 ),
+				Accumulator(),
+				[this, &f]( const tbb::blocked_range<size_t> &range, Accumulator result ) -> Accumulator
+				{
+					for( size_t i = range.begin(); i != range.end(); ++i )
+					{
+						f( m_primitiveIndices[i], result );
+					}
+					return result;
+				},
+				[]( Accumulator a, const Accumulator &b ) -> Accumulator
+				{
+					a.merge( b );
+					return a;
+				},
+				taskGroupContext
+			);
+		}
+
+		RangeInfo rangeInfo( size_t begin, size_t end ) const
+		{
+			return accumulate<RangeInfo>(
+				begin, end,
+				[this]( uint32_t primitiveIndex, RangeInfo &info )
+				{
+					boxExtend( info.bound, m_bounds[primitiveIndex] );
+					boxExtend( info.centroidBound, m_centroids[primitiveIndex] );
+				}
+			);
+		}
+
+		void buildWalk( NodeIndex nodeIndex, size_t begin, size_t end, const RangeInfo &info, unsigned depth )
+		{
+			// Existing elements of a concurrent_vector are not
+			// moved when the vector grows, so it's safe to hold
+			// this reference while children are allocated.
+			Node &node = m_nodes[nodeIndex];
+			node.m_bound = info.bound;
+
+			size_t mid = end;
+			RangeInfo firstInfo, secondInfo;
+			if( end - begin > m_maxLeafSize && depth + 1 < maxDepth )
+			{
+				mid = split( begin, end, info, firstInfo, secondInfo );
+			}
+
+			if( mid == begin || mid == end )
+			{
+				node.m_offset = begin;
+				node.m_count = end - begin;
+				return;
+			}
+
+			const NodeIndex firstChild = m_nodes.grow_by( 2 ) - m_nodes.begin();
+			node.m_offset = firstChild;
+			node.m_count = 0;
+
+			if( end - begin > parallelThreshold )
+			{
+				tbb::task_group_context taskGroupContext( tbb::task_group_context::isolated );
+				tbb::parallel_invoke(
+					[this, firstChild, begin, mid, &firstInfo, depth] { buildWalk( firstChild, begin, mid, firstInfo, depth + 1 ); },
+					[this, firstChild, mid, end, &secondInfo, depth] { buildWalk( firstChild + 1, mid, end, secondInfo, depth + 1 ); },
+					taskGroupContext
+				);
+			}
+			else
+			{
+				buildWalk( firstChild, begin, mid, firstInfo, depth + 1 );
+				buildWalk( firstChild + 1, mid, end, secondInfo, depth + 1 );
+			}
+		}
+
+		// Partitions the primitives in the range using the surface area heuristic,
+		// returning the start of the second partition and filling in the
+		// RangeInfo for each side.
+		size_t split( size_t begin, size_t end, const RangeInfo &info, RangeInfo &firstInfo, RangeInfo &secondInfo )
+		{
+			// Evaluating splits on every axis gives the best trees, but is
+			// the dominant cost in building. For smaller ranges, where the choice
+			// has less impact on query performance, we consider only the longest
+			// axis.
+			unsigned firstAxis = 0;
+			unsigned lastAxis = VectorTraits<BaseType>::dimensions();
+			if( end - begin <= allAxesThreshold )
+			{
+				firstAxis = boxMajorAxis( info.centroidBound );
+				lastAxis = firstAxis + 1;
+			}
+
+			const Binner binner( info.centroidBound );
+			const Bins bins = accumulate<Bins>(
+				begin, end,
+				[this, &binner, firstAxis, lastAxis]( uint32_t primitiveIndex, Bins &bins )
+				{
+					const BaseType &centroid = m_centroids[primitiveIndex];
+					for( unsigned axis = firstAxis; axis < lastAxis; ++axis )
+					{
+						const unsigned bin = binner( centroid, axis );
+						boxExtend( bins.info[axis][bin].bound, m_bounds[primitiveIndex] );
+						boxExtend( bins.info[axis][bin].centroidBound, centroid );
+						bins.counts[axis][bin]++;
+					}
+				}
+			);
+
+			double bestCost = std::numeric_limits<double>::max();
+			unsigned bestAxis = 0;
+			unsigned bestSplit = 0;
+			for( unsigned axis = firstAxis; axis < lastAxis; ++axis )
+			{
+				if( binner.scale[axis] == 0.0 )
+				{
+					continue;
+				}
+
+				// Sweep from the right, recording the cost of
+				// everything to the right of each split plane.
+				double rightCosts[numBins];
+				size_t rightCounts[numBins];
+				Bound accumulatedBound;
+				BoxTraits<Bound>::makeEmpty( accumulatedBound );
+				size_t accumulatedCount = 0;
+				for( unsigned i = numBins - 1; i > 0; --i )
+				{
+					boxExtend( accumulatedBound, bins.info[axis][i].bound );
+					accumulatedCount += bins.counts[axis][i];
+					rightCosts[i] = Detail::bvhArea( accumulatedBound ) * accumulatedCount;
+					rightCounts[i] = accumulatedCount;
+				}
+
+				// Sweep from the left, evaluating the total
+				// cost of each split.
+				BoxTraits<Bound>::makeEmpty( accumulatedBound );
+				accumulatedCount = 0;
+				for( unsigned i = 1; i < numBins; ++i )
+				{
+					boxExtend( accumulatedBound, bins.info[axis][i-1].bound );
+					accumulatedCount += bins.counts[axis][i-1];
+					if( !accumulatedCount || !rightCounts[i] )
+					{
+						continue;
+					}
+					const double cost = Detail::bvhArea( accumulatedBound ) * accumulatedCount + rightCosts[i];
+					if( cost < bestCost )
+					{
+						bestCost = cost;
+						bestAxis = axis;
+						bestSplit = i;
+					}
+				}
+			}
+
+			if( bestCost == std::numeric_limits<double>::max() )
+			{
+				// All centroids are coincident, so there's nothing to
+				// choose between them. Split down the middle.
+				const size_t mid = begin + ( end - begin ) / 2;
+				firstInfo = rangeInfo( begin, mid );
+				secondInfo = rangeInfo( mid, end );
+				return mid;
+			}
+
+			uint32_t *first = m_primitiveIndices.data() + begin;
+			uint32_t *mid = std::partition(
+				first, m_primitiveIndices.data() + end,
+				[this, &binner, bestAxis, bestSplit]( uint32_t primitiveIndex )
+				{
+					return binner( m_centroids[primitiveIndex], bestAxis ) < bestSplit;
+				}
+			);
+
+			for( unsigned i = 0; i < numBins; ++i )
+			{
+				( i < bestSplit ? firstInfo : secondInfo ).merge( bins.info[bestAxis][i] );
+			}
+
+			return begin + ( mid - first );
+		}
+
+		const size_t m_maxLeafSize;
+		std::vector<Bound> m_bounds;
+		std::vector<BaseType> m_centroids;
+		PrimitiveIndices &m_primitiveIndices;
+		tbb::concurrent_vector<Node> m_nodes;
+
+};
+
+//////////////////////////////////////////////////////////////////////////
+// BoundingVolumeHierarchy
+//////////////////////////////////////////////////////////////////////////
+
+template<class BoundType>
+template<typename BoundIterator>
+BoundingVolumeHierarchy<BoundType>::BoundingVolumeHierarchy( BoundIterator first, BoundIterator last, unsigned maxLeafSize )
+{
+	Builder builder( first, last, maxLeafSize, m_primitiveIndices );
+	builder.build( m_nodes );
+}
+
+template<class BoundType>
+template<typename BoundIterator>
+BoundingVolumeHierarchy<BoundType>::BoundingVolumeHierarchy( const BoundingVolumeHierarchy &other, BoundIterator first, BoundIterator last )
+	:	m_nodes( other.m_nodes ), m_primitiveIndices( other.m_primitiveIndices )
+{
+	refit( first, last );
+}
+
+template<class BoundType>
+BoundingVolumeHierarchy<BoundType>::~BoundingVolumeHierarchy()
+{
+}
+
+template<class BoundType>
+template<typename BoundIterator>
+void BoundingVolumeHierarchy<BoundType>::refit( BoundIterator first, BoundIterator last )
+{
+	if( (size_t)( last - first ) != m_primitiveIndices.size() )
+	{
+		throw InvalidArgumentException( "BoundingVolumeHierarchy::refit : Wrong number of bounds" );
+	}
+
+	// Leaves can be updated independently, in parallel.
+	tbb::task_group_context taskGroupContext( tbb::task_group_context::isolated );
+	tbb::parallel_for(
+		tbb::blocked_range<size_t>( 0, m_nodes.size(), 1000 ),
+		[this, &first]( const tbb::blocked_range<size_t> &range )
+		{
+			for( size_t i = range.begin(); i != range.end(); ++i )
+			{
+				Node &node = m_nodes[i];
+				if( !node.isLeaf() )
+				{
+					continue;
+				}
+				BoxTraits<Bound>::makeEmpty( node.m_bound );
+				for( uint32_t p = node.primitivesBegin(); p != node.primitivesEnd(); ++p )
+				{
+					boxExtend( node.m_bound, *( first + m_primitiveIndices[p] ) );
+				}
+			}
+		},
+		taskGroupContext
+	);
+
+	// Children always follow their parents, so a reverse
+	// iteration visits them before the parent.
+	for( size_t i = m_nodes.size(); i-- > 0; )
+	{
+		Node &node = m_nodes[i];
+		if( node.isLeaf() )
+		{
+			continue;
+		}
+		node.m_bound = m_nodes[node.firstChildIndex()].m_bound;
+		boxExtend( node.m_bound, m_nodes[node.secondChildIndex()].m_bound );
+	}
+}
+
+template<class BoundType>
+template<typename BoundIterator, typename S>
+size_t BoundingVolumeHierarchy<BoundType>::intersectingBounds( BoundIterator first, const S &b, std::vector<size_t> &indices ) const
+{
+	indices.clear();
+
+	NodeIndex stack[maxDepth + 1];
+	unsigned stackSize = 0;
+	stack[stackSize++] = rootIndex();
+
+	while( stackSize )
+	{
+		const Node &node = m_nodes[stack[--stackSize]];
+		if( !boxIntersects( node.bound(), b ) )
+		{
+			continue;
+		}
+
+		if( node.isLeaf() )
+		{
+			for( uint32_t i = node.primitivesBegin(); i != node.primitivesEnd(); ++i )
+			{
+				const uint32_t primitiveIndex = m_primitiveIndices[i];
+				if( boxIntersects( *( first + primitiveIndex ), b ) )
+				{
+					indices.push_back( primitiveIndex );
+				}
+			}
+		}
+		else
+		{
+			stack[stackSize++] = node.secondChildIndex();
+			stack[stackSize++] = node.firstChildIndex();
+		}
+	}
+
+	return indices.size();
+}
+
+template<class BoundType>
+size_t BoundingVolumeHierarchy<BoundType>::numPrimitives() const
+{
+	return m_primitiveIndices.size();
+}
+
+template<class BoundType>
+const typename BoundingVolumeHierarchy<BoundType>::PrimitiveIndices &BoundingVolumeHierarchy<BoundType>::primitiveIndices() const
+{
+	return m_primitiveIndices;
+}
+
+template<class BoundType>
+typename BoundingVolumeHierarchy<BoundType>::NodeIndex BoundingVolumeHierarchy<BoundType>::numNodes() const
+{
+	return m_nodes.size();
+}
+
+template<class BoundType>
+const typename BoundingVolumeHierarchy<BoundType>::Node &BoundingVolumeHierarchy<BoundType>::node( NodeIndex index ) const
+{
+	assert( index < m_nodes.size() );
+	return m_nodes[index];
+}
+
+template<class BoundType>
+typename BoundingVolumeHierarchy<BoundType>::NodeIndex BoundingVolumeHierarchy<BoundType>::rootIndex()
+{
+	return 0;
+}
+
+template<class BoundType>
+size_t BoundingVolumeHierarchy<BoundType>::memoryUsage() const
+{
+	return sizeof( *this ) + m_nodes.capacity() * sizeof( Node ) + m_primitiveIndices.capacity() * sizeof( uint32_t );
+}
+
+} // namespace IECore
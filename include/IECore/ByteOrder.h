@@ -39,6 +39,7 @@
 
 #include "boost/static_assert.hpp"
 
+#include <cstddef>
 #include <stdint.h>
 
 namespace IECore
@@ -163,6 +164,19 @@ inline double reverseBytes<double>( const double &x )
 	return xx.d;
 }
 
+/// Reverses the byte order of the n values starting
+/// at data, in place. The loop is simple enough that
+/// the compiler reduces it to bswap instructions, or
+/// to byte shuffles where the target supports them.
+template<typename T>
+inline void reverseBytes( T *data, size_t n )
+{
+	for( size_t i = 0; i < n; ++i )
+	{
+		data[i] = reverseBytes( data[i] );
+	}
+}
+
 /// If running on a big endian platform,
 /// returns a copy of x with reversed bytes,
 /// otherwise returns x unchanged.
@@ -52,17 +52,26 @@ IE_CORE_FORWARDDECLARE( CachedReader );
 /// <b>IECORE_CACHEDREADER_PATHS</b><br>
 /// Used to specify the settings for the default CachedReader. See
 /// CachedReader::defaultCachedReader() for more information.
+///
+/// <b>IECORE_CACHEDREADER_DISKCACHE_PATH</b><br>
+/// Used to specify a directory for the disk cache of the default
+/// CachedReader. See CachedReader::setDiskCache() for more information.
+///
+/// <b>IECORE_CACHEDREADER_DISKCACHE_SIZE</b><br>
+/// Used to specify the size limit (in megabytes) for the disk cache of the
+/// default CachedReader.
 
 /// The CachedReader class provides a means of loading files
 /// using the Reader subclasses, but caching them in memory to
 /// allow fast repeated loads. It uses a ObjectPool to store the images.
 /// It's recomended using the defaultObjectPool for sharing objects, which
 /// limits the memory used by the IECORE_OBJECTPOOL_MEMORY
-/// environment variable.
+/// environment variable. Optionally, a persistent cache on local disk
+/// may also be used as a second level behind the ObjectPool - see
+/// setDiskCache().
 /// \todo We probably need a way of setting parameters for the
 /// Readers, and treating reads with different parameters as different
 /// entities in the cache.
-/// \todo Stats on cache misses etc.
 /// \todo Can we do something to make sure that two paths to the same
 /// file (symlinks) result in only a single cache entry?
 /// \ingroup ioGroup
@@ -110,6 +119,56 @@ class IECORE_API CachedReader : public RefCounted
 		/// Returns the ObjectPool object used by this CachedReader.
 		ObjectPool *objectPool() const;
 
+		//! @name Disk cache
+		/// Files which are not found in the ObjectPool may also be looked
+		/// up in a persistent cache on disk, which can be shared between
+		/// processes. This is useful when the files themselves live on slow
+		/// network storage, and a fast local disk is available. Entries are
+		/// keyed on the resolved file path, the file's size and modification
+		/// time, the parameters of the Reader and of the post processor,
+		/// so modified files are never read from the cache. Entries are
+		/// stored in FileIndexedIO format, and the least recently used ones
+		/// are removed when the total size exceeds the limit.
+		//////////////////////////////////////////////////////////////
+		//@{
+		/// Enables the disk cache, storing entries in the specified
+		/// directory and limiting the total size to maxSize bytes. Passing
+		/// an empty directory disables the disk cache.
+		/// \threading This must not be called concurrently with read().
+		void setDiskCache( const std::string &directory, size_t maxSize );
+		/// Returns the directory used by the disk cache, or an
+		/// empty string if it is not enabled.
+		const std::string &getDiskCacheDirectory() const;
+		size_t getDiskCacheMaxSize() const;
+		/// Removes all entries from the disk cache.
+		void clearDiskCache();
+		//@}
+
+		struct Statistics
+		{
+			Statistics();
+			/// Number of calls to read() which found the object in
+			/// the ObjectPool.
+			size_t hits;
+			/// Number of calls to read() which didn't find the object
+			/// in the ObjectPool.
+			size_t misses;
+			/// Number of misses which were satisfied by the disk cache.
+			size_t diskCacheHits;
+			/// Number of misses which weren't found in the disk cache,
+			/// and so loaded the file itself. Always 0 if the disk cache
+			/// is not enabled.
+			size_t diskCacheMisses;
+			/// Total time spent loading files following misses,
+			/// in seconds.
+			double loadTime;
+		};
+
+		/// Returns statistics accumulated since construction or the last
+		/// call to resetStatistics().
+		Statistics statistics() const;
+		void resetStatistics();
+
 		/// Returns a static CachedReader instance to be used by anything
 		/// wishing to share it's cache with others. It makes sense to use
 		/// this wherever possible to conserve memory. This initially
@@ -40,6 +40,8 @@
 
 #include "boost/function.hpp"
 
+#include <atomic>
+
 namespace IECore
 {
 
@@ -101,17 +103,64 @@ class ComputationCache : public RefCounted
 		/// Returns the ObjectPool object used by this computation cache.
 		ObjectPool *objectPool() const;
 
+		/// Counters describing the use of the cache since construction or
+		/// the last call to resetStatistics().
+		struct Statistics
+		{
+			Statistics();
+
+			/// Number of calls to get() that found the result in the cache.
+			size_t hits;
+			/// Number of calls to get() that had to run the compute function.
+			size_t misses;
+			/// Number of results discarded to meet the computation limit, or
+			/// by calls to clear() and erase().
+			size_t evictions;
+			/// Total time spent in the compute function, in seconds.
+			double computeTime;
+		};
+
+		/// Returns the current statistics.
+		Statistics statistics() const;
+
+		/// Resets the statistics counters to zero.
+		void resetStatistics();
+
+		/// Returns the memory used by the results currently referenced by the cache.
+		/// Note that results are held by the ObjectPool and may also be referenced
+		/// by other caches.
+		size_t memoryUsage() const;
+
 	private :
 
 		ComputeFn m_computeFn;
 		HashFn m_hashFn;
 
-		typedef IECore::LRUCache<MurmurHash, MurmurHash> Cache;
+		struct CacheValue
+		{
+			CacheValue();
+			CacheValue( const MurmurHash &objectHash, size_t memoryUsage );
+
+			MurmurHash objectHash;
+			size_t memoryUsage;
+		};
+
+		typedef IECore::LRUCache<MurmurHash, CacheValue> Cache;
 		Cache m_cache;
 
 		ObjectPoolPtr m_objectPool;
 
-		static MurmurHash cacheGetter( const MurmurHash &h, size_t &cost );
+		std::atomic<size_t> m_hits;
+		std::atomic<size_t> m_misses;
+		std::atomic<size_t> m_evictions;
+		std::atomic<uint64_t> m_computeNanoseconds;
+		std::atomic<size_t> m_memoryUsage;
+
+		ConstObjectPtr compute( const T &args );
+		void setCacheValue( const MurmurHash &computationHash, const Object *obj );
+		void removalCallback( const MurmurHash &computationHash, const CacheValue &value );
+
+		static CacheValue cacheGetter( const MurmurHash &h, size_t &cost );
 };
 
 
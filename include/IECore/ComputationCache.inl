@@ -37,12 +37,39 @@
 
 #include "IECore/MessageHandler.h"
 
+#include <chrono>
+
 namespace IECore
 {
 
+template< typename T >
+ComputationCache<T>::Statistics::Statistics() :
+	hits( 0 ), misses( 0 ), evictions( 0 ), computeTime( 0 )
+{
+}
+
+template< typename T >
+ComputationCache<T>::CacheValue::CacheValue() :
+	memoryUsage( 0 )
+{
+}
+
+template< typename T >
+ComputationCache<T>::CacheValue::CacheValue( const MurmurHash &objectHash, size_t memoryUsage ) :
+	objectHash( objectHash ), memoryUsage( memoryUsage )
+{
+}
+
 template< typename T >
 ComputationCache<T>::ComputationCache( ComputeFn computeFn, HashFn hashFn, size_t maxResults, ObjectPoolPtr objectPool ) :
-	m_computeFn(computeFn), m_hashFn(hashFn), m_cache( &ComputationCache<T>::cacheGetter, maxResults), m_objectPool(objectPool)
+	m_computeFn(computeFn), m_hashFn(hashFn),
+	m_cache(
+		&ComputationCache<T>::cacheGetter,
+		[this]( const MurmurHash &computationHash, const CacheValue &value ) { removalCallback( computationHash, value ); },
+		maxResults
+	),
+	m_objectPool(objectPool),
+	m_hits( 0 ), m_misses( 0 ), m_evictions( 0 ), m_computeNanoseconds( 0 ), m_memoryUsage( 0 )
 {
 }
 
@@ -87,7 +114,7 @@ ConstObjectPtr ComputationCache<T>::get( const T &args, ComputationCache::Missin
 {
 	ConstObjectPtr obj(nullptr);
 	MurmurHash computationHash = m_hashFn(args);
-	MurmurHash objectHash = m_cache.get(computationHash);
+	MurmurHash objectHash = m_cache.get(computationHash).objectHash;
 
 	if ( objectHash == MurmurHash() )
 	{
@@ -100,10 +127,10 @@ ConstObjectPtr ComputationCache<T>::get( const T &args, ComputationCache::Missin
 		{
 			return nullptr;
 		}
-		obj = m_computeFn(args);
+		obj = compute(args);
 		if ( obj )
 		{
-			m_cache.set( computationHash, obj->hash(), 1 );
+			setCacheValue( computationHash, obj.get() );
 			obj = m_objectPool->store( obj.get(), ObjectPool::StoreReference );
 		}
 	}
@@ -121,7 +148,7 @@ ConstObjectPtr ComputationCache<T>::get( const T &args, ComputationCache::Missin
 			{
 				return nullptr;
 			}
-			obj = m_computeFn(args);
+			obj = compute(args);
 			if ( obj )
 			{
 				obj = m_objectPool->store( obj.get(), ObjectPool::StoreReference );
@@ -129,11 +156,15 @@ ConstObjectPtr ComputationCache<T>::get( const T &args, ComputationCache::Missin
 				if ( h != objectHash )
 				{
 					/// the computation returned a different object for some reason, so we have to update the hash
-					m_cache.set( computationHash, h, 1 );
+					setCacheValue( computationHash, obj.get() );
 					msg( Msg::Warning, "ComputationCache::get", "Inconsistent hash detected." );
 				}
 			}
 		}
+		else
+		{
+			m_hits++;
+		}
 	}
 	return obj;
 }
@@ -145,24 +176,107 @@ void ComputationCache<T>::set( const T &args, const Object *obj, StoreMode store
 	if ( obj )
 	{
 		m_objectPool->store(obj, storeMode);
-		m_cache.set( computationHash, obj->hash(), 1 );
+		setCacheValue( computationHash, obj );
 	}
 }
 
 template< typename T >
-MurmurHash ComputationCache<T>::cacheGetter( const MurmurHash &h, size_t &cost )
+ObjectPool *ComputationCache<T>::objectPool() const
+{
+	return m_objectPool.get();
+}
+
+template< typename T >
+typename ComputationCache<T>::Statistics ComputationCache<T>::statistics() const
 {
-	cost = 1;
-	return MurmurHash();
+	Statistics result;
+	result.hits = m_hits;
+	result.misses = m_misses;
+	result.evictions = m_evictions;
+	result.computeTime = m_computeNanoseconds / 1e9;
+	return result;
 }
 
 template< typename T >
-ObjectPool *ComputationCache<T>::objectPool() const
+void ComputationCache<T>::resetStatistics()
 {
-	return m_objectPool.get();
+	m_hits = 0;
+	m_misses = 0;
+	m_evictions = 0;
+	m_computeNanoseconds = 0;
+}
+
+template< typename T >
+size_t ComputationCache<T>::memoryUsage() const
+{
+	return m_memoryUsage;
+}
+
+template< typename T >
+ConstObjectPtr ComputationCache<T>::compute( const T &args )
+{
+	m_misses++;
+
+	const auto start = std::chrono::steady_clock::now();
+	ConstObjectPtr result = m_computeFn(args);
+	m_computeNanoseconds += std::chrono::duration_cast<std::chrono::nanoseconds>( std::chrono::steady_clock::now() - start ).count();
+
+	return result;
+}
+
+namespace Detail
+{
+
+/// The computation hash currently being replaced by ComputationCache::setCacheValue()
+/// on this thread, so the removal of the old value isn't counted as an eviction.
+inline MurmurHash &computationCacheReplacedHash()
+{
+	static thread_local MurmurHash g_hash;
+	return g_hash;
+}
+
+} // namespace Detail
+
+template< typename T >
+void ComputationCache<T>::setCacheValue( const MurmurHash &computationHash, const Object *obj )
+{
+	CacheValue value( obj->hash(), obj->memoryUsage() );
+	m_memoryUsage += value.memoryUsage;
+
+	MurmurHash &replacedHash = Detail::computationCacheReplacedHash();
+	replacedHash = computationHash;
+	const bool stored = m_cache.set( computationHash, value, 1 );
+	replacedHash = MurmurHash();
+
+	if( !stored )
+	{
+		m_memoryUsage -= value.memoryUsage;
+	}
+}
+
+template< typename T >
+void ComputationCache<T>::removalCallback( const MurmurHash &computationHash, const CacheValue &value )
+{
+	if( value.objectHash == MurmurHash() )
+	{
+		// placeholder stored by cacheGetter() while the result is computed
+		return;
+	}
+
+	m_memoryUsage -= value.memoryUsage;
+	if( computationHash != Detail::computationCacheReplacedHash() )
+	{
+		m_evictions++;
+	}
+}
+
+template< typename T >
+typename ComputationCache<T>::CacheValue ComputationCache<T>::cacheGetter( const MurmurHash &h, size_t &cost )
+{
+	cost = 1;
+	return CacheValue();
 }
 
 } // namespace IECore
 
 #endif // IECORE_COMPUTATIONCACHE_H
-
@@ -59,6 +59,8 @@ class IECORE_API FileIndexedIO : public StreamIndexedIO
 		/// 	"compressor" : String [ 'blosclz' | 'lz4' | 'lz4hc' | 'snappy' | 'zlib']
 		///		"compressionLevel" : Int [ 0 = no compression, 9 = max compression ]
 		///		"maxCompressedBlockSize" : UInt [ size of compression block ]
+		///		"memoryMapped" : Bool [ read files through a shared, read only memory mapping ]
+		///		"asyncCompression" : Bool [ compress large blocks on background tasks while writing ]
 		FileIndexedIO(const std::string &path, const IndexedIO::EntryIDList &root, IndexedIO::OpenMode mode, const CompoundData *options = nullptr);
 
 		~FileIndexedIO() override;
@@ -0,0 +1,127 @@
+//////////////////////////////////////////////////////////////////////////
+//
+//  Copyright (c) 2019, Image Engine Design Inc. All rights reserved.
+//
+//  Redistribution and use in source and binary forms, with or without
+//  modification, are permitted provided that the following conditions are
+//  met:
+//
+//     * Redistributions of source code must retain the above copyright
+//       notice, this list of conditions and the following disclaimer.
+//
+//     * Redistributions in binary form must reproduce the above copyright
+//       notice, this list of conditions and the following disclaimer in the
+//       documentation and/or other materials provided with the distribution.
+//
+//     * Neither the name of Image Engine Design nor the names of any
+//       other contributors to this software may be used to endorse or
+//       promote products derived from this software without specific prior
+//       written permission.
+//
+//  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS
+//  IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+//  THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+//  PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR
+//  CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+//  EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+//  PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+//  PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+//  LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+//  NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+//  SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+//
+//////////////////////////////////////////////////////////////////////////
+
+#ifndef IECORE_FLATPATHMATCHER_H
+#define IECORE_FLATPATHMATCHER_H
+
+#include "IECore/Export.h"
+#include "IECore/InternedString.h"
+#include "IECore/PathMatcher.h"
+#include "IECore/RefCounted.h"
+
+#include <vector>
+
+namespace IECore
+{
+
+/// An immutable counterpart to PathMatcher, storing its tree of paths in
+/// a single flat array rather than as individually allocated nodes. Nodes
+/// are stored in depth-first order, with each name interned and stored only
+/// once per branch, and siblings sorted alphabetically. This allows
+/// matching to be performed by binary searches over contiguous memory without
+/// any allocation, and makes the set operations simple merges which are
+/// performed in parallel. FlatPathMatchers may also be constructed in
+/// parallel from large lists of paths.
+///
+/// Use pathMatcher() to convert to a regular PathMatcher when editing
+/// is required.
+class IECORE_API FlatPathMatcher
+{
+
+	public :
+
+		FlatPathMatcher();
+		/// Copies are cheap, since the storage is shared.
+		FlatPathMatcher( const FlatPathMatcher &other );
+		~FlatPathMatcher();
+		FlatPathMatcher &operator = ( const FlatPathMatcher &other );
+
+		explicit FlatPathMatcher( const PathMatcher &pathMatcher );
+		/// Constructs from a list of paths. This is performed in
+		/// parallel, and the list may contain duplicates.
+		explicit FlatPathMatcher( const std::vector<std::string> &paths );
+		explicit FlatPathMatcher( const std::vector<std::vector<InternedString>> &paths );
+		/// Constructs from a depth-first traversal of a tree of paths, such
+		/// as would be produced by a PathMatcher::RawIterator. For each location,
+		/// `pathLengths` holds the length of its path, `exactMatches` holds
+		/// whether or not it is an exact match, and `names` holds the final
+		/// name in its path. The root location has no name. Siblings may be
+		/// visited in any order, but loading is quickest when they are in
+		/// the order produced by depthFirst().
+		FlatPathMatcher( const std::vector<InternedString> &names, const std::vector<unsigned int> &pathLengths, const std::vector<unsigned char> &exactMatches );
+
+		/// Returns an equivalent PathMatcher.
+		PathMatcher pathMatcher() const;
+
+		bool isEmpty() const;
+		/// Returns the number of exact matches. Complexity : constant.
+		size_t size() const;
+		/// Fills the paths container with all the paths held
+		/// within this matcher, in sorted order.
+		void paths( std::vector<std::string> &paths ) const;
+		/// Fills the containers with a depth-first traversal of the tree of paths,
+		/// using the layout described for the constructor above.
+		void depthFirst( std::vector<InternedString> &names, std::vector<unsigned int> &pathLengths, std::vector<unsigned char> &exactMatches ) const;
+
+		/// As for PathMatcher::match(). The second form performs no
+		/// allocations.
+		unsigned match( const std::string &path ) const;
+		unsigned match( const std::vector<InternedString> &path ) const;
+
+		/// Set operations, returning new matchers. These operate on the paths
+		/// themselves, so wildcards are treated as regular names.
+		FlatPathMatcher unionWith( const FlatPathMatcher &other ) const;
+		FlatPathMatcher intersection( const FlatPathMatcher &other ) const;
+		FlatPathMatcher difference( const FlatPathMatcher &other ) const;
+
+		bool operator == ( const FlatPathMatcher &other ) const;
+		bool operator != ( const FlatPathMatcher &other ) const;
+
+	private :
+
+		IE_CORE_FORWARDDECLARE( Data )
+
+		FlatPathMatcher( const ConstDataPtr &data );
+
+		// Conversion to and from PathMatcher's tree of nodes.
+		static void fromPathMatcherWalk( const PathMatcher::Node *node, const InternedString &name, bool wildcarded, Data *data );
+		static PathMatcher::NodePtr toPathMatcherWalk( const Data *data, size_t index );
+
+		ConstDataPtr m_data;
+
+};
+
+} // namespace IECore
+
+#endif // IECORE_FLATPATHMATCHER_H
@@ -116,6 +116,9 @@ class IECORE_API IFFFile : public RefCounted
 				bool isGroup();
 				Tag groupName();
 
+				/// Returns the offset of the Chunk data from the start of the file.
+				std::streampos filePosition();
+
 				typedef std::vector<Chunk>::iterator ChunkIterator;
 				ChunkIterator childrenBegin();
 				ChunkIterator childrenEnd();
@@ -39,6 +39,7 @@
 #include "IECore/MessageHandler.h"
 
 #include <cassert>
+#include <memory>
 #include <vector>
 
 namespace IECore
@@ -68,13 +69,7 @@ size_t IFFFile::Chunk::read( std::vector<T> &data )
 		msg( Msg::Error, "IFFFile::Chunk::read()", boost::format( "Attempting to read '%d' pieces of data of size '%d' for a Chunk '%s' with dataSize '%d'." ) % length % sizeof(T) % m_type.name() % m_dataSize );
 	}
 
-	std::vector<T> dataBuffer( length );
-	readData( dataBuffer.data(), length );
-
-	for ( size_t i = 0; i < length; i++ )
-	{
-		data[i] = dataBuffer[i];
-	}
+	readData( data.data(), length );
 
 	return data.size();
 }
@@ -89,15 +84,9 @@ size_t IFFFile::Chunk::read( std::vector<Imath::Vec3<T> > &data )
 		msg( Msg::Error, "IFFFile::Chunk::read()", boost::format( "Attempting to read %d pieces of IMath::Vec3 data of size %d for a Chunk '%s' with dataSize %d." ) % length % sizeof(T) % m_type.name() % m_dataSize );
 	}
 
-	std::vector<T> dataBuffer( length * 3 );
-	readData( dataBuffer.data(), length * 3 );
-
-	for ( size_t i = 0; i < length ; i++ )
-	{
-		data[ i ][0] = dataBuffer[ 3*i ];
-		data[ i ][1] = dataBuffer[ 3*i + 1 ];
-		data[ i ][2] = dataBuffer[ 3*i + 2 ];
-	}
+	// Imath::Vec3 is laid out as 3 contiguous values, so we can
+	// read straight into the vector rather than via a temporary.
+	readData( data.empty() ? nullptr : data[0].getValue(), length * 3 );
 
 	return data.size();
 }
@@ -107,10 +96,12 @@ void IFFFile::Chunk::readData( T *dataBuffer, unsigned long n )
 {
 	m_file->m_iStream->seekg( m_filePosition, std::ios_base::beg );
 
-	std::vector<char> buffer( m_dataSize );
-	m_file->m_iStream->read( buffer.data(), m_dataSize );
+	// Deliberately not value-initialised, as it is immediately
+	// overwritten by the read.
+	std::unique_ptr<char[]> buffer( new char[m_dataSize] );
+	m_file->m_iStream->read( buffer.get(), m_dataSize );
 
-	IFFFile::readData( buffer.data(), dataBuffer, n );
+	IFFFile::readData( buffer.get(), dataBuffer, n );
 }
 
 template<typename T>
@@ -208,6 +208,12 @@ class IECORE_API IndexedIO : public RunTimeTyped
 		/// Any IndexedIO instances to child directories will be in a invalid state and should not be used after commit is called.
 		virtual void commit() = 0;
 
+		/// Hints that the named entries in the current directory are about to be
+		/// read, so that implementations may start fetching them in the background.
+		/// Directories are prefetched recursively and missing entries are ignored.
+		/// The default implementation does nothing.
+		virtual void prefetch( const IndexedIO::EntryIDList &names ) const;
+
 		/// Returns a new interface for the parent of this node in the file or a NULL pointer if it's the root.
 		virtual IndexedIOPtr parentDirectory() = 0;
 
@@ -57,6 +57,8 @@ class IECORE_API MatrixMultiplyOp : public ModifyOp
 		ObjectParameter * matrixParameter();
 		const ObjectParameter * matrixParameter() const;
 
+		bool threadSafe() const override;
+
 	protected :
 
 		void modify( Object * toModify, const CompoundObject * operands ) override;
@@ -41,6 +41,8 @@
 
 #include <memory>
 #include <string>
+#include <utility>
+#include <vector>
 
 namespace IECore
 {
@@ -297,7 +299,10 @@ class IECORE_API Object : public RunTimeTyped
 		class IECORE_API MemoryAccumulator : private boost::noncopyable
 		{
 			public :
-				MemoryAccumulator();
+				/// If recordSharedAllocations is true, the allocations passed
+				/// to `accumulate( ptr, bytes )` are recorded for retrieval
+				/// with sharedAllocations().
+				MemoryAccumulator( bool recordSharedAllocations = false );
 				~MemoryAccumulator();
 				/// Adds the specified number of bytes to the total.
 				void accumulate( size_t bytes );
@@ -309,8 +314,17 @@ class IECORE_API Object : public RunTimeTyped
 				void accumulate( const void *ptr, size_t bytes );
 				/// Returns the total accumulated to date.
 				size_t total() const;
+				/// Returns the allocations that have been passed to
+				/// `accumulate( ptr, bytes )`, provided that recording was
+				/// requested on construction. These are typically buffers
+				/// which may be shared between several objects, so this can be
+				/// used to avoid counting them multiple times across separate
+				/// objects.
+				typedef std::vector<std::pair<const void *, size_t>> Allocations;
+				Allocations sharedAllocations() const;
 			private :
 				size_t m_total;
+				bool m_recordSharedAllocations;
 				struct Accumulated;
 				std::unique_ptr<Accumulated> m_accumulated;
 		};
@@ -56,6 +56,10 @@ IE_CORE_FORWARDDECLARE( ObjectPool );
 /// The function defaultObjectPool() returns a singleton object that should be used by most of the operations,
 /// so there will be one single place where the total memory used by IECore objects is defined.
 ///
+/// Memory usage is accounted for across the whole pool rather than per object, so that
+/// buffers shared between several pooled objects (for instance the copy-on-write storage
+/// of TypedData) are only counted once.
+///
 /// \ingroup utilityGroup
 class IECORE_API ObjectPool : public RefCounted
 {
@@ -63,7 +67,26 @@ class IECORE_API ObjectPool : public RefCounted
 
 		IE_CORE_DECLAREMEMBERPTR( ObjectPool );
 
-		ObjectPool( size_t maxMemory );
+		/// Enum used to specify which objects are discarded when the pool
+		/// needs to free memory.
+		enum EvictionPolicy
+		{
+			/// Approximate least-recently-used eviction, using the
+			/// second-chance (clock) algorithm.
+			LRU = 0,
+			/// An approximation of the GreedyDual-Size algorithm, where
+			/// small objects are given more chances than large ones before
+			/// being evicted. This favours retaining many small objects over
+			/// a few large ones, and is appropriate when the cost of recreating
+			/// an object is not proportional to its size.
+			GreedyDualSize,
+			/// As for LRU, except that objects no larger than
+			/// getPinnedObjectSize() are never evicted to free memory. They
+			/// may still be removed explicitly via erase() or clear().
+			PinSmallObjects
+		};
+
+		ObjectPool( size_t maxMemory, EvictionPolicy evictionPolicy = LRU );
 		~ObjectPool() override;
 
 		// Clears all the objects in the pool
@@ -78,9 +101,43 @@ class IECORE_API ObjectPool : public RefCounted
 		/// Get the maximum possible memory cost of all items held in the pool
 		size_t getMaxMemoryUsage() const;
 
-		/// Returns the current memory cost of items held in the pool
+		/// Returns the current memory cost of items held in the pool. Buffers
+		/// shared between several items are only counted once.
 		size_t memoryUsage() const;
 
+		void setEvictionPolicy( EvictionPolicy evictionPolicy );
+		EvictionPolicy getEvictionPolicy() const;
+
+		/// Sets the size (in bytes) at or below which objects are pinned
+		/// in the pool when using the PinSmallObjects policy. Defaults
+		/// to 1024.
+		void setPinnedObjectSize( size_t pinnedObjectSize );
+		size_t getPinnedObjectSize() const;
+
+		struct Statistics
+		{
+			Statistics();
+			/// Number of calls to retrieve() which found an object.
+			size_t hits;
+			/// Number of calls to retrieve() which didn't find an object.
+			size_t misses;
+			/// Number of objects discarded to keep within the memory limit.
+			size_t evictions;
+			/// Number of objects currently held in the pool.
+			size_t objects;
+			/// As returned by memoryUsage().
+			size_t memoryUsage;
+			/// The portion of memoryUsage which is held in buffers shared
+			/// by more than one object in the pool.
+			size_t sharedMemoryUsage;
+		};
+
+		/// Returns statistics accumulated since construction or the
+		/// last call to resetStatistics().
+		Statistics statistics() const;
+		/// Resets the hits, misses and evictions counts.
+		void resetStatistics();
+
 		/// Returns true if the object with the given hash is in the pool.
 		/// Note: this function doesn't garantee that retrieve() will return an object in a multi-threaded application.
 		bool contains( const MurmurHash &hash ) const;
@@ -100,6 +157,10 @@ class IECORE_API ObjectPool : public RefCounted
 		/// If the storeMode is Reference, then the object should not be modified after the call to this function to
 		/// prevent affecting the contents of the pool and it's memoryUsage count.
 		ConstObjectPtr store( const Object *obj, StoreMode mode );
+		/// As above, but stores the object under the specified hash rather than
+		/// its own. This allows results to be retrieved using a hash of the inputs
+		/// used to compute them, without needing to compute them first.
+		ConstObjectPtr store( const Object *obj, const MurmurHash &hash, StoreMode mode );
 
 		/// Returns a static ObjectPool instance to be used by anything
 		/// wishing to share IECore::Object instances.
@@ -75,6 +75,18 @@ class IECORE_API Op : public Parameterised
 		/// Performs the operation using the given values of parameters.
 		ObjectPtr operate( const CompoundObject *operands );
 
+		/// Returns true if operateConcurrently() may be called from multiple
+		/// threads at once. Derived classes may only return true if doOperation()
+		/// accesses arguments solely via its operands, and doesn't otherwise
+		/// modify the Op. The default implementation returns false.
+		virtual bool threadSafe() const;
+
+		/// As operate( operands ), but doesn't update resultParameter(). The
+		/// operands are not validated. This may be called concurrently from
+		/// multiple threads, each with its own operands, provided that
+		/// threadSafe() returns true.
+		ObjectPtr operateConcurrently( const CompoundObject *operands );
+
 		/// Returns a parameter describing the result of the operation - the
 		/// value of this parameter is always the value last returned by operate.
 		const Parameter *resultParameter() const;
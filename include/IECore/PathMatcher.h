@@ -143,6 +143,8 @@ class IECORE_API PathMatcher
 
 	private :
 
+		friend class FlatPathMatcher;
+
 		IE_CORE_FORWARDDECLARE( Node )
 
 		PathMatcher( const NodePtr &root );
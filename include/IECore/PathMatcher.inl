@@ -60,6 +60,20 @@ void PathMatcher::init( PathIterator pathsBegin, PathIterator pathsEnd )
 	}
 }
 
+//////////////////////////////////////////////////////////////////////////
+// Name
+//////////////////////////////////////////////////////////////////////////
+
+inline PathMatcher::Name::Name( IECore::InternedString name, Type type )
+	: name( name ), type( type )
+{
+}
+
+inline bool PathMatcher::Name::operator < ( const Name &other ) const
+{
+	return type < other.type || ( ( type == other.type ) && name < other.name );
+}
+
 //////////////////////////////////////////////////////////////////////////
 // RawIterator
 //////////////////////////////////////////////////////////////////////////
@@ -101,6 +101,8 @@ class IECORE_API StreamIndexedIO : public IndexedIO
 
 		void commit() override;
 
+		void prefetch( const IndexedIO::EntryIDList &names ) const override;
+
 		void write(const IndexedIO::EntryID &name, const float *x, unsigned long arrayLength) override;
 		void write(const IndexedIO::EntryID &name, const double *x, unsigned long arrayLength) override;
 		void write(const IndexedIO::EntryID &name, const half *x, unsigned long arrayLength) override;
@@ -178,6 +180,15 @@ class IECORE_API StreamIndexedIO : public IndexedIO
 				/// see 'setInput'
 				void read( char *buffer, size_t size, size_t pos);
 
+				/// Returns a pointer to 'size' bytes at 'pos' offset in the file if the file
+				/// has been memory mapped (see 'setInput'), or nullptr otherwise. The returned
+				/// memory is read only and remains valid for the lifetime of the StreamFile.
+				const char *mappedData( size_t size, size_t pos ) const;
+
+				/// Hints that 'size' bytes at 'pos' offset will be read soon, allowing
+				/// the operating system to start reading them in the background.
+				void prefetch( size_t size, size_t pos ) const;
+
 				void seekg( size_t pos, std::ios_base::seekdir dir );
 				void seekp( size_t pos, std::ios_base::seekdir dir );
 				void read( char *buffer, size_t size );
@@ -205,8 +216,10 @@ class IECORE_API StreamIndexedIO : public IndexedIO
 				StreamFile( IndexedIO::OpenMode mode );
 
 				/// Called during construction of derived classes. Assigns a stream and tells if the stream is empty.
-				/// Optionally provide a filename to use for lock free reading
-				void setInput( std::iostream *stream, bool emptyFile, const std::string& fileName );
+				/// Optionally provide a filename to use for lock free reading. When memoryMapped is true
+				/// and the file is opened for Read, the lock free reads are served from a shared read only
+				/// memory mapping of the file.
+				void setInput( std::iostream *stream, bool emptyFile, const std::string& fileName, bool memoryMapped = false );
 
 				IndexedIO::OpenMode m_openmode;
 				std::iostream *m_stream;
@@ -97,6 +97,17 @@ class IECORE_EXPORT TypedData : public Data
 		/// modified behind the scenes, it may not be called while
 		/// other threads are operating on the same instance.
 		T &writable();
+		/// As for writable(), but the data may continue to be modified through
+		/// the returned reference until a matching call to releaseWritable().
+		/// This is intended for exposing the data to external code, such as
+		/// Python's buffer protocol, which doesn't call writable() for each
+		/// modification. Until the release, copies duplicate the data rather
+		/// than sharing it, and hash() doesn't cache its result. Calls may
+		/// be nested.
+		/// \threading As for writable().
+		T &acquireWritable();
+		/// Releases writable access acquired by acquireWritable().
+		void releaseWritable();
 
 		/// Base type used in the internal data structure.
 		typedef typename TypedDataTraits<T>::BaseType BaseType;
@@ -194,6 +194,18 @@ T & TypedData<T>::writable()
 	return m_data.writable();
 }
 
+template<class T>
+T & TypedData<T>::acquireWritable()
+{
+	return m_data.acquireWritable();
+}
+
+template<class T>
+void TypedData<T>::releaseWritable()
+{
+	m_data.releaseWritable();
+}
+
 template<class T>
 void TypedData<T>::memoryUsage( Object::MemoryAccumulator &accumulator ) const
 {
@@ -37,9 +37,30 @@
 
 #include "IECore/MurmurHash.h"
 
+#include "tbb/atomic.h"
+#include "tbb/parallel_for.h"
+
+#include <algorithm>
+#include <vector>
+
 namespace IECore
 {
 
+namespace Detail
+{
+
+// Buffers of at least this many bytes are hashed in fixed size chunks
+// in parallel, with the chunk hashes then being combined into the
+// final result. Smaller buffers are hashed serially as they always have
+// been, so that their hashes remain unchanged. Changing either value
+// changes the hashes for large buffers, so the version must be bumped
+// if they are ever modified.
+static const size_t g_chunkedHashThreshold = 4 * 1024 * 1024;
+static const size_t g_chunkedHashChunkSize = 1024 * 1024;
+static const int g_chunkedHashVersion = 1;
+
+} // namespace Detail
+
 template<class T>
 class IECORE_EXPORT SimpleDataHolder
 {
@@ -66,6 +87,15 @@ class IECORE_EXPORT SimpleDataHolder
 			return m_data;
 		}
 
+		T &acquireWritable()
+		{
+			return m_data;
+		}
+
+		void releaseWritable()
+		{
+		}
+
 		bool operator == ( const SimpleDataHolder<T> &other ) const
 		{
 			return m_data == other.m_data;
@@ -98,6 +128,29 @@ class IECORE_EXPORT SharedDataHolder
 		{
 		}
 
+		// Data with active writers can't be shared, as the writers may
+		// modify it at any time. Copies duplicate it instead.
+		SharedDataHolder( const SharedDataHolder<T> &other )
+			: m_data( other.shareable() )
+		{
+		}
+
+		SharedDataHolder<T> &operator = ( const SharedDataHolder<T> &other )
+		{
+			if( m_data->writers )
+			{
+				// Our writers refer to our current storage, so we
+				// must copy into it rather than replace it.
+				m_data->data = other.readable();
+				m_data->hashValid = false;
+			}
+			else
+			{
+				m_data = other.shareable();
+			}
+			return *this;
+		}
+
 		const T &readable() const
 		{
 			assert( m_data );
@@ -116,6 +169,24 @@ class IECORE_EXPORT SharedDataHolder
 			return m_data->data;
 		}
 
+		// As for writable(), but the data may continue to be modified via
+		// the returned reference until a matching call to releaseWritable().
+		// In the meantime the data is not shared with copies, and the hash
+		// is not cached.
+		T &acquireWritable()
+		{
+			T &result = writable();
+			++m_data->writers;
+			return result;
+		}
+
+		void releaseWritable()
+		{
+			assert( m_data->writers );
+			--m_data->writers;
+			m_data->hashValid = false;
+		}
+
 		bool operator == ( const SharedDataHolder<T> &other ) const
 		{
 			if( m_data==other.m_data )
@@ -134,6 +205,12 @@ class IECORE_EXPORT SharedDataHolder
 		// datatype has special needs.
 		void hash( MurmurHash &h ) const
 		{
+			if( m_data->writers )
+			{
+				h.append( hash() );
+				return;
+			}
+
 			if( !m_data->hashValid )
 			{
 				m_data->hash = hash();
@@ -146,8 +223,42 @@ class IECORE_EXPORT SharedDataHolder
 
 		MurmurHash hash() const
 		{
+			typedef typename T::value_type ValueType;
+
+			const T &data = readable();
+			const size_t size = data.size();
+			if( size * sizeof( ValueType ) < Detail::g_chunkedHashThreshold )
+			{
+				MurmurHash result;
+				result.append( &(data[0]), size );
+				return result;
+			}
+
+			const size_t chunkSize = std::max( Detail::g_chunkedHashChunkSize / sizeof( ValueType ), size_t( 1 ) );
+			const size_t numChunks = ( size + chunkSize - 1 ) / chunkSize;
+			std::vector<MurmurHash> chunkHashes( numChunks );
+
+			tbb::task_group_context taskGroupContext( tbb::task_group_context::isolated );
+			tbb::parallel_for(
+				tbb::blocked_range<size_t>( 0, numChunks ),
+				[&data, &chunkHashes, chunkSize, size]( const tbb::blocked_range<size_t> &range )
+				{
+					for( size_t i = range.begin(); i != range.end(); ++i )
+					{
+						const size_t begin = i * chunkSize;
+						chunkHashes[i].append( &(data[begin]), std::min( chunkSize, size - begin ) );
+					}
+				},
+				taskGroupContext
+			);
+
 			MurmurHash result;
-			result.append( &(readable()[0]), readable().size() );
+			result.append( Detail::g_chunkedHashVersion );
+			result.append( (uint64_t)size );
+			for( const auto &h : chunkHashes )
+			{
+				result.append( h );
+			}
 			return result;
 		}
 
@@ -157,18 +268,25 @@ class IECORE_EXPORT SharedDataHolder
 		{
 			public :
 
-				Shareable() : data(), hashValid( false ) {}
-				Shareable( const T &initData ) : data( initData ), hashValid( false ) {}
+				Shareable() : data(), hashValid( false ), writers() {}
+				Shareable( const T &initData ) : data( initData ), hashValid( false ), writers() {}
 
 				T data;
 				MurmurHash hash;
 				volatile bool hashValid;
+				// Number of outstanding calls to acquireWritable().
+				tbb::atomic<size_t> writers;
 
 		};
 
 		IE_CORE_DECLAREPTR( Shareable )
 		ShareablePtr m_data;
 
+		ShareablePtr shareable() const
+		{
+			return m_data->writers ? new Shareable( m_data->data ) : m_data;
+		}
+
 };
 
 template <class T>
@@ -45,7 +45,9 @@ IECORE_PUSH_DEFAULT_VISIBILITY
 IECORE_POP_DEFAULT_VISIBILITY
 
 #include "tbb/recursive_mutex.h"
+#include "tbb/spin_mutex.h"
 
+#include <atomic>
 #include <list>
 
 
@@ -80,7 +82,13 @@ class IECOREGL_API Group : public Renderable
 		void setState( StatePtr state );
 
 		// render method ( assumes there's no threads modifying the group ).
+		/// If FrustumCullingStateComponent is enabled, the group is skipped
+		/// entirely when its bound lies outside the view frustum. The frustum
+		/// is taken from GL once, by the first Group with culling enabled,
+		/// and is then passed down to descendant Groups.
 		void render( State *currentState ) const override;
+		/// The bound is cached, and only recomputed after the bound
+		/// of a descendant has changed. See Renderable::boundChanged().
 		Imath::Box3f bound() const override;
 
 		void addChild( RenderablePtr child );
@@ -95,11 +103,31 @@ class IECOREGL_API Group : public Renderable
 
 	private :
 
+		friend class Renderable;
+
+		// As for render(), but with `parentToClip` transforming from the
+		// parent's space into clip space, if it is already known.
+		void render( State *currentState, const Imath::M44f *parentToClip ) const;
+		// Returns true if the children lie entirely outside the
+		// frustum defined by `toClip`.
+		bool culled( const Imath::M44f &toClip ) const;
+
+		// Returns the union of the bounds of all children,
+		// without m_transform applied.
+		Imath::Box3f childBound() const;
+		// Invalidates the cached child bound, propagating the
+		// change to our own parents.
+		void childBoundChanged();
+
 		StatePtr m_state;
 		Imath::M44f m_transform;
 		ChildContainer m_children;
 		mutable Mutex m_mutex;
 
+		mutable tbb::spin_mutex m_childBoundMutex;
+		mutable Imath::Box3f m_childBound;
+		mutable std::atomic_bool m_childBoundDirty;
+
 };
 
 IE_CORE_DECLAREPTR( Group );
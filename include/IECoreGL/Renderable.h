@@ -45,10 +45,15 @@ IECORE_PUSH_DEFAULT_VISIBILITY
 #include "OpenEXR/ImathBox.h"
 IECORE_POP_DEFAULT_VISIBILITY
 
+#include "tbb/spin_mutex.h"
+
+#include <vector>
+
 namespace IECoreGL
 {
 
 IE_CORE_FORWARDDECLARE( State );
+IE_CORE_FORWARDDECLARE( Group );
 
 /// The Renderable class provides an abstract base class
 /// for all classes capable of producing a visible result in
@@ -73,6 +78,27 @@ class IECOREGL_API Renderable : public IECore::RunTimeTyped
 		/// Returns the bounding box for the Renderable.
 		virtual Imath::Box3f bound() const = 0;
 
+	protected :
+
+		/// Must be called by derived classes whenever a modification
+		/// changes the result of bound(), so that the cached bounds of
+		/// any Groups containing them are invalidated.
+		void boundChanged();
+
+	private :
+
+		friend class Group;
+
+		// The Groups this Renderable has been added to, maintained
+		// by Group::addChild() and friends. A Group appears once for
+		// each time the Renderable appears in its children.
+		typedef std::vector<Group *> ParentContainer;
+		ParentContainer m_parents;
+		tbb::spin_mutex m_parentsMutex;
+
+		void addParent( Group *parent );
+		void removeParent( Group *parent );
+
 };
 
 IE_CORE_DECLAREPTR( Renderable );
@@ -357,6 +357,12 @@ class IECOREGL_API Renderer : public IECoreScene::Renderer
 		/// If a procedural is not visible then it will not be opened
 		/// to discover if it's contents might turn visibility back on.
 		///
+		/// \li <b>"gl:frustumCulling" BoolData false</b><br>
+		/// In deferred mode, specifies that groups whose bounds lie
+		/// entirely outside the view frustum are skipped at render time,
+		/// without submitting any of their contents to GL. This is only
+		/// safe when shaders don't displace geometry outside its bound.
+		///
 		/// \par Instancing attributes :
 		////////////////////////////////////////////////////////////
 		///
@@ -123,6 +123,7 @@ enum TypeId
 	PrimitiveSelectableTypeId = 105080,
 	ToGLStateConverterTypeId = 105081,
 	ToGLSphereConverterTypeId = 105082,
+	FrustumCullingStateComponentTypeId = 105083,
 	LastCoreGLTypeId = 105999,
 };
 
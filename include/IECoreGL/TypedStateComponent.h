@@ -230,6 +230,10 @@ typedef TypedStateComponent<RendererSpace, CullingSpaceStateComponentTypeId> Cul
 // Defines the bounding box for culling. The space it is defined on is given by CullingSpaceStateComponent.
 typedef TypedStateComponent<Imath::Box3f, CullingBoxStateComponentTypeId> CullingBoxStateComponent;
 
+/// Defines whether or not Groups are culled against the view frustum before
+/// their children are rendered.
+typedef TypedStateComponent<bool, FrustumCullingStateComponentTypeId> FrustumCullingStateComponent;
+
 /// Defines whether or not procedurals will be executed in parallel threads.
 typedef TypedStateComponent<bool, ProceduralThreadingStateComponentTypeId> ProceduralThreadingStateComponent;
 
@@ -255,6 +259,7 @@ IE_CORE_DECLAREPTR( DepthTestStateComponent );
 IE_CORE_DECLAREPTR( DepthMaskStateComponent );
 IE_CORE_DECLAREPTR( CullingSpaceStateComponent );
 IE_CORE_DECLAREPTR( CullingBoxStateComponent );
+IE_CORE_DECLAREPTR( FrustumCullingStateComponent );
 IE_CORE_DECLAREPTR( ProceduralThreadingStateComponent );
 IE_CORE_DECLAREPTR( CameraVisibilityStateComponent );
 IE_CORE_DECLAREPTR( AutomaticInstancingStateComponent );
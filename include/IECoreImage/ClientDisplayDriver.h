@@ -41,14 +41,21 @@
 #include "IECoreImage/DisplayDriver.h"
 #include "IECoreImage/Export.h"
 
+#include "IECore/VectorTypedData.h"
+
 namespace IECoreImage
 {
 
 
 /// Connects to a DisplayDriverServer and forwards the image to the server using socket messages.
-/// This client class works synchronously.
+/// Calls to imageData() queue the data and return immediately, with a background thread writing it
+/// to the socket. The queue is flushed by imageClose(), and any errors in sending are reported by
+/// the next call to imageData() or imageClose().
 /// It forwards all parameters to the server and also includes one called "clientPID" to help grouping AOVs from the same render.
 /// You must set the parameter 'remoteDisplayType' with a registered display driver to be instantiated in the server side.
+/// The optional BoolData parameters 'displayCompression' and 'displayHalfFloat' request that the image data is
+/// compressed using lz4 and/or sent as half precision floats. These are negotiated with the server when the image is
+/// opened, and the data is sent uncompressed to servers which don't support them.
 /// \ingroup renderingGroup
 class IECOREIMAGE_API ClientDisplayDriver : public DisplayDriver
 {
@@ -80,6 +87,7 @@ class IECOREIMAGE_API ClientDisplayDriver : public DisplayDriver
 
 		static const DisplayDriverDescription<ClientDisplayDriver> g_description;
 
+		void openImage( const IECore::CharVectorData *openParameters, unsigned char protocolVersion );
 		void sendHeader( int msg, size_t dataSize );
 		size_t receiveHeader( int msg );
 
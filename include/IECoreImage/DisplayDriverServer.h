@@ -52,7 +52,9 @@ namespace IECoreImage
 /// Server class that receives images from ClientDisplayDriver connections and forwards the data to local display drivers.
 /// The type of the local display drivers is defined by the 'remoteDisplayType' parameter.
 ///
-/// The server object creates a thread to control the socket connection. The thread dies when the object is destroyed.
+/// The server object creates a small pool of threads to service the socket connections, so that several images
+/// may be received and decoded concurrently. The threads die when the object is destroyed. Compression of the
+/// image data is negotiated with each client as the image is opened - see ClientDisplayDriver for details.
 /// \ingroup renderingGroup
 class IECOREIMAGE_API DisplayDriverServer : public IECore::RunTimeTyped
 {
@@ -38,6 +38,7 @@
 #include "IECoreImage/Export.h"
 #include "IECoreImage/TypeIds.h"
 
+#include "IECore/CompoundData.h"
 #include "IECore/Reader.h"
 #include "IECore/NumericParameter.h"
 #include "IECore/SimpleTypedParameter.h"
@@ -85,6 +86,11 @@ class IECOREIMAGE_API ImageReader : public IECore::Reader
 		/// The parameter specifying the miplevel to be read from the image file.
 		IECore::IntParameter *mipLevelParameter();
 		const IECore::IntParameter *mipLevelParameter() const;
+		/// The parameter specifying if the image cache shared by all readers
+		/// should be used, rather than a private one. Note that the shared
+		/// cache does not check for files being modified on disk.
+		IECore::BoolParameter *sharedCacheParameter();
+		const IECore::BoolParameter *sharedCacheParameter() const;
 		//@}
 
 		//! @name Image specific reading functions
@@ -105,6 +111,22 @@ class IECOREIMAGE_API ImageReader : public IECore::Reader
 		/// each element corresponds to a pixel. If that does not correspond
 		/// to the native file format, then it should return a FloatVectorData.
 		IECore::DataPtr readChannel( const std::string &name, bool raw = false );
+		/// Reads several channels in a single pass over the file, returning
+		/// a map from channel name to data. This is much more efficient than
+		/// calling readChannel() repeatedly, and the decoding is performed in
+		/// parallel. If region is empty the whole data window is read,
+		/// otherwise just the pixels within it. Pixels outside the data window
+		/// are returned as zero.
+		IECore::CompoundDataPtr readChannels( const std::vector<std::string> &names, const Imath::Box2i &region = Imath::Box2i(), bool raw = false );
+		//@}
+
+		//! @name Shared cache
+		/// Controls the image cache used by readers with sharedCacheParameter()
+		/// turned on.
+		///////////////////////////////////////////////////////////////
+		//@{
+		static void setSharedCacheMemoryLimit( float megabytes );
+		static float getSharedCacheMemoryLimit();
 		//@}
 
 	protected :
@@ -123,6 +145,7 @@ class IECOREIMAGE_API ImageReader : public IECore::Reader
 		IECore::StringVectorParameterPtr m_channelNamesParameter;
 		IECore::BoolParameterPtr m_rawChannelsParameter;
 		IECore::IntParameterPtr m_miplevelParameter;
+		IECore::BoolParameterPtr m_sharedCacheParameter;
 
 		class Implementation;
 		std::unique_ptr<Implementation> m_implementation;
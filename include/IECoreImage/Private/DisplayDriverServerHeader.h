@@ -43,22 +43,31 @@ namespace IECoreImage
 /* Header block used by back and forth messages with the server.
 * 7 bytes long:
 * [0] - magic number ( 0x82 )
-* [1] - protocol version ( 1 )
-* [2] - message type ( imageOpen, imageData, imageClose )
+* [1] - protocol version ( 2 or 3 )
+* [2] - message type ( imageOpen, imageData, imageClose, exception, imageDataCompressed )
 * [3-6] - length of following data block.
+*
+* Version 3 sessions are only opened by clients wanting to negotiate compression.
+* The server replies to a version 3 imageOpen with a third block containing the
+* Compression flags it accepts, after which the client may send imageDataCompressed
+* blocks, which contain a Box2i, a 32 bit word of Compression flags and the
+* ( possibly compressed ) pixel data.
 */
 class DisplayDriverServerHeader
 {
 	public:
 
-		enum MessageType { imageOpen = 1, imageData = 2, imageClose = 3, exception = 4 };
+		enum MessageType { imageOpen = 1, imageData = 2, imageClose = 3, exception = 4, imageDataCompressed = 5 };
+
+		enum Compression { noCompression = 0, lz4Compression = 1, halfCompression = 2 };
 
 		static const unsigned char headerLength = 7;
 		static const unsigned char magicNumber = 0x82;
-		static const unsigned char currentProtocolVersion = 2;
+		static const unsigned char minimumProtocolVersion = 2;
+		static const unsigned char currentProtocolVersion = 3;
 
 		DisplayDriverServerHeader();
-		DisplayDriverServerHeader( MessageType msg, size_t dataSize );
+		DisplayDriverServerHeader( MessageType msg, size_t dataSize, unsigned char protocolVersion = minimumProtocolVersion );
 
 		// returns internal buffer ( length = headerLength constant )
 		unsigned char *buffer();
@@ -75,6 +84,9 @@ class DisplayDriverServerHeader
 		// returns the message type defined in the header.
 		MessageType messageType();
 
+		// returns the protocol version defined in the header.
+		unsigned char protocolVersion();
+
 	private:
 
 		unsigned char m_header[ headerLength ];
@@ -35,6 +35,7 @@
 #ifndef IECOREPYTHON_OPBINDING_H
 #define IECOREPYTHON_OPBINDING_H
 
+#include "IECorePython/ExceptionAlgo.h"
 #include "IECorePython/Export.h"
 #include "IECorePython/RunTimeTypedBinding.h"
 
@@ -97,6 +98,27 @@ class OpWrapper : public IECorePython::RunTimeTypedWrapper<T>
 			}
 		}
 
+		bool threadSafe() const override
+		{
+			if( this->isSubclassed() )
+			{
+				ScopedGILLock gilLock;
+				try
+				{
+					if( boost::python::object f = this->methodOverride( "threadSafe" ) )
+					{
+						return boost::python::extract<bool>( f() );
+					}
+				}
+				catch( const boost::python::error_already_set &e )
+				{
+					ExceptionAlgo::translatePythonException();
+				}
+			}
+
+			return T::threadSafe();
+		}
+
 };
 
 IECOREPYTHON_API void bindOp();
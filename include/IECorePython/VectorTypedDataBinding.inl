@@ -42,11 +42,307 @@
 
 #include "boost/python/suite/indexing/container_utils.hpp"
 
+#include "IECore/ByteOrder.h"
+#include "IECore/VectorTypedData.h"
+
+#include "boost/python/def_visitor.hpp"
+
+#include <cstdint>
+#include <cstring>
+#include <map>
 #include <sstream>
 
 namespace IECorePython
 {
 
+namespace Detail
+{
+
+/// Provides the PEP 3118 format character for the base types
+/// which may be exposed through the buffer protocol. Types without a
+/// specialisation are not exposed.
+template<typename T>
+struct BufferFormat
+{
+	static const bool supported = false;
+};
+
+#define IECOREPYTHON_DEFINEBUFFERFORMAT( TYPE, FORMAT ) \
+template<> \
+struct BufferFormat<TYPE> \
+{ \
+	static const bool supported = true; \
+	static const char *format() { return FORMAT; } \
+};
+
+IECOREPYTHON_DEFINEBUFFERFORMAT( half, "e" )
+IECOREPYTHON_DEFINEBUFFERFORMAT( float, "f" )
+IECOREPYTHON_DEFINEBUFFERFORMAT( double, "d" )
+IECOREPYTHON_DEFINEBUFFERFORMAT( int, "i" )
+IECOREPYTHON_DEFINEBUFFERFORMAT( unsigned int, "I" )
+IECOREPYTHON_DEFINEBUFFERFORMAT( char, "b" )
+IECOREPYTHON_DEFINEBUFFERFORMAT( unsigned char, "B" )
+IECOREPYTHON_DEFINEBUFFERFORMAT( short, "h" )
+IECOREPYTHON_DEFINEBUFFERFORMAT( unsigned short, "H" )
+IECOREPYTHON_DEFINEBUFFERFORMAT( int64_t, "q" )
+IECOREPYTHON_DEFINEBUFFERFORMAT( uint64_t, "Q" )
+
+#undef IECOREPYTHON_DEFINEBUFFERFORMAT
+
+/// Returns 'f' for floating point formats, 'i' for signed integers,
+/// 'u' for unsigned integers and 0 for anything else. Byte order
+/// prefixes matching the native byte order are ignored.
+inline char bufferFormatKind( const char *format )
+{
+	if( !format )
+	{
+		// no format means unsigned bytes
+		return 'u';
+	}
+
+	if( *format == '@' || *format == '=' || *format == ( IECore::littleEndian() ? '<' : '>' ) )
+	{
+		format++;
+	}
+
+	if( !format[0] || format[1] )
+	{
+		return 0;
+	}
+
+	switch( format[0] )
+	{
+		case 'e' :
+		case 'f' :
+		case 'd' :
+			return 'f';
+		case 'b' :
+		case 'h' :
+		case 'i' :
+		case 'l' :
+		case 'q' :
+			return 'i';
+		case 'B' :
+		case 'H' :
+		case 'I' :
+		case 'L' :
+		case 'Q' :
+			return 'u';
+		default :
+			return 0;
+	}
+}
+
+/// Returns the number of buffers currently exported for each
+/// object. Entries are removed when their count falls to zero.
+/// Only accessed while holding the GIL.
+inline std::map<const IECore::Data *, size_t> &bufferExports()
+{
+	static std::map<const IECore::Data *, size_t> g_exports;
+	return g_exports;
+}
+
+} // namespace Detail
+
+/// Implements the buffer protocol and the numpy `__array_interface__`
+/// for VectorTypedData classes whose elements are made of a supported
+/// base type, allowing them to be shared with numpy without copying.
+template<typename ThisClass, bool supported = Detail::BufferFormat<typename ThisClass::BaseType>::supported>
+class VectorTypedDataBufferFunctions
+{
+	public :
+
+		typedef typename ThisClass::BaseType BaseType;
+		typedef typename ThisClass::ValueType Container;
+		typedef typename Container::value_type data_type;
+
+		/// Fills the container with a copy of the contiguous buffer exported by v,
+		/// returning false if v doesn't export a buffer of a compatible type.
+		static bool fromBuffer( Container &container, boost::python::object v )
+		{
+			if( !PyObject_CheckBuffer( v.ptr() ) )
+			{
+				return false;
+			}
+
+			Py_buffer view;
+			if( PyObject_GetBuffer( v.ptr(), &view, PyBUF_C_CONTIGUOUS | PyBUF_FORMAT ) == -1 )
+			{
+				PyErr_Clear();
+				return false;
+			}
+
+			const bool compatible =
+				view.itemsize == sizeof( BaseType ) &&
+				Detail::bufferFormatKind( view.format ) == Detail::bufferFormatKind( Detail::BufferFormat<BaseType>::format() ) &&
+				view.len % sizeof( data_type ) == 0
+			;
+
+			if( compatible )
+			{
+				container.resize( view.len / sizeof( data_type ) );
+				memcpy( container.data(), view.buf, view.len );
+			}
+
+			PyBuffer_Release( &view );
+			return compatible;
+		}
+
+		/// Raises BufferError if a buffer is currently exported for x,
+		/// as changing the size of the data would reallocate it out
+		/// from under the consumer.
+		static void checkResizable( const ThisClass &x )
+		{
+			if( Detail::bufferExports().count( &x ) )
+			{
+				PyErr_SetString( PyExc_BufferError, "Existing exports of data: object cannot be re-sized" );
+				boost::python::throw_error_already_set();
+			}
+		}
+
+		template<typename Class>
+		static void bind( Class &c )
+		{
+			PyTypeObject *type = reinterpret_cast<PyTypeObject *>( c.ptr() );
+			type->tp_as_buffer->bf_getbuffer = &getBuffer;
+			type->tp_as_buffer->bf_releasebuffer = &releaseBuffer;
+#if PY_MAJOR_VERSION < 3
+			type->tp_flags |= Py_TPFLAGS_HAVE_NEWBUFFER;
+#endif
+
+			c.add_property( "__array_interface__", &arrayInterface );
+		}
+
+	private :
+
+		/// Number of BaseType components in each element. Elements are
+		/// exposed as rows of a 2D array when this is greater than 1.
+		static size_t components()
+		{
+			return sizeof( data_type ) / sizeof( BaseType );
+		}
+
+		/// Implements `bf_getbuffer`. The buffer protocol requires that exporters
+		/// consistently provide either read-only or writable buffers, and we always
+		/// provide writable ones, so that consumers such as numpy can modify the
+		/// data in place. Writable access is held until the buffer is released (see
+		/// TypedData::acquireWritable()). This ensures the data isn't shared with any
+		/// copies made in the meantime, and that hashes reflect writes made through
+		/// the buffer.
+		static int getBuffer( PyObject *self, Py_buffer *view, int flags )
+		{
+			boost::python::extract<ThisClass &> e( self );
+			if( !e.check() )
+			{
+				PyErr_SetString( PyExc_BufferError, "Unable to get buffer" );
+				view->obj = nullptr;
+				return -1;
+			}
+
+			ThisClass &x = e();
+			const size_t size = x.readable().size();
+
+			// shape followed by strides, freed in releaseBuffer()
+			Py_ssize_t *shapeAndStrides = new Py_ssize_t[4];
+			shapeAndStrides[0] = size;
+			shapeAndStrides[1] = components();
+			shapeAndStrides[2] = sizeof( data_type );
+			shapeAndStrides[3] = sizeof( BaseType );
+
+			x.acquireWritable();
+
+			view->buf = (void *)x.baseReadable();
+			view->obj = self;
+			Py_INCREF( self );
+			view->len = size * sizeof( data_type );
+			view->readonly = 0;
+			view->itemsize = sizeof( BaseType );
+			view->format = ( flags & PyBUF_FORMAT ) ? const_cast<char *>( Detail::BufferFormat<BaseType>::format() ) : nullptr;
+			view->ndim = components() > 1 ? 2 : 1;
+			view->shape = ( flags & PyBUF_ND ) ? shapeAndStrides : nullptr;
+			view->strides = ( ( flags & PyBUF_STRIDES ) == PyBUF_STRIDES ) ? shapeAndStrides + 2 : nullptr;
+			view->suboffsets = nullptr;
+			view->internal = shapeAndStrides;
+			Detail::bufferExports()[&x]++;
+			return 0;
+		}
+
+		/// Implements `bf_releasebuffer`.
+		static void releaseBuffer( PyObject *self, Py_buffer *view )
+		{
+			delete[] static_cast<Py_ssize_t *>( view->internal );
+
+			ThisClass &x = boost::python::extract<ThisClass &>( self )();
+			std::map<const IECore::Data *, size_t> &exports = Detail::bufferExports();
+			std::map<const IECore::Data *, size_t>::iterator it = exports.find( &x );
+			if( it != exports.end() && !--it->second )
+			{
+				exports.erase( it );
+			}
+
+			x.releaseWritable();
+		}
+
+		/// Implements the `__array_interface__` property. Because there is no
+		/// way of knowing when the consumer has finished with the data, it is
+		/// only ever exposed read-only, without unsharing it from any copies.
+		/// Writable access is available via the buffer protocol, which numpy
+		/// uses in preference to `__array_interface__`.
+		static boost::python::object arrayInterface( ThisClass &x )
+		{
+			const size_t size = x.readable().size();
+
+			std::string typeStr( IECore::littleEndian() ? "<" : ">" );
+			typeStr += Detail::bufferFormatKind( Detail::BufferFormat<BaseType>::format() );
+			typeStr += std::to_string( sizeof( BaseType ) );
+
+			boost::python::dict result;
+			result["version"] = 3;
+			result["shape"] = components() > 1 ? boost::python::make_tuple( size, components() ) : boost::python::make_tuple( size );
+			result["typestr"] = typeStr;
+			result["data"] = boost::python::make_tuple( reinterpret_cast<uintptr_t>( x.baseReadable() ), true );
+			return result;
+		}
+
+};
+
+/// Specialisation for classes which can't be exposed as buffers.
+template<typename ThisClass>
+class VectorTypedDataBufferFunctions<ThisClass, false>
+{
+	public :
+
+		static bool fromBuffer( typename ThisClass::ValueType &container, boost::python::object v )
+		{
+			return false;
+		}
+
+		static void checkResizable( const ThisClass &x )
+		{
+		}
+
+		template<typename Class>
+		static void bind( Class &c )
+		{
+		}
+
+};
+
+/// A def_visitor which binds VectorTypedDataBufferFunctions.
+template<typename ThisClass>
+class VectorTypedDataBufferVisitor : public boost::python::def_visitor<VectorTypedDataBufferVisitor<ThisClass> >
+{
+
+	friend class boost::python::def_visitor_access;
+
+	template<class Class>
+	void visit( Class &c ) const
+	{
+		VectorTypedDataBufferFunctions<ThisClass>::bind( c );
+	}
+
+};
+
 template<typename ThisClass>
 class VectorTypedDataFunctions
 {
@@ -81,7 +377,10 @@ class VectorTypedDataFunctions
 			else
 			{
 				ThisClassPtr r = new ThisClass();
-				boost::python::container_utils::extend_container( r->writable(), v );
+				if( !VectorTypedDataBufferFunctions<ThisClass>::fromBuffer( r->writable(), v ) )
+				{
+					boost::python::container_utils::extend_container( r->writable(), v );
+				}
 				return r;
 			}
 		}
@@ -171,6 +470,10 @@ class VectorTypedDataFunctions
 					data_type value = convertValue( v.ptr() );
 					if ( from <= to )
 					{
+						if( to - from != 1 )
+						{
+							VectorTypedDataBufferFunctions<ThisClass>::checkResizable( x );
+						}
 						Container &xData = x.writable();
 						xData.erase( xData.begin()+from, xData.begin()+to );
 						xData.insert( xData.begin()+from, value );
@@ -178,6 +481,10 @@ class VectorTypedDataFunctions
 					return;
 				}
 			}
+			if( from > to ? !vData->empty() : (size_t)( to - from ) != vData->size() )
+			{
+				VectorTypedDataBufferFunctions<ThisClass>::checkResizable( x );
+			}
 			Container &xData = x.writable();
 			// we have vData pointing to a valid vector
 			if ( from > to )
@@ -194,6 +501,7 @@ class VectorTypedDataFunctions
 		/// binding for append function
 		static void append( ThisClass &x, PyObject* v )
 		{
+			VectorTypedDataBufferFunctions<ThisClass>::checkResizable( x );
 			Container &xData = x.writable();
 			boost::python::extract<data_type&> elem( v );
 			xData.push_back( convertValue( v ) );
@@ -207,6 +515,7 @@ class VectorTypedDataFunctions
 				delSlice( x, reinterpret_cast<PySliceObject*>( i ) );
 				return;
 			}
+			VectorTypedDataBufferFunctions<ThisClass>::checkResizable( x );
 			Container &xData = x.writable();
 			index_type index = convertIndex( x, i );
 			xData.erase( xData.begin()+index );
@@ -217,6 +526,10 @@ class VectorTypedDataFunctions
 		{
 			long from, to;
 			convertSlice( x, i, from, to );
+			if( from < to )
+			{
+				VectorTypedDataBufferFunctions<ThisClass>::checkResizable( x );
+			}
 			Container &xData = x.writable();
 			xData.erase( xData.begin()+from, xData.begin()+to );
 		}
@@ -236,11 +549,13 @@ class VectorTypedDataFunctions
 
 		static void resize( ThisClass &x, size_t s )
 		{
+			VectorTypedDataBufferFunctions<ThisClass>::checkResizable( x );
 			x.writable().resize( s );
 		}
 
 		static void resizeWithValue( ThisClass &x, size_t s, const data_type &v )
 		{
+			VectorTypedDataBufferFunctions<ThisClass>::checkResizable( x );
 			x.writable().resize( s, v );
 		}
 
@@ -286,6 +601,7 @@ class VectorTypedDataFunctions
 				}
 			}
 			// now concatenate the given list to the object
+			VectorTypedDataBufferFunctions<ThisClass>::checkResizable( x );
 			Container &xData = x.writable();
 			const_iterator iterV = vData->begin();
 			for ( ; iterV != vData->end(); iterV++ )
@@ -344,6 +660,7 @@ class VectorTypedDataFunctions
 		/// binding for insert function
 		static void insert( ThisClass &x, PyObject *i, PyObject *v )
 		{
+			VectorTypedDataBufferFunctions<ThisClass>::checkResizable( x );
 			Container &xData = x.writable();
 			typename Container::iterator iterX = xData.begin() + convertIndex( x, i, true );
 			xData.insert( iterX, convertValue( v ) );
@@ -678,7 +995,8 @@ std::string str<IECore::TypedData<std::vector<TYPE> > >( IECore::TypedData<std::
 			.def("__init__", boost::python::make_constructor(&ThisBinder::dataConstructor), "Default constructor: creates an empty vector.")	\
 			.def("__init__", boost::python::make_constructor(&ThisBinder::dataListOrSizeConstructor),										\
 						 "Accepts another vector of the same class or a python list containing " Tname \
-						 "\nor any other python built-in type that is convertible to it. Alternatively accepts the size of the new vector.")	 						\
+						 "\nor any other python built-in type that is convertible to it. Alternatively accepts the size of the new vector," \
+						 "\nor any object exporting a contiguous buffer of a compatible type, such as a numpy array.")	 						\
 			.def("__getitem__", &ThisBinder::getItem, "indexing operator.\nAccept an integer index (starting from 0), slices and negative indexes too.")		\
 			.def("__setitem__", &ThisBinder::setItem, "index assignment operator.\nWorks exactly like on python lists but it only accepts " Tname " as the new value.")	\
 			.def("__delitem__", &ThisBinder::delItem, "index deletion operator.\nWorks exactly like on python lists.")		\
@@ -700,6 +1018,7 @@ std::string str<IECore::TypedData<std::vector<TYPE> > >( IECore::TypedData<std::
 			.def("hasBase", &ThisClass::hasBase ).staticmethod( "hasBase" ) \
 			.def("__str__", &str<ThisClass> )	\
 			.def("__repr__", &repr<ThisClass> )	\
+			.def( VectorTypedDataBufferVisitor<ThisClass>() ) \
 
 // bind a VectorTypedData class that does not support Math operators
 #define BIND_VECTOR_TYPEDDATA(T, Tname)													\
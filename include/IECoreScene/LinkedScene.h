@@ -148,6 +148,7 @@ class IECORESCENE_API LinkedScene : public  SampledSceneInterface
 		IECore::ConstObjectPtr readObjectAtSample( size_t sampleIndex ) const override;
 		IECore::ConstObjectPtr readObject( double time ) const override;
 		PrimitiveVariableMap readObjectPrimitiveVariables( const std::vector<IECore::InternedString> &primVarNames, double time ) const override;
+		IECore::ConstObjectPtr readObjectWithPrimitiveVariables( const std::vector<IECore::InternedString> &primVarNames, double time ) const override;
 		void writeObject( const IECore::Object *object, double time ) override;
 
 		bool hasChild( const Name &name ) const override;
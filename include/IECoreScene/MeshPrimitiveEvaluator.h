@@ -40,7 +40,9 @@
 #include "IECoreScene/PrimitiveEvaluator.h"
 
 #include "IECore/BoundedKDTree.h"
+#include "IECore/BoundingVolumeHierarchy.h"
 
+#include "tbb/atomic.h"
 #include "tbb/mutex.h"
 
 #include <vector>
@@ -142,55 +144,86 @@ class IECORESCENE_API MeshPrimitiveEvaluator : public PrimitiveEvaluator
 		/// Returns a bounding box covering all the uv coordinates of the mesh.
 		const Imath::Box2f uvBound() const;
 
-		//! @name Internal KDTrees.
-		/// The MeshPrimitiveEvaluator uses internal KDTrees to perform many of
-		/// its queries. Const access is provided to these so that clients can use them
-		/// in implementing their own algorithms.
+		//! @name Acceleration structures
+		/// The MeshPrimitiveEvaluator uses internal bounding volume hierarchies
+		/// to perform many of its queries. Const access is provided to these so that
+		/// clients can use them in implementing their own algorithms. Each hierarchy
+		/// is built on demand, the first time it is needed, and hierarchies are shared
+		/// between evaluators for meshes with identical topology. When only the
+		/// topology matches, the shared hierarchy is refit to the new positions rather
+		/// than rebuilt. This keeps the original layout, so queries may be slower if
+		/// the mesh has deformed substantially.
 		//////////////////////////////////////////////////////////////////////////
 		//@{
 		/// A type for storing the bounding box for a triangle.
 		typedef Imath::Box3f TriangleBound;
 		/// A type for storing an array of bounding boxes, one per triangle.
 		typedef std::vector<TriangleBound> TriangleBoundVector;
-		/// A BoundedKDTree providing accelerated lookups of triangles using their bounding boxes.
-		typedef IECore::BoundedKDTree<TriangleBoundVector::iterator> TriangleBoundTree;
+		/// A BoundingVolumeHierarchy providing accelerated lookups of triangles using their bounding boxes.
+		typedef IECore::Box3fBVH TriangleBVH;
 		/// Returns a pointer to the bounding boxes for each triangle.
 		const TriangleBoundVector *triangleBounds() const;
-		/// Returns a pointer to a tree that can be used for performing fast spacial queries.
-		///  The iterators in this tree point to elements in the vector returned by triangleBounds().
-		const TriangleBoundTree *triangleBoundTree() const;
+		/// Returns a hierarchy that can be used for performing fast spatial queries.
+		/// The primitive indices in the hierarchy are triangle indices, and index into
+		/// the vector returned by triangleBounds().
+		const TriangleBVH *triangleBVH() const;
 
 		/// A type for storing the uv bounding box for a triangle.
 		typedef Imath::Box2f UVBound;
 		/// A type for storing an array of uv bounds, one per triangle.
 		typedef std::vector<UVBound> UVBoundVector;
-		/// A BoundedKDTree providing accelerated lookups of triangles using their uv bounds.
-		typedef IECore::BoundedKDTree<UVBoundVector::iterator> UVBoundTree;
+		/// A BoundingVolumeHierarchy providing accelerated lookups of triangles using their uv bounds.
+		typedef IECore::Box2fBVH UVBVH;
 		/// Returns a pointer to the uv bounding boxes for each triangle. Note that this function may
 		/// return 0 in the case of the mesh not having suitable uvs.
 		const UVBoundVector *uvBounds() const;
-		/// Returns a pointer to a tree than can be used for performing fast uv queries. The iterators
-		/// in this tree point to the elements in the vector returned by uvBounds(). Note that
-		/// this function may return 0 in the case of the mesh not having suitable uvs.
+		/// Returns a hierarchy that can be used for performing fast uv queries. The primitive
+		/// indices in the hierarchy index into the vector returned by uvBounds(). Note that this
+		/// function may return 0 in the case of the mesh not having suitable uvs.
+		const UVBVH *uvBVH() const;
+
+		/// \deprecated Use TriangleBVH instead.
+		typedef IECore::BoundedKDTree<TriangleBoundVector::iterator> TriangleBoundTree;
+		/// \deprecated Use triangleBVH() instead. The tree is no longer used by the
+		/// evaluator itself, and is built separately on the first call.
+		const TriangleBoundTree *triangleBoundTree() const;
+
+		/// \deprecated Use UVBVH instead.
+		typedef IECore::BoundedKDTree<UVBoundVector::iterator> UVBoundTree;
+		/// \deprecated Use uvBVH() instead. The tree is no longer used by the
+		/// evaluator itself, and is built separately on the first call.
 		const UVBoundTree *uvBoundTree() const;
 		//@}
 
 	protected:
 
+		BatchResultFunction batchResultFunction( IECore::CompoundData *batchResult, size_t size ) const override;
+
 		ConstMeshPrimitivePtr m_mesh;
 		IECore::ConstV3fVectorDataPtr m_verts;
 		const std::vector<int> *m_meshVertexIds;
 
-		TriangleBoundVector m_triangles;
-		TriangleBoundTree *m_tree;
+		typedef tbb::mutex TreeMutex;
+
+		mutable TreeMutex m_triangleBVHMutex;
+		mutable tbb::atomic<bool> m_haveTriangleBVH;
+		mutable TriangleBoundVector m_triangles;
+		mutable TriangleBVH::ConstPtr m_triangleBVH;
+		mutable TriangleBoundTree *m_tree;
+
+		mutable TreeMutex m_uvBVHMutex;
+		mutable tbb::atomic<bool> m_haveUVBVH;
+		mutable UVBoundVector m_uvTriangles;
+		mutable UVBVH::ConstPtr m_uvBVH;
+		mutable UVBoundTree *m_uvTree;
 
-		UVBoundVector m_uvTriangles;
-		UVBoundTree *m_uvTree;
+		TriangleBVH::ConstPtr buildTriangleBVH( TriangleBoundVector &triangles ) const;
+		UVBVH::ConstPtr buildUVBVH( UVBoundVector &uvTriangles ) const;
 
-		bool pointAtUVWalk( UVBoundTree::NodeIndex nodeIndex, const Imath::V2f &targetUV, Result *result ) const;
-		void closestPointWalk( TriangleBoundTree::NodeIndex nodeIndex, const Imath::V3f &p, float &closestDistanceSqrd, Result *result ) const;
-		bool intersectionPointWalk( TriangleBoundTree::NodeIndex nodeIndex, const Imath::Line3f &ray, float &maxDistSqrd, Result *result, bool &hit ) const;
-		void intersectionPointsWalk( TriangleBoundTree::NodeIndex nodeIndex, const Imath::Line3f &ray, float maxDistSqrd, std::vector<PrimitiveEvaluator::ResultPtr> &results ) const;
+		bool pointAtUVWalk( const Imath::V2f &targetUV, Result *result ) const;
+		void closestPointWalk( const Imath::V3f &p, float &closestDistanceSqrd, Result *result ) const;
+		bool intersectionPointWalk( const Imath::Line3f &ray, float &maxDistSqrd, Result *result ) const;
+		void intersectionPointsWalk( const Imath::Line3f &ray, float maxDistSqrd, std::vector<PrimitiveEvaluator::ResultPtr> &results ) const;
 
 		void calculateMassProperties() const;
 		void calculateAverageNormals() const;
@@ -41,12 +41,26 @@
 #include "IECore/IFFFile.h"
 #include "IECore/SimpleTypedData.h"
 
+#include <map>
+#include <memory>
 #include <vector>
 
+namespace boost
+{
+namespace iostreams
+{
+
+class mapped_file_source;
+
+} // namespace iostreams
+} // namespace boost
+
 namespace IECoreScene
 {
 
 /// The NParticleReader class defines a class for reading IFF cache files (Maya nCaches) onto a PointsPrimitive.
+/// The channels of each frame are indexed the first time the frame is read from, and channel data is
+/// copied directly from a memory mapping of the file.
 /// \ingroup ioGroup
 class IECORESCENE_API NParticleReader : public ParticleReader
 {
@@ -81,6 +95,7 @@ class IECORESCENE_API NParticleReader : public ParticleReader
 		// returns true on success and false on failure.
 		bool open();
 		IECore::IFFFilePtr m_iffFile;
+		std::unique_ptr<boost::iostreams::mapped_file_source> m_file;
 		std::string m_iffFileName;
 		IECore::IntParameterPtr m_frameParameter;
 
@@ -113,6 +128,25 @@ class IECORESCENE_API NParticleReader : public ParticleReader
 		IECore::IntVectorDataPtr m_frames;
 		std::map<int, IECore::IFFFile::Chunk::ChunkIterator> frameToRootChildren;
 
+		struct FrameIndex
+		{
+			int numParticles;
+			// channel names in file order
+			std::vector<std::string> names;
+			// maps from channel name to its CHNM chunk
+			std::map<std::string, IECore::IFFFile::Chunk::ChunkIterator> channels;
+		};
+
+		// returns the index for the current frame, building it if necessary.
+		// returns nullptr if the frame does not exist.
+		const FrameIndex *frameIndex( const char *context );
+		std::map<int, FrameIndex> m_frameIndices;
+
+		// copies the n elements of chunk into buffer, converting them from big endian.
+		// returns false if the chunk holds too few elements.
+		template<typename T>
+		bool readElements( IECore::IFFFile::Chunk &chunk, T *buffer, size_t n ) const;
+
 		template<typename T, typename F>
 		typename T::Ptr filterAttr( const F * attr, float percentage );
 };
@@ -40,6 +40,7 @@
 
 #include "IECore/Export.h"
 #include "IECore/Reader.h"
+#include "IECore/SimpleTypedParameter.h"
 
 IECORE_PUSH_DEFAULT_VISIBILITY
 #include "OpenEXR/ImathVec.h"
@@ -54,6 +55,12 @@ IE_CORE_FORWARDDECLARE(MeshPrimitive);
 
 /// The OBJReader class defines a class for reading OBJ mesh data.
 /// This is a subset of the full setup of objects encodable in OBJ.
+///
+/// By default the file is memory mapped and parsed in parallel, in
+/// line-aligned chunks. The original line-by-line parser remains
+/// available via the "useLegacyParser" parameter, and is used
+/// automatically for files containing statements the parallel
+/// parser doesn't support.
 /// \ingroup ioGroup
 class IECORESCENE_API OBJReader : public IECore::Reader
 {
@@ -73,6 +80,11 @@ class IECORESCENE_API OBJReader : public IECore::Reader
 
 		static const ReaderDescription<OBJReader> m_readerDescription;
 
+		IECore::BoolParameterPtr m_useLegacyParserParameter;
+
+		// legacy parser, used to fill the mesh data below
+		MeshPrimitivePtr readLegacy();
+
 		// top-level parse method
 		void parseOBJ();
 
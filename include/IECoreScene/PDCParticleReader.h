@@ -40,6 +40,18 @@
 
 #include "IECore/VectorTypedData.h"
 
+#include <memory>
+
+namespace boost
+{
+namespace iostreams
+{
+
+class mapped_file_source;
+
+} // namespace iostreams
+} // namespace boost
+
 namespace IECoreScene
 {
 
@@ -47,6 +59,9 @@ namespace IECoreScene
 /// interface for Maya .pdc format particle caches. Percentage filtering
 /// of loaded particles is seeded using the particleId attribute, so
 /// is not only repeatable but also consistent from frame to frame.
+/// The file is memory mapped and the offset of each attribute is
+/// indexed when the header is read, so that only the attributes
+/// requested by the "attributes" parameter are ever touched.
 /// \ingroup ioGroup
 class IECORESCENE_API PDCParticleReader : public ParticleReader
 {
@@ -87,13 +102,13 @@ class IECORESCENE_API PDCParticleReader : public ParticleReader
 		struct Record
 		{
 			int type;
-			std::streampos position;
+			size_t offset;
 		};
 
-		// makes sure that m_iStream is open and that m_header is full.
+		// makes sure that m_file is mapped and that m_header is full.
 		// returns true on success and false on failure.
 		bool open();
-		std::ifstream *m_iStream;
+		std::unique_ptr<boost::iostreams::mapped_file_source> m_file;
 		std::string m_streamFileName;
 		struct
 		{
@@ -104,8 +119,10 @@ class IECORESCENE_API PDCParticleReader : public ParticleReader
 			std::map<std::string, Record> attributes;
 		} m_header;
 
+		// copies n elements starting at offset into buffer,
+		// reversing their byte order if necessary.
 		template<typename T>
-		void readElements( T *buffer, std::streampos pos, unsigned long n ) const;
+		void readElements( T *buffer, size_t offset, unsigned long n ) const;
 
 		// loads particleId in a completely unfiltered state
 		const IECore::Data * idAttribute();
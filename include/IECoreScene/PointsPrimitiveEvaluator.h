@@ -130,6 +130,8 @@ class IECORESCENE_API PointsPrimitiveEvaluator : public PrimitiveEvaluator
 
 	protected :
 
+		BatchResultFunction batchResultFunction( IECore::CompoundData *batchResult, size_t size ) const override;
+
 		/// \todo It would be much better if PrimitiveEvaluator::Description didn't require these create()
 		/// functions and instead just called the constructors that have to exist anyway.
 		static PrimitiveEvaluatorPtr create( ConstPrimitivePtr primitive );
@@ -141,6 +141,15 @@ class IECORESCENE_API Primitive : public VisibleRenderable
 		/// \param primVarNames List of primitive variable names that will be attempted to be loaded.
 		static PrimitiveVariableMap loadPrimitiveVariables( const IECore::IndexedIO *ioInterface, const IECore::IndexedIO::EntryID &name, const IECore::IndexedIO::EntryIDList &primVarNames );
 
+		/// Utility function that can be used in place of Object::load() to load a Primitive without
+		/// paying the cost of loading all its primitive variables. Only the primitive variables named
+		/// in `primVarNames` are loaded, and the others may be loaded on demand later using
+		/// loadPrimitiveVariables(). Objects which are not Primitives are loaded in full.
+		/// \param ioInterface File handle where the Primitive is stored.
+		/// \param name Name of the entry where the Primitive is stored under the file location.
+		/// \param primVarNames List of primitive variable names to be loaded.
+		static IECore::ObjectPtr loadWithPrimitiveVariables( const IECore::IndexedIO *ioInterface, const IECore::IndexedIO::EntryID &name, const IECore::IndexedIO::EntryIDList &primVarNames );
+
 	private:
 
 		static const unsigned int m_ioVersion;
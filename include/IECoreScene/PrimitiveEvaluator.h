@@ -38,15 +38,19 @@
 #include "IECoreScene/Export.h"
 #include "IECoreScene/Primitive.h"
 
+#include "IECore/CompoundData.h"
 #include "IECore/Export.h"
 #include "IECore/RunTimeTyped.h"
+#include "IECore/VectorTypedData.h"
 
 IECORE_PUSH_DEFAULT_VISIBILITY
 #include "OpenEXR/ImathColor.h"
 #include "OpenEXR/ImathVec.h"
 IECORE_POP_DEFAULT_VISIBILITY
 
+#include <functional>
 #include <string>
+#include <vector>
 
 namespace IECoreScene
 {
@@ -164,6 +168,30 @@ class IECORESCENE_API PrimitiveEvaluator : public IECore::RunTimeTyped
 
 		//@}
 
+		//! @name Batch Query Functions
+		/// These perform many queries at once, in parallel, avoiding the overhead
+		/// of a function call and Result per query. Results are returned in
+		/// "struct of arrays" form, as a CompoundData with the following members,
+		/// each holding one element per query :
+		///
+		/// - "hit" : BoolVectorData, true for each query which succeeded. The
+		///   other members hold default values for the queries which failed.
+		/// - "point" : V3fVectorData.
+		/// - The members provided by batchResultFunction(). By default these are
+		///   "normal" (V3fVectorData) and "uv" (V2fVectorData), but evaluators
+		///   omit those their Results don't support, and may add others, such
+		///   as "triangleIndex" and "barycentricCoordinates" for meshes.
+		/// - A member for each of the requested primitive variables, holding
+		///   the interpolated values. V3f, V2f, float, int and Color3f primitive
+		///   variables are supported.
+		////////////////////////////////////////////////////////////////////////////////////////
+		//@{
+		IECore::CompoundDataPtr batchClosestPoint( const IECore::V3fVectorData *points, const std::vector<std::string> &primitiveVariables = std::vector<std::string>() ) const;
+		IECore::CompoundDataPtr batchPointAtUV( const IECore::V2fVectorData *uvs, const std::vector<std::string> &primitiveVariables = std::vector<std::string>() ) const;
+		/// Origins and directions must have the same length.
+		IECore::CompoundDataPtr batchIntersectionPoint( const IECore::V3fVectorData *origins, const IECore::V3fVectorData *directions, float maxDistance = Imath::limits<float>::max(), const std::vector<std::string> &primitiveVariables = std::vector<std::string>() ) const;
+		//@}
+
 		/// Throws an exception if the passed result type is not compatible with the current evaluator
 		virtual void validateResult( Result *result ) const =0;
 
@@ -178,8 +206,25 @@ class IECORESCENE_API PrimitiveEvaluator : public IECore::RunTimeTyped
 			}
 		};
 
+	protected :
+
+		/// Function used to output evaluator-specific data from a successful
+		/// query in a batch.
+		typedef std::function<void ( const Result *result, size_t index )> BatchResultFunction;
+		/// May be implemented by derived classes to output additional data from
+		/// the batch queries. Implementations should add appropriately sized
+		/// members to `batchResult` and return a function to fill them in from
+		/// each successful Result. The function will be called concurrently for
+		/// different indices. The default implementation outputs "normal" and
+		/// "uv". Implementations whose Results don't support those should not
+		/// call it.
+		virtual BatchResultFunction batchResultFunction( IECore::CompoundData *batchResult, size_t size ) const;
+
 	private:
 
+		template<typename Query>
+		IECore::CompoundDataPtr batchQuery( size_t size, const std::vector<std::string> &primitiveVariables, Query &&query ) const;
+
 		static void registerCreator( IECore::TypeId id, CreatorFn f );
 
 		typedef std::map<IECore::TypeId, CreatorFn> CreatorMap;
@@ -41,6 +41,7 @@
 
 #include <map>
 #include <string>
+#include <vector>
 
 namespace IECoreScene
 {
@@ -67,6 +68,16 @@ IECORESCENE_API SceneStats parallelReadAll( const SceneInterface *src, int start
 /// copy from one scene to another.
 IECORESCENE_API void copy( const SceneInterface *src, SceneInterface *dst, int startFrame, int endFrame, float frameRate, unsigned int flags );
 
+/// Reads the locations matched by `locations` (relative to `src`) at each of the
+/// specified times in parallel, so that subsequent reads are served from any caches
+/// maintained by `src`. For a SceneCache, this warms the object, attribute and transform
+/// caches shared by all locations of the same root scene, and the ObjectPool that holds
+/// the objects. Times are read in the order given, and reading stops once the objects read
+/// exceed `maxMemory` bytes, so that prefetching doesn't evict the objects for the earliest
+/// times before they are used. If `maxMemory` is 0, the memory limit of
+/// ObjectPool::defaultObjectPool() is used. Returns the memory used by the objects read.
+IECORESCENE_API size_t prefetch( const SceneInterface *src, const IECore::PathMatcher &locations, const std::vector<double> &times, unsigned int flags = All, size_t maxMemory = 0 );
+
 } // SceneAlgo
 
 } // IECoreScene
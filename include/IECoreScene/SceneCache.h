@@ -35,6 +35,7 @@
 #ifndef IECORESCENE_SCENECACHE_H
 #define IECORESCENE_SCENECACHE_H
 
+#include "IECore/CompoundData.h"
 #include "IECore/PathMatcherData.h"
 
 #include "IECoreScene/Export.h"
@@ -68,7 +69,10 @@ class IECORESCENE_API SceneCache : public SampledSceneInterface
 		/// open mode is Read, only the const methods may be used and
 		/// when the open mode is Write, the non-const methods
 		/// may be used in addition. Append mode is currently not supported.
-		SceneCache( const std::string &fileName, IECore::IndexedIO::OpenMode mode );
+		/// The options are passed to IndexedIO::create(). For instance, when
+		/// writing, `{ "compressionLevel" : 9, "asyncCompression" : true }`
+		/// compresses objects on background tasks while the scene is written.
+		SceneCache( const std::string &fileName, IECore::IndexedIO::OpenMode mode, const IECore::CompoundData *options = nullptr );
 		/// Constructor which uses an already-opened IndexedIO, this
 		/// can be used if you wish to use an alternative IndexedIO
 		/// implementation for the backend. The given IndexedIO should be
@@ -124,6 +128,9 @@ class IECORESCENE_API SceneCache : public SampledSceneInterface
 		double objectSampleInterval( double time, size_t &floorIndex, size_t &ceilIndex ) const override;
 		IECore::ConstObjectPtr readObjectAtSample( size_t sampleIndex ) const override;
 		PrimitiveVariableMap readObjectPrimitiveVariables( const std::vector<IECore::InternedString> &primVarNames, double time ) const override;
+		/// Loads only the requested primitive variables from the file, leaving
+		/// the others to be loaded on demand by readObjectPrimitiveVariables().
+		IECore::ConstObjectPtr readObjectWithPrimitiveVariables( const std::vector<IECore::InternedString> &primVarNames, double time ) const override;
 		void writeObject( const IECore::Object *object, double time ) override;
 
 		bool hasChild( const Name &name ) const override;
@@ -139,6 +146,33 @@ class IECORESCENE_API SceneCache : public SampledSceneInterface
 		/// tells you if this scene cache is read only or writable:
 		bool readOnly() const;
 
+		/// The caches used when reading. Each is shared by all the
+		/// locations within a file.
+		enum CacheType
+		{
+			ObjectSampleCache = 0,
+			AttributeSampleCache,
+			TransformSampleCache
+		};
+
+		/// Returns statistics for the read caches, with an "object",
+		/// "attribute" and "transform" member for each cache. Each member
+		/// holds "hits", "misses", "evictions", "cachedComputations",
+		/// "maxComputations", "memoryUsage" (in bytes) and "computeTime"
+		/// (the time in seconds spent reading from the file).
+		/// Throws if the file is not open for reading.
+		IECore::CompoundDataPtr cacheStatistics() const;
+		/// Resets the hit, miss, eviction and timing counters of the read caches.
+		void resetCacheStatistics();
+		/// Returns the total memory used by the read caches, in bytes. This
+		/// is cheaper than summing the "memoryUsage" members of cacheStatistics().
+		size_t cacheMemoryUsage() const;
+		/// Returns the maximum number of samples held by the given cache.
+		size_t getCacheLimit( CacheType cache ) const;
+		/// Sets the maximum number of samples held by the given cache,
+		/// evicting samples if necessary.
+		void setCacheLimit( CacheType cache, size_t maxSamples );
+
 		// The attribute names used to mark animated topology and primitive variables
 		// when SceneCache objects are Primitives.
 		static const Name &animatedObjectTopologyAttribute;
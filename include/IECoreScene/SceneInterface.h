@@ -234,6 +234,13 @@ class IECORESCENE_API SceneInterface : public IECore::RunTimeTyped
 		/// Reads primitive variables from the object of type Primitive stored at this path in the scene at the given time.
 		/// Raises exception if it turns out not to be a Primitive object.
 		virtual PrimitiveVariableMap readObjectPrimitiveVariables( const std::vector<IECore::InternedString> &primVarNames, double time ) const = 0;
+		/// Reads the object stored at this path in the scene at the given time, loading only the named
+		/// primitive variables if it is a Primitive. The others may be loaded on demand using
+		/// readObjectPrimitiveVariables(), so that clients such as viewers need only pay for the
+		/// primitive variables they actually use. The default implementation reads the whole object
+		/// and removes the other primitive variables, and should be overridden by implementations
+		/// able to avoid loading them in the first place.
+		virtual IECore::ConstObjectPtr readObjectWithPrimitiveVariables( const std::vector<IECore::InternedString> &primVarNames, double time ) const;
 		/// Writes a geometry to this path in the scene.
 		/// Raises an exception if you try to write an object in the root path.
 		virtual void writeObject( const IECore::Object *object, double time ) = 0;
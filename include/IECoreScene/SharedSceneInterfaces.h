@@ -38,6 +38,8 @@
 #include "IECoreScene/Export.h"
 #include "IECoreScene/SceneInterface.h"
 
+#include "IECore/CompoundData.h"
+
 namespace IECoreScene
 {
 
@@ -45,7 +47,10 @@ class IECORESCENE_API SharedSceneInterfaces
 {
 	public :
 
-		/// Creates a SceneInterface using a cache, so you don't end up opening the same file multiple times
+		/// Creates a SceneInterface using a cache, so you don't end up opening the same file multiple times.
+		/// If the file has been rewritten on disk since it was cached ( as determined by its modification
+		/// time, size and inode ), it is opened again rather than returning the stale scene. The file is
+		/// checked at most once per interval set by setCheckInterval().
 		static ConstSceneInterfacePtr get( const std::string &fileName );
 
 		/// Erase a single file from the cache
@@ -63,6 +68,34 @@ class IECORESCENE_API SharedSceneInterfaces
 		/// Returns the number of scene interfaces currently in the cache.
 		static size_t numScenes();
 
+		/// Sets the limit for the memory used by the cached scene interfaces,
+		/// in bytes. This includes the memory used by the read caches of each
+		/// SceneCache, which grow as the scene is read. Scenes are evicted when
+		/// either this or the limit set by setMaxScenes() is exceeded, except
+		/// that the most recently used scene is always kept, even if it alone
+		/// exceeds the memory limit.
+		static void setMaxMemory( size_t bytes );
+		/// Returns the limit for the memory used by the cached scene interfaces.
+		static size_t getMaxMemory();
+		/// Returns the memory currently used by the cached scene interfaces, in bytes.
+		static size_t memoryUsage();
+
+		/// Sets the minimum time in seconds between checks that the file for a cached
+		/// scene hasn't been rewritten. Each check requires a call to stat(), so this
+		/// limits the cost of calling get() repeatedly. An interval of 0 checks on every
+		/// call to get(). Defaults to 1 second.
+		static void setCheckInterval( float seconds );
+		/// Returns the interval set by setCheckInterval().
+		static float getCheckInterval();
+
+		/// Returns statistics for the cache, with "hits", "misses", "evictions",
+		/// "staleReloads" ( scenes reopened because their file had changed ),
+		/// "staleScenes" ( cached scenes whose file has changed since ), "numScenes",
+		/// "maxScenes", "memoryUsage" and "maxMemory" members.
+		static IECore::CompoundDataPtr statistics();
+		/// Resets the hit, miss, eviction and reload counters.
+		static void resetStatistics();
+
 };
 
 } // namespace IECoreScene
@@ -0,0 +1,171 @@
+//////////////////////////////////////////////////////////////////////////
+//
+//  Copyright (c) 2019, Image Engine Design Inc. All rights reserved.
+//
+//  Redistribution and use in source and binary forms, with or without
+//  modification, are permitted provided that the following conditions are
+//  met:
+//
+//     * Redistributions of source code must retain the above copyright
+//       notice, this list of conditions and the following disclaimer.
+//
+//     * Redistributions in binary form must reproduce the above copyright
+//       notice, this list of conditions and the following disclaimer in the
+//       documentation and/or other materials provided with the distribution.
+//
+//     * Neither the name of Image Engine Design nor the names of any
+//       other contributors to this software may be used to endorse or
+//       promote products derived from this software without specific prior
+//       written permission.
+//
+//  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS
+//  IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+//  THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+//  PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR
+//  CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+//  EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+//  PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+//  PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+//  LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+//  NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+//  SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+//
+//////////////////////////////////////////////////////////////////////////
+#ifndef IECORESCENE_MESHALGOUTILS_H
+#define IECORESCENE_MESHALGOUTILS_H
+
+#include "IECoreScene/MeshPrimitive.h"
+
+#include "IECore/Canceller.h"
+#include "IECore/CompoundData.h"
+#include "IECore/VectorTypedData.h"
+
+#include "tbb/blocked_range.h"
+#include "tbb/parallel_for.h"
+
+#include <functional>
+#include <vector>
+
+namespace IECoreScene
+{
+
+namespace Detail
+{
+
+/// Returns the index of the first face-vertex of each face, so that
+/// faces may be visited in any order.
+inline std::vector<int> faceVertexOffsets( const std::vector<int> &verticesPerFace )
+{
+	std::vector<int> result;
+	result.reserve( verticesPerFace.size() );
+	int offset = 0;
+	for( int numVerts : verticesPerFace )
+	{
+		result.push_back( offset );
+		offset += numVerts;
+	}
+	return result;
+}
+
+/// Inverts `indices`, which holds a target index in the range [ 0, size ) for
+/// each face-vertex. For target `i`, the range [ offsets[i], offsets[i+1] ) of
+/// `faceVertices` and `faces` lists the face-vertices referencing it, and the
+/// faces containing them, in their original order. This allows accumulations
+/// onto the targets to be performed in parallel, while giving results identical
+/// to those of a serial loop over the faces. Either of `faceVertices` or `faces`
+/// may be null if not required.
+inline void invertFaceVertexIndices(
+	const std::vector<int> &verticesPerFace, const std::vector<int> &indices, size_t size,
+	std::vector<int> &offsets, std::vector<int> *faceVertices, std::vector<int> *faces
+)
+{
+	offsets.assign( size + 1, 0 );
+	for( int index : indices )
+	{
+		++offsets[index + 1];
+	}
+
+	for( size_t i = 1; i <= size; ++i )
+	{
+		offsets[i] += offsets[i - 1];
+	}
+
+	if( faceVertices )
+	{
+		faceVertices->resize( indices.size() );
+	}
+	if( faces )
+	{
+		faces->resize( indices.size() );
+	}
+
+	std::vector<int> next( offsets.begin(), offsets.end() - 1 );
+	int faceVertex = 0;
+	for( size_t face = 0; face < verticesPerFace.size(); ++face )
+	{
+		for( int v = 0; v < verticesPerFace[face]; ++v, ++faceVertex )
+		{
+			const int slot = next[indices[faceVertex]]++;
+			if( faceVertices )
+			{
+				(*faceVertices)[slot] = faceVertex;
+			}
+			if( faces )
+			{
+				(*faces)[slot] = face;
+			}
+		}
+	}
+}
+
+/// Returns the tables computed by `compute()` for the topology of `mesh`,
+/// sharing them between calls via MeshAlgo::topologyCache(). `key` must
+/// uniquely identify the tables computed, and any parameters other than
+/// the topology that they depend on. The result must not be modified.
+IECore::ConstCompoundDataPtr cachedTopologyTables(
+	const MeshPrimitive *mesh, const IECore::MurmurHash &key,
+	const std::function<IECore::CompoundDataPtr ()> &compute
+);
+
+/// Cached equivalent of `faceVertexOffsets( mesh->verticesPerFace()->readable() )`.
+IECore::ConstIntVectorDataPtr faceVertexOffsets( const MeshPrimitive *mesh );
+
+/// The result of `invertFaceVertexIndices()`, as shared via
+/// MeshAlgo::topologyCache().
+struct InverseFaceVertexIndices
+{
+	IECore::ConstIntVectorDataPtr offsets;
+	IECore::ConstIntVectorDataPtr faceVertices;
+	IECore::ConstIntVectorDataPtr faces;
+};
+
+/// Cached equivalent of `invertFaceVertexIndices()`. Aside from the topology
+/// of `mesh`, `key` must uniquely identify `indices` and `size`.
+InverseFaceVertexIndices invertFaceVertexIndices( const MeshPrimitive *mesh, const IECore::MurmurHash &key, const std::vector<int> &indices, size_t size );
+
+/// Cached equivalent of calling `invertFaceVertexIndices()` with the
+/// vertex ids of `mesh`.
+InverseFaceVertexIndices vertexFaces( const MeshPrimitive *mesh, size_t numVertices );
+
+/// Calls `f( range )` in parallel for subranges of [ 0, size ), checking
+/// for cancellation before each one.
+template<typename F>
+void parallelFor( size_t size, const IECore::Canceller *canceller, F &&f )
+{
+	IECore::Canceller::check( canceller );
+	tbb::task_group_context taskGroupContext( tbb::task_group_context::isolated );
+	tbb::parallel_for(
+		tbb::blocked_range<size_t>( 0, size ),
+		[canceller, &f]( const tbb::blocked_range<size_t> &range ) {
+			IECore::Canceller::check( canceller );
+			f( range );
+		},
+		taskGroupContext
+	);
+}
+
+} // namespace Detail
+
+} // namespace IECoreScene
+
+#endif // IECORESCENE_MESHALGOUTILS_H
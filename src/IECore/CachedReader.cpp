@@ -35,16 +35,33 @@
 #include "IECore/CachedReader.h"
 
 #include "IECore/ComputationCache.h"
+#include "IECore/CompoundObject.h"
+#include "IECore/CompoundParameter.h"
+#include "IECore/FileIndexedIO.h"
+#include "IECore/MessageHandler.h"
 #include "IECore/ModifyOp.h"
 #include "IECore/Object.h"
 #include "IECore/Reader.h"
+#include "IECore/SimpleTypedData.h"
 
+#include "boost/filesystem/operations.hpp"
 #include "boost/format.hpp"
 #include "boost/lexical_cast.hpp"
 
+#include "tbb/atomic.h"
 #include "tbb/concurrent_hash_map.h"
 #include "tbb/mutex.h"
 
+#include <algorithm>
+#include <ctime>
+#include <memory>
+#include <tuple>
+#include <vector>
+
+#ifndef _MSC_VER
+#include <sys/stat.h>
+#endif
+
 // Windows defines SearchPath
 #ifdef SearchPath
 #undef SearchPath
@@ -55,6 +72,245 @@ using namespace boost;
 using namespace boost::filesystem;
 using namespace std;
 
+//////////////////////////////////////////////////////////////////////////
+// DiskCache
+//////////////////////////////////////////////////////////////////////////
+
+namespace
+{
+
+const char *g_diskCacheExtension = ".fio";
+
+// Appends the values of all parameters except `ignore1` and `ignore2`.
+void appendParameterValues( const CompoundParameter *parameters, const std::string &ignore1, const std::string &ignore2, MurmurHash &h )
+{
+	const CompoundParameter::ParameterVector &children = parameters->orderedParameters();
+	for( CompoundParameter::ParameterVector::const_iterator it = children.begin(), eIt = children.end(); it != eIt; ++it )
+	{
+		const std::string &name = (*it)->name();
+		if( name == ignore1 || name == ignore2 )
+		{
+			continue;
+		}
+		h.append( name );
+		(*it)->getValue()->hash( h );
+	}
+}
+
+// Appends the size and modification time of the file. Where possible
+// we use the full resolution of the modification time, so that a file
+// rewritten within the same second as it was read is still detected.
+void appendFileStamp( const path &file, MurmurHash &h )
+{
+#ifndef _MSC_VER
+	struct stat s;
+	if( stat( file.c_str(), &s ) == 0 )
+	{
+		h.append( (uint64_t)s.st_size );
+#ifdef __APPLE__
+		h.append( (uint64_t)s.st_mtimespec.tv_sec );
+		h.append( (uint64_t)s.st_mtimespec.tv_nsec );
+#else
+		h.append( (uint64_t)s.st_mtim.tv_sec );
+		h.append( (uint64_t)s.st_mtim.tv_nsec );
+#endif
+		return;
+	}
+#endif
+	h.append( (uint64_t)file_size( file ) );
+	h.append( (uint64_t)last_write_time( file ) );
+}
+
+// A directory of objects saved in FileIndexedIO files, named
+// according to the hash of the file they were loaded from. The
+// modification time of the entries is updated when they are read,
+// and used to remove the least recently used entries when the size
+// limit is exceeded.
+class DiskCache
+{
+
+	public :
+
+		DiskCache( const std::string &directory, size_t maxSize )
+			:	m_directory( directory ), m_maxSize( maxSize )
+		{
+			create_directories( m_directory );
+			m_size = limitSize();
+		}
+
+		const std::string &directory() const
+		{
+			return m_directory;
+		}
+
+		size_t maxSize() const
+		{
+			return m_maxSize;
+		}
+
+		// Returns nullptr if there is no entry for the hash.
+		ObjectPtr read( const MurmurHash &hash ) const
+		{
+			const path file = entryPath( hash );
+			boost::system::error_code ec;
+			if( !exists( file, ec ) )
+			{
+				return nullptr;
+			}
+
+			ObjectPtr result;
+			try
+			{
+				ConstIndexedIOPtr io = new FileIndexedIO( file.string(), IndexedIO::rootPath, IndexedIO::Read );
+				result = Object::load( io, "object" );
+			}
+			catch( const std::exception &e )
+			{
+				// Most likely the entry was removed by another
+				// process in the meantime.
+				msg( Msg::Debug, "CachedReader", boost::format( "Unable to read disk cache entry \"%s\" : %s" ) % file.string() % e.what() );
+				return nullptr;
+			}
+
+			// Mark as recently used. Failure isn't fatal - it
+			// would just make the entry more likely to be evicted.
+			last_write_time( file, std::time( nullptr ), ec );
+			return result;
+		}
+
+		void write( const MurmurHash &hash, const Object *object )
+		{
+			// Write to a temporary file first and then rename,
+			// so that other processes sharing the cache never
+			// see a partially written entry.
+			const path file = entryPath( hash );
+			const path tmpFile = path( m_directory ) / unique_path( file.filename().string() + ".%%%%-%%%%-%%%%.tmp" );
+			try
+			{
+				{
+					IndexedIOPtr io = new FileIndexedIO( tmpFile.string(), IndexedIO::rootPath, IndexedIO::Exclusive | IndexedIO::Write );
+					object->save( io, "object" );
+				}
+				// If we're replacing an existing entry, then its
+				// size must no longer be counted.
+				boost::system::error_code ec;
+				const uintmax_t previousSize = file_size( file, ec );
+				boost::filesystem::rename( tmpFile, file );
+				m_size += file_size( file );
+				if( !ec )
+				{
+					m_size -= std::min<size_t>( previousSize, m_size );
+				}
+			}
+			catch( const std::exception &e )
+			{
+				boost::system::error_code ec;
+				boost::filesystem::remove( tmpFile, ec );
+				msg( Msg::Warning, "CachedReader", boost::format( "Unable to write disk cache entry \"%s\" : %s" ) % file.string() % e.what() );
+				return;
+			}
+
+			if( m_size > m_maxSize )
+			{
+				// Only one thread needs to do the work.
+				tbb::mutex::scoped_lock lock;
+				if( lock.try_acquire( m_limitMutex ) )
+				{
+					m_size = limitSize();
+				}
+			}
+		}
+
+		void clear()
+		{
+			tbb::mutex::scoped_lock lock( m_limitMutex );
+			std::vector<Entry> entries;
+			scan( entries );
+			for( std::vector<Entry>::const_iterator it = entries.begin(), eIt = entries.end(); it != eIt; ++it )
+			{
+				boost::system::error_code ec;
+				boost::filesystem::remove( std::get<2>( *it ), ec );
+			}
+			m_size = 0;
+		}
+
+	private :
+
+		// Last used time, size, path.
+		typedef std::tuple<std::time_t, uintmax_t, path> Entry;
+
+		path entryPath( const MurmurHash &hash ) const
+		{
+			return path( m_directory ) / ( hash.toString() + g_diskCacheExtension );
+		}
+
+		void scan( std::vector<Entry> &entries ) const
+		{
+			boost::system::error_code ec;
+			for( directory_iterator it( m_directory, ec ), eIt; it != eIt; it.increment( ec ) )
+			{
+				if( ec )
+				{
+					break;
+				}
+				const path &p = it->path();
+				if( p.extension() != g_diskCacheExtension )
+				{
+					continue;
+				}
+				// Entries may be removed concurrently by
+				// other processes, so we ignore errors.
+				boost::system::error_code entryEc;
+				const std::time_t t = last_write_time( p, entryEc );
+				const uintmax_t s = file_size( p, entryEc );
+				if( !entryEc )
+				{
+					entries.push_back( Entry( t, s, p ) );
+				}
+			}
+		}
+
+		// Removes least recently used entries until the total size is within
+		// the limit, and returns the resulting size. The directory is scanned
+		// each time, because it may be shared with other processes.
+		size_t limitSize() const
+		{
+			std::vector<Entry> entries;
+			scan( entries );
+
+			size_t size = 0;
+			for( std::vector<Entry>::const_iterator it = entries.begin(), eIt = entries.end(); it != eIt; ++it )
+			{
+				size += std::get<1>( *it );
+			}
+
+			if( size <= m_maxSize )
+			{
+				return size;
+			}
+
+			std::sort( entries.begin(), entries.end() );
+			for( std::vector<Entry>::const_iterator it = entries.begin(), eIt = entries.end(); it != eIt && size > m_maxSize; ++it )
+			{
+				boost::system::error_code ec;
+				if( boost::filesystem::remove( std::get<2>( *it ), ec ) )
+				{
+					size -= std::get<1>( *it );
+				}
+			}
+
+			return size;
+		}
+
+		const std::string m_directory;
+		const size_t m_maxSize;
+		tbb::atomic<size_t> m_size;
+		tbb::mutex m_limitMutex;
+
+};
+
+} // namespace
+
 //////////////////////////////////////////////////////////////////////////
 // MemberData
 //////////////////////////////////////////////////////////////////////////
@@ -68,6 +324,8 @@ struct CachedReader::MemberData
 		MemberData(const SearchPath &paths, ConstModifyOpPtr postProcessor, ObjectPoolPtr objectPool )
 			:	m_searchPaths( paths ), m_cache( computeFn, hashFn, 10000, objectPool ), m_postProcessor( postProcessor )
 		{
+			m_diskCacheHits = 0;
+			m_diskCacheMisses = 0;
 		}
 
 		typedef std::pair< std::string, MemberData * > ComputeParameters;
@@ -76,9 +334,12 @@ struct CachedReader::MemberData
 		SearchPath m_searchPaths;
 		Cache m_cache;
 		ConstModifyOpPtr m_postProcessor;
-		tbb::mutex m_postProcessorMutex;
+		mutable tbb::mutex m_postProcessorMutex;
 		typedef tbb::concurrent_hash_map< std::string, std::string > FileErrors;
 		FileErrors m_fileErrors;
+		std::unique_ptr<DiskCache> m_diskCache;
+		tbb::atomic<size_t> m_diskCacheHits;
+		tbb::atomic<size_t> m_diskCacheMisses;
 
 	private :
 
@@ -91,6 +352,51 @@ struct CachedReader::MemberData
 			}
 		}
 
+		MurmurHash diskCacheHash( const path &resolvedPath, const Reader *reader ) const
+		{
+			MurmurHash h;
+			h.append( resolvedPath.string() );
+			appendFileStamp( resolvedPath, h );
+			h.append( reader->typeName() );
+			appendParameterValues( reader->parameters(), "fileName", "", h );
+			if( m_postProcessor )
+			{
+				h.append( m_postProcessor->typeName() );
+				tbb::mutex::scoped_lock l( m_postProcessorMutex );
+				appendParameterValues( m_postProcessor->parameters(), m_postProcessor->inputParameter()->name(), m_postProcessor->copyParameter()->name(), h );
+			}
+			return h;
+		}
+
+		void postProcess( Object *object )
+		{
+			ModifyOpPtr postProcessor = boost::const_pointer_cast<ModifyOp>( m_postProcessor );
+			if( !postProcessor->threadSafe() )
+			{
+				// We have no choice but to serialise everything, because
+				// the Op may access its parameters directly.
+				tbb::mutex::scoped_lock l( m_postProcessorMutex );
+				postProcessor->inputParameter()->setValue( object );
+				postProcessor->copyParameter()->setTypedValue( false );
+				postProcessor->operate();
+				return;
+			}
+
+			// The Op only accesses its arguments via the operands, so
+			// we only need to lock while taking a copy of the parameter
+			// values, and can then modify the object concurrently with
+			// other threads.
+			CompoundObjectPtr operands = new CompoundObject;
+			{
+				tbb::mutex::scoped_lock l( m_postProcessorMutex );
+				operands->members() = postProcessor->parameters()->getTypedValue<CompoundObject>()->members();
+			}
+			operands->members()[postProcessor->inputParameter()->name()] = object;
+			operands->members()[postProcessor->copyParameter()->name()] = new BoolData( false );
+			postProcessor->parameters()->validate( operands.get() );
+			postProcessor->operateConcurrently( operands.get() );
+		}
+
 		static MurmurHash hashFn( const ComputeParameters &params )
 		{
 			const std::string &filePath = params.first;
@@ -141,6 +447,19 @@ struct CachedReader::MemberData
 					throw Exception( "Could not create reader for '" + resolvedPath.string() + "'" );
 				}
 
+				MurmurHash diskCacheHash;
+				if( data->m_diskCache )
+				{
+					diskCacheHash = data->diskCacheHash( resolvedPath, r.get() );
+					result = data->m_diskCache->read( diskCacheHash );
+					if( result )
+					{
+						data->m_diskCacheHits++;
+						return result;
+					}
+					data->m_diskCacheMisses++;
+				}
+
 				result = r->read();
 				/// \todo Why would this ever be NULL? Wouldn't we have thrown an exception already if
 				/// we were unable to read the file?
@@ -151,16 +470,12 @@ struct CachedReader::MemberData
 
 				if( data->m_postProcessor )
 				{
-					/// \todo We need to allow arguments to be passed to Op::operate() directly
-					/// so that the same Op can be used from multiple threads with different arguments.
-					/// This means adding an overloaded operate() method but more importantly making sure
-					/// that all Ops only use their operands to access arguments and not go getting them
-					/// from the Parameters directly.
-					tbb::mutex::scoped_lock l( data->m_postProcessorMutex );
-					ModifyOpPtr postProcessor = boost::const_pointer_cast<ModifyOp>( data->m_postProcessor );
-					postProcessor->inputParameter()->setValue( result );
-					postProcessor->copyParameter()->setTypedValue( false );
-					postProcessor->operate();
+					data->postProcess( result.get() );
+				}
+
+				if( data->m_diskCache )
+				{
+					data->m_diskCache->write( diskCacheHash, result.get() );
 				}
 			}
 			catch ( std::exception &e )
@@ -247,6 +562,62 @@ ObjectPool *CachedReader::objectPool() const
 	return m_data->m_cache.objectPool();
 }
 
+void CachedReader::setDiskCache( const std::string &directory, size_t maxSize )
+{
+	if( directory.empty() )
+	{
+		m_data->m_diskCache.reset();
+	}
+	else
+	{
+		m_data->m_diskCache.reset( new DiskCache( directory, maxSize ) );
+	}
+}
+
+const std::string &CachedReader::getDiskCacheDirectory() const
+{
+	static const std::string g_emptyString;
+	return m_data->m_diskCache ? m_data->m_diskCache->directory() : g_emptyString;
+}
+
+size_t CachedReader::getDiskCacheMaxSize() const
+{
+	return m_data->m_diskCache ? m_data->m_diskCache->maxSize() : 0;
+}
+
+void CachedReader::clearDiskCache()
+{
+	if( m_data->m_diskCache )
+	{
+		m_data->m_diskCache->clear();
+	}
+}
+
+CachedReader::Statistics::Statistics()
+	:	hits( 0 ), misses( 0 ), diskCacheHits( 0 ), diskCacheMisses( 0 ), loadTime( 0 )
+{
+}
+
+CachedReader::Statistics CachedReader::statistics() const
+{
+	const MemberData::Cache::Statistics cacheStatistics = m_data->m_cache.statistics();
+
+	Statistics result;
+	result.hits = cacheStatistics.hits;
+	result.misses = cacheStatistics.misses;
+	result.diskCacheHits = m_data->m_diskCacheHits;
+	result.diskCacheMisses = m_data->m_diskCacheMisses;
+	result.loadTime = cacheStatistics.computeTime;
+	return result;
+}
+
+void CachedReader::resetStatistics()
+{
+	m_data->m_cache.resetStatistics();
+	m_data->m_diskCacheHits = 0;
+	m_data->m_diskCacheMisses = 0;
+}
+
 CachedReader *CachedReader::defaultCachedReader()
 {
 	static CachedReaderPtr c = nullptr;
@@ -254,6 +625,12 @@ CachedReader *CachedReader::defaultCachedReader()
 	{
 		const char *sp = getenv( "IECORE_CACHEDREADER_PATHS" );
 		c = new CachedReader( SearchPath( sp ? sp : "" ) );
+		if( const char *dp = getenv( "IECORE_CACHEDREADER_DISKCACHE_PATH" ) )
+		{
+			const char *ds = getenv( "IECORE_CACHEDREADER_DISKCACHE_SIZE" );
+			const size_t dsi = ds ? boost::lexical_cast<size_t>( ds ) : 10 * 1024;
+			c->setDiskCache( dp, 1024 * 1024 * dsi );
+		}
 	}
 	return c.get();
 }
@@ -34,7 +34,9 @@
 
 #include "IECore/FileIndexedIO.h"
 
+#include "IECore/CompoundData.h"
 #include "IECore/MessageHandler.h"
+#include "IECore/SimpleTypedData.h"
 
 #include "boost/filesystem/operations.hpp"
 
@@ -59,7 +61,7 @@ class FileIndexedIO::StreamFile : public StreamIndexedIO::StreamFile
 
 		size_t m_endPosition;
 
-		StreamFile( const std::string &filename, IndexedIO::OpenMode mode );
+		StreamFile( const std::string &filename, IndexedIO::OpenMode mode, const CompoundData *options = nullptr );
 
 		~StreamFile() override;
 
@@ -69,8 +71,17 @@ class FileIndexedIO::StreamFile : public StreamIndexedIO::StreamFile
 
 };
 
-FileIndexedIO::StreamFile::StreamFile( const std::string &filename, IndexedIO::OpenMode mode ) : StreamIndexedIO::StreamFile(mode), m_filename( filename ), m_endPosition(0)
+FileIndexedIO::StreamFile::StreamFile( const std::string &filename, IndexedIO::OpenMode mode, const CompoundData *options ) : StreamIndexedIO::StreamFile(mode), m_filename( filename ), m_endPosition(0)
 {
+	bool memoryMapped = false;
+	if( options )
+	{
+		if( const BoolData *memoryMappedData = options->member<BoolData>( "memoryMapped", false ) )
+		{
+			memoryMapped = memoryMappedData->readable();
+		}
+	}
+
 	if (mode & IndexedIO::Write)
 	{
 		std::fstream *f = new std::fstream(filename.c_str(), std::ios::trunc | std::ios::binary | std::ios::in | std::ios::out);
@@ -132,7 +143,7 @@ FileIndexedIO::StreamFile::StreamFile( const std::string &filename, IndexedIO::O
 
 		try
 		{
-			setInput( f, false, filename );
+			setInput( f, false, filename, memoryMapped );
 		}
 		catch ( Exception &e )
 		{
@@ -223,7 +234,7 @@ FileIndexedIO::FileIndexedIO(const std::string &path, const IndexedIO::EntryIDLi
 	{
 		throw FileNotFoundIOException(filename);
 	}
-	open( new StreamFile( filename, mode ), root, options );
+	open( new StreamFile( filename, mode, options ), root, options );
 }
 
 FileIndexedIO::FileIndexedIO( StreamIndexedIO::Node &rootNode ) : StreamIndexedIO( rootNode )
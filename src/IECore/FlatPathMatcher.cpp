@@ -0,0 +1,1049 @@
+//////////////////////////////////////////////////////////////////////////
+//
+//  Copyright (c) 2019, Image Engine Design Inc. All rights reserved.
+//
+//  Redistribution and use in source and binary forms, with or without
+//  modification, are permitted provided that the following conditions are
+//  met:
+//
+//     * Redistributions of source code must retain the above copyright
+//       notice, this list of conditions and the following disclaimer.
+//
+//     * Redistributions in binary form must reproduce the above copyright
+//       notice, this list of conditions and the following disclaimer in the
+//       documentation and/or other materials provided with the distribution.
+//
+//     * Neither the name of Image Engine Design nor the names of any
+//       other contributors to this software may be used to endorse or
+//       promote products derived from this software without specific prior
+//       written permission.
+//
+//  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS
+//  IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+//  THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+//  PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR
+//  CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+//  EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+//  PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+//  PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+//  LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+//  NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+//  SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+//
+//////////////////////////////////////////////////////////////////////////
+
+#include "IECore/FlatPathMatcher.h"
+
+#include "IECore/Exception.h"
+#include "IECore/StringAlgo.h"
+
+#include "tbb/blocked_range.h"
+#include "tbb/parallel_for.h"
+#include "tbb/parallel_sort.h"
+
+#include <algorithm>
+#include <cstring>
+#include <limits>
+
+using namespace std;
+using namespace IECore;
+
+//////////////////////////////////////////////////////////////////////////
+// Internal implementation
+//////////////////////////////////////////////////////////////////////////
+
+namespace
+{
+
+const InternedString g_ellipsis( "..." );
+
+// Amount of work below which we don't bother parallelising.
+const size_t g_parallelThreshold = 10000;
+
+// Index used to represent a location which doesn't exist.
+const uint32_t g_noNode = std::numeric_limits<uint32_t>::max();
+
+struct Node
+{
+
+	Node( const InternedString &name = InternedString(), bool wildcarded = false, bool terminator = false )
+		:	name( name ), end( 0 ), childrenBegin( 0 ), wildcardsBegin( 0 ), childrenEnd( 0 ), wildcarded( wildcarded ), terminator( terminator )
+	{
+	}
+
+	InternedString name;
+	// Index one past the last descendant of this node.
+	uint32_t end;
+	// Indices into `Tree::children`. Children with plain names are in the
+	// range [childrenBegin, wildcardsBegin) and children with wildcarded names
+	// are in the range [wildcardsBegin, childrenEnd).
+	uint32_t childrenBegin;
+	uint32_t wildcardsBegin;
+	uint32_t childrenEnd;
+	bool wildcarded;
+	bool terminator;
+
+};
+
+typedef vector<Node> Nodes;
+typedef vector<uint32_t> Children;
+
+struct Tree
+{
+
+	Tree()
+		:	size( 0 )
+	{
+	}
+
+	// Computes `children` and `size` from `nodes`, which
+	// must be in depth-first order with sorted siblings.
+	void finalise()
+	{
+		if( nodes.empty() )
+		{
+			nodes.push_back( Node() );
+			nodes.back().end = 1;
+		}
+
+		size = 0;
+		children.clear();
+		children.reserve( nodes.size() - 1 );
+		for( uint32_t i = 0, e = nodes.size(); i < e; ++i )
+		{
+			Node &node = nodes[i];
+			size += node.terminator;
+			node.childrenBegin = node.wildcardsBegin = children.size();
+			for( uint32_t c = i + 1; c < node.end; c = nodes[c].end )
+			{
+				children.push_back( c );
+				if( !nodes[c].wildcarded )
+				{
+					node.wildcardsBegin = children.size();
+				}
+			}
+			node.childrenEnd = children.size();
+		}
+	}
+
+	Nodes nodes;
+	Children children;
+	size_t size;
+
+};
+
+bool isWildcarded( const InternedString &name )
+{
+	return name == g_ellipsis || StringAlgo::hasWildcards( name.c_str() );
+}
+
+// Defines the order of siblings : plain names first, followed by wildcarded
+// names, each sorted alphabetically. Unlike the pointer-based ordering used
+// by PathMatcher, this is the same in every process, so depth-first traversals
+// can be saved and loaded without re-sorting.
+inline int compare( bool wildcarded1, const InternedString &name1, bool wildcarded2, const InternedString &name2 )
+{
+	if( wildcarded1 != wildcarded2 )
+	{
+		return wildcarded1 ? 1 : -1;
+	}
+	if( name1 == name2 )
+	{
+		return 0;
+	}
+	return strcmp( name1.c_str(), name2.c_str() );
+}
+
+inline int compare( const Node &node1, const Node &node2 )
+{
+	return compare( node1.wildcarded, node1.name, node2.wildcarded, node2.name );
+}
+
+// Appends nodes [begin, end) from `src` to `dst`, adjusting
+// their `end` indices to suit their new position.
+void appendNodes( const Nodes &src, uint32_t begin, uint32_t end, Nodes &dst )
+{
+	const uint32_t dstBegin = dst.size();
+	dst.insert( dst.end(), src.begin() + begin, src.begin() + end );
+	for( auto it = dst.begin() + dstBegin, eIt = dst.end(); it != eIt; ++it )
+	{
+		it->end = it->end - begin + dstBegin;
+	}
+}
+
+void appendNodes( const vector<Nodes> &src, Nodes &dst )
+{
+	for( const auto &nodes : src )
+	{
+		appendNodes( nodes, 0, nodes.size(), dst );
+	}
+}
+
+//////////////////////////////////////////////////////////////////////////
+// Construction from lists of paths
+//////////////////////////////////////////////////////////////////////////
+
+struct Component
+{
+	InternedString name;
+	bool wildcarded;
+};
+
+typedef vector<Component> ComponentPath;
+typedef vector<ComponentPath>::const_iterator ComponentPathIterator;
+
+bool componentLess( const Component &c1, const Component &c2 )
+{
+	return compare( c1.wildcarded, c1.name, c2.wildcarded, c2.name ) < 0;
+}
+
+bool componentEqual( const Component &c1, const Component &c2 )
+{
+	return c1.name == c2.name;
+}
+
+bool componentPathLess( const ComponentPath &p1, const ComponentPath &p2 )
+{
+	return lexicographical_compare( p1.begin(), p1.end(), p2.begin(), p2.end(), componentLess );
+}
+
+bool componentPathEqual( const ComponentPath &p1, const ComponentPath &p2 )
+{
+	return p1.size() == p2.size() && equal( p1.begin(), p1.end(), p2.begin(), componentEqual );
+}
+
+// Returns the end of the run of paths starting at `begin` which
+// share the same name at `depth`.
+ComponentPathIterator nextGroup( ComponentPathIterator begin, ComponentPathIterator end, size_t depth )
+{
+	const InternedString &name = (*begin)[depth].name;
+	ComponentPathIterator it = begin + 1;
+	while( it != end && (*it)[depth].name == name )
+	{
+		++it;
+	}
+	return it;
+}
+
+// Appends the subtree for the paths in [begin, end). These must be sorted
+// and unique, and must all share the same first `depth` components, the
+// last of which is `component`.
+void buildWalk( ComponentPathIterator begin, ComponentPathIterator end, size_t depth, const Component &component, Nodes &nodes )
+{
+	const size_t index = nodes.size();
+	nodes.push_back( Node( component.name, component.wildcarded ) );
+	if( begin != end && begin->size() == depth )
+	{
+		// Shorter paths sort first, so this can only be the first path.
+		nodes[index].terminator = true;
+		++begin;
+	}
+
+	if( (size_t)( end - begin ) < g_parallelThreshold )
+	{
+		while( begin != end )
+		{
+			ComponentPathIterator groupEnd = nextGroup( begin, end, depth );
+			buildWalk( begin, groupEnd, depth + 1, (*begin)[depth], nodes );
+			begin = groupEnd;
+		}
+	}
+	else
+	{
+		vector<ComponentPathIterator> groups;
+		for( ; begin != end; begin = nextGroup( begin, end, depth ) )
+		{
+			groups.push_back( begin );
+		}
+		groups.push_back( end );
+
+		vector<Nodes> childNodes( groups.size() - 1 );
+		tbb::task_group_context taskGroupContext( tbb::task_group_context::isolated );
+		tbb::parallel_for(
+			tbb::blocked_range<size_t>( 0, childNodes.size() ),
+			[&]( const tbb::blocked_range<size_t> &range ) {
+				for( size_t i = range.begin(); i != range.end(); ++i )
+				{
+					buildWalk( groups[i], groups[i+1], depth + 1, (*groups[i])[depth], childNodes[i] );
+				}
+			},
+			taskGroupContext
+		);
+		appendNodes( childNodes, nodes );
+	}
+
+	nodes[index].end = nodes.size();
+}
+
+// Builds nodes from `numPaths` paths, where `tokenizer( i, names )` fills
+// `names` with the i'th path, returning false if it isn't a valid path.
+template<typename Tokenizer>
+Nodes buildNodes( size_t numPaths, Tokenizer &&tokenizer )
+{
+	vector<ComponentPath> paths( numPaths );
+	vector<unsigned char> valid( numPaths, 1 );
+
+	tbb::task_group_context taskGroupContext( tbb::task_group_context::isolated );
+	tbb::parallel_for(
+		tbb::blocked_range<size_t>( 0, numPaths ),
+		[&]( const tbb::blocked_range<size_t> &range ) {
+			vector<InternedString> names;
+			for( size_t i = range.begin(); i != range.end(); ++i )
+			{
+				names.clear();
+				if( !tokenizer( i, names ) )
+				{
+					valid[i] = 0;
+					continue;
+				}
+				ComponentPath &path = paths[i];
+				path.reserve( names.size() );
+				for( const auto &name : names )
+				{
+					path.push_back( { name, isWildcarded( name ) } );
+				}
+			}
+		},
+		taskGroupContext
+	);
+
+	if( find( valid.begin(), valid.end(), 0 ) != valid.end() )
+	{
+		size_t numValid = 0;
+		for( size_t i = 0; i < numPaths; ++i )
+		{
+			if( valid[i] )
+			{
+				paths[numValid++].swap( paths[i] );
+			}
+		}
+		paths.resize( numValid );
+	}
+
+	tbb::parallel_sort( paths.begin(), paths.end(), componentPathLess );
+	paths.erase( unique( paths.begin(), paths.end(), componentPathEqual ), paths.end() );
+
+	Nodes nodes;
+	buildWalk( paths.begin(), paths.end(), 0, Component{ InternedString(), false }, nodes );
+	return nodes;
+}
+
+// Reorders the subtree at `index` so that siblings are sorted, appending
+// the result to `result`.
+void sortWalk( const Tree &tree, uint32_t index, Nodes &result )
+{
+	const size_t resultIndex = result.size();
+	const Node &node = tree.nodes[index];
+	result.push_back( node );
+
+	vector<uint32_t> children( tree.children.begin() + node.childrenBegin, tree.children.begin() + node.childrenEnd );
+	stable_sort(
+		children.begin(), children.end(),
+		[&tree]( uint32_t c1, uint32_t c2 ) { return compare( tree.nodes[c1], tree.nodes[c2] ) < 0; }
+	);
+	for( auto c : children )
+	{
+		sortWalk( tree, c, result );
+	}
+
+	result[resultIndex].end = result.size();
+}
+
+//////////////////////////////////////////////////////////////////////////
+// Matching
+//////////////////////////////////////////////////////////////////////////
+
+typedef vector<InternedString>::const_iterator NameIterator;
+
+// Returns the index of the plain child called `name`, or g_noNode.
+uint32_t plainChild( const Tree &tree, const Node &node, const InternedString &name )
+{
+	Children::const_iterator first = tree.children.begin() + node.childrenBegin;
+	Children::const_iterator last = tree.children.begin() + node.wildcardsBegin;
+	while( first < last )
+	{
+		Children::const_iterator mid = first + ( last - first ) / 2;
+		const InternedString &midName = tree.nodes[*mid].name;
+		if( midName == name )
+		{
+			return *mid;
+		}
+		if( strcmp( midName.c_str(), name.c_str() ) < 0 )
+		{
+			first = mid + 1;
+		}
+		else
+		{
+			last = mid;
+		}
+	}
+	return g_noNode;
+}
+
+uint32_t ellipsisChild( const Tree &tree, const Node &node )
+{
+	for( uint32_t c = node.wildcardsBegin; c < node.childrenEnd; ++c )
+	{
+		if( tree.nodes[tree.children[c]].name == g_ellipsis )
+		{
+			return tree.children[c];
+		}
+	}
+	return g_noNode;
+}
+
+// Equivalent to PathMatcher::matchWalk().
+void matchWalk( const Tree &tree, uint32_t index, const NameIterator &start, const NameIterator &end, unsigned &result )
+{
+	const Node &node = tree.nodes[index];
+
+	if( start == end )
+	{
+		if( node.terminator )
+		{
+			result |= PathMatcher::ExactMatch;
+		}
+		if( node.childrenBegin != node.childrenEnd )
+		{
+			result |= PathMatcher::DescendantMatch;
+		}
+		const uint32_t ellipsis = ellipsisChild( tree, node );
+		if( ellipsis != g_noNode )
+		{
+			result |= PathMatcher::DescendantMatch;
+			if( tree.nodes[ellipsis].terminator )
+			{
+				result |= PathMatcher::ExactMatch;
+			}
+		}
+		return;
+	}
+
+	if( node.terminator )
+	{
+		result |= PathMatcher::AncestorMatch;
+	}
+
+	const uint32_t child = plainChild( tree, node, *start );
+	if( child != g_noNode )
+	{
+		matchWalk( tree, child, start + 1, end, result );
+		if( result == PathMatcher::EveryMatch )
+		{
+			return;
+		}
+	}
+
+	uint32_t ellipsis = g_noNode;
+	for( uint32_t c = node.wildcardsBegin; c < node.childrenEnd; ++c )
+	{
+		const uint32_t childIndex = tree.children[c];
+		const InternedString &childName = tree.nodes[childIndex].name;
+		if( childName == g_ellipsis )
+		{
+			ellipsis = childIndex;
+			continue;
+		}
+
+		if( StringAlgo::match( start->c_str(), childName.c_str() ) )
+		{
+			matchWalk( tree, childIndex, start + 1, end, result );
+			if( result == PathMatcher::EveryMatch )
+			{
+				return;
+			}
+		}
+	}
+
+	if( ellipsis != g_noNode )
+	{
+		result |= PathMatcher::DescendantMatch;
+		if( tree.nodes[ellipsis].terminator )
+		{
+			result |= PathMatcher::ExactMatch;
+		}
+
+		for( NameIterator newStart = start; newStart != end; ++newStart )
+		{
+			matchWalk( tree, ellipsis, newStart, end, result );
+			if( result == PathMatcher::EveryMatch )
+			{
+				return;
+			}
+		}
+	}
+}
+
+//////////////////////////////////////////////////////////////////////////
+// Set operations
+//////////////////////////////////////////////////////////////////////////
+
+enum Operation
+{
+	Union,
+	Intersection,
+	Difference
+};
+
+// Calls `f( childA, childB )` for the union of the children of `a` and `b`,
+// passing g_noNode for children that exist on only one side.
+template<typename F>
+void forEachChildPair( const Tree &treeA, uint32_t a, const Tree &treeB, uint32_t b, F &&f )
+{
+	const Node &nodeA = treeA.nodes[a];
+	const Node &nodeB = treeB.nodes[b];
+	uint32_t ia = nodeA.childrenBegin;
+	uint32_t ib = nodeB.childrenBegin;
+	while( ia < nodeA.childrenEnd || ib < nodeB.childrenEnd )
+	{
+		if( ib == nodeB.childrenEnd )
+		{
+			f( treeA.children[ia++], g_noNode );
+			continue;
+		}
+		if( ia == nodeA.childrenEnd )
+		{
+			f( g_noNode, treeB.children[ib++] );
+			continue;
+		}
+
+		const uint32_t ca = treeA.children[ia];
+		const uint32_t cb = treeB.children[ib];
+		const int c = compare( treeA.nodes[ca], treeB.nodes[cb] );
+		if( c < 0 )
+		{
+			f( ca, g_noNode );
+			ia++;
+		}
+		else if( c > 0 )
+		{
+			f( g_noNode, cb );
+			ib++;
+		}
+		else
+		{
+			f( ca, cb );
+			ia++;
+			ib++;
+		}
+	}
+}
+
+// Appends the result of applying `operation` to the subtrees at `a` and `b`,
+// either of which may be g_noNode. Locations which are neither exact matches
+// nor ancestors of exact matches are omitted, except for the root.
+void mergeWalk( Operation operation, const Tree &treeA, uint32_t a, const Tree &treeB, uint32_t b, Nodes &result )
+{
+	if( b == g_noNode )
+	{
+		if( operation != Intersection )
+		{
+			appendNodes( treeA.nodes, a, treeA.nodes[a].end, result );
+		}
+		return;
+	}
+
+	if( a == g_noNode )
+	{
+		if( operation == Union )
+		{
+			appendNodes( treeB.nodes, b, treeB.nodes[b].end, result );
+		}
+		return;
+	}
+
+	const Node &nodeA = treeA.nodes[a];
+	const Node &nodeB = treeB.nodes[b];
+
+	const size_t index = result.size();
+	result.push_back( Node( nodeA.name, nodeA.wildcarded ) );
+	switch( operation )
+	{
+		case Union :
+			result[index].terminator = nodeA.terminator || nodeB.terminator;
+			break;
+		case Intersection :
+			result[index].terminator = nodeA.terminator && nodeB.terminator;
+			break;
+		case Difference :
+			result[index].terminator = nodeA.terminator && !nodeB.terminator;
+			break;
+	}
+
+	if( ( nodeA.end - a ) + ( nodeB.end - b ) < g_parallelThreshold )
+	{
+		forEachChildPair(
+			treeA, a, treeB, b,
+			[&]( uint32_t childA, uint32_t childB ) {
+				mergeWalk( operation, treeA, childA, treeB, childB, result );
+			}
+		);
+	}
+	else
+	{
+		vector<pair<uint32_t, uint32_t>> childPairs;
+		forEachChildPair(
+			treeA, a, treeB, b,
+			[&childPairs]( uint32_t childA, uint32_t childB ) {
+				childPairs.push_back( make_pair( childA, childB ) );
+			}
+		);
+
+		vector<Nodes> childNodes( childPairs.size() );
+		tbb::task_group_context taskGroupContext( tbb::task_group_context::isolated );
+		tbb::parallel_for(
+			tbb::blocked_range<size_t>( 0, childPairs.size() ),
+			[&]( const tbb::blocked_range<size_t> &range ) {
+				for( size_t i = range.begin(); i != range.end(); ++i )
+				{
+					mergeWalk( operation, treeA, childPairs[i].first, treeB, childPairs[i].second, childNodes[i] );
+				}
+			},
+			taskGroupContext
+		);
+		appendNodes( childNodes, result );
+	}
+
+	result[index].end = result.size();
+	if( index && !result[index].terminator && result.size() == index + 1 )
+	{
+		result.pop_back();
+	}
+}
+
+} // namespace
+
+//////////////////////////////////////////////////////////////////////////
+// FlatPathMatcher::Data
+//////////////////////////////////////////////////////////////////////////
+
+class FlatPathMatcher::Data : public RefCounted, public Tree
+{
+
+	public :
+
+		Data()
+		{
+		}
+
+		Data( Nodes &&nodes )
+		{
+			this->nodes = std::move( nodes );
+			finalise();
+		}
+
+};
+
+//////////////////////////////////////////////////////////////////////////
+// FlatPathMatcher
+//////////////////////////////////////////////////////////////////////////
+
+FlatPathMatcher::FlatPathMatcher()
+	:	m_data( new Data( Nodes() ) )
+{
+}
+
+FlatPathMatcher::FlatPathMatcher( const FlatPathMatcher &other )
+	:	m_data( other.m_data )
+{
+}
+
+FlatPathMatcher::~FlatPathMatcher()
+{
+}
+
+FlatPathMatcher &FlatPathMatcher::operator = ( const FlatPathMatcher &other )
+{
+	m_data = other.m_data;
+	return *this;
+}
+
+FlatPathMatcher::FlatPathMatcher( const ConstDataPtr &data )
+	:	m_data( data )
+{
+}
+
+FlatPathMatcher::FlatPathMatcher( const PathMatcher &pathMatcher )
+{
+	DataPtr data = new Data;
+	fromPathMatcherWalk( pathMatcher.m_root.get(), InternedString(), false, data.get() );
+	data->finalise();
+	m_data = data;
+}
+
+FlatPathMatcher::FlatPathMatcher( const std::vector<std::string> &paths )
+	:	m_data(
+			new Data(
+				buildNodes(
+					paths.size(),
+					[&paths]( size_t i, vector<InternedString> &names ) {
+						if( paths[i].empty() )
+						{
+							return false;
+						}
+						StringAlgo::tokenize( paths[i], '/', names );
+						return true;
+					}
+				)
+			)
+		)
+{
+}
+
+FlatPathMatcher::FlatPathMatcher( const std::vector<std::vector<InternedString>> &paths )
+	:	m_data(
+			new Data(
+				buildNodes(
+					paths.size(),
+					[&paths]( size_t i, vector<InternedString> &names ) {
+						names = paths[i];
+						return true;
+					}
+				)
+			)
+		)
+{
+}
+
+FlatPathMatcher::FlatPathMatcher( const std::vector<InternedString> &names, const std::vector<unsigned int> &pathLengths, const std::vector<unsigned char> &exactMatches )
+{
+	if( pathLengths.size() != exactMatches.size() )
+	{
+		throw InvalidArgumentException( "FlatPathMatcher : pathLengths and exactMatches must have the same length" );
+	}
+
+	DataPtr data = new Data;
+	Nodes &nodes = data->nodes;
+	nodes.reserve( pathLengths.size() );
+
+	// Indices of the nodes on the path to the current location.
+	vector<uint32_t> stack;
+	size_t nameIndex = 0;
+	bool sorted = true;
+	for( size_t i = 0, e = pathLengths.size(); i < e; ++i )
+	{
+		const size_t length = pathLengths[i];
+		if( i == 0 )
+		{
+			if( length )
+			{
+				throw InvalidArgumentException( "FlatPathMatcher : First location must be the root" );
+			}
+			stack.push_back( 0 );
+			nodes.push_back( Node( InternedString(), false, exactMatches[i] ) );
+			continue;
+		}
+
+		if( length == 0 || length > stack.size() )
+		{
+			throw InvalidArgumentException( "FlatPathMatcher : Invalid path length" );
+		}
+		if( nameIndex >= names.size() )
+		{
+			throw InvalidArgumentException( "FlatPathMatcher : Not enough names" );
+		}
+
+		// Close the locations which are not ancestors of this one. The
+		// last one we close is the previous sibling, if there is one.
+		uint32_t previousSibling = g_noNode;
+		while( stack.size() > length )
+		{
+			previousSibling = stack.back();
+			nodes[previousSibling].end = nodes.size();
+			stack.pop_back();
+		}
+
+		const InternedString &name = names[nameIndex++];
+		Node node( name, isWildcarded( name ), exactMatches[i] );
+		if( previousSibling != g_noNode && compare( nodes[previousSibling], node ) >= 0 )
+		{
+			sorted = false;
+		}
+
+		stack.push_back( nodes.size() );
+		nodes.push_back( node );
+	}
+
+	while( stack.size() )
+	{
+		nodes[stack.back()].end = nodes.size();
+		stack.pop_back();
+	}
+
+	data->finalise();
+	if( !sorted )
+	{
+		Nodes sortedNodes;
+		sortedNodes.reserve( nodes.size() );
+		sortWalk( *data, 0, sortedNodes );
+		data = new Data( std::move( sortedNodes ) );
+	}
+
+	m_data = data;
+}
+
+PathMatcher FlatPathMatcher::pathMatcher() const
+{
+	const Node &root = m_data->nodes[0];
+	if( root.childrenBegin == root.childrenEnd )
+	{
+		// Avoid using the shared leaf node for the root.
+		return PathMatcher( new PathMatcher::Node( root.terminator ) );
+	}
+	return PathMatcher( toPathMatcherWalk( m_data.get(), 0 ) );
+}
+
+bool FlatPathMatcher::isEmpty() const
+{
+	return m_data->nodes.size() == 1 && !m_data->nodes[0].terminator;
+}
+
+size_t FlatPathMatcher::size() const
+{
+	return m_data->size;
+}
+
+void FlatPathMatcher::paths( std::vector<std::string> &paths ) const
+{
+	const Nodes &nodes = m_data->nodes;
+
+	string path;
+	// Ends and path lengths for the nodes on the path
+	// to the current location.
+	vector<uint32_t> ends;
+	vector<size_t> lengths;
+	for( uint32_t i = 0, e = nodes.size(); i < e; ++i )
+	{
+		while( ends.size() && i >= ends.back() )
+		{
+			ends.pop_back();
+			path.resize( lengths.back() );
+			lengths.pop_back();
+		}
+
+		const Node &node = nodes[i];
+		ends.push_back( node.end );
+		lengths.push_back( path.size() );
+		if( i )
+		{
+			path += "/";
+			path += node.name.string();
+		}
+
+		if( node.terminator )
+		{
+			paths.push_back( i ? path : "/" );
+		}
+	}
+}
+
+void FlatPathMatcher::depthFirst( std::vector<InternedString> &names, std::vector<unsigned int> &pathLengths, std::vector<unsigned char> &exactMatches ) const
+{
+	if( isEmpty() )
+	{
+		return;
+	}
+
+	const Nodes &nodes = m_data->nodes;
+	names.reserve( names.size() + nodes.size() - 1 );
+	pathLengths.reserve( pathLengths.size() + nodes.size() );
+	exactMatches.reserve( exactMatches.size() + nodes.size() );
+
+	vector<uint32_t> ends;
+	for( uint32_t i = 0, e = nodes.size(); i < e; ++i )
+	{
+		while( ends.size() && i >= ends.back() )
+		{
+			ends.pop_back();
+		}
+
+		const Node &node = nodes[i];
+		if( i )
+		{
+			names.push_back( node.name );
+		}
+		pathLengths.push_back( ends.size() );
+		exactMatches.push_back( node.terminator );
+		ends.push_back( node.end );
+	}
+}
+
+unsigned FlatPathMatcher::match( const std::string &path ) const
+{
+	if( path.empty() )
+	{
+		return PathMatcher::NoMatch;
+	}
+	std::vector<IECore::InternedString> tokenizedPath;
+	StringAlgo::tokenize( path, '/', tokenizedPath );
+	return match( tokenizedPath );
+}
+
+unsigned FlatPathMatcher::match( const std::vector<InternedString> &path ) const
+{
+	unsigned result = PathMatcher::NoMatch;
+	matchWalk( *m_data, 0, path.begin(), path.end(), result );
+	return result;
+}
+
+FlatPathMatcher FlatPathMatcher::unionWith( const FlatPathMatcher &other ) const
+{
+	if( m_data == other.m_data || other.isEmpty() )
+	{
+		return *this;
+	}
+	else if( isEmpty() )
+	{
+		return other;
+	}
+
+	Nodes nodes;
+	nodes.reserve( m_data->nodes.size() + other.m_data->nodes.size() );
+	mergeWalk( Union, *m_data, 0, *other.m_data, 0, nodes );
+	return FlatPathMatcher( new Data( std::move( nodes ) ) );
+}
+
+FlatPathMatcher FlatPathMatcher::intersection( const FlatPathMatcher &other ) const
+{
+	if( m_data == other.m_data )
+	{
+		return *this;
+	}
+
+	Nodes nodes;
+	mergeWalk( Intersection, *m_data, 0, *other.m_data, 0, nodes );
+	return FlatPathMatcher( new Data( std::move( nodes ) ) );
+}
+
+FlatPathMatcher FlatPathMatcher::difference( const FlatPathMatcher &other ) const
+{
+	if( m_data == other.m_data )
+	{
+		return FlatPathMatcher();
+	}
+	else if( other.isEmpty() )
+	{
+		return *this;
+	}
+
+	Nodes nodes;
+	nodes.reserve( m_data->nodes.size() );
+	mergeWalk( Difference, *m_data, 0, *other.m_data, 0, nodes );
+	return FlatPathMatcher( new Data( std::move( nodes ) ) );
+}
+
+bool FlatPathMatcher::operator == ( const FlatPathMatcher &other ) const
+{
+	if( m_data == other.m_data )
+	{
+		return true;
+	}
+
+	const Nodes &nodes = m_data->nodes;
+	const Nodes &otherNodes = other.m_data->nodes;
+	if( nodes.size() != otherNodes.size() || m_data->size != other.m_data->size )
+	{
+		return false;
+	}
+
+	for( size_t i = 0, e = nodes.size(); i < e; ++i )
+	{
+		const Node &node = nodes[i];
+		const Node &otherNode = otherNodes[i];
+		if( node.name != otherNode.name || node.end != otherNode.end || node.terminator != otherNode.terminator )
+		{
+			return false;
+		}
+	}
+
+	return true;
+}
+
+bool FlatPathMatcher::operator != ( const FlatPathMatcher &other ) const
+{
+	return !( *this == other );
+}
+
+void FlatPathMatcher::fromPathMatcherWalk( const PathMatcher::Node *node, const InternedString &name, bool wildcarded, Data *data )
+{
+	const size_t index = data->nodes.size();
+	data->nodes.push_back( Node( name, wildcarded, node->terminator ) );
+
+	// PathMatcher orders children by the address of their names,
+	// so we must sort them into our own order.
+	typedef PathMatcher::Node::ConstChildMapIterator ChildIterator;
+	const PathMatcher::Node::ChildMap &children = node->children;
+	vector<ChildIterator> sortedChildren;
+	sortedChildren.reserve( children.size() );
+	for( ChildIterator it = children.begin(), eIt = children.end(); it != eIt; ++it )
+	{
+		sortedChildren.push_back( it );
+	}
+
+	if( sortedChildren.size() > 1 )
+	{
+		sort(
+			sortedChildren.begin(), sortedChildren.end(),
+			[]( const ChildIterator &c1, const ChildIterator &c2 ) {
+				return compare(
+					c1->first.type == PathMatcher::Name::Wildcarded, c1->first.name,
+					c2->first.type == PathMatcher::Name::Wildcarded, c2->first.name
+				) < 0;
+			}
+		);
+	}
+
+	for( const auto &child : sortedChildren )
+	{
+		fromPathMatcherWalk( child->second.get(), child->first.name, child->first.type == PathMatcher::Name::Wildcarded, data );
+	}
+
+	data->nodes[index].end = data->nodes.size();
+}
+
+PathMatcher::NodePtr FlatPathMatcher::toPathMatcherWalk( const Data *data, size_t index )
+{
+	const Node &node = data->nodes[index];
+	if( node.terminator && node.childrenBegin == node.childrenEnd )
+	{
+		return PathMatcher::Node::leaf();
+	}
+
+	const size_t numChildren = node.childrenEnd - node.childrenBegin;
+	vector<PathMatcher::NodePtr> children( numChildren );
+	if( node.end - index < g_parallelThreshold )
+	{
+		for( size_t i = 0; i < numChildren; ++i )
+		{
+			children[i] = toPathMatcherWalk( data, data->children[node.childrenBegin + i] );
+		}
+	}
+	else
+	{
+		tbb::task_group_context taskGroupContext( tbb::task_group_context::isolated );
+		tbb::parallel_for(
+			tbb::blocked_range<size_t>( 0, numChildren ),
+			[&]( const tbb::blocked_range<size_t> &range ) {
+				for( size_t i = range.begin(); i != range.end(); ++i )
+				{
+					children[i] = toPathMatcherWalk( data, data->children[node.childrenBegin + i] );
+				}
+			},
+			taskGroupContext
+		);
+	}
+
+	PathMatcher::NodePtr result = new PathMatcher::Node( node.terminator );
+	for( size_t i = 0; i < numChildren; ++i )
+	{
+		const Node &child = data->nodes[data->children[node.childrenBegin + i]];
+		result->children.insert(
+			PathMatcher::Node::ChildMapValue(
+				PathMatcher::Name( child.name, child.wildcarded ? PathMatcher::Name::Wildcarded : PathMatcher::Name::Plain ),
+				children[i]
+			)
+		);
+	}
+
+	return result;
+}
@@ -126,6 +126,11 @@ IFFFile::Tag IFFFile::Chunk::groupName()
 	return m_groupName;
 }
 
+std::streampos IFFFile::Chunk::filePosition()
+{
+	return m_filePosition;
+}
+
 IFFFile::Chunk::ChunkIterator IFFFile::Chunk::childrenBegin()
 {
 	if ( isGroup() && !m_children.size() )
@@ -114,6 +114,10 @@ void IndexedIO::readable(const IndexedIO::EntryID &name) const
 {
 }
 
+void IndexedIO::prefetch( const IndexedIO::EntryIDList &names ) const
+{
+}
+
 void IndexedIO::writable(const IndexedIO::EntryID &name) const
 {
 	if ( ( openMode() & (IndexedIO::Write | IndexedIO::Append) ) == 0)
@@ -35,11 +35,14 @@
 #include "IECore/InternedString.h"
 
 #include "boost/lexical_cast.hpp"
-#include "boost/multi_index/hashed_index.hpp"
-#include "boost/multi_index_container.hpp"
 
 #include "tbb/concurrent_hash_map.h"
-#include "tbb/spin_rw_mutex.h"
+#include "tbb/spin_mutex.h"
+
+#include <atomic>
+#include <deque>
+#include <memory>
+#include <vector>
 
 #include <string.h>
 
@@ -49,150 +52,206 @@ namespace IECore
 namespace Detail
 {
 
-// Simple type for specifying a range of characters, to
-// represent non-null-terminated strings.
-typedef std::pair<const char *, const char *> CharRange;
+// The table is split into shards, each with its own mutex, so that
+// threads inserting different strings rarely contend. Lookups of
+// existing strings - by far the most common operation - don't lock
+// at all. They probe an open addressing table of atomic pointers,
+// which is only ever written to by a thread holding the shard mutex.
+// When a table needs to grow, a new one is published in its place,
+// and the old one is kept alive for any readers still probing it.
+// Readers which miss in a stale table just fall through to the locked
+// path, which always uses the current table.
+
+const size_t g_numShardsLog2 = 6;
+const size_t g_numShards = 1 << g_numShardsLog2;
+const size_t g_initialTableSize = 64;
+
+// Dan Bernstein's original string hash, followed by a
+// finaliser so that both the low bits ( used to pick a shard )
+// and the high bits ( used to pick a slot ) are well mixed.
+inline size_t hash( const char *s, size_t length )
+{
+	uint64_t hash = 5381;
+	for( const char *e = s + length; s != e; ++s )
+	{
+		hash = ( ( hash << 5 ) + hash ) + *s;
+	}
+
+	hash ^= hash >> 33;
+	hash *= 0xff51afd7ed558ccdULL;
+	hash ^= hash >> 33;
+	hash *= 0xc4ceb9fe1a85ec53ULL;
+	hash ^= hash >> 33;
+
+	return hash;
+}
 
-// Hash for strings of various types.
-// By overloading it for multiple types, we are able to do
-// lookups into HashSet using any type as a key, and without
-// needing to construct a temporary std::string when the type
-// is a raw c string.
-struct Hash
+struct Entry
 {
 
-	// Dan Bernstein's original string hash
-	size_t operator()( const char *s ) const
+	Entry( size_t hash, const char *value, size_t length )
+		:	hash( hash ), value( value, length )
 	{
-		size_t hash = 5381;
-		while( *s )
+	}
+
+	const size_t hash;
+	const std::string value;
+
+};
+
+class Table
+{
+
+	public :
+
+		Table( size_t size )
+			:	m_mask( size - 1 ), m_slots( new std::atomic<const Entry *>[size] )
 		{
-			hash = ( ( hash << 5 ) + hash ) + *s++;
+			for( size_t i = 0; i < size; ++i )
+			{
+				m_slots[i].store( nullptr, std::memory_order_relaxed );
+			}
 		}
 
-		return hash;
-	}
+		size_t size() const
+		{
+			return m_mask + 1;
+		}
 
-	size_t operator()( const std::string &s ) const
-	{
-		return (*this)( s.c_str() );
-	}
+		const Entry *find( size_t hash, const char *value, size_t length ) const
+		{
+			for( size_t i = slot( hash ); ; i = ( i + 1 ) & m_mask )
+			{
+				const Entry *e = m_slots[i].load( std::memory_order_acquire );
+				if( !e )
+				{
+					return nullptr;
+				}
+				if( e->hash == hash && e->value.size() == length && memcmp( e->value.c_str(), value, length ) == 0 )
+				{
+					return e;
+				}
+			}
+		}
 
-	size_t operator()( const CharRange &range ) const
-	{
-		size_t hash = 5381;
-		for( const char *s = range.first; s != range.second; ++s )
+		// Must only be called by the thread holding the shard mutex,
+		// and only when the entry isn't already present.
+		void insert( const Entry *entry )
 		{
-			hash = ( ( hash << 5 ) + hash ) + *s;
+			size_t i = slot( entry->hash );
+			while( m_slots[i].load( std::memory_order_relaxed ) )
+			{
+				i = ( i + 1 ) & m_mask;
+			}
+			m_slots[i].store( entry, std::memory_order_release );
 		}
 
-		return hash;
-	}
+	private :
+
+		size_t slot( size_t hash ) const
+		{
+			return ( hash >> g_numShardsLog2 ) & m_mask;
+		}
+
+		const size_t m_mask;
+		std::unique_ptr<std::atomic<const Entry *>[]> m_slots;
 
 };
 
-// Equality operator between strings of various types.
-// As above, this allows HashSet lookups to be performed
-// using any type, without the overhead of constructing
-// temporary std::strings.
-struct Equal
+// Aligned to avoid false sharing between threads
+// operating on neighbouring shards.
+struct alignas( 64 ) Shard
 {
 
-	bool operator()( const std::string &s1, const std::string &s2 ) const
+	Shard()
+		:	table( nullptr ), size( 0 )
 	{
-		return s1 == s2;
+		tables.emplace_back( new Table( g_initialTableSize ) );
+		table.store( tables.back().get(), std::memory_order_release );
 	}
 
-	bool operator()( const char *c, const std::string &s ) const
+	const std::string *internedString( size_t hash, const char *value, size_t length )
 	{
-		return strcmp( c, s.c_str() )==0;
-	}
+		if( const Entry *e = table.load( std::memory_order_acquire )->find( hash, value, length ) )
+		{
+			return &e->value;
+		}
 
-	bool operator()( const std::string &s, const char *c ) const
-	{
-		return strcmp( c, s.c_str() )==0;
-	}
+		tbb::spin_mutex::scoped_lock lock( mutex );
 
-	bool operator()( const CharRange &c, const std::string &s ) const
-	{
-		return s.compare( 0, std::string::npos, c.first, c.second - c.first )==0;
-	}
+		// Check again now we hold the lock, in case another thread
+		// inserted the string or replaced the table.
+		Table *t = tables.back().get();
+		if( const Entry *e = t->find( hash, value, length ) )
+		{
+			return &e->value;
+		}
 
-	bool operator()( const std::string &s, const CharRange &c ) const
-	{
-		return s.compare( 0, std::string::npos, c.first, c.second - c.first )==0;
+		// Keep the load factor at or below 0.5,
+		// so that probe sequences stay short.
+		if( ( size + 1 ) * 2 > t->size() )
+		{
+			Table *grown = new Table( t->size() * 2 );
+			for( const auto &e : entries )
+			{
+				grown->insert( &e );
+			}
+			tables.emplace_back( grown );
+			table.store( grown, std::memory_order_release );
+			t = grown;
+		}
+
+		// The deque serves as an arena for the entries. It
+		// allocates them in blocks, and never moves them.
+		entries.emplace_back( hash, value, length );
+		const Entry *e = &entries.back();
+		t->insert( e );
+		size.store( size + 1, std::memory_order_relaxed );
+
+		return &e->value;
 	}
 
+	std::atomic<Table *> table;
+	std::atomic<size_t> size;
+	tbb::spin_mutex mutex;
+	std::deque<Entry> entries;
+	std::vector<std::unique_ptr<Table>> tables;
+
 };
 
-typedef boost::multi_index::multi_index_container<
-	std::string,
-	boost::multi_index::indexed_by<
-		boost::multi_index::hashed_unique<
-			boost::multi_index::identity<std::string>,
-			Hash,
-			Equal
-		>
-	>
-> HashSet;
-
-typedef HashSet::nth_index<0>::type Index;
-typedef HashSet::nth_index_const_iterator<0>::type ConstIterator;
-typedef tbb::spin_rw_mutex Mutex;
-
-static HashSet *hashSet()
+static Shard *shards()
 {
-	static HashSet g_hashSet;
-	return &g_hashSet;
+	static Shard g_shards[g_numShards];
+	return g_shards;
 }
 
-static Mutex *mutex()
+inline const std::string *internedString( const char *value, size_t length )
 {
-	static Detail::Mutex g_mutex;
-	return &g_mutex;
+	const size_t h = hash( value, length );
+	return shards()[h & ( g_numShards - 1 )].internedString( h, value, length );
 }
 
 } // namespace Detail
 
 const std::string *InternedString::internedString( const char *value )
 {
-	Detail::HashSet *hashSet = Detail::hashSet();
-	Detail::Index &hashIndex = hashSet->get<0>();
-	Detail::Mutex::scoped_lock lock( *Detail::mutex(), false ); // read-only lock
-	Detail::HashSet::const_iterator it = hashIndex.find( value );
-	if( it!=hashIndex.end() )
-	{
-		return &(*it);
-	}
-	else
-	{
-		lock.upgrade_to_writer();
-		return &(*(hashSet->insert( std::string( value ) ).first ) );
-	}
+	return Detail::internedString( value, strlen( value ) );
 }
 
 const std::string *InternedString::internedString( const char *value, size_t length )
 {
-	Detail::HashSet *hashSet = Detail::hashSet();
-	Detail::Index &hashIndex = hashSet->get<0>();
-	Detail::Mutex::scoped_lock lock( *Detail::mutex(), false ); // read-only lock
-	Detail::HashSet::const_iterator it = hashIndex.find( Detail::CharRange( value, value + length ) );
-	if( it!=hashIndex.end() )
-	{
-		return &(*it);
-	}
-	else
-	{
-		lock.upgrade_to_writer();
-		return &(*(hashSet->insert( std::string( value, length ) ).first ) );
-	}
+	return Detail::internedString( value, length );
 }
 
 size_t InternedString::numUniqueStrings()
 {
-	Detail::Mutex::scoped_lock lock( *Detail::mutex(), false ); // read-only lock
-	Detail::HashSet *hashSet = Detail::hashSet();
-	return hashSet->size();
+	size_t result = 0;
+	const Detail::Shard *shards = Detail::shards();
+	for( size_t i = 0; i < Detail::g_numShards; ++i )
+	{
+		result += shards[i].size.load( std::memory_order_relaxed );
+	}
+	return result;
 }
 
 static InternedString g_emptyString("");
@@ -215,9 +215,14 @@ struct MultiplyFunctor
 
 };
 
+bool MatrixMultiplyOp::threadSafe() const
+{
+	return true;
+}
+
 void MatrixMultiplyOp::modify( Object * toModify, const CompoundObject * operands )
 {
 	Data *data = static_cast< Data * >( toModify );
-	MultiplyFunctor func = { data, m_matrixParameter->getValue() };
+	MultiplyFunctor func = { data, operands->member<Object>( m_matrixParameter->name(), /* throwExceptions = */ true ) };
 	despatchTypedData< MultiplyFunctor, TypeTraits::IsFloatVec3VectorTypedData >( data, func );
 }
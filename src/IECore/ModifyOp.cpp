@@ -99,12 +99,19 @@ const BoolParameter *ModifyOp::enableParameter() const
 
 ObjectPtr ModifyOp::doOperation( const CompoundObject *operands )
 {
-	ObjectPtr object = m_inputParameter->getValue();
-	if( m_copyParameter->getTypedValue() )
+	// We take our arguments from the operands where possible, so that
+	// operateConcurrently() may be used with per-thread operands.
+	const Object *input = operands->member<Object>( m_inputParameter->name() );
+	ObjectPtr object = input ? const_cast<Object *>( input ) : m_inputParameter->getValue();
+
+	const BoolData *copy = operands->member<BoolData>( m_copyParameter->name() );
+	if( copy ? copy->readable() : m_copyParameter->getTypedValue() )
 	{
 		object = object->copy();
 	}
-	if( m_enableParameter->getTypedValue() )
+
+	const BoolData *enable = operands->member<BoolData>( m_enableParameter->name() );
+	if( enable ? enable->readable() : m_enableParameter->getTypedValue() )
 	{
 		modify( object.get(), operands );
 	}
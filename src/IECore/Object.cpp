@@ -334,10 +334,11 @@ ObjectPtr Object::LoadContext::loadObject( const IndexedIO *container )
 
 struct IECore::Object::MemoryAccumulator::Accumulated : public std::set<const void *>
 {
+	Allocations allocations;
 };
 
-Object::MemoryAccumulator::MemoryAccumulator()
-	:	m_total( 0 )
+Object::MemoryAccumulator::MemoryAccumulator( bool recordSharedAllocations )
+	:	m_total( 0 ), m_recordSharedAllocations( recordSharedAllocations )
 {
 }
 
@@ -383,6 +384,10 @@ void Object::MemoryAccumulator::accumulate( const void *ptr, size_t bytes )
 	{
 		m_total += bytes;
 		m_accumulated->insert( ptr );
+		if( m_recordSharedAllocations )
+		{
+			m_accumulated->allocations.push_back( Allocations::value_type( ptr, bytes ) );
+		}
 	}
 }
 
@@ -391,6 +396,11 @@ size_t Object::MemoryAccumulator::total() const
 	return m_total;
 }
 
+Object::MemoryAccumulator::Allocations Object::MemoryAccumulator::sharedAllocations() const
+{
+	return m_accumulated ? m_accumulated->allocations : Allocations();
+}
+
 //////////////////////////////////////////////////////////////////////////////////////////
 // object interface stuff
 //////////////////////////////////////////////////////////////////////////////////////////
@@ -34,39 +34,403 @@
 
 #include "IECore/ObjectPool.h"
 
-#include "IECore/LRUCache.h"
-
+#include "boost/functional/hash.hpp"
 #include "boost/lexical_cast.hpp"
+#include "boost/multi_index/hashed_index.hpp"
+#include "boost/multi_index/member.hpp"
+#include "boost/multi_index_container.hpp"
+
+#include "tbb/atomic.h"
+#include "tbb/spin_mutex.h"
+#include "tbb/spin_rw_mutex.h"
+#include "tbb/tbb_thread.h"
+
+#include <unordered_map>
+#include <vector>
 
 using namespace IECore;
 
+//////////////////////////////////////////////////////////////////////////
+// Internal utilities
+//////////////////////////////////////////////////////////////////////////
+
+namespace
+{
+
+// The GreedyDualSize policy gives objects up to this size
+// the maximum number of chances before being evicted. Each
+// doubling in size above this removes one chance.
+const size_t g_smallObjectSize = 4 * 1024;
+const unsigned char g_maxCredits = 8;
+
+unsigned char credits( ObjectPool::EvictionPolicy evictionPolicy, size_t memoryUsage )
+{
+	if( evictionPolicy != ObjectPool::GreedyDualSize )
+	{
+		// Second chance.
+		return 1;
+	}
+
+	unsigned char result = g_maxCredits;
+	size_t size = g_smallObjectSize;
+	while( size < memoryUsage && result > 1 )
+	{
+		size *= 2;
+		result--;
+	}
+	return result;
+}
+
+} // namespace
+
 ////////////////////////////////////////////////////////////////////////
 // MemberData
 ////////////////////////////////////////////////////////////////////////
 
+// The storage is modelled on the LRUCachePolicy::Parallel policy, with
+// the items split across multiple bins to reduce contention, and eviction
+// performed using a clock algorithm. We don't use LRUCache itself because
+// we need to account for memory across the whole pool, so that buffers shared
+// between objects are only counted once, and because the cost of evicting
+// an object depends on what else remains in the pool.
 struct ObjectPool::MemberData
 {
 
-	MemberData( size_t maxMemory ) : cache( getter, maxMemory )
+	struct Item
+	{
+		Item( const MurmurHash &hash, ConstObjectPtr object, EvictionPolicy evictionPolicy )
+			:	hash( hash ), object( object )
+		{
+			Object::MemoryAccumulator accumulator( /* recordSharedAllocations = */ true );
+			accumulator.accumulate( object.get() );
+			memoryUsage = accumulator.total();
+			sharedAllocations = accumulator.sharedAllocations();
+			this->credits = ::credits( evictionPolicy, memoryUsage );
+		}
+
+		Item( const Item &other )
+			:	hash( other.hash ), object( other.object ), memoryUsage( other.memoryUsage ), sharedAllocations( other.sharedAllocations )
+		{
+			credits = other.credits;
+		}
+
+		MurmurHash hash;
+		ConstObjectPtr object;
+		// As returned by `object->memoryUsage()`.
+		size_t memoryUsage;
+		// The portion of `memoryUsage` which may be shared
+		// with other objects.
+		Object::MemoryAccumulator::Allocations sharedAllocations;
+		// Number of times the item will be skipped by
+		// the clock before it is evicted.
+		mutable tbb::atomic<unsigned char> credits;
+	};
+
+	typedef boost::multi_index::multi_index_container<
+		Item,
+		boost::multi_index::indexed_by<
+			// Unlike std::unordered_map, insertion does not
+			// invalidate existing iterators, allowing us to
+			// store popIterator.
+			boost::multi_index::hashed_unique<
+				boost::multi_index::member<Item, MurmurHash, &Item::hash>
+			>
+		>
+	> Map;
+
+	typedef Map::iterator MapIterator;
+
+	struct Bin
 	{
+		Bin() {}
+		Bin( const Bin &other ) : map( other.map ) {}
+		Bin &operator = ( const Bin &other ) { map = other.map; return *this; }
+		Map map;
+		typedef tbb::spin_rw_mutex Mutex;
+		Mutex mutex;
+	};
+
+	typedef std::vector<Bin> Bins;
+
+	// Reference counted record of a buffer shared
+	// between objects in the pool.
+	struct Allocation
+	{
+		Allocation() : bytes( 0 ), holders( 0 ) {}
+		size_t bytes;
+		size_t holders;
+	};
+
+	typedef std::unordered_map<const void *, Allocation> Allocations;
+	typedef tbb::spin_mutex AllocationsMutex;
+
+	typedef tbb::spin_mutex PopMutex;
+
+	MemberData( size_t maxMemory, EvictionPolicy evictionPolicy )
+	{
+		bins.resize( tbb::tbb_thread::hardware_concurrency() );
+		popBinIndex = 0;
+		popIterator = bins[0].map.begin();
+		this->maxMemory = maxMemory;
+		this->evictionPolicy = evictionPolicy;
+		pinnedObjectSize = 1024;
+		memoryUsage = 0;
+		sharedMemoryUsage = 0;
+		objects = 0;
+		hits = 0;
+		misses = 0;
+		evictions = 0;
+	}
+
+	Bin &bin( const MurmurHash &hash )
+	{
+		return bins[boost::hash<MurmurHash>()( hash ) % bins.size()];
+	}
+
+	ConstObjectPtr find( const MurmurHash &hash, bool updateStatistics )
+	{
+		Bin &b = bin( hash );
+		Bin::Mutex::scoped_lock lock( b.mutex, /* write = */ false );
+		MapIterator it = b.map.find( hash );
+		if( it == b.map.end() )
+		{
+			if( updateStatistics )
+			{
+				misses++;
+			}
+			return nullptr;
+		}
+
+		it->credits = credits( evictionPolicy, it->memoryUsage );
+		if( updateStatistics )
+		{
+			hits++;
+		}
+		return it->object;
+	}
+
+	ConstObjectPtr insert( const MurmurHash &hash, const ConstObjectPtr &object )
+	{
+		// Compute the memory usage before taking any locks,
+		// as it may be expensive for large objects.
+		Item item( hash, object, evictionPolicy );
+
+		Bin &b = bin( hash );
+		Bin::Mutex::scoped_lock lock( b.mutex );
+		std::pair<MapIterator, bool> inserted = b.map.insert( item );
+		if( !inserted.second )
+		{
+			// Another thread got there first.
+			return inserted.first->object;
+		}
+
+		// We add the accounting while holding the bin lock, so that
+		// the item can't be evicted before it is accounted for.
+		addAccounting( item );
+		objects++;
+		return object;
 	}
 
-	LRUCache< MurmurHash, ConstObjectPtr > cache;
+	bool erase( const MurmurHash &hash )
+	{
+		PopMutex::scoped_lock popLock( popMutex );
+
+		Bin &b = bin( hash );
+		Bin::Mutex::scoped_lock lock( b.mutex );
+		MapIterator it = b.map.find( hash );
+		if( it == b.map.end() )
+		{
+			return false;
+		}
+
+		removeAccounting( *it );
+		objects--;
+		if( &b == &bins[popBinIndex] && it == popIterator )
+		{
+			popIterator = b.map.erase( it );
+		}
+		else
+		{
+			b.map.erase( it );
+		}
+		return true;
+	}
 
-	/// our getter always returns NULL
-	static ConstObjectPtr getter( const MurmurHash &h, size_t &cost )
+	void clear()
 	{
-		cost = 0;
-		return nullptr;
+		PopMutex::scoped_lock popLock( popMutex );
+
+		for( size_t i = 0; i < bins.size(); ++i )
+		{
+			Bin &b = bins[i];
+			Bin::Mutex::scoped_lock lock( b.mutex );
+			for( MapIterator it = b.map.begin(); it != b.map.end(); ++it )
+			{
+				removeAccounting( *it );
+				objects--;
+			}
+			b.map.clear();
+			if( i == 0 )
+			{
+				popBinIndex = 0;
+				popIterator = b.map.begin();
+			}
+		}
 	}
+
+	// Evicts objects until memory usage is within the limit. Only one
+	// thread needs to be doing this at a time, so we return immediately if
+	// another thread is already limiting memory usage.
+	void limitMemoryUsage()
+	{
+		if( memoryUsage <= maxMemory )
+		{
+			return;
+		}
+
+		PopMutex::scoped_lock popLock;
+		if( !popLock.try_acquire( popMutex ) )
+		{
+			return;
+		}
+
+		const EvictionPolicy policy = evictionPolicy;
+		const size_t pinnedSize = pinnedObjectSize;
+
+		Bin *b = &bins[popBinIndex];
+		Bin::Mutex::scoped_lock binLock( b->mutex );
+
+		size_t visits = 0;
+		while( memoryUsage > maxMemory )
+		{
+			// If we're at the end of this bin, advance to
+			// the next non-empty one.
+			size_t binsVisited = 0;
+			while( popIterator == b->map.end() )
+			{
+				if( ++binsVisited > bins.size() )
+				{
+					// All bins are empty.
+					return;
+				}
+				binLock.release();
+				popBinIndex = ( popBinIndex + 1 ) % bins.size();
+				b = &bins[popBinIndex];
+				binLock.acquire( b->mutex );
+				popIterator = b->map.begin();
+			}
+
+			if( policy == PinSmallObjects && popIterator->memoryUsage <= pinnedSize )
+			{
+				// Pinned - skip.
+			}
+			else if( unsigned char c = popIterator->credits )
+			{
+				// Used since we last visited. Take away a chance,
+				// so we can evict it when we come round again,
+				// unless another thread uses it in the meantime.
+				popIterator->credits = c - 1;
+			}
+			else
+			{
+				removeAccounting( *popIterator );
+				popIterator = b->map.erase( popIterator );
+				objects--;
+				evictions++;
+				visits = 0;
+				continue;
+			}
+
+			++popIterator;
+			if( ++visits > ( g_maxCredits + 1 ) * objects )
+			{
+				// We've been all the way round without being able
+				// to evict anything, so only pinned objects remain.
+				return;
+			}
+		}
+	}
+
+	void addAccounting( const Item &item )
+	{
+		AllocationsMutex::scoped_lock lock( allocationsMutex );
+
+		size_t unsharedMemoryUsage = item.memoryUsage;
+		for( Object::MemoryAccumulator::Allocations::const_iterator it = item.sharedAllocations.begin(), eIt = item.sharedAllocations.end(); it != eIt; ++it )
+		{
+			unsharedMemoryUsage -= it->second;
+			Allocation &allocation = allocations[it->first];
+			allocation.holders++;
+			if( allocation.holders == 1 )
+			{
+				allocation.bytes = it->second;
+				memoryUsage += allocation.bytes;
+			}
+			else if( allocation.holders == 2 )
+			{
+				sharedMemoryUsage += allocation.bytes;
+			}
+		}
+		memoryUsage += unsharedMemoryUsage;
+	}
+
+	void removeAccounting( const Item &item )
+	{
+		AllocationsMutex::scoped_lock lock( allocationsMutex );
+
+		size_t unsharedMemoryUsage = item.memoryUsage;
+		for( Object::MemoryAccumulator::Allocations::const_iterator it = item.sharedAllocations.begin(), eIt = item.sharedAllocations.end(); it != eIt; ++it )
+		{
+			unsharedMemoryUsage -= it->second;
+			Allocations::iterator aIt = allocations.find( it->first );
+			assert( aIt != allocations.end() );
+			aIt->second.holders--;
+			if( aIt->second.holders == 0 )
+			{
+				memoryUsage -= aIt->second.bytes;
+				allocations.erase( aIt );
+			}
+			else if( aIt->second.holders == 1 )
+			{
+				sharedMemoryUsage -= aIt->second.bytes;
+			}
+		}
+		memoryUsage -= unsharedMemoryUsage;
+	}
+
+	Bins bins;
+
+	PopMutex popMutex;
+	size_t popBinIndex;
+	MapIterator popIterator;
+
+	Allocations allocations;
+	AllocationsMutex allocationsMutex;
+
+	tbb::atomic<size_t> maxMemory;
+	tbb::atomic<EvictionPolicy> evictionPolicy;
+	tbb::atomic<size_t> pinnedObjectSize;
+
+	tbb::atomic<size_t> memoryUsage;
+	tbb::atomic<size_t> sharedMemoryUsage;
+	tbb::atomic<size_t> objects;
+	tbb::atomic<size_t> hits;
+	tbb::atomic<size_t> misses;
+	tbb::atomic<size_t> evictions;
+
 };
 
 //////////////////////////////////////////////////////////////////////////
 // ObjectPool
 //////////////////////////////////////////////////////////////////////////
 
-ObjectPool::ObjectPool( size_t maxMemory )
-	:	m_data( new MemberData(maxMemory) )
+ObjectPool::Statistics::Statistics()
+	:	hits( 0 ), misses( 0 ), evictions( 0 ), objects( 0 ), memoryUsage( 0 ), sharedMemoryUsage( 0 )
+{
+}
+
+ObjectPool::ObjectPool( size_t maxMemory, EvictionPolicy evictionPolicy )
+	:	m_data( new MemberData( maxMemory, evictionPolicy ) )
 {
 }
 
@@ -76,15 +440,18 @@ ObjectPool::~ObjectPool()
 
 ConstObjectPtr ObjectPool::retrieve( const MurmurHash &hash ) const
 {
-	return m_data->cache.get(hash);
+	return m_data->find( hash, /* updateStatistics = */ true );
 }
 
 ConstObjectPtr ObjectPool::store( const Object *obj, StoreMode mode )
 {
-	MurmurHash h = obj->hash();
+	return store( obj, obj->hash(), mode );
+}
 
+ConstObjectPtr ObjectPool::store( const Object *obj, const MurmurHash &h, StoreMode mode )
+{
 	// first tries to see if the object is already in the cache and return that one quickly.
-	ConstObjectPtr cachedObj = m_data->cache.get(h);
+	ConstObjectPtr cachedObj = m_data->find( h, /* updateStatistics = */ false );
 	if ( cachedObj )
 	{
 		return cachedObj;
@@ -92,49 +459,92 @@ ConstObjectPtr ObjectPool::store( const Object *obj, StoreMode mode )
 
 	if ( mode == StoreCopy )
 	{
-		cachedObj = obj->copy();
-		m_data->cache.set( h, cachedObj, obj->memoryUsage() );
-		return cachedObj;
+		cachedObj = m_data->insert( h, obj->copy() );
 	}
 	else if ( mode == StoreReference )
 	{
-		m_data->cache.set( h, obj, obj->memoryUsage() );
-		return obj;
+		cachedObj = m_data->insert( h, obj );
 	}
 	else
 	{
 		throw Exception( "Invalid store mode!" );
 	}
+
+	m_data->limitMemoryUsage();
+	return cachedObj;
 }
 
 bool ObjectPool::contains( const MurmurHash &hash ) const
 {
-	return m_data->cache.cached(hash);
+	MemberData::Bin &bin = m_data->bin( hash );
+	MemberData::Bin::Mutex::scoped_lock lock( bin.mutex, /* write = */ false );
+	return bin.map.find( hash ) != bin.map.end();
 }
 
 void ObjectPool::clear()
 {
-	m_data->cache.clear();
+	m_data->clear();
 }
 
 bool ObjectPool::erase( const MurmurHash &hash )
 {
-	return m_data->cache.erase(hash);
+	return m_data->erase( hash );
 }
 
 void ObjectPool::setMaxMemoryUsage( size_t maxMemory )
 {
-	m_data->cache.setMaxCost(maxMemory);
+	m_data->maxMemory = maxMemory;
+	m_data->limitMemoryUsage();
 }
 
 size_t ObjectPool::getMaxMemoryUsage() const
 {
-	return m_data->cache.getMaxCost();
+	return m_data->maxMemory;
 }
 
 size_t ObjectPool::memoryUsage() const
 {
-	return m_data->cache.currentCost();
+	return m_data->memoryUsage;
+}
+
+void ObjectPool::setEvictionPolicy( EvictionPolicy evictionPolicy )
+{
+	m_data->evictionPolicy = evictionPolicy;
+}
+
+ObjectPool::EvictionPolicy ObjectPool::getEvictionPolicy() const
+{
+	return m_data->evictionPolicy;
+}
+
+void ObjectPool::setPinnedObjectSize( size_t pinnedObjectSize )
+{
+	m_data->pinnedObjectSize = pinnedObjectSize;
+	m_data->limitMemoryUsage();
+}
+
+size_t ObjectPool::getPinnedObjectSize() const
+{
+	return m_data->pinnedObjectSize;
+}
+
+ObjectPool::Statistics ObjectPool::statistics() const
+{
+	Statistics result;
+	result.hits = m_data->hits;
+	result.misses = m_data->misses;
+	result.evictions = m_data->evictions;
+	result.objects = m_data->objects;
+	result.memoryUsage = m_data->memoryUsage;
+	result.sharedMemoryUsage = m_data->sharedMemoryUsage;
+	return result;
+}
+
+void ObjectPool::resetStatistics()
+{
+	m_data->hits = 0;
+	m_data->misses = 0;
+	m_data->evictions = 0;
 }
 
 ObjectPool *ObjectPool::defaultObjectPool()
@@ -152,4 +562,3 @@ ObjectPool *ObjectPool::defaultObjectPool()
 /// make sure the default pool is created at load time and avoid
 /// running conditions on multi-threaded environments.
 static ObjectPoolPtr initializer = ObjectPool::defaultObjectPool();
-
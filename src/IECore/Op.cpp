@@ -67,6 +67,16 @@ ObjectPtr Op::operate( const CompoundObject *operands )
 	return result;
 }
 
+bool Op::threadSafe() const
+{
+	return false;
+}
+
+ObjectPtr Op::operateConcurrently( const CompoundObject *operands )
+{
+	return doOperation( operands );
+}
+
 const Parameter * Op::resultParameter() const
 {
 	return m_resultParameter.get();
@@ -53,16 +53,6 @@ inline PathMatcher::Name::Name( IECore::InternedString name )
 {
 }
 
-inline PathMatcher::Name::Name( IECore::InternedString name, Type type )
-	: name( name ), type( type )
-{
-}
-
-inline bool PathMatcher::Name::operator < ( const Name &other ) const
-{
-	return type < other.type || ( ( type == other.type ) && name < other.name );
-}
-
 //////////////////////////////////////////////////////////////////////////
 // Node implementation
 //////////////////////////////////////////////////////////////////////////
@@ -34,6 +34,7 @@
 
 #include "IECore/PathMatcherData.h"
 
+#include "IECore/FlatPathMatcher.h"
 #include "IECore/MessageHandler.h"
 #include "IECore/TypedData.inl"
 
@@ -101,15 +102,9 @@ void PathMatcherData::save( SaveContext *context ) const
 	std::vector<unsigned int> pathLengths;
 	std::vector<unsigned char> exactMatches;
 
-	for( PathMatcher::RawIterator it = readable().begin(), eIt = readable().end(); it != eIt; ++it )
-	{
-		pathLengths.push_back( it->size() );
-		if( it->size() )
-		{
-			strings.push_back( it->back() );
-		}
-		exactMatches.push_back( it.exactMatch() );
-	}
+	// We save via FlatPathMatcher because it visits siblings in a consistent
+	// order, which allows load() to build the tree without re-sorting.
+	FlatPathMatcher( readable() ).depthFirst( strings, pathLengths, exactMatches );
 
 	container->write( "strings", strings.data(), strings.size() );
 	container->write( "pathLengths", pathLengths.data(), pathLengths.size() );
@@ -141,19 +136,7 @@ void PathMatcherData::load( LoadContextPtr context )
 	unsigned char *exactMatchesPtr = exactMatches.data();
 	container->read( "exactMatches", exactMatchesPtr, exactMatchesEntry.arrayLength() );
 
-	std::vector<InternedString> path;
-	for( size_t i = 0, e = pathLengths.size(); i < e; ++i )
-	{
-		path.resize( pathLengths[i] );
-		if( pathLengths[i] )
-		{
-			path.back() = *stringsPtr++;
-		}
-		if( exactMatches[i] )
-		{
-			writable().addPath( path );
-		}
-	}
+	writable() = FlatPathMatcher( strings, pathLengths, exactMatches ).pathMatcher();
 }
 
 // Our hash is complicated by the fact that PathMatcher::Iterator doesn't
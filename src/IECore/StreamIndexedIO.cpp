@@ -45,7 +45,10 @@
 
 #include "blosc.h"
 
+#include "tbb/blocked_range.h"
+#include "tbb/parallel_for.h"
 #include "tbb/spin_rw_mutex.h"
+#include "tbb/task_group.h"
 
 #include "boost/format.hpp"
 #include "boost/iostreams/device/file.hpp"
@@ -57,14 +60,21 @@
 #include "boost/tokenizer.hpp"
 
 #include <algorithm>
+#include <atomic>
 #include <cassert>
+#include <cstring>
+#include <deque>
+#include <exception>
 #include <iostream>
 #include <list>
 #include <map>
+#include <memory>
 #include <set>
 
 #include <fcntl.h>
 #ifndef _MSC_VER
+	#include <sys/mman.h>
+	#include <sys/stat.h>
 	#include <unistd.h>
 #endif
 #include <stdint.h>
@@ -162,7 +172,13 @@ class StreamIndexedIO::PlatformReader
 	public:
 		virtual ~PlatformReader();
 		virtual bool read( char *buffer, size_t size, size_t pos ) = 0;
-		static std::unique_ptr<PlatformReader> create( const std::string &fileName );
+		/// Returns a pointer to the requested bytes if they can be
+		/// accessed without copying, or nullptr otherwise.
+		virtual const char *data( size_t size, size_t pos ) const;
+		/// Hints that the requested bytes will be read soon.
+		/// The default implementation does nothing.
+		virtual void prefetch( size_t size, size_t pos ) const;
+		static std::unique_ptr<PlatformReader> create( const std::string &fileName, bool memoryMapped = false );
 };
 
 #ifndef _MSC_VER
@@ -174,6 +190,7 @@ class PosixPlatformReader : public StreamIndexedIO::PlatformReader
 		~PosixPlatformReader();
 		PosixPlatformReader( const std::string &fileName );
 		bool read( char *buffer, size_t size, size_t pos ) override;
+		void prefetch( size_t size, size_t pos ) const override;
 	private:
 		int m_fileHandle;
 };
@@ -200,15 +217,129 @@ bool PosixPlatformReader::read( char *buffer, size_t size, size_t pos )
 	return (size_t) result == size;
 }
 
+void PosixPlatformReader::prefetch( size_t size, size_t pos ) const
+{
+#ifdef POSIX_FADV_WILLNEED
+	posix_fadvise( m_fileHandle, pos, size, POSIX_FADV_WILLNEED );
+#endif
+}
+
+/// Posix Reader which maps the whole file into memory. The mapping is
+/// shared, so the page cache is shared between all the processes reading
+/// the same file, and data can be accessed without any copying.
+class MemoryMappedPlatformReader : public StreamIndexedIO::PlatformReader
+{
+	public:
+		~MemoryMappedPlatformReader();
+		MemoryMappedPlatformReader( const std::string &fileName );
+		/// Returns false if the file could not be mapped.
+		bool valid() const;
+		bool read( char *buffer, size_t size, size_t pos ) override;
+		const char *data( size_t size, size_t pos ) const override;
+		void prefetch( size_t size, size_t pos ) const override;
+	private:
+		const char *m_data;
+		size_t m_size;
+};
+
+MemoryMappedPlatformReader::MemoryMappedPlatformReader( const std::string &fileName ) : m_data( nullptr ), m_size( 0 )
+{
+	int fileHandle = ::open( fileName.c_str(), O_RDONLY );
+	if( fileHandle < 0 )
+	{
+		return;
+	}
+
+	struct stat fileStat;
+	if( fstat( fileHandle, &fileStat ) == 0 && fileStat.st_size > 0 )
+	{
+		void *data = mmap( nullptr, fileStat.st_size, PROT_READ, MAP_SHARED, fileHandle, 0 );
+		if( data != MAP_FAILED )
+		{
+			m_data = static_cast<const char *>( data );
+			m_size = fileStat.st_size;
+		}
+	}
+
+	// the mapping keeps its own reference to the file
+	::close( fileHandle );
+}
+
+MemoryMappedPlatformReader::~MemoryMappedPlatformReader()
+{
+	if( m_data )
+	{
+		munmap( const_cast<char *>( m_data ), m_size );
+	}
+}
+
+bool MemoryMappedPlatformReader::valid() const
+{
+	return m_data != nullptr;
+}
+
+bool MemoryMappedPlatformReader::read( char *buffer, size_t size, size_t pos )
+{
+	const char *src = data( size, pos );
+	if( !src )
+	{
+		return false;
+	}
+
+	memcpy( buffer, src, size );
+	return true;
+}
+
+const char *MemoryMappedPlatformReader::data( size_t size, size_t pos ) const
+{
+	if( !m_data || pos > m_size || size > m_size - pos )
+	{
+		return nullptr;
+	}
+
+	return m_data + pos;
+}
+
+void MemoryMappedPlatformReader::prefetch( size_t size, size_t pos ) const
+{
+	if( !data( size, pos ) )
+	{
+		return;
+	}
+
+	// madvise requires a page aligned address
+	static const size_t pageSize = sysconf( _SC_PAGESIZE );
+	const size_t alignedPos = pos - pos % pageSize;
+	posix_madvise( const_cast<char *>( m_data ) + alignedPos, size + pos - alignedPos, POSIX_MADV_WILLNEED );
+}
+
 #endif
 
 StreamIndexedIO::PlatformReader::~PlatformReader()
 {
 }
 
-std::unique_ptr<StreamIndexedIO::PlatformReader> StreamIndexedIO::PlatformReader::create(const std::string& fileName)
+const char *StreamIndexedIO::PlatformReader::data( size_t size, size_t pos ) const
+{
+	return nullptr;
+}
+
+void StreamIndexedIO::PlatformReader::prefetch( size_t size, size_t pos ) const
+{
+}
+
+std::unique_ptr<StreamIndexedIO::PlatformReader> StreamIndexedIO::PlatformReader::create( const std::string& fileName, bool memoryMapped )
 {
 #ifndef _MSC_VER
+	if( memoryMapped )
+	{
+		std::unique_ptr<MemoryMappedPlatformReader> m( new MemoryMappedPlatformReader( fileName ) );
+		if( m->valid() )
+		{
+			return std::move( m );
+		}
+	}
+
 	PlatformReader* p = new PosixPlatformReader(fileName);
 	return std::unique_ptr<StreamIndexedIO::PlatformReader>(p);
 #else
@@ -375,6 +506,14 @@ namespace
 const char* indexCompressor = "lz4";
 const int indexCompressionLevel = 9;
 
+// Blocks smaller than this are compressed on the calling thread even
+// when asynchronous compression is enabled, as the task overhead would
+// outweigh the gain.
+const size_t minAsyncCompressionSize = 16 * 1024;
+// Upper limit on the amount of uncompressed data held by pending
+// asynchronous writes, after which the writer waits for them to complete.
+const size_t maxPendingCompressionSize = 256 * 1024 * 1024;
+
 const static std::map<std::string, int> nameCodeMapping = {{"blosclz", 0}, {"lz4", 1}, {"lz4hc", 2}, {"snappy", 3}, {"zlib", 4}};
 
 //! map blosc compressor name to a int which we can serialise into
@@ -700,6 +839,15 @@ class DataNode : public NodeBase
 			return m_numCompressedBlocks;
 		}
 
+		/// Used to fill in the location of data which was compressed
+		/// asynchronously, once it has been written to the file.
+		void setLocation( Imf::Int64 offset, Imf::Int64 size, unsigned short numCompressedBlocks )
+		{
+			m_offset = offset;
+			m_size = size;
+			m_numCompressedBlocks = numCompressedBlocks;
+		}
+
 		void copyFrom( DataNode *other )
 		{
 			m_dataType = other->m_dataType;
@@ -910,8 +1058,21 @@ class StreamIndexedIO::Node
 			size_t numCompressedBlocks
 		);
 
+		/// Writes the data to the file, compressing as required, and adds a
+		/// Data node referencing it.
+		void writeDataChild(
+			const IndexedIO::EntryID &childName,
+			IndexedIO::DataType dataType,
+			size_t arrayLen,
+			const char *data,
+			size_t size
+		);
+
 		void removeChild( const IndexedIO::EntryID &childName, bool throwException = true );
 
+		/// Prefetches the data for the named child, recursing into directories.
+		void prefetchChild( const IndexedIO::EntryID &childName ) const;
+
 		StreamIndexedIO::IndexPtr m_idx;
 		DirectoryNode *m_node;
 };
@@ -923,48 +1084,79 @@ class StreamIndexedIO::Reader
 	public:
 
 		//! If an outputBuffer is supplied then it has to be large enough to store info.decompressedSize bytes of data
-		//! and if one isn't supplied then a suitably sized buffer is created and freed on destruction.
+		//! and if one isn't supplied then a suitably sized buffer is created and freed on destruction. If the file is
+		//! memory mapped and no outputBuffer is supplied, uncompressed data is accessed directly from the mapping.
 		Reader( StreamIndexedIO::StreamFile &f, const Node::Info &info, int threadCount = 1, char *outputBuffer = nullptr )
 			: m_data( nullptr ),
 			m_decompressedData( outputBuffer ),
+			m_mappedData( f.mappedData( info.size, info.offset ) ),
 			m_size( info.size ),
 			m_decompressedSize( info.decompressedSize ),
 			m_ownDecompressedData( outputBuffer == nullptr )
 		{
-			if( m_ownDecompressedData )
-			{
-				m_decompressedData = new char[m_decompressedSize];
-			}
-
 			if( info.numCompressedBlocks > 0 )
 			{
-				m_data = new char[info.size];
-				f.read( m_data, info.size, info.offset );
+				if( m_ownDecompressedData )
+				{
+					m_decompressedData = new char[m_decompressedSize];
+				}
+
+				const char* readPtr = m_mappedData;
+				if( !readPtr )
+				{
+					m_data = new char[info.size];
+					f.read( m_data, info.size, info.offset );
+					readPtr = m_data;
+				}
 
-				const char* readPtr = m_data;
 				char* writePtr = m_decompressedData;
 
-				size_t writeBufferSize = m_decompressedSize;
+				/// read the blosc header of each block up front, so we can
+				/// decompress the blocks in parallel
+				std::vector<Block> blocks;
+				blocks.reserve( info.numCompressedBlocks );
 				for ( size_t block = 0; block < info.numCompressedBlocks; ++block )
 				{
-					/// read the blosc header so we can decompress this block
 					size_t compresedNumBytes = 0, decompressedNumBytes = 0, blockSize = 0;
 					blosc_cbuffer_sizes( readPtr, &decompressedNumBytes , &compresedNumBytes, &blockSize );
 
-					int bloscResult = blosc_decompress_ctx( readPtr, writePtr, decompressedNumBytes, threadCount );
-
-					if( bloscResult <= 0 )
-					{
-						throw IECore::IOException( "StreamIndexedIO::Reader - Corrupted compressed archive" );
-					}
+					blocks.push_back( { readPtr, writePtr, decompressedNumBytes } );
 
 					readPtr += compresedNumBytes;
 					writePtr += decompressedNumBytes;
-					writeBufferSize -= decompressedNumBytes;
+				}
+
+				const tbb::blocked_range<size_t> range( 0, blocks.size() );
+				if( blocks.size() > 1 )
+				{
+					tbb::task_group_context taskGroupContext( tbb::task_group_context::isolated );
+					tbb::parallel_for(
+						range,
+						[&blocks, threadCount]( const tbb::blocked_range<size_t> &r )
+						{
+							decompressBlocks( blocks, r, threadCount );
+						},
+						taskGroupContext
+					);
+				}
+				else
+				{
+					decompressBlocks( blocks, range, threadCount );
+				}
+			}
+			else if( m_mappedData )
+			{
+				if( !m_ownDecompressedData )
+				{
+					memcpy( m_decompressedData, m_mappedData, info.size );
 				}
 			}
 			else
 			{
+				if( m_ownDecompressedData )
+				{
+					m_decompressedData = new char[m_decompressedSize];
+				}
 				f.read( m_decompressedData, info.size, info.offset );
 			}
 		}
@@ -982,12 +1174,16 @@ class StreamIndexedIO::Reader
 			}
 		}
 
-		char *data() const
+		const char *data() const
 		{
 			if( m_decompressedData )
 			{
 				return m_decompressedData;
 			}
+			else if( m_mappedData )
+			{
+				return m_mappedData;
+			}
 			else
 			{
 				return m_data;
@@ -1000,8 +1196,31 @@ class StreamIndexedIO::Reader
 		}
 
 	private:
+
+		struct Block
+		{
+			const char *compressedData;
+			char *decompressedData;
+			size_t decompressedSize;
+		};
+
+		static void decompressBlocks( const std::vector<Block> &blocks, const tbb::blocked_range<size_t> &range, int threadCount )
+		{
+			for( size_t i = range.begin(); i != range.end(); ++i )
+			{
+				const Block &block = blocks[i];
+				int bloscResult = blosc_decompress_ctx( block.compressedData, block.decompressedData, block.decompressedSize, threadCount );
+
+				if( bloscResult <= 0 )
+				{
+					throw IECore::IOException( "StreamIndexedIO::Reader - Corrupted compressed archive" );
+				}
+			}
+		}
+
 		char *m_data;
 		char *m_decompressedData;
+		const char *m_mappedData;
 		Imf::Int64 m_size;
 		Imf::Int64 m_decompressedSize;
 		bool m_ownDecompressedData;
@@ -1059,6 +1278,18 @@ class StreamIndexedIO::Index : public RefCounted
 
 		WriteInfo writeUniqueDataCompressed( const char *data, size_t size, bool prefixSize = false );
 
+		/// Returns true if a block of the given size should be written with
+		/// `writeDataAsync()` rather than `writeUniqueDataCompressed()`.
+		bool compressesAsync( size_t size ) const;
+		/// Copies the data and compresses it on a background task. The node's
+		/// location is filled in once the compressed data has been appended to
+		/// the file, which always happens in submission order and on the calling
+		/// thread.
+		void writeDataAsync( DataNode *node, const char *data, size_t size );
+		/// Waits for all outstanding asynchronous writes and appends them to the file.
+		/// Must be called before node locations are read or serialised.
+		void waitForPendingWrites();
+
 		/// flushes the children of the given directory node to a subindex in the file
 		void commitNodeToSubIndex( DirectoryNode *n );
 
@@ -1129,6 +1360,28 @@ class StreamIndexedIO::Index : public RefCounted
 		boost::optional<size_t> m_maxCompressedBlockSize;
 		std::string m_compressor;
 
+		struct PendingWrite
+		{
+			PendingWrite( DataNode *node, const char *data, size_t size )
+				:	node( node ), data( data, data + size ), numCompressedBlocks( 0 ), done( false )
+			{
+			}
+
+			DataNode *node;
+			std::vector<char> data;
+			std::vector<char> compressedData;
+			size_t numCompressedBlocks;
+			std::exception_ptr exception;
+			std::atomic<bool> done;
+		};
+
+		void appendPendingWrite( PendingWrite &pendingWrite );
+
+		bool m_asyncCompression;
+		tbb::task_group m_compressionTasks;
+		std::deque<std::unique_ptr<PendingWrite>> m_pendingWrites;
+		size_t m_pendingWriteSize;
+
 		struct FreePage
 		{
 			FreePage( Imf::Int64 offset, Imf::Int64 sz ) : m_offset(offset), m_size(sz) {}
@@ -1376,6 +1629,8 @@ DirectoryNode* StreamIndexedIO::Node::directoryChild( const IndexedIO::EntryID &
 
 bool StreamIndexedIO::Node::dataChildInfo( const IndexedIO::EntryID &name, Info &info ) const
 {
+	m_idx->waitForPendingWrites();
+
 	Index::MutexLock lock;
 	m_idx->lockDirectory( lock, m_node );
 
@@ -1486,6 +1741,67 @@ void StreamIndexedIO::Node::addDataChild(
 	m_idx->m_hasChanged = true;
 }
 
+void StreamIndexedIO::Node::writeDataChild(
+	const IndexedIO::EntryID &childName,
+	IndexedIO::DataType dataType,
+	size_t arrayLen,
+	const char *data,
+	size_t size
+)
+{
+	if( !m_idx->compressesAsync( size ) )
+	{
+		Index::WriteInfo info = m_idx->writeUniqueDataCompressed( data, size );
+		addDataChild( childName, dataType, arrayLen, info.offset, info.size, size, info.numCompressedBlocks );
+		return;
+	}
+
+	if ( m_node->subindex() )
+	{
+		throw Exception( "Cannot modify the file at current location! It was already committed to the file." );
+	}
+
+	if ( hasChild(childName) )
+	{
+		throw IOException( "StreamIndexedIO: Could not insert node '" + childName.value() + "' into index" );
+	}
+
+	m_idx->m_stringCache.add( childName );
+
+	// We don't know the final location or compressed size yet, so we always
+	// use a DataNode and let the Index fill in the details when it appends
+	// the compressed data to the file.
+	DataNode *child = new DataNode( childName, dataType, arrayLen, size, 0, size, 0 );
+	m_node->registerChild( child );
+	m_idx->m_hasChanged = true;
+
+	m_idx->writeDataAsync( child, data, size );
+}
+
+void StreamIndexedIO::Node::prefetchChild( const IndexedIO::EntryID &childName ) const
+{
+	Info info;
+	if( dataChildInfo( childName, info ) )
+	{
+		m_idx->streamFile().prefetch( info.size, info.offset );
+		return;
+	}
+
+	DirectoryNode *childDirectory = directoryChild( childName );
+	if( !childDirectory )
+	{
+		return;
+	}
+
+	Node childNode( m_idx.get(), childDirectory );
+	IndexedIO::EntryIDList grandChildNames;
+	childNode.childNames( grandChildNames );
+	for( const auto &grandChildName : grandChildNames )
+	{
+		childNode.prefetchChild( grandChildName );
+	}
+}
+
 const IndexedIO::EntryID &StreamIndexedIO::Node::name() const
 {
 	return m_node->name();
@@ -1565,7 +1881,8 @@ StreamIndexedIO::Index::Index( StreamIndexedIO::StreamFilePtr stream, const Comp
 	m_next( 0 ),
 	m_stream( stream ), m_compressionLevel( 0 ),
 	m_compressionThreadCount(1),
-	m_decompressionThreadCount(1), m_compressor( "lz4" )
+	m_decompressionThreadCount(1), m_compressor( "lz4" ),
+	m_asyncCompression( false ), m_pendingWriteSize( 0 )
 
 {
 	m_stringCache.add(IndexedIO::rootName);
@@ -1606,6 +1923,11 @@ StreamIndexedIO::Index::Index( StreamIndexedIO::StreamFilePtr stream, const Comp
 		{
 			m_maxCompressedBlockSize = maxCompressedBlockSize->readable();
 		}
+
+		if ( const BoolData* asyncCompression = options->member<BoolData>("asyncCompression", false) )
+		{
+			m_asyncCompression = asyncCompression->readable();
+		}
 	}
 
 	// validate our parameters
@@ -1644,6 +1966,8 @@ StreamIndexedIO::Index::~Index()
 
 void StreamIndexedIO::Index::flush()
 {
+	waitForPendingWrites();
+
 	if ( m_hasChanged )
 	{
 		Imf::Int64 end = write();
@@ -1708,13 +2032,19 @@ void StreamIndexedIO::Index::openStream()
 
 			if( m_version >= 7 )
 			{
-				// read the compressed Index
+				// read the compressed Index, directly from the file mapping if available
 				Imf::Int64 indexCompressedSize = end - m_offset;
-				std::vector<char> compressedIndex( indexCompressedSize );
-				f.read( &compressedIndex[0], indexCompressedSize );
+				std::vector<char> compressedIndex;
+				const char *compressedIndexData = f.mappedData( indexCompressedSize, m_offset );
+				if( !compressedIndexData )
+				{
+					compressedIndex.resize( indexCompressedSize );
+					f.read( &compressedIndex[0], indexCompressedSize );
+					compressedIndexData = &compressedIndex[0];
+				}
 
 				std::vector<char> decompressedIndex;
-				decompress( &compressedIndex[0], indexCompressedSize, decompressedIndex, 1 );
+				decompress( compressedIndexData, indexCompressedSize, decompressedIndex, 1 );
 
 				MemoryStreamSource source( &decompressedIndex[0], decompressedIndex.size(), false );
 				indexInStream.push( source );
@@ -2580,6 +2910,95 @@ StreamIndexedIO::Index::WriteInfo StreamIndexedIO::Index::writeUniqueDataCompres
 	return writeInfo;
 }
 
+bool StreamIndexedIO::Index::compressesAsync( size_t size ) const
+{
+	return m_asyncCompression && m_compressionLevel && size >= minAsyncCompressionSize;
+}
+
+void StreamIndexedIO::Index::writeDataAsync( DataNode *node, const char *data, size_t size )
+{
+	m_pendingWrites.push_back( std::unique_ptr<PendingWrite>( new PendingWrite( node, data, size ) ) );
+	m_pendingWriteSize += size;
+
+	// Each task compresses a whole block single threaded - parallelism
+	// comes from compressing many blocks at once.
+	PendingWrite *pendingWrite = m_pendingWrites.back().get();
+	m_compressionTasks.run(
+		[this, pendingWrite] {
+			try
+			{
+				pendingWrite->numCompressedBlocks = compress(
+					pendingWrite->data.data(), pendingWrite->data.size(), pendingWrite->compressedData,
+					m_compressionLevel, m_compressor, 1, m_maxCompressedBlockSize
+				);
+			}
+			catch( ... )
+			{
+				pendingWrite->exception = std::current_exception();
+			}
+			pendingWrite->done = true;
+		}
+	);
+
+	if( m_pendingWriteSize > maxPendingCompressionSize )
+	{
+		waitForPendingWrites();
+		return;
+	}
+
+	// Append whatever has already been compressed, without
+	// waiting and without reordering.
+	while( !m_pendingWrites.empty() && m_pendingWrites.front()->done )
+	{
+		std::unique_ptr<PendingWrite> front = std::move( m_pendingWrites.front() );
+		m_pendingWrites.pop_front();
+		appendPendingWrite( *front );
+	}
+}
+
+void StreamIndexedIO::Index::waitForPendingWrites()
+{
+	if( m_pendingWrites.empty() )
+	{
+		return;
+	}
+
+	m_compressionTasks.wait();
+
+	while( !m_pendingWrites.empty() )
+	{
+		std::unique_ptr<PendingWrite> front = std::move( m_pendingWrites.front() );
+		m_pendingWrites.pop_front();
+		appendPendingWrite( *front );
+	}
+}
+
+void StreamIndexedIO::Index::appendPendingWrite( PendingWrite &pendingWrite )
+{
+	m_pendingWriteSize -= pendingWrite.data.size();
+
+	if( pendingWrite.exception )
+	{
+		std::rethrow_exception( pendingWrite.exception );
+	}
+
+	//! as in writeUniqueDataCompressed(), we fall back to the uncompressed
+	//! data if compression fails or doesn't make it any smaller.
+	if(
+		pendingWrite.numCompressedBlocks && pendingWrite.numCompressedBlocks <= std::numeric_limits<unsigned short>::max() &&
+		!pendingWrite.compressedData.empty() && ( pendingWrite.compressedData.size() < pendingWrite.data.size() )
+	)
+	{
+		Imf::Int64 offset = writeUniqueData( pendingWrite.compressedData.data(), pendingWrite.compressedData.size() );
+		pendingWrite.node->setLocation( offset, pendingWrite.compressedData.size(), pendingWrite.numCompressedBlocks );
+	}
+	else
+	{
+		Imf::Int64 offset = writeUniqueData( pendingWrite.data.data(), pendingWrite.data.size() );
+		pendingWrite.node->setLocation( offset, pendingWrite.data.size(), 0 );
+	}
+}
+
 void StreamIndexedIO::Index::deallocateWalk( NodeBase* n )
 {
 	assert(n);
@@ -2613,6 +3032,8 @@ void StreamIndexedIO::Index::commitNodeToSubIndex( DirectoryNode *n )
 		return;
 	}
 
+	waitForPendingWrites();
+
 	if ( n->subindex() == DirectoryNode::NoSubIndex )
 	{
 		MemoryStreamSink sink;
@@ -2656,8 +3077,13 @@ void StreamIndexedIO::Index::readNodeFromSubIndex( DirectoryNode *n )
 	uint32_t subindexSize = 0;
 	readLittleEndian( *m_stream, subindexSize );
 
-	char *data = m_stream->ioBuffer(subindexSize);
-	m_stream->read( data, subindexSize );
+	const char *data = m_stream->mappedData( subindexSize, n->offset() + sizeof( uint32_t ) );
+	if( !data )
+	{
+		char *buffer = m_stream->ioBuffer(subindexSize);
+		m_stream->read( buffer, subindexSize );
+		data = buffer;
+	}
 
 	io::filtering_istream indexInStream;
 
@@ -2682,7 +3108,7 @@ void StreamIndexedIO::Index::readNodeFromSubIndex( DirectoryNode *n )
 	}
 	else
 	{
-		MemoryStreamSource source( data, subindexSize, false );
+		MemoryStreamSource source( const_cast<char *>( data ), subindexSize, false );
 
 		indexInStream.push( io::gzip_decompressor() );
 		indexInStream.push( source );
@@ -2752,7 +3178,7 @@ IndexedIO::OpenMode StreamIndexedIO::StreamFile::openMode() const
 	return m_openmode;
 }
 
-void StreamIndexedIO::StreamFile::setInput( std::iostream *stream, bool emptyFile, const std::string& fileName )
+void StreamIndexedIO::StreamFile::setInput( std::iostream *stream, bool emptyFile, const std::string& fileName, bool memoryMapped )
 {
 	m_stream = stream;
 	if ( m_openmode & IndexedIO::Append && emptyFile )
@@ -2762,7 +3188,21 @@ void StreamIndexedIO::StreamFile::setInput( std::iostream *stream, bool emptyFil
 
 	if ( fileName != "" && getenv("IECORE_OFFSETREAD_DISABLED") == nullptr )
 	{
-		m_platformReader = PlatformReader::create( fileName );
+		// files opened for Append may grow, so we only ever map files opened for Read
+		m_platformReader = PlatformReader::create( fileName, memoryMapped && ( m_openmode & IndexedIO::Read ) );
+	}
+}
+
+const char *StreamIndexedIO::StreamFile::mappedData( size_t size, size_t pos ) const
+{
+	return m_platformReader ? m_platformReader->data( size, pos ) : nullptr;
+}
+
+void StreamIndexedIO::StreamFile::prefetch( size_t size, size_t pos ) const
+{
+	if( m_platformReader )
+	{
+		m_platformReader->prefetch( size, pos );
 	}
 }
 
@@ -3199,6 +3639,16 @@ void StreamIndexedIO::commit()
 	m_node->m_idx->commitNodeToSubIndex( m_node->m_node );
 }
 
+void StreamIndexedIO::prefetch( const IndexedIO::EntryIDList &names ) const
+{
+	assert( m_node );
+
+	for( const auto &name : names )
+	{
+		m_node->prefetchChild( name );
+	}
+}
+
 void StreamIndexedIO::write(const IndexedIO::EntryID &name, const InternedString *x, unsigned long arrayLength)
 {
 	writable(name);
@@ -3223,8 +3673,7 @@ void StreamIndexedIO::write(const IndexedIO::EntryID &name, const InternedString
 
 	IndexedIO::DataFlattenTraits<Imf::Int64*>::flatten(constIds, arrayLength, data);
 
-	Index::WriteInfo info = index->writeUniqueDataCompressed( data, size );
-	m_node->addDataChild( name, dataType, arrayLength, info.offset, info.size, size, info.numCompressedBlocks );
+	m_node->writeDataChild( name, dataType, arrayLength, data, size );
 
 	delete [] ids;
 }
@@ -3284,8 +3733,7 @@ void StreamIndexedIO::write(const IndexedIO::EntryID &name, const T *x, unsigned
 	assert(data);
 	IndexedIO::DataFlattenTraits<T*>::flatten(x, arrayLength, data);
 
-	Index::WriteInfo info = m_node->m_idx->writeUniqueDataCompressed( data, size );
-	m_node->addDataChild( name, dataType, arrayLength, info.offset, info.size, size, info.numCompressedBlocks );
+	m_node->writeDataChild( name, dataType, arrayLength, data, size );
 }
 
 template<typename T>
@@ -3297,8 +3745,7 @@ void StreamIndexedIO::rawWrite(const IndexedIO::EntryID &name, const T *x, unsig
 	unsigned long size = IndexedIO::DataSizeTraits<T*>::size(x, arrayLength);
 	IndexedIO::DataType dataType = IndexedIO::DataTypeTraits<T*>::type();
 
-	Index::WriteInfo info = m_node->m_idx->writeUniqueDataCompressed( (char *) x, size );
-	m_node->addDataChild( name, dataType, arrayLength, info.offset, info.size, size, info.numCompressedBlocks );
+	m_node->writeDataChild( name, dataType, arrayLength, (const char *) x, size );
 }
 
 template<typename T>
@@ -3314,8 +3761,7 @@ void StreamIndexedIO::write(const IndexedIO::EntryID &name, const T &x)
 	assert(data);
 	IndexedIO::DataFlattenTraits<T>::flatten(x, data);
 
-	Index::WriteInfo info = m_node->m_idx->writeUniqueDataCompressed( data, size );
-	m_node->addDataChild( name, dataType, 0, info.offset, info.size, size, info.numCompressedBlocks );
+	m_node->writeDataChild( name, dataType, 0, data, size );
 }
 
 template<typename T>
@@ -3327,8 +3773,7 @@ void StreamIndexedIO::rawWrite(const IndexedIO::EntryID &name, const T &x)
 	unsigned long size = IndexedIO::DataSizeTraits<T>::size(x);
 	IndexedIO::DataType dataType = IndexedIO::DataTypeTraits<T>::type();
 
-	Index::WriteInfo info = m_node->m_idx->writeUniqueDataCompressed( (char *) &x, size );
-	m_node->addDataChild( name, dataType, 0, info.offset, info.size, size, info.numCompressedBlocks );
+	m_node->writeDataChild( name, dataType, 0, (const char *) &x, size );
 }
 
 template<typename T>
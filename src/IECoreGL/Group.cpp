@@ -36,6 +36,7 @@
 
 #include "IECoreGL/GL.h"
 #include "IECoreGL/State.h"
+#include "IECoreGL/TypedStateComponent.h"
 
 #include "OpenEXR/ImathBoxAlgo.h"
 
@@ -46,22 +47,31 @@ using namespace std;
 IE_CORE_DEFINERUNTIMETYPED( Group );
 
 Group::Group()
-	:	m_state( new State( false ) ), m_transform( M44f() )
+	:	m_state( new State( false ) ), m_transform( M44f() ), m_childBoundDirty( true )
 {
 }
 
 Group::Group( const Group &other )
-	:	m_state( new State( *(other.m_state) ) ), m_transform( other.m_transform ), m_children( other.m_children )
+	:	m_state( new State( *(other.m_state) ) ), m_transform( other.m_transform ), m_children( other.m_children ), m_childBoundDirty( true )
 {
+	for( ChildContainer::const_iterator it=m_children.begin(); it!=m_children.end(); it++ )
+	{
+		(*it)->addParent( this );
+	}
 }
 
 Group::~Group()
 {
+	for( ChildContainer::const_iterator it=m_children.begin(); it!=m_children.end(); it++ )
+	{
+		(*it)->removeParent( this );
+	}
 }
 
 void Group::setTransform( const Imath::M44f &matrix )
 {
 	m_transform = matrix;
+	boundChanged();
 }
 
 const Imath::M44f &Group::getTransform() const
@@ -85,6 +95,11 @@ void Group::setState( StatePtr state )
 }
 
 void Group::render( State *currentState ) const
+{
+	render( currentState, nullptr );
+}
+
+void Group::render( State *currentState, const Imath::M44f *parentToClip ) const
 {
 	const bool haveTransform = m_transform != M44f();
 	if( haveTransform )
@@ -109,9 +124,45 @@ void Group::render( State *currentState ) const
 
 	{
 		State::ScopedBinding scope( *m_state, *currentState );
-		for( ChildContainer::const_iterator it=m_children.begin(); it!=m_children.end(); it++ )
+		if( currentState->get<FrustumCullingStateComponent>()->value() )
 		{
-			(*it)->render( currentState );
+			M44f toClip;
+			if( parentToClip )
+			{
+				toClip = m_transform * *parentToClip;
+			}
+			else
+			{
+				// We're the first group with culling enabled, so
+				// must fetch the frustum from GL. The current
+				// modelview matrix already includes m_transform.
+				M44f modelView, projection;
+				glGetFloatv( GL_MODELVIEW_MATRIX, modelView.getValue() );
+				glGetFloatv( GL_PROJECTION_MATRIX, projection.getValue() );
+				toClip = modelView * projection;
+			}
+
+			if( !culled( toClip ) )
+			{
+				for( ChildContainer::const_iterator it=m_children.begin(); it!=m_children.end(); it++ )
+				{
+					if( const Group *group = IECore::runTimeCast<const Group>( it->get() ) )
+					{
+						group->render( currentState, &toClip );
+					}
+					else
+					{
+						(*it)->render( currentState );
+					}
+				}
+			}
+		}
+		else
+		{
+			for( ChildContainer::const_iterator it=m_children.begin(); it!=m_children.end(); it++ )
+			{
+				(*it)->render( currentState );
+			}
 		}
 	}
 
@@ -123,27 +174,41 @@ void Group::render( State *currentState ) const
 
 Imath::Box3f Group::bound() const
 {
-	Box3f result;
-	for( ChildContainer::const_iterator it=children().begin(); it!=children().end(); it++ )
-	{
-		result.extendBy( (*it)->bound() );
-	}
-	return transform( result, m_transform );
+	return transform( childBound(), m_transform );
 }
 
 void Group::addChild( RenderablePtr child )
 {
+	child->addParent( this );
 	m_children.push_back( child );
+	childBoundChanged();
 }
 
 void Group::removeChild( Renderable *child )
 {
-	m_children.remove( child );
+	for( ChildContainer::iterator it=m_children.begin(); it!=m_children.end(); )
+	{
+		if( it->get() == child )
+		{
+			child->removeParent( this );
+			it = m_children.erase( it );
+		}
+		else
+		{
+			++it;
+		}
+	}
+	childBoundChanged();
 }
 
 void Group::clearChildren()
 {
+	for( ChildContainer::const_iterator it=m_children.begin(); it!=m_children.end(); it++ )
+	{
+		(*it)->removeParent( this );
+	}
 	m_children.clear();
+	childBoundChanged();
 }
 
 const Group::ChildContainer &Group::children() const
@@ -156,3 +221,81 @@ Group::Mutex &Group::mutex() const
 	return m_mutex;
 }
 
+Imath::Box3f Group::childBound() const
+{
+	if( !m_childBoundDirty )
+	{
+		tbb::spin_mutex::scoped_lock lock( m_childBoundMutex );
+		return m_childBound;
+	}
+
+	Box3f result;
+	for( ChildContainer::const_iterator it=children().begin(); it!=children().end(); it++ )
+	{
+		result.extendBy( (*it)->bound() );
+	}
+
+	// The flag is only cleared once the bound has been stored,
+	// so that concurrent calls never see a stale bound.
+	tbb::spin_mutex::scoped_lock lock( m_childBoundMutex );
+	m_childBound = result;
+	m_childBoundDirty = false;
+	return result;
+}
+
+void Group::childBoundChanged()
+{
+	// If we were already dirty then so are all our ancestors,
+	// because they can only have been cleaned by computing
+	// our bound. So we only need to propagate the first change.
+	if( !m_childBoundDirty.exchange( true ) )
+	{
+		boundChanged();
+	}
+}
+
+bool Group::culled( const Imath::M44f &toClip ) const
+{
+	const Box3f b = childBound();
+	if( b.isEmpty() || b.isInfinite() )
+	{
+		// Children without a bound may still draw something,
+		// so we can't make any assumptions.
+		return false;
+	}
+
+	const M44f &m = toClip;
+
+	// We're culled if all the corners of the bound lie outside
+	// the same clipping plane.
+	unsigned outside = 0x3f;
+	for( int i = 0; i < 8; ++i )
+	{
+		const V3f p(
+			i & 1 ? b.max.x : b.min.x,
+			i & 2 ? b.max.y : b.min.y,
+			i & 4 ? b.max.z : b.min.z
+		);
+
+		const float x = p.x * m[0][0] + p.y * m[1][0] + p.z * m[2][0] + m[3][0];
+		const float y = p.x * m[0][1] + p.y * m[1][1] + p.z * m[2][1] + m[3][1];
+		const float z = p.x * m[0][2] + p.y * m[1][2] + p.z * m[2][2] + m[3][2];
+		const float w = p.x * m[0][3] + p.y * m[1][3] + p.z * m[2][3] + m[3][3];
+
+		unsigned corner = 0;
+		corner |= x < -w ? 0x01 : 0;
+		corner |= x > w ? 0x02 : 0;
+		corner |= y < -w ? 0x04 : 0;
+		corner |= y > w ? 0x08 : 0;
+		corner |= z < -w ? 0x10 : 0;
+		corner |= z > w ? 0x20 : 0;
+
+		outside &= corner;
+		if( !outside )
+		{
+			return false;
+		}
+	}
+
+	return true;
+}
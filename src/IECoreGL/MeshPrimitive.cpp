@@ -96,6 +96,7 @@ void MeshPrimitive::addPrimitiveVariable( const std::string &name, const IECoreS
 				m_memberData->bound.extendBy( p[i] );
 			}
 		}
+		boundChanged();
 	}
 
 	if ( primVar.interpolation==IECoreScene::PrimitiveVariable::FaceVarying )
@@ -171,6 +171,7 @@ Primitive::~Primitive()
 
 void Primitive::addPrimitiveVariable( const std::string &name, const IECoreScene::PrimitiveVariable &primVar )
 {
+	boundChanged();
 	if ( primVar.interpolation == IECoreScene::PrimitiveVariable::Constant )
 	{
 		addUniformAttribute( name, primVar.expandedData() );
@@ -34,6 +34,10 @@
 
 #include "IECoreGL/Renderable.h"
 
+#include "IECoreGL/Group.h"
+
+#include <algorithm>
+
 using namespace IECoreGL;
 
 IE_CORE_DEFINERUNTIMETYPED( Renderable );
@@ -45,3 +49,28 @@ Renderable::Renderable()
 Renderable::~Renderable()
 {
 }
+
+void Renderable::boundChanged()
+{
+	tbb::spin_mutex::scoped_lock lock( m_parentsMutex );
+	for( ParentContainer::const_iterator it = m_parents.begin(); it != m_parents.end(); ++it )
+	{
+		(*it)->childBoundChanged();
+	}
+}
+
+void Renderable::addParent( Group *parent )
+{
+	tbb::spin_mutex::scoped_lock lock( m_parentsMutex );
+	m_parents.push_back( parent );
+}
+
+void Renderable::removeParent( Group *parent )
+{
+	tbb::spin_mutex::scoped_lock lock( m_parentsMutex );
+	ParentContainer::iterator it = std::find( m_parents.begin(), m_parents.end(), parent );
+	if( it != m_parents.end() )
+	{
+		m_parents.erase( it );
+	}
+}
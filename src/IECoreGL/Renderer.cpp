@@ -1383,6 +1383,7 @@ static const AttributeSetterMap *attributeSetters()
 		(*a)["gl:textPrimitive:type"] = textPrimitiveTypeSetter;
 		(*a)["gl:cullingSpace"] = rendererSpaceSetter<CullingSpaceStateComponent>;
 		(*a)["gl:cullingBox"] = typedAttributeSetter<CullingBoxStateComponent>;
+		(*a)["gl:frustumCulling"] = typedAttributeSetter<FrustumCullingStateComponent>;
 		(*a)["gl:procedural:reentrant"] = typedAttributeSetter<ProceduralThreadingStateComponent>;
 		(*a)["gl:visibility:camera"] = typedAttributeSetter<CameraVisibilityStateComponent>;
 		(*a)["gl:depthTest"] = typedAttributeSetter<DepthTestStateComponent>;
@@ -1437,6 +1438,7 @@ static const AttributeGetterMap *attributeGetters()
 		(*a)["gl:textPrimitive:type"] = textPrimitiveTypeGetter;
 		(*a)["gl:cullingSpace"] = rendererSpaceGetter<CullingSpaceStateComponent>;
 		(*a)["gl:cullingBox"] = typedAttributeGetter<CullingBoxStateComponent>;
+		(*a)["gl:frustumCulling"] = typedAttributeGetter<FrustumCullingStateComponent>;
 		(*a)["gl:procedural:reentrant"] = typedAttributeGetter<ProceduralThreadingStateComponent>;
 		(*a)["gl:visibility:camera"] = typedAttributeGetter<CameraVisibilityStateComponent>;
 		(*a)["gl:depthTest"] = typedAttributeGetter<DepthTestStateComponent>;
@@ -64,6 +64,7 @@ void bindTypedStateComponents()
 	bindTypedStateComponent< RightHandedOrientationStateComponent >( "RightHandedOrientationStateComponent" );
 	bindTypedStateComponent< CullingSpaceStateComponent >( "CullingSpaceStateComponent" );
 	bindTypedStateComponent< CullingBoxStateComponent >( "CullingBoxStateComponent" );
+	bindTypedStateComponent< FrustumCullingStateComponent >( "FrustumCullingStateComponent" );
 	bindTypedStateComponent< ProceduralThreadingStateComponent >( "ProceduralThreadingStateComponent" );
 	bindTypedStateComponent< CameraVisibilityStateComponent >( "CameraVisibilityStateComponent" );
 	bindTypedStateComponent< AutomaticInstancingStateComponent >( "AutomaticInstancingStateComponent" );
@@ -45,9 +45,19 @@
 #include "IECore/MemoryIndexedIO.h"
 #include "IECore/SimpleTypedData.h"
 
-#include "boost/array.hpp"
+#include "OpenEXR/half.h"
+
 #include "boost/bind.hpp"
 
+#include "tbb/concurrent_queue.h"
+#include "tbb/tbb_thread.h"
+
+#include "blosc.h"
+
+#include <atomic>
+#include <cstring>
+#include <memory>
+
 using namespace std;
 using boost::asio::ip::tcp;
 using namespace boost;
@@ -55,25 +65,222 @@ using namespace Imath;
 using namespace IECore;
 using namespace IECoreImage;
 
+namespace
+{
+
+// The number of buckets which may be queued for sending before
+// imageData() blocks waiting for the network to catch up.
+const int g_maxQueuedBuckets = 64;
+
+// We favour speed over compression ratio, as the whole point
+// is to get the pixels to the server sooner.
+const int g_compressionLevel = 1;
+
+// A complete message, header included, ready to be written to the socket.
+typedef std::shared_ptr<std::vector<char> > PacketPtr;
+
+uint32_t requestedCompression( const CompoundData *parameters )
+{
+	uint32_t result = DisplayDriverServerHeader::noCompression;
+	const BoolData *compressionData = parameters->member<BoolData>( "displayCompression" );
+	if( compressionData && compressionData->readable() )
+	{
+		result |= DisplayDriverServerHeader::lz4Compression;
+	}
+	const BoolData *halfFloatData = parameters->member<BoolData>( "displayHalfFloat" );
+	if( halfFloatData && halfFloatData->readable() )
+	{
+		result |= DisplayDriverServerHeader::halfCompression;
+	}
+	return result;
+}
+
+PacketPtr imageDataPacket( const Box2i &box, const float *data, size_t dataSize, unsigned char protocolVersion )
+{
+	const size_t size = sizeof( box ) + dataSize * sizeof( float );
+	DisplayDriverServerHeader header( DisplayDriverServerHeader::imageData, size, protocolVersion );
+
+	PacketPtr result = std::make_shared<std::vector<char> >( header.headerLength + size );
+	char *p = result->data();
+	memcpy( p, header.buffer(), header.headerLength );
+	p += header.headerLength;
+	memcpy( p, &box, sizeof( box ) );
+	p += sizeof( box );
+	memcpy( p, data, dataSize * sizeof( float ) );
+
+	return result;
+}
+
+PacketPtr compressedImageDataPacket( const Box2i &box, const float *data, size_t dataSize, uint32_t compression, unsigned char protocolVersion )
+{
+	const char *pixels = reinterpret_cast<const char *>( data );
+	size_t pixelsSize = dataSize * sizeof( float );
+	size_t typeSize = sizeof( float );
+
+	std::vector<half> halfData;
+	if( compression & DisplayDriverServerHeader::halfCompression )
+	{
+		halfData.assign( data, data + dataSize );
+		pixels = reinterpret_cast<const char *>( halfData.data() );
+		pixelsSize = dataSize * sizeof( half );
+		typeSize = sizeof( half );
+	}
+
+	const size_t prefixSize = DisplayDriverServerHeader::headerLength + sizeof( box ) + sizeof( compression );
+	PacketPtr result = std::make_shared<std::vector<char> >( prefixSize + pixelsSize + BLOSC_MAX_OVERHEAD );
+
+	int compressedSize = 0;
+	if( ( compression & DisplayDriverServerHeader::lz4Compression ) && pixelsSize <= BLOSC_MAX_BUFFERSIZE )
+	{
+		compressedSize = blosc_compress_ctx(
+			g_compressionLevel,
+			true,
+			typeSize,
+			pixelsSize,
+			pixels,
+			result->data() + prefixSize,
+			pixelsSize + BLOSC_MAX_OVERHEAD,
+			"lz4",
+			0,
+			1
+		);
+	}
+
+	if( compressedSize > 0 )
+	{
+		result->resize( prefixSize + compressedSize );
+	}
+	else
+	{
+		// Compression wasn't requested or didn't succeed, so we send the pixels as they are.
+		compression &= ~DisplayDriverServerHeader::lz4Compression;
+		memcpy( result->data() + prefixSize, pixels, pixelsSize );
+		result->resize( prefixSize + pixelsSize );
+	}
+
+	DisplayDriverServerHeader header( DisplayDriverServerHeader::imageDataCompressed, result->size() - DisplayDriverServerHeader::headerLength, protocolVersion );
+	char *p = result->data();
+	memcpy( p, header.buffer(), header.headerLength );
+	p += header.headerLength;
+	memcpy( p, &box, sizeof( box ) );
+	p += sizeof( box );
+	memcpy( p, &compression, sizeof( compression ) );
+
+	return result;
+}
+
+} // namespace
+
 class ClientDisplayDriver::PrivateData : public RefCounted
 {
 	public :
 		PrivateData() :
-		m_service(), m_host(""), m_port(""), m_scanLineOrderOnly(false), m_acceptsRepeatedData(false), m_socket( m_service )
+		m_service(), m_host(""), m_port(""), m_scanLineOrderOnly(false), m_acceptsRepeatedData(false), m_socket( m_service ),
+		m_protocolVersion( DisplayDriverServerHeader::minimumProtocolVersion ), m_compression( DisplayDriverServerHeader::noCompression ),
+		m_failed( false )
 		{
+			m_queue.set_capacity( g_maxQueuedBuckets );
 		}
 
 		~PrivateData() override
 		{
+			stopSending();
 			m_socket.close();
 		}
 
+		void connect()
+		{
+			tcp::resolver resolver( m_service );
+			tcp::resolver::query query( m_host, m_port );
+
+			boost::system::error_code error;
+			tcp::resolver::iterator iterator = resolver.resolve( query, error );
+			if( !error )
+			{
+				error = boost::asio::error::host_not_found;
+				while( error && iterator != tcp::resolver::iterator() )
+				{
+					m_socket.close();
+					m_socket.connect( *iterator++, error );
+				}
+			}
+			if( error )
+			{
+				throw Exception( std::string( "Could not connect to remote display driver server : " ) + error.message() );
+			}
+		}
+
+		// Buckets are written to the socket on a separate thread, so that
+		// the renderer can get on with the next bucket while we wait for
+		// the network.
+		void startSending()
+		{
+			m_senderThread.reset( new tbb::tbb_thread( boost::bind( &PrivateData::sendPackets, this ) ) );
+		}
+
+		// Blocks until all queued buckets have been written.
+		void stopSending()
+		{
+			if( !m_senderThread )
+			{
+				return;
+			}
+			m_queue.push( PacketPtr() );
+			m_senderThread->join();
+			m_senderThread.reset();
+		}
+
+		// Rethrows any error encountered by the sending thread.
+		void checkSending()
+		{
+			if( m_failed )
+			{
+				throw Exception( std::string( "Could not send image data to remote display driver server : " ) + m_error );
+			}
+		}
+
 		boost::asio::io_service m_service;
 		std::string m_host;
 		std::string m_port;
 		bool m_scanLineOrderOnly;
 		bool m_acceptsRepeatedData;
 		boost::asio::ip::tcp::socket m_socket;
+		unsigned char m_protocolVersion;
+		uint32_t m_compression;
+		tbb::concurrent_bounded_queue<PacketPtr> m_queue;
+
+	private :
+
+		void sendPackets()
+		{
+			PacketPtr packet;
+			while( true )
+			{
+				m_queue.pop( packet );
+				if( !packet )
+				{
+					break;
+				}
+				if( m_failed )
+				{
+					// Keep draining the queue so imageData() doesn't block.
+					continue;
+				}
+				try
+				{
+					boost::asio::write( m_socket, boost::asio::buffer( packet->data(), packet->size() ) );
+				}
+				catch( const std::exception &e )
+				{
+					m_error = e.what();
+					m_failed = true;
+				}
+			}
+		}
+
+		std::unique_ptr<tbb::tbb_thread> m_senderThread;
+		std::atomic<bool> m_failed;
+		std::string m_error;
 };
 
 IE_CORE_DEFINERUNTIMETYPED( ClientDisplayDriver );
@@ -90,25 +297,7 @@ ClientDisplayDriver::ClientDisplayDriver( const Imath::Box2i &displayWindow, con
 
 	m_data->m_host = displayHostData->readable();
 	m_data->m_port = displayPortData->readable();
-
-	tcp::resolver resolver(m_data->m_service);
-	tcp::resolver::query query(m_data->m_host, m_data->m_port);
-
-	boost::system::error_code error;
-	tcp::resolver::iterator iterator = resolver.resolve( query, error );
-	if( !error )
-	{
-		error = boost::asio::error::host_not_found;
-		while( error && iterator != tcp::resolver::iterator() )
-		{
-			m_data->m_socket.close();
-			m_data->m_socket.connect( *iterator++, error );
-		}
-	}
-	if( error )
-	{
-		throw Exception( std::string( "Could not connect to remote display driver server : " ) + error.message() );
-	}
+	m_data->connect();
 
 	MemoryIndexedIOPtr io;
 	ConstCharVectorDataPtr buf;
@@ -127,11 +316,40 @@ ClientDisplayDriver::ClientDisplayDriver( const Imath::Box2i &displayWindow, con
 	tmpParameters->Object::save( io, "parameters" );
 	buf = io->buffer();
 
-	size_t dataSize = buf->readable().size();
+	const uint32_t compression = requestedCompression( parameters.get() );
+	if( compression == DisplayDriverServerHeader::noCompression )
+	{
+		openImage( buf.get(), DisplayDriverServerHeader::minimumProtocolVersion );
+	}
+	else
+	{
+		try
+		{
+			openImage( buf.get(), DisplayDriverServerHeader::currentProtocolVersion );
+			m_data->m_compression &= compression;
+		}
+		catch( const boost::system::system_error & )
+		{
+			// Servers predating compression reject the newer protocol version by
+			// closing the connection. Reconnect and send the data uncompressed.
+			m_data->connect();
+			openImage( buf.get(), DisplayDriverServerHeader::minimumProtocolVersion );
+		}
+	}
+
+	m_data->startSending();
+}
+
+void ClientDisplayDriver::openImage( const IECore::CharVectorData *openParameters, unsigned char protocolVersion )
+{
+	m_data->m_protocolVersion = protocolVersion;
+	m_data->m_compression = DisplayDriverServerHeader::noCompression;
+
+	size_t dataSize = openParameters->readable().size();
 
 	sendHeader( DisplayDriverServerHeader::imageOpen, dataSize );
 
-	boost::asio::write( m_data->m_socket, boost::asio::buffer( &(buf->readable()[0]), dataSize ) );
+	boost::asio::write( m_data->m_socket, boost::asio::buffer( &(openParameters->readable()[0]), dataSize ) );
 
 	if ( receiveHeader( DisplayDriverServerHeader::imageOpen ) != sizeof(m_data->m_scanLineOrderOnly) )
 	{
@@ -144,6 +362,15 @@ ClientDisplayDriver::ClientDisplayDriver( const Imath::Box2i &displayWindow, con
 		throw Exception( "Invalid returned acceptsRepeatedData from display driver server!" );
 	}
 	m_data->m_socket.receive( boost::asio::buffer( &m_data->m_acceptsRepeatedData, sizeof(m_data->m_acceptsRepeatedData) ) );
+
+	if( protocolVersion >= 3 )
+	{
+		if ( receiveHeader( DisplayDriverServerHeader::imageOpen ) != sizeof(m_data->m_compression) )
+		{
+			throw Exception( "Invalid returned compression from display driver server!" );
+		}
+		m_data->m_socket.receive( boost::asio::buffer( &m_data->m_compression, sizeof(m_data->m_compression) ) );
+	}
 }
 
 ClientDisplayDriver::~ClientDisplayDriver()
@@ -172,7 +399,7 @@ bool ClientDisplayDriver::acceptsRepeatedData() const
 
 void ClientDisplayDriver::sendHeader( int msg, size_t dataSize )
 {
-	DisplayDriverServerHeader header( (DisplayDriverServerHeader::MessageType)msg, dataSize );
+	DisplayDriverServerHeader header( (DisplayDriverServerHeader::MessageType)msg, dataSize, m_data->m_protocolVersion );
 	boost::asio::write( m_data->m_socket, boost::asio::buffer( header.buffer(), header.headerLength ) );
 }
 
@@ -202,17 +429,28 @@ size_t ClientDisplayDriver::receiveHeader( int msg )
 
 void ClientDisplayDriver::imageData( const Box2i &box, const float *data, size_t dataSize )
 {
-	sendHeader( DisplayDriverServerHeader::imageData, sizeof( box ) + dataSize * sizeof( float ) );
+	m_data->checkSending();
+
+	// The packet is built ( and compressed ) on the calling thread, so that
+	// renderers which output buckets concurrently also compress concurrently.
+	PacketPtr packet;
+	if( m_data->m_compression != DisplayDriverServerHeader::noCompression )
+	{
+		packet = compressedImageDataPacket( box, data, dataSize, m_data->m_compression, m_data->m_protocolVersion );
+	}
+	else
+	{
+		packet = imageDataPacket( box, data, dataSize, m_data->m_protocolVersion );
+	}
 
-	boost::array<boost::asio::const_buffer, 2> buffers = { {
-		boost::asio::buffer( &box, sizeof( box ) ),
-		boost::asio::buffer( data, dataSize * sizeof( float ) )
-	} };
-	boost::asio::write( m_data->m_socket, buffers );
+	m_data->m_queue.push( packet );
 }
 
 void ClientDisplayDriver::imageClose()
 {
+	m_data->stopSending();
+	m_data->checkSending();
+
 	sendHeader( DisplayDriverServerHeader::imageClose, 0 );
 	receiveHeader( DisplayDriverServerHeader::imageClose );
 	m_data->m_socket.close();
@@ -41,14 +41,23 @@
 
 #include "IECoreImage/Private/DisplayDriverServerHeader.h"
 
+#include "IECore/Exception.h"
 #include "IECore/MemoryIndexedIO.h"
 #include "IECore/MessageHandler.h"
 #include "IECore/SimpleTypedData.h"
 
+#include "OpenEXR/half.h"
+
 #include "boost/bind.hpp"
 
 #include "tbb/tbb_thread.h"
 
+#include "blosc.h"
+
+#include <algorithm>
+#include <memory>
+#include <vector>
+
 #include <fcntl.h>
 #ifndef _MSC_VER
 #include <unistd.h>
@@ -61,6 +70,19 @@ using namespace IECoreImage;
 
 IE_CORE_DEFINERUNTIMETYPED( DisplayDriverServer );
 
+namespace
+{
+
+// Sessions are serviced by a small pool of threads, so that the decoding
+// and display of one image doesn't hold up any others being received
+// concurrently ( for instance, the AOVs of a single render ).
+const unsigned g_maxServerThreads = 8;
+
+// The compression modes we are able to decode from imageDataCompressed blocks.
+const uint32_t g_supportedCompression = DisplayDriverServerHeader::lz4Compression | DisplayDriverServerHeader::halfCompression;
+
+} // namespace
+
 class DisplayDriverServer::Session : public RefCounted
 {
 	public:
@@ -78,12 +100,16 @@ class DisplayDriverServer::Session : public RefCounted
 		void handleReadDataParameters( const boost::system::error_code& error );
 		void sendResult( DisplayDriverServerHeader::MessageType msg, size_t dataSize );
 		void sendException( const char *message );
+		const float *decompress( const char *data, size_t size, uint32_t compression, size_t &dataSize );
 
 	private:
 		boost::asio::ip::tcp::socket m_socket;
 		DisplayDriverPtr m_displayDriver;
 		DisplayDriverServerHeader m_header;
+		unsigned char m_protocolVersion;
 		CharVectorDataPtr m_buffer;
+		std::vector<char> m_decompressedBuffer;
+		std::vector<float> m_floatBuffer;
 };
 
 class DisplayDriverServer::PrivateData : public RefCounted
@@ -95,14 +121,13 @@ class DisplayDriverServer::PrivateData : public RefCounted
 		boost::asio::ip::tcp::endpoint m_endpoint;
 		boost::asio::io_service m_service;
 		boost::asio::ip::tcp::acceptor m_acceptor;
-		tbb::tbb_thread m_thread;
+		std::vector<std::unique_ptr<tbb::tbb_thread>> m_threads;
 
 		PrivateData( int portNumber ) :
 			m_success(false),
 			m_endpoint(tcp::v4(), portNumber),
 			m_service(),
-			m_acceptor( m_service ),
-			m_thread()
+			m_acceptor( m_service )
 		{
 			m_acceptor.open(  m_endpoint.protocol() );
 			m_acceptor.set_option( boost::asio::ip::tcp::acceptor::reuse_address(true));
@@ -117,7 +142,10 @@ class DisplayDriverServer::PrivateData : public RefCounted
 			{
 				m_acceptor.cancel();
 				m_acceptor.close();
-				m_thread.join();
+				for( auto &thread : m_threads )
+				{
+					thread->join();
+				}
 			}
 		}
 
@@ -145,8 +173,15 @@ DisplayDriverServer::DisplayDriverServer( int portNumber ) :
 			boost::bind( &DisplayDriverServer::handleAccept, this, newSession,
 			boost::asio::placeholders::error));
 	fixSocketFlags( m_data->m_acceptor.native() );
-	tbb::tbb_thread newThread( boost::bind(&DisplayDriverServer::serverThread, this) );
-	m_data->m_thread.swap( newThread );
+
+	// Each session only ever has a single asynchronous operation in flight,
+	// so running the service on several threads parallelises across sessions
+	// while keeping the messages within a session strictly ordered.
+	const unsigned numThreads = std::min( std::max( tbb::tbb_thread::hardware_concurrency(), 1u ), g_maxServerThreads );
+	for( unsigned i = 0; i < numThreads; ++i )
+	{
+		m_data->m_threads.emplace_back( new tbb::tbb_thread( boost::bind( &DisplayDriverServer::serverThread, this ) ) );
+	}
 }
 
 DisplayDriverServer::~DisplayDriverServer()
@@ -187,7 +222,7 @@ void DisplayDriverServer::handleAccept( DisplayDriverServer::SessionPtr session,
  */
 
 DisplayDriverServer::Session::Session( boost::asio::io_service& io_service ) :
-	m_socket( io_service ), m_displayDriver(nullptr), m_buffer( new CharVectorData( ) )
+	m_socket( io_service ), m_displayDriver(nullptr), m_protocolVersion( DisplayDriverServerHeader::minimumProtocolVersion ), m_buffer( new CharVectorData( ) )
 {
 }
 
@@ -239,6 +274,9 @@ void DisplayDriverServer::Session::handleReadHeader( const boost::system::error_
 	switch( m_header.messageType() )
 	{
 	case DisplayDriverServerHeader::imageOpen:
+		// replies are sent using the protocol version the client opened with,
+		// so that clients predating compression continue to understand us.
+		m_protocolVersion = m_header.protocolVersion();
 		boost::asio::async_read( m_socket,
 				boost::asio::buffer( &data[0], bytesAhead ),
 				boost::bind( &DisplayDriverServer::Session::handleReadOpenParameters, SessionPtr(this), boost::asio::placeholders::error)
@@ -246,6 +284,7 @@ void DisplayDriverServer::Session::handleReadHeader( const boost::system::error_
 		break;
 
 	case DisplayDriverServerHeader::imageData:
+	case DisplayDriverServerHeader::imageDataCompressed:
 		boost::asio::async_read( m_socket,
 				boost::asio::buffer( &data[0], bytesAhead ),
 				boost::bind(&DisplayDriverServer::Session::handleReadDataParameters, SessionPtr(this),
@@ -340,6 +379,13 @@ void DisplayDriverServer::Session::handleReadOpenParameters( const boost::system
 		sendResult( DisplayDriverServerHeader::imageOpen, sizeof(acceptsRepeatedData) );
 		m_socket.send( boost::asio::buffer( &acceptsRepeatedData, sizeof(acceptsRepeatedData) ) );
 
+		if( m_protocolVersion >= 3 )
+		{
+			// negotiate compression of the imageData blocks to follow.
+			sendResult( DisplayDriverServerHeader::imageOpen, sizeof(g_supportedCompression) );
+			m_socket.send( boost::asio::buffer( &g_supportedCompression, sizeof(g_supportedCompression) ) );
+		}
+
 		// prepare for getting imageData packages
 		boost::asio::async_read( m_socket,
 			boost::asio::buffer( m_header.buffer(), m_header.headerLength),
@@ -380,9 +426,25 @@ void DisplayDriverServer::Session::handleReadDataParameters( const boost::system
 		/// We used to send the data via MemoryIndexedIO which would take care of this
 		/// for us, but the overhead of this significantly affected interactive render
 		/// speeds.
-		const Imath::Box2i box = *reinterpret_cast<const Imath::Box2i *>( &m_buffer->readable()[0] );
-		const float *data = reinterpret_cast<const float *>( &m_buffer->readable()[0] + sizeof( box ) );
-		const size_t dataSize = ( m_buffer->readable().size() - sizeof( box ) ) / sizeof( float );
+		const std::vector<char> &buffer = m_buffer->readable();
+		const Imath::Box2i box = *reinterpret_cast<const Imath::Box2i *>( &buffer[0] );
+		const float *data = nullptr;
+		size_t dataSize = 0;
+		if( m_header.messageType() == DisplayDriverServerHeader::imageDataCompressed )
+		{
+			const size_t headerSize = sizeof( box ) + sizeof( uint32_t );
+			if( buffer.size() < headerSize )
+			{
+				throw IOException( "Truncated imageDataCompressed block" );
+			}
+			const uint32_t compression = *reinterpret_cast<const uint32_t *>( &buffer[0] + sizeof( box ) );
+			data = decompress( &buffer[0] + headerSize, buffer.size() - headerSize, compression, dataSize );
+		}
+		else
+		{
+			data = reinterpret_cast<const float *>( &buffer[0] + sizeof( box ) );
+			dataSize = ( buffer.size() - sizeof( box ) ) / sizeof( float );
+		}
 
 		// call imageData passing the data
 		m_displayDriver->imageData( box, data, dataSize );
@@ -406,7 +468,7 @@ void DisplayDriverServer::Session::handleReadDataParameters( const boost::system
 
 void DisplayDriverServer::Session::sendResult( DisplayDriverServerHeader::MessageType msg, size_t dataSize )
 {
-	DisplayDriverServerHeader header( msg, dataSize );
+	DisplayDriverServerHeader header( msg, dataSize, m_protocolVersion );
 	m_socket.send( boost::asio::buffer( header.buffer(), header.headerLength ) );
 }
 
@@ -416,3 +478,43 @@ void DisplayDriverServer::Session::sendException( const char *message )
 	sendResult( DisplayDriverServerHeader::exception, msgLen );
 	m_socket.send( boost::asio::buffer( message, msgLen ) );
 }
+
+const float *DisplayDriverServer::Session::decompress( const char *data, size_t size, uint32_t compression, size_t &dataSize )
+{
+	if( compression & ~g_supportedCompression )
+	{
+		throw IOException( "Unsupported compression in imageDataCompressed block" );
+	}
+
+	if( compression & DisplayDriverServerHeader::lz4Compression )
+	{
+		size_t uncompressedSize = 0, compressedSize = 0, blockSize = 0;
+		if( size < BLOSC_MIN_HEADER_LENGTH )
+		{
+			throw IOException( "Truncated imageDataCompressed block" );
+		}
+		blosc_cbuffer_sizes( data, &uncompressedSize, &compressedSize, &blockSize );
+		if( compressedSize != size )
+		{
+			throw IOException( "Corrupted imageDataCompressed block" );
+		}
+		m_decompressedBuffer.resize( uncompressedSize );
+		if( blosc_decompress_ctx( data, m_decompressedBuffer.data(), uncompressedSize, 1 ) < 0 )
+		{
+			throw IOException( "Corrupted imageDataCompressed block" );
+		}
+		data = m_decompressedBuffer.data();
+		size = uncompressedSize;
+	}
+
+	if( compression & DisplayDriverServerHeader::halfCompression )
+	{
+		const half *halfData = reinterpret_cast<const half *>( data );
+		m_floatBuffer.assign( halfData, halfData + size / sizeof( half ) );
+		dataSize = m_floatBuffer.size();
+		return m_floatBuffer.data();
+	}
+
+	dataSize = size / sizeof( float );
+	return reinterpret_cast<const float *>( data );
+}
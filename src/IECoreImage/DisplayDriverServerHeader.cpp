@@ -52,10 +52,10 @@ DisplayDriverServerHeader::DisplayDriverServerHeader()
 	memset( &m_header[0], 0, sizeof(m_header) );
 }
 
-DisplayDriverServerHeader::DisplayDriverServerHeader( MessageType msg, size_t dataSize )
+DisplayDriverServerHeader::DisplayDriverServerHeader( MessageType msg, size_t dataSize, unsigned char protocolVersion )
 {
 	m_header[orderMagicNumber] = magicNumber;
-	m_header[orderProtocolVersion] = currentProtocolVersion;
+	m_header[orderProtocolVersion] = protocolVersion;
 	m_header[orderMessageType] = msg;
 	setDataSize( dataSize );
 }
@@ -68,11 +68,13 @@ unsigned char *DisplayDriverServerHeader::buffer()
 bool DisplayDriverServerHeader::valid()
 {
 	if ( m_header[orderMagicNumber] != magicNumber ||
-		 m_header[orderProtocolVersion] != currentProtocolVersion ||
+		 m_header[orderProtocolVersion] < minimumProtocolVersion ||
+		 m_header[orderProtocolVersion] > currentProtocolVersion ||
 		( m_header[orderMessageType] != imageOpen &&
 			m_header[orderMessageType] != imageData &&
 			m_header[orderMessageType] != imageClose &&
-			m_header[orderMessageType] != exception ) )
+			m_header[orderMessageType] != exception &&
+			m_header[orderMessageType] != imageDataCompressed ) )
 	{
 		return false;
 	}
@@ -95,5 +97,10 @@ void DisplayDriverServerHeader::setDataSize( size_t dataSize )
 
 DisplayDriverServerHeader::MessageType DisplayDriverServerHeader::messageType()
 {
-	return (MessageType)m_header[2];
+	return (MessageType)m_header[orderMessageType];
+}
+
+unsigned char DisplayDriverServerHeader::protocolVersion()
+{
+	return m_header[orderProtocolVersion];
 }
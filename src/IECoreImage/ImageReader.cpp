@@ -50,6 +50,9 @@
 
 #include "boost/tokenizer.hpp"
 
+#include "tbb/mutex.h"
+#include "tbb/parallel_for.h"
+
 OIIO_NAMESPACE_USING
 
 using namespace std;
@@ -91,6 +94,28 @@ ImageInputPtr openImageInput( const std::string &fileName )
 
 #endif
 
+// Number of scanlines read by each parallel task in `readChannels()`.
+const int g_scanlinesPerBand = 64;
+
+float g_sharedCacheMemoryLimit = 256.0f;
+tbb::mutex g_sharedCacheMutex;
+
+// An ImageCache shared by all ImageReaders that request it. We don't use
+// OIIO's own shared cache, as we set attributes on it which we
+// don't want to impose on other clients.
+ImageCache *sharedCache()
+{
+	static ImageCache *g_cache = nullptr;
+	tbb::mutex::scoped_lock lock( g_sharedCacheMutex );
+	if( !g_cache )
+	{
+		g_cache = ImageCache::create( /* shared */ false );
+		g_cache->attribute( "automip", 1 );
+		g_cache->attribute( "max_memory_MB", g_sharedCacheMemoryLimit );
+	}
+	return g_cache;
+}
+
 } // namespace
 
 ////////////////////////////////////////////////////////////////////////////////
@@ -102,7 +127,7 @@ class ImageReader::Implementation
 
 	public :
 
-		Implementation( const ImageReader *reader ) : m_reader( reader ), m_cache( nullptr, &destroyImageCache )
+		Implementation( const ImageReader *reader ) : m_reader( reader ), m_cache( nullptr ), m_privateCache( nullptr, &destroyImageCache )
 		{
 		}
 
@@ -278,18 +303,35 @@ class ImageReader::Implementation
 		}
 
 		DataPtr readChannel( const std::string &name, bool raw )
+		{
+			CompoundDataPtr channels = readChannels( { name }, Box2i(), raw );
+			return channels->writable().begin()->second;
+		}
+
+		CompoundDataPtr readChannels( const std::vector<std::string> &names, const Box2i &region, bool raw )
 		{
 			open( /* throwOnFailure */ true );
 
 			const ImageSpec *spec = m_cache->imagespec( m_inputFileName, /* subimage = */ 0, miplevel() );
 
-			const auto channelIt = find( spec->channelnames.begin(), spec->channelnames.end(), name );
-			if( channelIt == spec->channelnames.end() )
+			std::vector<size_t> channelIndices;
+			for( const auto &name : names )
 			{
-				throw InvalidArgumentException( "Image Reader : Non-existent image channel \"" + name + "\" requested." );
+				const auto channelIt = find( spec->channelnames.begin(), spec->channelnames.end(), name );
+				if( channelIt == spec->channelnames.end() )
+				{
+					throw InvalidArgumentException( "Image Reader : Non-existent image channel \"" + name + "\" requested." );
+				}
+				channelIndices.push_back( channelIt - spec->channelnames.begin() );
 			}
 
-			size_t channelIndex = channelIt - spec->channelnames.begin();
+			const Box2i window = region.isEmpty() ? dataWindow() : region;
+
+			CompoundDataPtr result = new CompoundData;
+			if( names.empty() )
+			{
+				return result;
+			}
 
 			if( raw )
 			{
@@ -297,50 +339,70 @@ class ImageReader::Implementation
 				{
 					case TypeDesc::UCHAR :
 					{
-						return readTypedChannel<unsigned char>( channelIndex, spec->format );
+						readTypedChannels<unsigned char>( names, channelIndices, window, spec->format, result.get() );
+						break;
 					}
 					case TypeDesc::CHAR :
 					{
-						return readTypedChannel<char>( channelIndex, spec->format );
+						readTypedChannels<char>( names, channelIndices, window, spec->format, result.get() );
+						break;
 					}
 					case TypeDesc::USHORT :
 					{
-						return readTypedChannel<unsigned short>( channelIndex, spec->format );
+						readTypedChannels<unsigned short>( names, channelIndices, window, spec->format, result.get() );
+						break;
 					}
 					case TypeDesc::SHORT :
 					{
-						return readTypedChannel<short>( channelIndex, spec->format );
+						readTypedChannels<short>( names, channelIndices, window, spec->format, result.get() );
+						break;
 					}
 					case TypeDesc::UINT :
 					{
-						return readTypedChannel<unsigned int>( channelIndex, spec->format );
+						readTypedChannels<unsigned int>( names, channelIndices, window, spec->format, result.get() );
+						break;
 					}
 					case TypeDesc::INT :
 					{
-						return readTypedChannel<int>( channelIndex, spec->format );
+						readTypedChannels<int>( names, channelIndices, window, spec->format, result.get() );
+						break;
 					}
 					case TypeDesc::HALF :
 					{
-						return readTypedChannel<half>( channelIndex, spec->format );
+						readTypedChannels<half>( names, channelIndices, window, spec->format, result.get() );
+						break;
 					}
 					case TypeDesc::FLOAT :
 					{
-						return readTypedChannel<float>( channelIndex, spec->format );
+						readTypedChannels<float>( names, channelIndices, window, spec->format, result.get() );
+						break;
 					}
 					case TypeDesc::DOUBLE :
 					{
-						return readTypedChannel<double>( channelIndex, spec->format );
+						readTypedChannels<double>( names, channelIndices, window, spec->format, result.get() );
+						break;
 					}
 					default :
 					{
 						throw IECore::IOException( ( boost::format( "ImageReader : Unsupported data type \"%d\"" ) % spec->format ).str() );
 					}
 				}
+				return result;
 			}
-			else
+
+			readTypedChannels<float>( names, channelIndices, window, TypeDesc::FLOAT, result.get() );
+
+			std::string linearColorSpace;
+			std::string currentColorSpace;
+			for( size_t i = 0; i < names.size(); ++i )
 			{
-				DataPtr data = readTypedChannel<float>( channelIndex, TypeDesc::FLOAT );
-				if( (int)channelIndex != spec->alpha_channel && (int)channelIndex != spec->z_channel )
+				const int channelIndex = channelIndices[i];
+				if( channelIndex == spec->alpha_channel || channelIndex == spec->z_channel )
+				{
+					continue;
+				}
+
+				if( linearColorSpace.empty() )
 				{
 					const char *fileFormat = nullptr;
 					m_cache->get_image_info(
@@ -350,8 +412,6 @@ class ImageReader::Implementation
 						TypeDesc::TypeString, &fileFormat
 					);
 
-					std::string linearColorSpace;
-					std::string currentColorSpace;
 					if( strcmp( fileFormat, "png" ) == 0 )
 					{
 						// The most common use for loading PNGs via Cortex is for icons in Gaffer.
@@ -370,43 +430,83 @@ class ImageReader::Implementation
 						linearColorSpace = OpenImageIOAlgo::colorSpace( "", *spec );
 						currentColorSpace = OpenImageIOAlgo::colorSpace( fileFormat, *spec );
 					}
-					ColorAlgo::transformChannel( data.get(), currentColorSpace, linearColorSpace );
 				}
 
-				return data;
+				ColorAlgo::transformChannel( result->member<Data>( names[i] ), currentColorSpace, linearColorSpace );
 			}
+
+			return result;
 		}
 
 	private :
 
+		// Reads the specified channels over `window` with a single pass over the
+		// file. Bands of scanlines are read in parallel, so that the decoding of
+		// tiles and scanlines by the ImageCache happens concurrently.
 		template<class T>
-		DataPtr readTypedChannel( size_t channelIndex, TypeDesc dataType )
+		void readTypedChannels( const std::vector<std::string> &names, const std::vector<size_t> &channelIndices, const Box2i &window, TypeDesc dataType, CompoundData *result )
 		{
 			typedef TypedData<vector<T> > DataType;
-			typename DataType::Ptr data = new DataType;
-
-			bool status;
-
-			const ImageSpec *spec = m_cache->imagespec( m_inputFileName, 0, miplevel() );
-
-			data->writable().resize( spec->width * spec->height );
-			status = m_cache->get_pixels(
-				m_inputFileName,
-				0, miplevel(), // subimage, miplevel
-				spec->x, spec->width + spec->x,
-				spec->y, spec->height + spec->y,
-				0, 1, // z begin, z end
-				channelIndex, channelIndex + 1,
-				/* format */ dataType,
-				/* data */ &( data->writable()[0] )
-			);
 
-			if( !status )
+			const int width = window.size().x + 1;
+			const int height = window.size().y + 1;
+
+			std::vector<typename DataType::Ptr> channelData;
+			std::vector<T *> channels;
+			for( const auto &name : names )
 			{
-				throw IOException( string( "ImageReader : Failed to read channel \"" ) + spec->channelnames[channelIndex] + "\". " + m_cache->geterror() );
+				typename DataType::Ptr data = new DataType;
+				data->writable().resize( width * height );
+				channelData.push_back( data );
+				channels.push_back( data->writable().data() );
+				result->writable()[name] = data;
 			}
 
-			return data;
+			// We read the contiguous range of channels spanning all those requested,
+			// and then deinterleave them into the individual channels.
+			const size_t channelBegin = *min_element( channelIndices.begin(), channelIndices.end() );
+			const size_t channelEnd = *max_element( channelIndices.begin(), channelIndices.end() ) + 1;
+			const size_t numChannels = channelEnd - channelBegin;
+			const int mipLevel = miplevel();
+
+			tbb::task_group_context taskGroupContext( tbb::task_group_context::isolated );
+			tbb::parallel_for(
+				tbb::blocked_range<int>( 0, height, g_scanlinesPerBand ),
+				[&]( const tbb::blocked_range<int> &range )
+				{
+					const size_t bandBegin = range.begin() * width;
+					const size_t bandSize = ( range.end() - range.begin() ) * width;
+					std::vector<T> buffer( bandSize * numChannels );
+
+					const bool status = m_cache->get_pixels(
+						m_inputFileName,
+						0, mipLevel, // subimage, miplevel
+						window.min.x, window.max.x + 1,
+						window.min.y + range.begin(), window.min.y + range.end(),
+						0, 1, // z begin, z end
+						channelBegin, channelEnd,
+						/* format */ dataType,
+						/* data */ buffer.data()
+					);
+
+					if( !status )
+					{
+						throw IOException( string( "ImageReader : Failed to read channels from \"" ) + m_inputFileName.string() + "\". " + m_cache->geterror() );
+					}
+
+					for( size_t i = 0, e = channels.size(); i < e; ++i )
+					{
+						const T *source = buffer.data() + channelIndices[i] - channelBegin;
+						T *destination = channels[i] + bandBegin;
+						for( size_t p = 0; p < bandSize; ++p )
+						{
+							destination[p] = *source;
+							source += numChannels;
+						}
+					}
+				},
+				taskGroupContext
+			);
 		}
 
 		void addMetadata( const std::string &name, DataPtr data, CompoundData *metadata )
@@ -434,18 +534,28 @@ class ImageReader::Implementation
 		// Exception is thrown rather than false being returned.
 		bool open( bool throwOnFailure = false )
 		{
-			if( m_cache && m_reader->fileName() == m_inputFileName )
+			const bool useSharedCache = m_reader->sharedCacheParameter()->getTypedValue();
+			if( m_cache && m_reader->fileName() == m_inputFileName && useSharedCache == !m_privateCache )
 			{
 				// we already opened the right file successfully
 				return true;
 			}
 
 			m_inputFileName = "";
-			m_cache.reset( ImageCache::create( /* shared */ false ) );
+			if( useSharedCache )
+			{
+				m_privateCache.reset();
+				m_cache = sharedCache();
+			}
+			else
+			{
+				m_privateCache.reset( ImageCache::create( /* shared */ false ) );
+				m_cache = m_privateCache.get();
 
-			// Autompip ensures that if a miplevel is requested that the file
-			// doesn't contain, OIIO creates the respective level on the fly.
-			m_cache->attribute( "automip", 1 );
+				// Autompip ensures that if a miplevel is requested that the file
+				// doesn't contain, OIIO creates the respective level on the fly.
+				m_cache->attribute( "automip", 1 );
+			}
 
 			// a non-null spec indicates the image was opened successfully
 			if( m_cache->imagespec( ustring( m_reader->fileName() ), 0, miplevel() ) )
@@ -465,13 +575,21 @@ class ImageReader::Implementation
 				return true;
 			}
 
+			const std::string error = geterror();
+			if( useSharedCache )
+			{
+				// Don't leave the failure cached, so that other readers
+				// can succeed if the file becomes valid later.
+				m_cache->invalidate( ustring( m_reader->fileName() ) );
+			}
+
 			if( !throwOnFailure )
 			{
 				return false;
 			}
 			else
 			{
-				throw IOException( string( "Failed to open file \"" ) + m_reader->fileName() + "\". " + geterror() );
+				throw IOException( string( "Failed to open file \"" ) + m_reader->fileName() + "\". " + error );
 			}
 		}
 
@@ -487,7 +605,8 @@ class ImageReader::Implementation
 		}
 
 		const ImageReader *m_reader;
-		std::unique_ptr<ImageCache, decltype(&destroyImageCache) > m_cache;
+		ImageCache *m_cache;
+		std::unique_ptr<ImageCache, decltype(&destroyImageCache) > m_privateCache;
 		ustring m_inputFileName;
 		int m_miplevels;
 
@@ -523,9 +642,18 @@ ImageReader::ImageReader() :
 		0
 	);
 
+	m_sharedCacheParameter = new BoolParameter(
+		"sharedCache",
+		"When on, the reader uses an image cache shared by all readers in the process, "
+		"so that files read repeatedly are only decoded once. When off, the reader uses "
+		"a private cache, and always sees the current contents of the file.",
+		false
+	);
+
 	parameters()->addParameter( m_channelNamesParameter );
 	parameters()->addParameter( m_rawChannelsParameter );
 	parameters()->addParameter( m_miplevelParameter );
+	parameters()->addParameter( m_sharedCacheParameter );
 }
 
 ImageReader::ImageReader( const string &fileName ) : ImageReader()
@@ -571,15 +699,16 @@ ObjectPtr ImageReader::doOperation( const CompoundObject *operands )
 	vector<string> channelNames;
 	channelsToRead( channelNames );
 
-	for( size_t ci = 0, cend = channelNames.size(); ci != cend; ++ci )
+	CompoundDataPtr channels = m_implementation->readChannels( channelNames, Box2i(), rawChannels );
+	for( const auto &channel : channels->readable() )
 	{
-		DataPtr d = m_implementation->readChannel( channelNames[ci], rawChannels );
+		DataPtr d = channel.second;
 		assert( d  );
 		assert( rawChannels || d->typeId()==FloatVectorDataTypeId );
 
 		assert( image->channelValid( d.get() ) );
 
-		image->channels[ channelNames[ci] ] = d;
+		image->channels[ channel.first ] = d;
 	}
 
 	m_implementation->updateMetadata( image->blindData() );
@@ -592,6 +721,25 @@ DataPtr ImageReader::readChannel( const std::string &name, bool raw )
 	return m_implementation->readChannel( name, raw );
 }
 
+CompoundDataPtr ImageReader::readChannels( const std::vector<std::string> &names, const Imath::Box2i &region, bool raw )
+{
+	return m_implementation->readChannels( names, region, raw );
+}
+
+void ImageReader::setSharedCacheMemoryLimit( float megabytes )
+{
+	ImageCache *cache = sharedCache();
+	tbb::mutex::scoped_lock lock( g_sharedCacheMutex );
+	g_sharedCacheMemoryLimit = megabytes;
+	cache->attribute( "max_memory_MB", megabytes );
+}
+
+float ImageReader::getSharedCacheMemoryLimit()
+{
+	tbb::mutex::scoped_lock lock( g_sharedCacheMutex );
+	return g_sharedCacheMemoryLimit;
+}
+
 void ImageReader::channelsToRead( vector<string> &names )
 {
 	vector<string> allNames;
@@ -649,6 +797,16 @@ const IntParameter *ImageReader::mipLevelParameter() const
 	return m_miplevelParameter.get();
 }
 
+BoolParameter *ImageReader::sharedCacheParameter()
+{
+	return m_sharedCacheParameter.get();
+}
+
+const BoolParameter *ImageReader::sharedCacheParameter() const
+{
+	return m_sharedCacheParameter.get();
+}
+
 CompoundObjectPtr ImageReader::readHeader()
 {
 	std::vector<std::string> cn;
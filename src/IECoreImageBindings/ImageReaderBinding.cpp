@@ -33,9 +33,11 @@
 //////////////////////////////////////////////////////////////////////////
 
 #include "boost/python.hpp"
+#include "boost/python/suite/indexing/container_utils.hpp"
 
 #include "IECore/VectorTypedData.h"
 #include "IECorePython/ReaderBinding.h"
+#include "IECorePython/ScopedGILRelease.h"
 
 #include "IECoreImage/ImageReader.h"
 #include "IECoreImageBindings/ImageReaderBinding.h"
@@ -57,6 +59,14 @@ static StringVectorDataPtr channelNames( ImageReader &that )
 	return result;
 }
 
+static CompoundDataPtr readChannels( ImageReader &that, object pythonNames, const Imath::Box2i &region, bool raw )
+{
+	std::vector<std::string> names;
+	boost::python::container_utils::extend_container( names, pythonNames );
+	ScopedGILRelease gilRelease;
+	return that.readChannels( names, region, raw );
+}
+
 } // namespace
 
 namespace IECoreImageBindings
@@ -74,6 +84,9 @@ void bindImageReader()
 		.def( "dataWindow", &ImageReader::dataWindow )
 		.def( "displayWindow", &ImageReader::displayWindow )
 		.def( "readChannel", (DataPtr (ImageReader::*)( const std::string &, bool ))&ImageReader::readChannel, ( arg_("name"), arg_( "raw" ) = false ) )
+		.def( "readChannels", &readChannels, ( arg_( "names" ), arg_( "region" ) = Imath::Box2i(), arg_( "raw" ) = false ) )
+		.def( "setSharedCacheMemoryLimit", &ImageReader::setSharedCacheMemoryLimit ).staticmethod( "setSharedCacheMemoryLimit" )
+		.def( "getSharedCacheMemoryLimit", &ImageReader::getSharedCacheMemoryLimit ).staticmethod( "getSharedCacheMemoryLimit" )
 	;
 
 }
@@ -0,0 +1,115 @@
+//////////////////////////////////////////////////////////////////////////
+//
+//  Copyright (c) 2019, Image Engine Design Inc. All rights reserved.
+//
+//  Redistribution and use in source and binary forms, with or without
+//  modification, are permitted provided that the following conditions are
+//  met:
+//
+//     * Redistributions of source code must retain the above copyright
+//       notice, this list of conditions and the following disclaimer.
+//
+//     * Redistributions in binary form must reproduce the above copyright
+//       notice, this list of conditions and the following disclaimer in the
+//       documentation and/or other materials provided with the distribution.
+//
+//     * Neither the name of Image Engine Design nor the names of any
+//       other contributors to this software may be used to endorse or
+//       promote products derived from this software without specific prior
+//       written permission.
+//
+//  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS
+//  IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+//  THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+//  PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR
+//  CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+//  EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+//  PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+//  PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+//  LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+//  NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+//  SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+//
+//////////////////////////////////////////////////////////////////////////
+
+#include "boost/python.hpp"
+
+#include "IECorePython/BoundingVolumeHierarchyBinding.h"
+
+#include "IECorePython/ScopedGILRelease.h"
+
+#include "IECore/BoundingVolumeHierarchy.h"
+#include "IECore/VectorTypedData.h"
+
+using namespace boost::python;
+using namespace IECore;
+
+namespace IECorePython
+{
+
+template<typename T>
+void bindBoundingVolumeHierarchy( const char *bindName );
+
+void bindBoundingVolumeHierarchy()
+{
+	bindBoundingVolumeHierarchy<Box2fBVH>( "Box2fBVH" );
+	bindBoundingVolumeHierarchy<Box2dBVH>( "Box2dBVH" );
+	bindBoundingVolumeHierarchy<Box3fBVH>( "Box3fBVH" );
+	bindBoundingVolumeHierarchy<Box3dBVH>( "Box3dBVH" );
+}
+
+template<typename T>
+struct BoundingVolumeHierarchyWrapper
+{
+	typedef TypedData<std::vector<typename T::Bound> > BoundData;
+	IE_CORE_DECLAREPTR( BoundData )
+
+	typename T::Ptr m_bvh;
+
+	BoundDataPtr m_bounds;
+
+	BoundingVolumeHierarchyWrapper( BoundDataPtr bounds, unsigned maxLeafSize )
+	{
+		m_bounds = bounds->copy();
+		ScopedGILRelease gilRelease;
+		m_bvh = new T( m_bounds->readable().begin(), m_bounds->readable().end(), maxLeafSize );
+	}
+
+	void refit( BoundDataPtr bounds )
+	{
+		m_bounds = bounds->copy();
+		ScopedGILRelease gilRelease;
+		m_bvh->refit( m_bounds->readable().begin(), m_bounds->readable().end() );
+	}
+
+	size_t numNodes()
+	{
+		return m_bvh->numNodes();
+	}
+
+	template<typename S>
+	IntVectorDataPtr intersectingBounds( const S &b )
+	{
+		std::vector<size_t> indices;
+		m_bvh->intersectingBounds( m_bounds->readable().begin(), b, indices );
+
+		IntVectorDataPtr result = new IntVectorData();
+		result->writable().insert( result->writable().end(), indices.begin(), indices.end() );
+		return result;
+	}
+
+};
+
+template<typename T>
+void bindBoundingVolumeHierarchy( const char *bindName )
+{
+	class_<BoundingVolumeHierarchyWrapper<T>, boost::noncopyable>( bindName, no_init )
+		.def( init<typename BoundingVolumeHierarchyWrapper<T>::BoundDataPtr, unsigned>( ( arg( "bounds" ), arg( "maxLeafSize" ) = 4 ) ) )
+		.def( "refit", &BoundingVolumeHierarchyWrapper<T>::refit )
+		.def( "numNodes", &BoundingVolumeHierarchyWrapper<T>::numNodes )
+		.def( "intersectingBounds", &BoundingVolumeHierarchyWrapper<T>::template intersectingBounds<typename T::Bound> )
+		.def( "intersectingBounds", &BoundingVolumeHierarchyWrapper<T>::template intersectingBounds<typename T::BaseType> )
+	;
+}
+
+}
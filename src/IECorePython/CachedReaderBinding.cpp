@@ -65,9 +65,29 @@ static ObjectPtr read( CachedReader &r, const std::string &f )
 	}
 }
 
+static void clearDiskCache( CachedReader &r )
+{
+	ScopedGILRelease gilRelease;
+	r.clearDiskCache();
+}
+
 void bindCachedReader()
 {
-	RefCountedClass<CachedReader, RefCounted>( "CachedReader" )
+	RefCountedClass<CachedReader, RefCounted> cachedReaderClass( "CachedReader" );
+
+	{
+		scope s( cachedReaderClass );
+
+		class_<CachedReader::Statistics>( "Statistics" )
+			.def_readonly( "hits", &CachedReader::Statistics::hits )
+			.def_readonly( "misses", &CachedReader::Statistics::misses )
+			.def_readonly( "diskCacheHits", &CachedReader::Statistics::diskCacheHits )
+			.def_readonly( "diskCacheMisses", &CachedReader::Statistics::diskCacheMisses )
+			.def_readonly( "loadTime", &CachedReader::Statistics::loadTime )
+		;
+	}
+
+	cachedReaderClass
 		.def( init<const SearchPath &, optional<ObjectPoolPtr> >() )
 		.def( init<const SearchPath &, ConstModifyOpPtr, optional<ObjectPoolPtr> >() )
 		.def( "read", &read )
@@ -78,6 +98,12 @@ void bindCachedReader()
 		.add_property( "searchPath", make_function( &CachedReader::getSearchPath, return_value_policy<copy_const_reference>() ), &CachedReader::setSearchPath )
 		.def( "defaultCachedReader", &CachedReader::defaultCachedReader, return_value_policy<CastToIntrusivePtr>() ).staticmethod( "defaultCachedReader" )
 		.def( "objectPool", &CachedReader::objectPool, return_value_policy<CastToIntrusivePtr>() )
+		.def( "setDiskCache", &CachedReader::setDiskCache, ( arg( "directory" ), arg( "maxSize" ) ) )
+		.def( "getDiskCacheDirectory", &CachedReader::getDiskCacheDirectory, return_value_policy<copy_const_reference>() )
+		.def( "getDiskCacheMaxSize", &CachedReader::getDiskCacheMaxSize )
+		.def( "clearDiskCache", &clearDiskCache )
+		.def( "statistics", &CachedReader::statistics )
+		.def( "resetStatistics", &CachedReader::resetStatistics )
 	;
 }
 
@@ -134,6 +134,13 @@ struct IndexedIOHelper
 		return p->directory(path, missingBehaviour);
 	}
 
+	static void prefetch(IndexedIOPtr p, list l)
+	{
+		IndexedIO::EntryIDList names;
+		IndexedIOHelper::listToEntryIds( l, names );
+		p->prefetch( names );
+	}
+
 	static list entryIds(IndexedIOPtr p)
 	{
 		assert(p);
@@ -375,6 +382,7 @@ void bindIndexedIOBase()
 		.def("metadata", &IndexedIO::metadata)
 		.def("parentDirectory", nonConstParentDirectory)
 		.def("directory",  &IndexedIOHelper::directory, ( arg( "path" ), arg( "missingBehaviour" ) = IndexedIO::ThrowIfMissing ) )
+		.def("prefetch", &IndexedIOHelper::prefetch, ( arg( "names" ) ) )
 		.def("subdirectory", nonConstSubdirectory, ( arg( "name" ), arg( "missingBehaviour" ) = IndexedIO::ThrowIfMissing ) )
 		.def("createSubdirectory", &IndexedIO::createSubdirectory )
 		.def("path", &IndexedIOHelper::path)
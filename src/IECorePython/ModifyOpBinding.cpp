@@ -36,6 +36,7 @@
 
 #include "IECorePython/ModifyOpBinding.h"
 
+#include "IECorePython/ExceptionAlgo.h"
 #include "IECorePython/RunTimeTypedBinding.h"
 #include "IECorePython/ScopedGILLock.h"
 
@@ -67,6 +68,27 @@ class ModifyOpWrapper : public RunTimeTypedWrapper<ModifyOp>
 			this->methodOverride( "modify" )( ObjectPtr( object ), CompoundObjectPtr( const_cast<CompoundObject *>( operands ) ) );
 		};
 
+		bool threadSafe() const override
+		{
+			if( this->isSubclassed() )
+			{
+				ScopedGILLock gilLock;
+				try
+				{
+					if( boost::python::object f = this->methodOverride( "threadSafe" ) )
+					{
+						return boost::python::extract<bool>( f() );
+					}
+				}
+				catch( const boost::python::error_already_set &e )
+				{
+					ExceptionAlgo::translatePythonException();
+				}
+			}
+
+			return ModifyOp::threadSafe();
+		}
+
 };
 
 } // namespace
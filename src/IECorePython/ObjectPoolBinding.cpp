@@ -53,6 +53,11 @@ ObjectPtr store( ObjectPool &pool, Object* obj, ObjectPool::StoreMode storeMode
 	return const_cast< Object * >( pool.store(obj, storeMode).get() );
 }
 
+ObjectPtr storeWithHash( ObjectPool &pool, Object* obj, const MurmurHash &hash, ObjectPool::StoreMode storeMode )
+{
+	return const_cast< Object * >( pool.store(obj, hash, storeMode).get() );
+}
+
 ObjectPtr retrieve( const ObjectPool &pool, MurmurHash key, bool _copy )
 {
 	ConstObjectPtr o = pool.retrieve(key);
@@ -83,18 +88,41 @@ void bindObjectPool()
 			.value("StoreReference", ObjectPool::StoreReference)
 			.export_values()
 		;
+
+		enum_< ObjectPool::EvictionPolicy > ("EvictionPolicy")
+			.value("LRU", ObjectPool::LRU)
+			.value("GreedyDualSize", ObjectPool::GreedyDualSize)
+			.value("PinSmallObjects", ObjectPool::PinSmallObjects)
+			.export_values()
+		;
+
+		class_<ObjectPool::Statistics>( "Statistics" )
+			.def_readonly( "hits", &ObjectPool::Statistics::hits )
+			.def_readonly( "misses", &ObjectPool::Statistics::misses )
+			.def_readonly( "evictions", &ObjectPool::Statistics::evictions )
+			.def_readonly( "objects", &ObjectPool::Statistics::objects )
+			.def_readonly( "memoryUsage", &ObjectPool::Statistics::memoryUsage )
+			.def_readonly( "sharedMemoryUsage", &ObjectPool::Statistics::sharedMemoryUsage )
+		;
 	}
 
 	objectPoolClass
-		.def( init<size_t>() )
+		.def( init<size_t, ObjectPool::EvictionPolicy>( ( arg( "maxMemory" ), arg( "evictionPolicy" ) = ObjectPool::LRU ) ) )
 		.def( "erase", &ObjectPool::erase )
 		.def( "clear", &ObjectPool::clear )
 		.def( "retrieve", &retrieve, ( arg("key"), arg("_copy") = true ) )		/// _copy=false provides low level access to the pointer stored in the cache
 		.def( "store",  &store )
+		.def( "store",  &storeWithHash )
 		.def( "contains", &ObjectPool::contains )
 		.def( "memoryUsage", &ObjectPool::memoryUsage )
 		.def( "getMaxMemoryUsage", &ObjectPool::getMaxMemoryUsage)
 		.def( "setMaxMemoryUsage", &ObjectPool::setMaxMemoryUsage )
+		.def( "setEvictionPolicy", &ObjectPool::setEvictionPolicy )
+		.def( "getEvictionPolicy", &ObjectPool::getEvictionPolicy )
+		.def( "setPinnedObjectSize", &ObjectPool::setPinnedObjectSize )
+		.def( "getPinnedObjectSize", &ObjectPool::getPinnedObjectSize )
+		.def( "statistics", &ObjectPool::statistics )
+		.def( "resetStatistics", &ObjectPool::resetStatistics )
 		.def( "defaultObjectPool", &ObjectPool::defaultObjectPool, return_value_policy<CastToIntrusivePtr>() )
 		.staticmethod( "defaultObjectPool" )
 	;
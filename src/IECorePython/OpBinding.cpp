@@ -85,6 +85,7 @@ void bindOp()
 		.def( init< const std::string &, ParameterPtr >( ( arg( "description" ), arg( "resultParameter") ) ) )
 		.def( init< const std::string &, CompoundParameterPtr, ParameterPtr >( ( arg( "description" ), arg( "compoundParameter" ), arg( "resultParameter") ) ) )
 		.def( "resultParameter", &resultParameter )
+		.def( "threadSafe", &Op::threadSafe )
 		.def( "operate", &operate )
 		.def( "operate", &operateWithArgs )
 		.def( "__call__", &operate )
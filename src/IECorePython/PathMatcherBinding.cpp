@@ -41,8 +41,10 @@
 
 #include "IECorePython/RunTimeTypedBinding.h"
 
+#include "IECore/FlatPathMatcher.h"
 #include "IECore/PathMatcher.h"
 #include "IECore/PathMatcherData.h"
+#include "IECore/StringAlgo.h"
 #include "IECore/VectorTypedData.h"
 
 #include "boost/format.hpp"
@@ -310,6 +312,56 @@ std::string pathMatcherRepr( object p )
 	return "IECore.PathMatcher( " + paths + " )";
 }
 
+FlatPathMatcher *constructFlatPathMatcherFromObject( boost::python::object oPaths )
+{
+	std::vector<std::vector<InternedString>> paths;
+	paths.reserve( len( oPaths ) );
+	for( size_t i = 0, e = len( oPaths ); i < e; ++i )
+	{
+		object path = oPaths[i];
+		extract<const IECore::InternedStringVectorData *> pathDataExtractor( path );
+		const IECore::InternedStringVectorData *pathData = pathDataExtractor.check() ? pathDataExtractor() : nullptr;
+		if( pathData )
+		{
+			paths.push_back( pathData->readable() );
+		}
+		else
+		{
+			const std::string s = extract<std::string>( path );
+			if( s.empty() )
+			{
+				continue;
+			}
+			paths.push_back( std::vector<InternedString>() );
+			StringAlgo::tokenize( s, '/', paths.back() );
+		}
+	}
+	return new FlatPathMatcher( paths );
+}
+
+FlatPathMatcher *constructFlatPathMatcherFromVectorData( IECore::ConstStringVectorDataPtr paths )
+{
+	return new FlatPathMatcher( paths->readable() );
+}
+
+list flatPaths( const FlatPathMatcher &p )
+{
+	std::vector<std::string> paths;
+	p.paths( paths );
+	list result;
+	for( std::vector<std::string>::const_iterator it = paths.begin(), eIt = paths.end(); it != eIt; it++ )
+	{
+		result.append( *it );
+	}
+	return result;
+}
+
+std::string flatPathMatcherRepr( object p )
+{
+	std::string paths = extract<std::string>( p.attr( "paths" )().attr( "__repr__" )() );
+	return "IECore.FlatPathMatcher( " + paths + " )";
+}
+
 std::string pathMatcherDataRepr( object d )
 {
 	std::string p = extract<std::string>( d.attr( "value" ).attr( "__repr__" )() );
@@ -337,6 +389,25 @@ void IECorePython::bindPathMatcher()
 		.def( "__repr__", &pathMatcherDataRepr )
 	;
 
+	class_<FlatPathMatcher>( "FlatPathMatcher" )
+		.def( "__init__", make_constructor( constructFlatPathMatcherFromObject ) )
+		.def( "__init__", make_constructor( constructFlatPathMatcherFromVectorData ) )
+		.def( init<const PathMatcher &>() )
+		.def( init<const FlatPathMatcher &>() )
+		.def( "pathMatcher", &FlatPathMatcher::pathMatcher )
+		.def( "isEmpty", &FlatPathMatcher::isEmpty )
+		.def( "size", &FlatPathMatcher::size )
+		.def( "paths", &flatPaths )
+		.def( "match", (unsigned (FlatPathMatcher::*)( const std::vector<IECore::InternedString> & ) const)&FlatPathMatcher::match )
+		.def( "match", (unsigned (FlatPathMatcher::*)( const std::string & ) const)&FlatPathMatcher::match )
+		.def( "unionWith", &FlatPathMatcher::unionWith )
+		.def( "intersection", &FlatPathMatcher::intersection )
+		.def( "difference", &FlatPathMatcher::difference )
+		.def( "__repr__", &flatPathMatcherRepr )
+		.def( self == self )
+		.def( self != self )
+	;
+
 	scope s = class_<PathMatcher>( "PathMatcher" )
 		.def( "__init__", make_constructor( constructFromObject ) )
 		.def( "__init__", make_constructor( constructFromVectorData ) )
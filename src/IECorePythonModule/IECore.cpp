@@ -93,6 +93,7 @@
 #include "IECorePython/TransformationMatrixBinding.h"
 #include "IECorePython/TransformationMatrixDataBinding.h"
 #include "IECorePython/BoundedKDTreeBinding.h"
+#include "IECorePython/BoundingVolumeHierarchyBinding.h"
 #include "IECorePython/VectorDataFilterOpBinding.h"
 #include "IECorePython/TypedObjectParameterBinding.h"
 #include "IECorePython/HeaderGeneratorBinding.h"
@@ -237,6 +238,7 @@ BOOST_PYTHON_MODULE(_IECore)
 	bindTransformationMatrix();
 	bindTransformationMatrixData();
 	bindBoundedKDTree();
+	bindBoundingVolumeHierarchy();
 	bindVectorDataFilterOp();
 	bindTypedObjectParameter();
 	bindHeaderGenerator();
@@ -380,6 +380,24 @@ PrimitiveEvaluator::ResultPtr CurvesPrimitiveEvaluator::createResult() const
 	return new Result( m_p, m_curvesPrimitive->basis() == CubicBasisf::linear(), m_curvesPrimitive->periodic() );
 }
 
+PrimitiveEvaluator::BatchResultFunction CurvesPrimitiveEvaluator::batchResultFunction( CompoundData *batchResult, size_t size ) const
+{
+	// We don't call the base class implementation, because our
+	// results don't provide normals.
+	IntVectorDataPtr curveIndexData = new IntVectorData( std::vector<int>( size, 0 ) );
+	V2fVectorDataPtr uvData = new V2fVectorData( std::vector<V2f>( size, V2f( 0 ) ) );
+	batchResult->writable()["curveIndex"] = curveIndexData;
+	batchResult->writable()["uv"] = uvData;
+
+	std::vector<int> *curveIndices = &curveIndexData->writable();
+	std::vector<V2f> *uvs = &uvData->writable();
+	return [curveIndices, uvs]( const PrimitiveEvaluator::Result *result, size_t index ) {
+		const Result *curvesResult = static_cast<const Result *>( result );
+		(*curveIndices)[index] = curvesResult->curveIndex();
+		(*uvs)[index] = curvesResult->uv();
+	};
+}
+
 void CurvesPrimitiveEvaluator::validateResult( PrimitiveEvaluator::Result *result ) const
 {
 	if( ! dynamic_cast<CurvesPrimitiveEvaluator::Result *>( result ) )
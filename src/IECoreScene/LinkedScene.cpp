@@ -1075,6 +1075,22 @@ PrimitiveVariableMap LinkedScene::readObjectPrimitiveVariables( const std::vecto
 	}
 }
 
+ConstObjectPtr LinkedScene::readObjectWithPrimitiveVariables( const std::vector<InternedString> &primVarNames, double time ) const
+{
+	if ( m_linkedScene )
+	{
+		if ( m_timeRemapped )
+		{
+			time = remappedLinkTime( time );
+		}
+		return m_linkedScene->readObjectWithPrimitiveVariables( primVarNames, time );
+	}
+	else
+	{
+		return m_mainScene->readObjectWithPrimitiveVariables( primVarNames, time );
+	}
+}
+
 void LinkedScene::writeObject( const Object *object, double time )
 {
 	if ( m_readOnly )
@@ -33,55 +33,113 @@
 //////////////////////////////////////////////////////////////////////////
 
 #include "IECoreScene/MeshAlgo.h"
+#include "IECoreScene/private/MeshAlgoUtils.h"
+
+#include <algorithm>
+#include <numeric>
 
 using namespace std;
 using namespace IECore;
 using namespace IECoreScene;
 
-pair<IntVectorDataPtr, IntVectorDataPtr> MeshAlgo::connectedVertices( const MeshPrimitive *mesh )
+namespace
+{
+
+CompoundDataPtr connectedVerticesTables( const MeshPrimitive *mesh, size_t numVertices, const Canceller *canceller )
 {
-	size_t numVertices = mesh->variableData< V3fVectorData >( "P", PrimitiveVariable::Vertex )->readable().size();
 	const vector<int> &numVerticesPerFace = mesh->verticesPerFace()->readable();
 	const vector<int> &vertexIds = mesh->vertexIds()->readable();
 
-	vector< set<int> > neighbors( numVertices );
+	ConstIntVectorDataPtr faceOffsetsData = Detail::faceVertexOffsets( mesh );
+	const vector<int> &faceOffsets = faceOffsetsData->readable();
+
+	const Detail::InverseFaceVertexIndices vertexFaces = Detail::vertexFaces( mesh, numVertices );
+	const vector<int> &vertexFaceVertexOffsets = vertexFaces.offsets->readable();
+	const vector<int> &vertexFaceVertices = vertexFaces.faceVertices->readable();
+	const vector<int> &vertexFaceIndices = vertexFaces.faces->readable();
 
-	int currentVertOffset = 0;
-	for ( auto &vertsPerFace : numVerticesPerFace )
+	// the neighbors of a vertex are the previous and next vertices
+	// of each face-vertex referencing it, sorted and without duplicates.
+	auto neighbors = [&]( size_t vertex, vector<int> &result )
 	{
-		for ( int i = 0; i < vertsPerFace; ++i)
+		result.clear();
+		for( int i = vertexFaceVertexOffsets[vertex]; i < vertexFaceVertexOffsets[vertex+1]; ++i )
 		{
-			const int &faceVert = vertexIds[ currentVertOffset + i ];
-			const int &faceVertNext = vertexIds[ currentVertOffset + ( i + 1 ) % vertsPerFace ];
-			neighbors[ faceVert ].insert( faceVertNext );
-			neighbors[ faceVertNext ].insert( faceVert );
+			const int face = vertexFaceIndices[i];
+			const int vertsPerFace = numVerticesPerFace[face];
+			const int faceVertIndex = vertexFaceVertices[i] - faceOffsets[face];
+			result.push_back( vertexIds[ faceOffsets[face] + ( faceVertIndex + 1 ) % vertsPerFace ] );
+			result.push_back( vertexIds[ faceOffsets[face] + ( faceVertIndex + vertsPerFace - 1 ) % vertsPerFace ] );
 		}
-		currentVertOffset += vertsPerFace;
-	}
-
-	int neighborCount = 0;
-	for ( auto &n : neighbors )
-	{
-		neighborCount += n.size();
-	}
+		sort( result.begin(), result.end() );
+		result.erase( unique( result.begin(), result.end() ), result.end() );
+	};
 
 	IntVectorDataPtr offsets = new IntVectorData();
 	IntVectorDataPtr neighborList = new IntVectorData();
 	vector<int> &offsetsW = offsets->writable();
 	vector<int> &neighborListW = neighborList->writable();
 
-	neighborListW.resize( neighborCount, -1 );
-	offsetsW.resize( neighbors.size(), -1 );
+	// count the neighbors of each vertex, and then accumulate
+	// the counts into offsets before filling in the neighbors.
+	offsetsW.resize( numVertices, -1 );
+	Detail::parallelFor(
+		numVertices, canceller,
+		[&]( const tbb::blocked_range<size_t> &range )
+		{
+			vector<int> n;
+			for( size_t i = range.begin(); i != range.end(); ++i )
+			{
+				neighbors( i, n );
+				offsetsW[i] = n.size();
+			}
+		}
+	);
 
-	int ix = 0;
-	for ( size_t i = 0; i < neighbors.size(); ++i )
-	{
-		for ( auto &n : neighbors[ i ] )
+	partial_sum( offsetsW.begin(), offsetsW.end(), offsetsW.begin() );
+	neighborListW.resize( offsetsW.empty() ? 0 : offsetsW.back(), -1 );
+
+	Detail::parallelFor(
+		numVertices, canceller,
+		[&]( const tbb::blocked_range<size_t> &range )
 		{
-			neighborListW[ ix++ ] = n;
+			vector<int> n;
+			for( size_t i = range.begin(); i != range.end(); ++i )
+			{
+				neighbors( i, n );
+				copy( n.begin(), n.end(), neighborListW.begin() + ( i > 0 ? offsetsW[i - 1] : 0 ) );
+			}
+		}
+	);
+
+	CompoundDataPtr result = new CompoundData;
+	result->writable()["neighbors"] = neighborList;
+	result->writable()["offsets"] = offsets;
+	return result;
+}
+
+} // namespace
+
+pair<IntVectorDataPtr, IntVectorDataPtr> MeshAlgo::connectedVertices( const MeshPrimitive *mesh, const Canceller *canceller )
+{
+	Canceller::check( canceller );
+
+	size_t numVertices = mesh->variableData< V3fVectorData >( "P", PrimitiveVariable::Vertex )->readable().size();
+
+	MurmurHash key;
+	key.append( "connectedVertices" );
+	key.append( (uint64_t)numVertices );
+
+	ConstCompoundDataPtr tables = Detail::cachedTopologyTables(
+		mesh, key,
+		[mesh, numVertices, canceller] {
+			return connectedVerticesTables( mesh, numVertices, canceller );
 		}
-		offsetsW[ i ] = ix;
-	}
+	);
 
-	return pair<IntVectorDataPtr, IntVectorDataPtr>( neighborList, offsets );
+	// the copies share storage with the cached tables until they are modified.
+	return pair<IntVectorDataPtr, IntVectorDataPtr>(
+		tables->member<IntVectorData>( "neighbors" )->copy(),
+		tables->member<IntVectorData>( "offsets" )->copy()
+	);
 }
@@ -33,6 +33,7 @@
 //////////////////////////////////////////////////////////////////////////
 
 #include "IECoreScene/MeshAlgo.h"
+#include "IECoreScene/private/MeshAlgoUtils.h"
 #include "IECoreScene/private/PrimitiveVariableAlgos.h"
 
 #include "IECore/DespatchTypedData.h"
@@ -129,8 +130,10 @@ void deleteCreases( MeshPrimitive *out, const MeshPrimitive *in, const std::vect
 };
 
 template<typename T>
-MeshPrimitivePtr deleteFaces( const MeshPrimitive *meshPrimitive, PrimitiveVariable::IndexedView<T> &deleteFlagView, bool invert )
+MeshPrimitivePtr deleteFaces( const MeshPrimitive *meshPrimitive, PrimitiveVariable::IndexedView<T> &deleteFlagView, bool invert, const Canceller *canceller )
 {
+	Canceller::check( canceller );
+
 	// construct 3 functors for deleting (uniform, vertex & face varying) primvars
 	IECoreScene::PrimitiveVariableAlgos::DeleteFlaggedUniformFunctor<T> uniformFunctor( deleteFlagView, invert );
 	IECoreScene::PrimitiveVariableAlgos::DeleteFlaggedFaceVaryingFunctor<T> faceVaryingFunctor( deleteFlagView, meshPrimitive->verticesPerFace(), invert );
@@ -153,10 +156,16 @@ MeshPrimitivePtr deleteFaces( const MeshPrimitive *meshPrimitive, PrimitiveVaria
 	const std::vector<int> &remapping = remappingData->readable();
 	IntVectorDataPtr vertexIdsData = IECore::runTimeCast<IECore::IntVectorData>( outputVertexIds.data );
 	IntVectorData::ValueType &vertexIds = vertexIdsData->writable();
-	for( size_t i = 0; i < vertexIds.size(); ++i )
-	{
-		vertexIds[i] = remapping[vertexIds[i]];
-	}
+	IECoreScene::Detail::parallelFor(
+		vertexIds.size(), canceller,
+		[&]( const tbb::blocked_range<size_t> &range )
+		{
+			for( size_t i = range.begin(); i != range.end(); ++i )
+			{
+				vertexIds[i] = remapping[vertexIds[i]];
+			}
+		}
+	);
 
 	// construct mesh without positions as they'll be set when filtering the primvars
 	MeshPrimitivePtr outMeshPrimitive = new MeshPrimitive( verticesPerFace, vertexIdsData, meshPrimitive->interpolation() );
@@ -164,6 +173,7 @@ MeshPrimitivePtr deleteFaces( const MeshPrimitive *meshPrimitive, PrimitiveVaria
 	deleteCorners( outMeshPrimitive.get(), meshPrimitive, remapping );
 	deleteCreases( outMeshPrimitive.get(), meshPrimitive, remapping );
 
+	std::vector<PrimitiveVariableMap::const_iterator> inputVariables;
 	for( PrimitiveVariableMap::const_iterator it = meshPrimitive->variables.begin(), e = meshPrimitive->variables.end(); it != e; ++it )
 	{
 		if( !meshPrimitive->isPrimitiveVariableValid( it->second ) )
@@ -171,49 +181,73 @@ MeshPrimitivePtr deleteFaces( const MeshPrimitive *meshPrimitive, PrimitiveVaria
 			throw InvalidArgumentException(
 				boost::str ( boost::format( "MeshAlgo::deleteFaces cannot process invalid primitive variable \"%s\"" ) % it->first ) );
 		}
+		inputVariables.push_back( it );
+	}
 
-		switch( it->second.interpolation )
+	// filter the primitive variables in parallel, using a copy of the
+	// appropriate functor for each, since the functors hold per-variable
+	// state in the form of the indices.
+	std::vector<PrimitiveVariable> outputVariables( inputVariables.size() );
+	tbb::task_group_context taskGroupContext( tbb::task_group_context::isolated );
+	tbb::parallel_for(
+		tbb::blocked_range<size_t>( 0, inputVariables.size(), 1 ),
+		[&]( const tbb::blocked_range<size_t> &range )
 		{
-			case PrimitiveVariable::Uniform:
+			for( size_t i = range.begin(); i != range.end(); ++i )
 			{
-				const IECore::Data *inputData = it->second.data.get();
-				uniformFunctor.setIndices( it->second.indices.get() );
-				IECoreScene::PrimitiveVariableAlgos::IndexedData outputData = dispatch( inputData, uniformFunctor );
-				outMeshPrimitive->variables[it->first] = PrimitiveVariable( it->second.interpolation, outputData.data, outputData.indices );
-				break;
-			}
-			case PrimitiveVariable::Vertex:
-			case PrimitiveVariable::Varying:
-			{
-				const IECore::Data *inputData = it->second.data.get();
-				vertexFunctor.setIndices( it->second.indices.get() );
-				IECoreScene::PrimitiveVariableAlgos::IndexedData outputData = dispatch( inputData, vertexFunctor );
-				outMeshPrimitive->variables[it->first] = PrimitiveVariable( it->second.interpolation, outputData.data, outputData.indices );
-				break;
+				Canceller::check( canceller );
+				const PrimitiveVariable &primitiveVariable = inputVariables[i]->second;
+				const IECore::Data *inputData = primitiveVariable.data.get();
+				switch( primitiveVariable.interpolation )
+				{
+					case PrimitiveVariable::Uniform:
+					{
+						auto functor = uniformFunctor;
+						functor.setIndices( primitiveVariable.indices.get() );
+						IECoreScene::PrimitiveVariableAlgos::IndexedData outputData = dispatch( inputData, functor );
+						outputVariables[i] = PrimitiveVariable( primitiveVariable.interpolation, outputData.data, outputData.indices );
+						break;
+					}
+					case PrimitiveVariable::Vertex:
+					case PrimitiveVariable::Varying:
+					{
+						auto functor = vertexFunctor;
+						functor.setIndices( primitiveVariable.indices.get() );
+						IECoreScene::PrimitiveVariableAlgos::IndexedData outputData = dispatch( inputData, functor );
+						outputVariables[i] = PrimitiveVariable( primitiveVariable.interpolation, outputData.data, outputData.indices );
+						break;
+					}
+					case PrimitiveVariable::FaceVarying:
+					{
+						auto functor = faceVaryingFunctor;
+						functor.setIndices( primitiveVariable.indices.get() );
+						IECoreScene::PrimitiveVariableAlgos::IndexedData outputData = dispatch( inputData, functor );
+						outputVariables[i] = PrimitiveVariable( primitiveVariable.interpolation, outputData.data, outputData.indices );
+						break;
+					}
+					case PrimitiveVariable::Constant:
+					case PrimitiveVariable::Invalid:
+					{
+						outputVariables[i] = primitiveVariable;
+						break;
+					}
+				}
 			}
+		},
+		taskGroupContext
+	);
 
-			case PrimitiveVariable::FaceVarying:
-			{
-				const IECore::Data *inputData = it->second.data.get();
-				faceVaryingFunctor.setIndices( it->second.indices.get() );
-				IECoreScene::PrimitiveVariableAlgos::IndexedData outputData = dispatch(inputData, faceVaryingFunctor );
-				outMeshPrimitive->variables[it->first] = PrimitiveVariable( it->second.interpolation, outputData.data, outputData.indices );
-				break;
-			}
-			case PrimitiveVariable::Constant:
-			case PrimitiveVariable::Invalid:
-			{
-				outMeshPrimitive->variables[it->first] = it->second;
-				break;
-			}
-		}
+	for( size_t i = 0; i < inputVariables.size(); ++i )
+	{
+		outMeshPrimitive->variables[inputVariables[i]->first] = outputVariables[i];
 	}
+
 	return outMeshPrimitive;
 }
 
 } // namespace
 
-MeshPrimitivePtr IECoreScene::MeshAlgo::deleteFaces( const MeshPrimitive *meshPrimitive, const PrimitiveVariable &facesToDelete, bool invert )
+MeshPrimitivePtr IECoreScene::MeshAlgo::deleteFaces( const MeshPrimitive *meshPrimitive, const PrimitiveVariable &facesToDelete, bool invert, const Canceller *canceller )
 {
 
 	if( facesToDelete.interpolation != PrimitiveVariable::Uniform )
@@ -226,7 +260,7 @@ MeshPrimitivePtr IECoreScene::MeshAlgo::deleteFaces( const MeshPrimitive *meshPr
 	if( intDeleteFlagData )
 	{
 		PrimitiveVariable::IndexedView<int> deleteFlagView( facesToDelete );
-		return ::deleteFaces( meshPrimitive, deleteFlagView, invert );
+		return ::deleteFaces( meshPrimitive, deleteFlagView, invert, canceller );
 	}
 
 	const BoolVectorData *boolDeleteFlagData = runTimeCast<const BoolVectorData>( facesToDelete.data.get() );
@@ -234,7 +268,7 @@ MeshPrimitivePtr IECoreScene::MeshAlgo::deleteFaces( const MeshPrimitive *meshPr
 	if( boolDeleteFlagData )
 	{
 		PrimitiveVariable::IndexedView<bool> deleteFlagView( facesToDelete );
-		return ::deleteFaces( meshPrimitive, deleteFlagView, invert );
+		return ::deleteFaces( meshPrimitive, deleteFlagView, invert, canceller );
 	}
 
 	const FloatVectorData *floatDeleteFlagData = runTimeCast<const FloatVectorData>( facesToDelete.data.get() );
@@ -242,7 +276,7 @@ MeshPrimitivePtr IECoreScene::MeshAlgo::deleteFaces( const MeshPrimitive *meshPr
 	if( floatDeleteFlagData )
 	{
 		PrimitiveVariable::IndexedView<float> deleteFlagView( facesToDelete );
-		return ::deleteFaces( meshPrimitive, deleteFlagView, invert );
+		return ::deleteFaces( meshPrimitive, deleteFlagView, invert, canceller );
 	}
 
 	throw InvalidArgumentException( "MeshAlgo::deleteFaces requires an Uniform [Int|Bool|Float]VectorData primitiveVariable " );
@@ -34,6 +34,9 @@
 
 #include "IECoreScene/MeshAlgo.h"
 #include "IECoreScene/PolygonIterator.h"
+#include "IECoreScene/private/MeshAlgoUtils.h"
+
+#include <numeric>
 
 using namespace std;
 using namespace Imath;
@@ -76,97 +79,177 @@ struct VertexDistortion
 	}
 };
 
+// Calls `accumulator` for the two edges adjacent to each of the face-vertices
+// referencing `index`, as listed by `IECoreScene::Detail::invertFaceVertexIndices()`. Edges
+// are visited in the same order as a serial loop over the faces would visit
+// them, so that outputs can be computed independently of one another but still
+// match the results of a serial accumulation.
+template<typename Accumulator>
+void accumulateEdges(
+	const vector<int> &vertsPerFace, const vector<int> &faceOffsets,
+	const vector<int> &offsets, const vector<int> &faceVertices, const vector<int> &faces,
+	size_t index, Accumulator &&accumulator
+)
+{
+	for( int i = offsets[index]; i < offsets[index+1]; ++i )
+	{
+		const size_t fvi = faceVertices[i];
+		const size_t firstFvi = faceOffsets[faces[i]];
+		if( fvi == firstFvi )
+		{
+			accumulator( fvi );
+			accumulator( firstFvi + vertsPerFace[faces[i]] - 1 );
+		}
+		else
+		{
+			accumulator( fvi - 1 );
+			accumulator( fvi );
+		}
+	}
+}
+
 std::pair<PrimitiveVariable, PrimitiveVariable> calculateDistortionInternal(
 	const vector<int> &vertsPerFace,
 	const vector<int> &vertIds,
 	const vector<Imath::V3f> &p,
 	const vector<Imath::V3f> &pRef,
-	const PrimitiveVariable &uvPrimitiveVariable
+	const PrimitiveVariable &uvPrimitiveVariable,
+	const Canceller *canceller
 )
 {
 	PrimitiveVariable::IndexedView<V2f> uvs( uvPrimitiveVariable );
 
-	vector<VertexDistortion> distortions;
-	distortions.resize( p.size() );
-
-	vector<UVDistortion> uvDistortions;
-	uvDistortions.resize( uvs.data().size() );
+	const vector<int> faceOffsets = IECoreScene::Detail::faceVertexOffsets( vertsPerFace );
 
-	size_t fvi0 = 0;
+	// compute the distortion and uv direction along each edge. the
+	// edge starting at each face-vertex is stored at the same index.
 
-	for( size_t faceIndex = 0; faceIndex < vertsPerFace.size() ; faceIndex++ )
-	{
-		size_t firstFvi = fvi0;
-		unsigned vertex0 = vertIds[ fvi0 ];
-		Imath::V2f uv0( uvs[ fvi0 ] );
+	vector<float> edgeDistortions( vertIds.size() );
+	vector<Imath::V2f> edgeUVDirections( vertIds.size() );
 
-		for ( int v = 1; v <= vertsPerFace[faceIndex]; v++, fvi0++ )
+	IECoreScene::Detail::parallelFor(
+		vertsPerFace.size(), canceller,
+		[&]( const tbb::blocked_range<size_t> &range )
 		{
-			size_t fvi1 = fvi0 + 1;
-			if ( v == vertsPerFace[faceIndex] )
-			{
-				// final edge must also be computed...
-				fvi1 = firstFvi;
-			}
-			unsigned vertex1 = vertIds[ fvi1 ];
-			// compute distortion along the edge
-			const V3f &p0 = p[ vertex0 ];
-			const V3f &refP0 = pRef[ vertex0 ];
-			const V3f &p1 = p[ vertex1 ];
-			const V3f &refP1 = pRef[ vertex1 ];
-			V3f edge = p1 - p0;
-			V3f refEdge = refP1 - refP0;
-			float edgeLen = edge.length();
-			float refEdgeLen = refEdge.length();
-			float distortion = 0;
-			if ( edgeLen >= refEdgeLen )
+			for( size_t faceIndex = range.begin(); faceIndex != range.end(); ++faceIndex )
 			{
-				distortion = fabs((edgeLen / refEdgeLen) - 1.0f);
-			}
-			else
-			{
-				distortion = -fabs( (refEdgeLen / edgeLen) - 1.0f );
-			}
+				const size_t firstFvi = faceOffsets[faceIndex];
+				size_t fvi0 = firstFvi;
+				unsigned vertex0 = vertIds[ fvi0 ];
+				Imath::V2f uv0( uvs[ fvi0 ] );
+
+				for ( int v = 1; v <= vertsPerFace[faceIndex]; v++, fvi0++ )
+				{
+					size_t fvi1 = fvi0 + 1;
+					if ( v == vertsPerFace[faceIndex] )
+					{
+						// final edge must also be computed...
+						fvi1 = firstFvi;
+					}
+					unsigned vertex1 = vertIds[ fvi1 ];
+					// compute distortion along the edge
+					const V3f &p0 = p[ vertex0 ];
+					const V3f &refP0 = pRef[ vertex0 ];
+					const V3f &p1 = p[ vertex1 ];
+					const V3f &refP1 = pRef[ vertex1 ];
+					V3f edge = p1 - p0;
+					V3f refEdge = refP1 - refP0;
+					float edgeLen = edge.length();
+					float refEdgeLen = refEdge.length();
+					float distortion = 0;
+					if ( edgeLen >= refEdgeLen )
+					{
+						distortion = fabs((edgeLen / refEdgeLen) - 1.0f);
+					}
+					else
+					{
+						distortion = -fabs( (refEdgeLen / edgeLen) - 1.0f );
+					}
+					edgeDistortions[ fvi0 ] = distortion;
+					vertex0 = vertex1;
 
-			// accumulate vertex distortions
-			distortions[ vertex0 ].accumulateDistortion( distortion );
-			distortions[ vertex1 ].accumulateDistortion( distortion );
-			vertex0 = vertex1;
-
-			// compute uv vector
-			Imath::V2f uv1( uvs[ fvi1 ] );
-			const Imath::V2f uvDir = (uv1 - uv0).normalized();
-			// accumulate uv distortion
-			uvDistortions[ uvs.index( fvi0 ) ].accumulateDistortion( distortion, uvDir );
-			uvDistortions[ uvs.index( fvi1 ) ].accumulateDistortion( distortion, uvDir );
-			uv0 = uv1;
+					// compute uv vector
+					Imath::V2f uv1( uvs[ fvi1 ] );
+					edgeUVDirections[ fvi0 ] = (uv1 - uv0).normalized();
+					uv0 = uv1;
+				}
+			}
 		}
-		fvi0 = firstFvi + vertsPerFace[faceIndex];
-	}
+	);
 
-	// normalize distortions and build output vectors
+	// accumulate the distortions of the two edges adjacent to each
+	// face-vertex onto its vertex and uv.
 
 	// create the distortion prim var.
 	FloatVectorDataPtr distortionData = new FloatVectorData();
 	std::vector<float> &distortionVec = distortionData->writable();
-	distortionVec.reserve( distortions.size() );
-	for( auto &dist : distortions )
+	distortionVec.resize( p.size() );
+
 	{
-		float invCounter = 0;
-		if ( dist.counter )
-		{
-			invCounter = ( 1.0f / dist.counter );
-		}
-		distortionVec.push_back( dist.distortion * invCounter );
+		vector<int> offsets;
+		vector<int> faceVertices;
+		vector<int> faces;
+		IECoreScene::Detail::invertFaceVertexIndices( vertsPerFace, vertIds, p.size(), offsets, &faceVertices, &faces );
+
+		IECoreScene::Detail::parallelFor(
+			p.size(), canceller,
+			[&]( const tbb::blocked_range<size_t> &range )
+			{
+				for( size_t vertex = range.begin(); vertex != range.end(); ++vertex )
+				{
+					VertexDistortion dist;
+					accumulateEdges(
+						vertsPerFace, faceOffsets, offsets, faceVertices, faces, vertex,
+						[&]( size_t edge ) { dist.accumulateDistortion( edgeDistortions[edge] ); }
+					);
+
+					// normalize distortions
+					float invCounter = 0;
+					if ( dist.counter )
+					{
+						invCounter = ( 1.0f / dist.counter );
+					}
+					distortionVec[vertex] = dist.distortion * invCounter;
+				}
+			}
+		);
 	}
 
 	// create U and V distortions
 	V2fVectorDataPtr uvDistortionData = new V2fVectorData();
 	std::vector<Imath::V2f> &uvDistortionVec = uvDistortionData->writable();
-	uvDistortionVec.reserve( uvDistortions.size() );
-	for( const auto &uvDist : uvDistortions )
+	uvDistortionVec.resize( uvs.data().size() );
+
 	{
-		uvDistortionVec.push_back( uvDist.distortion / max( 1, uvDist.counter ) );
+		vector<int> offsets;
+		vector<int> faceVertices;
+		vector<int> faces;
+		if( uvs.indices() )
+		{
+			IECoreScene::Detail::invertFaceVertexIndices( vertsPerFace, *uvs.indices(), uvs.data().size(), offsets, &faceVertices, &faces );
+		}
+		else
+		{
+			vector<int> identity( vertIds.size() );
+			iota( identity.begin(), identity.end(), 0 );
+			IECoreScene::Detail::invertFaceVertexIndices( vertsPerFace, identity, uvs.data().size(), offsets, &faceVertices, &faces );
+		}
+
+		IECoreScene::Detail::parallelFor(
+			uvs.data().size(), canceller,
+			[&]( const tbb::blocked_range<size_t> &range )
+			{
+				for( size_t uv = range.begin(); uv != range.end(); ++uv )
+				{
+					UVDistortion uvDist;
+					accumulateEdges(
+						vertsPerFace, faceOffsets, offsets, faceVertices, faces, uv,
+						[&]( size_t edge ) { uvDist.accumulateDistortion( edgeDistortions[edge], edgeUVDirections[edge] ); }
+					);
+					uvDistortionVec[uv] = uvDist.distortion / max( 1, uvDist.counter );
+				}
+			}
+		);
 	}
 
 	return std::make_pair(
@@ -181,7 +264,7 @@ std::pair<PrimitiveVariable, PrimitiveVariable> calculateDistortionInternal(
 
 } // namespace
 
-std::pair<PrimitiveVariable, PrimitiveVariable> MeshAlgo::calculateDistortion( const MeshPrimitive *mesh, const std::string &uvSet, const std::string &referencePosition, const std::string &position )
+std::pair<PrimitiveVariable, PrimitiveVariable> MeshAlgo::calculateDistortion( const MeshPrimitive *mesh, const std::string &uvSet, const std::string &referencePosition, const std::string &position, const Canceller *canceller )
 {
 	const V3fVectorData *pData = mesh->variableData<V3fVectorData>( position, PrimitiveVariable::Vertex );
 	if( !pData )
@@ -209,6 +292,7 @@ std::pair<PrimitiveVariable, PrimitiveVariable> MeshAlgo::calculateDistortion( c
 		mesh->vertexIds()->readable(),
 		pData->readable(),
 		pRefData->readable(),
-		uvIt->second
+		uvIt->second,
+		canceller
 	);
 }
@@ -34,6 +34,7 @@
 
 #include "IECoreScene/MeshAlgo.h"
 #include "IECoreScene/PolygonIterator.h"
+#include "IECoreScene/private/MeshAlgoUtils.h"
 
 #include "IECore/PolygonAlgo.h"
 
@@ -65,7 +66,7 @@ struct V2fToV3f
 
 } // namespace
 
-PrimitiveVariable MeshAlgo::calculateFaceArea( const MeshPrimitive *mesh, const std::string &position )
+PrimitiveVariable MeshAlgo::calculateFaceArea( const MeshPrimitive *mesh, const std::string &position, const Canceller *canceller )
 {
 	const V3fVectorData *pData = mesh->variableData<V3fVectorData>( position, PrimitiveVariable::Vertex );
 	if( !pData )
@@ -74,21 +75,30 @@ PrimitiveVariable MeshAlgo::calculateFaceArea( const MeshPrimitive *mesh, const
 	}
 	const std::vector<V3f> &p = pData->readable();
 
+	const std::vector<int> &verticesPerFace = mesh->verticesPerFace()->readable();
+	const std::vector<int> &vertexIds = mesh->vertexIds()->readable();
+	const std::vector<int> faceOffsets = Detail::faceVertexOffsets( verticesPerFace );
+
 	FloatVectorDataPtr areasData = new FloatVectorData;
 	std::vector<float> &areas = areasData->writable();
-	areas.reserve( mesh->variableSize( PrimitiveVariable::Uniform ) );
+	areas.resize( verticesPerFace.size() );
 
-	/// \todo: can MeshPrimitive::faceEnd() be const?
-	PolygonIterator faceEnd = const_cast<MeshPrimitive*>( mesh )->faceEnd();
-	for( PolygonIterator pIt = const_cast<MeshPrimitive*>( mesh )->faceBegin(); pIt != faceEnd; pIt++ )
-	{
-		areas.push_back( polygonArea( pIt.vertexBegin( p.begin() ), pIt.vertexEnd( p.begin() ) ) );
-	}
+	Detail::parallelFor(
+		verticesPerFace.size(), canceller,
+		[&]( const tbb::blocked_range<size_t> &range )
+		{
+			for( size_t face = range.begin(); face != range.end(); ++face )
+			{
+				PolygonIterator pIt( verticesPerFace.begin() + face, vertexIds.begin() + faceOffsets[face], faceOffsets[face] );
+				areas[face] = polygonArea( pIt.vertexBegin( p.begin() ), pIt.vertexEnd( p.begin() ) );
+			}
+		}
+	);
 
 	return PrimitiveVariable( PrimitiveVariable::Uniform, areasData );
 }
 
-PrimitiveVariable MeshAlgo::calculateFaceTextureArea( const MeshPrimitive *mesh, const std::string &uvSet, const std::string &position )
+PrimitiveVariable MeshAlgo::calculateFaceTextureArea( const MeshPrimitive *mesh, const std::string &uvSet, const std::string &position, const Canceller *canceller )
 {
 	PrimitiveVariable::Interpolation uvInterpolation = PrimitiveVariable::Vertex;
 	ConstV2fVectorDataPtr uvData = mesh->expandedVariableData<V2fVectorData>( uvSet, PrimitiveVariable::Vertex );
@@ -103,35 +113,44 @@ PrimitiveVariable MeshAlgo::calculateFaceTextureArea( const MeshPrimitive *mesh,
 	}
 	const std::vector<Imath::V2f> &uvs = uvData->readable();
 
+	const std::vector<int> &verticesPerFace = mesh->verticesPerFace()->readable();
+	const std::vector<int> &vertexIds = mesh->vertexIds()->readable();
+	const std::vector<int> faceOffsets = Detail::faceVertexOffsets( verticesPerFace );
+
 	FloatVectorDataPtr textureAreasData = new FloatVectorData;
 	std::vector<float> &textureAreas = textureAreasData->writable();
-	textureAreas.reserve( mesh->variableSize( PrimitiveVariable::Uniform ) );
-
-	/// \todo: can MeshPrimitive::faceEnd() be const?
-	PolygonIterator faceEnd = const_cast<MeshPrimitive*>( mesh )->faceEnd();
-	for( PolygonIterator pIt = const_cast<MeshPrimitive*>( mesh )->faceBegin(); pIt!=faceEnd; pIt++ )
-	{
-		if( uvInterpolation==PrimitiveVariable::Vertex )
-		{
-			typedef PolygonVertexIterator<std::vector<Imath::V2f>::const_iterator> VertexIterator;
-			typedef boost::transform_iterator<V2fToV3f, VertexIterator> STIterator;
+	textureAreas.resize( verticesPerFace.size() );
 
-			STIterator begin( pIt.vertexBegin( uvs.begin() ) );
-			STIterator end( pIt.vertexEnd( uvs.begin() ) );
-
-			textureAreas.push_back( polygonArea( begin, end ) );
-		}
-		else
+	Detail::parallelFor(
+		verticesPerFace.size(), canceller,
+		[&]( const tbb::blocked_range<size_t> &range )
 		{
-			assert( uvInterpolation==PrimitiveVariable::FaceVarying );
-			typedef boost::transform_iterator<V2fToV3f, std::vector<Imath::V2f>::const_iterator> STIterator;
-
-			STIterator begin( pIt.faceVaryingBegin( uvs.begin() ) );
-			STIterator end( pIt.faceVaryingEnd( uvs.begin() ) );
-
-			textureAreas.push_back( polygonArea( begin, end ) );
+			for( size_t face = range.begin(); face != range.end(); ++face )
+			{
+				PolygonIterator pIt( verticesPerFace.begin() + face, vertexIds.begin() + faceOffsets[face], faceOffsets[face] );
+				if( uvInterpolation==PrimitiveVariable::Vertex )
+				{
+					typedef PolygonVertexIterator<std::vector<Imath::V2f>::const_iterator> VertexIterator;
+					typedef boost::transform_iterator<V2fToV3f, VertexIterator> STIterator;
+
+					STIterator begin( pIt.vertexBegin( uvs.begin() ) );
+					STIterator end( pIt.vertexEnd( uvs.begin() ) );
+
+					textureAreas[face] = polygonArea( begin, end );
+				}
+				else
+				{
+					assert( uvInterpolation==PrimitiveVariable::FaceVarying );
+					typedef boost::transform_iterator<V2fToV3f, std::vector<Imath::V2f>::const_iterator> STIterator;
+
+					STIterator begin( pIt.faceVaryingBegin( uvs.begin() ) );
+					STIterator end( pIt.faceVaryingEnd( uvs.begin() ) );
+
+					textureAreas[face] = polygonArea( begin, end );
+				}
+			}
 		}
-	}
+	);
 
 	return PrimitiveVariable( PrimitiveVariable::Uniform, textureAreasData );
 }
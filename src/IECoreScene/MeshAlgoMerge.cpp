@@ -33,6 +33,7 @@
 //////////////////////////////////////////////////////////////////////////
 
 #include "IECoreScene/MeshAlgo.h"
+#include "IECoreScene/private/MeshAlgoUtils.h"
 #include "IECoreScene/private/PrimitiveAlgoUtils.h"
 
 #include "IECore/DataAlgo.h"
@@ -227,7 +228,7 @@ struct PrependPrimVars
 
 };
 
-void merge( MeshPrimitive *a, const MeshPrimitive *b )
+void merge( MeshPrimitive *a, const MeshPrimitive *b, const Canceller *canceller )
 {
 	const auto &vertexIdsA = a->vertexIds()->readable();
 	const auto &verticesPerFaceA = a->verticesPerFace()->readable();
@@ -247,7 +248,13 @@ void merge( MeshPrimitive *a, const MeshPrimitive *b )
 	it = std::copy( vertexIdsA.begin(), vertexIdsA.end(), vertexIds.begin() );
 	int vertexIdOffset = a->variableSize( PrimitiveVariable::Vertex );
 	auto idShift = [vertexIdOffset]( int id ){ return id + vertexIdOffset; };
-	std::transform( vertexIdsB.begin(), vertexIdsB.end(), it, idShift );
+	IECoreScene::Detail::parallelFor(
+		vertexIdsB.size(), canceller,
+		[&]( const tbb::blocked_range<size_t> &range )
+		{
+			std::transform( vertexIdsB.begin() + range.begin(), vertexIdsB.begin() + range.end(), it + range.begin(), idShift );
+		}
+	);
 
 	a->setTopologyUnchecked( verticesPerFaceData, vertexIdsData, a->variableSize( PrimitiveVariable::Vertex ) + b->variableSize( PrimitiveVariable::Vertex ), a->interpolation() );
 
@@ -301,19 +308,50 @@ void merge( MeshPrimitive *a, const MeshPrimitive *b )
 		a->setCreases( lengthData.get(), idData.get(), sharpnessData.get() );
 	}
 
-	/// \todo: can this be parallelized?
-	std::set<DataPtr> visitedData;
-	for( auto &pv : a->variables )
+	// Data may be shared between several primitive variables, and must
+	// only be appended to once. So we first decide which variables to
+	// append to, and then append to them in parallel.
+	std::vector<PrimitiveVariableMap::iterator> appendVariables;
+	std::set<const Data *> visitedData;
+	std::set<const IntVectorData *> visitedIndices;
+	bool sharedIndices = false;
+	for( auto pvIt = a->variables.begin(); pvIt != a->variables.end(); ++pvIt )
 	{
-		if( pv.second.interpolation != PrimitiveVariable::Constant )
+		if( pvIt->second.interpolation != PrimitiveVariable::Constant && visitedData.insert( pvIt->second.data.get() ).second )
+		{
+			appendVariables.push_back( pvIt );
+			if( pvIt->second.indices && !visitedIndices.insert( pvIt->second.indices.get() ).second )
+			{
+				sharedIndices = true;
+			}
+		}
+	}
+
+	auto appendPrimVars = [&]( const tbb::blocked_range<size_t> &range )
+	{
+		for( size_t i = range.begin(); i != range.end(); ++i )
 		{
+			auto &pv = *appendVariables[i];
 			IntVectorData *indices = pv.second.indices ? pv.second.indices.get() : nullptr;
-			AppendPrimVars f( a, b, pv.first, pv.second.interpolation, indices, visitedData );
+			std::set<DataPtr> appendedData;
+			AppendPrimVars f( a, b, pv.first, pv.second.interpolation, indices, appendedData );
 			despatchTypedData<AppendPrimVars, TypeTraits::IsVectorTypedData, DespatchTypedDataIgnoreError>( pv.second.data.get(), f );
 		}
+	};
+
+	if( sharedIndices )
+	{
+		// Appending to the same indices from several variables
+		// at once isn't safe, so we must do things serially.
+		Canceller::check( canceller );
+		appendPrimVars( tbb::blocked_range<size_t>( 0, appendVariables.size() ) );
+	}
+	else
+	{
+		IECoreScene::Detail::parallelFor( appendVariables.size(), canceller, appendPrimVars );
 	}
 
-	/// \todo: can this be parallelized?
+	Canceller::check( canceller );
 	std::map<ConstDataPtr, DataPtr> visitedData2;
 	for( auto &pv : b->variables )
 	{
@@ -327,7 +365,7 @@ void merge( MeshPrimitive *a, const MeshPrimitive *b )
 
 } // namespace
 
-MeshPrimitivePtr IECoreScene::MeshAlgo::merge( const std::vector<const MeshPrimitive *> &meshes )
+MeshPrimitivePtr IECoreScene::MeshAlgo::merge( const std::vector<const MeshPrimitive *> &meshes, const Canceller *canceller )
 {
 	if( meshes.empty() )
 	{
@@ -342,7 +380,7 @@ MeshPrimitivePtr IECoreScene::MeshAlgo::merge( const std::vector<const MeshPrimi
 	auto it = meshes.begin() + 1;
 	for( ; it != meshes.end(); ++it )
 	{
-		::merge( result.get(), *it );
+		::merge( result.get(), *it, canceller );
 	}
 
 	return result;
@@ -34,6 +34,7 @@
 
 #include "IECoreScene/MeshAlgo.h"
 #include "IECoreScene/PolygonIterator.h"
+#include "IECoreScene/private/MeshAlgoUtils.h"
 
 #include "IECore/PolygonAlgo.h"
 
@@ -46,7 +47,7 @@ using namespace Imath;
 using namespace IECore;
 using namespace IECoreScene;
 
-PrimitiveVariable MeshAlgo::calculateNormals( const MeshPrimitive *mesh, PrimitiveVariable::Interpolation interpolation, const std::string &position )
+PrimitiveVariable MeshAlgo::calculateNormals( const MeshPrimitive *mesh, PrimitiveVariable::Interpolation interpolation, const std::string &position, const Canceller *canceller )
 {
 	const V3fVectorData *pData = mesh->variableData<V3fVectorData>( position, PrimitiveVariable::Vertex );
 	if( !pData )
@@ -60,58 +61,72 @@ PrimitiveVariable MeshAlgo::calculateNormals( const MeshPrimitive *mesh, Primiti
 		throw InvalidArgumentException( "MeshAlgo::calculateNormals : \"interpolation\" must be Vertex or Uniform" );
 	}
 
-	V3fVectorDataPtr normalsData = new V3fVectorData;
-	normalsData->setInterpretation( GeometricData::Normal );
-	auto &normals = normalsData->writable();
-
 	const auto &verticesPerFace = mesh->verticesPerFace()->readable();
-	if( interpolation == PrimitiveVariable::Uniform )
-	{
-		normals.reserve( verticesPerFace.size() );
-	}
-	else
-	{
-		normals.resize( points.size(), Imath::V3f( 0 ) );
-	}
-
 	const auto &vertIds = mesh->vertexIds()->readable();
-	const int *vertId = &(vertIds[0]);
-	for( auto numVerts : verticesPerFace )
-	{
-		// calculate the face normal. note that this method is very naive, and doesn't
-		// cope with colinear vertices or concave faces - we could use polygonNormal() from
-		// PolygonAlgo.h to deal with that, but currently we'd prefer to avoid the overhead.
-		const V3f &p0 = points[*vertId];
-		const V3f &p1 = points[*(vertId+1)];
-		const V3f &p2 = points[*(vertId+2)];
+	ConstIntVectorDataPtr faceOffsetsData = Detail::faceVertexOffsets( mesh );
+	const std::vector<int> &faceOffsets = faceOffsetsData->readable();
 
-		V3f normal = ( p2 - p1 ).cross( p0 - p1 );
-		normal.normalize();
+	// calculate the face normals. note that this method is very naive, and doesn't
+	// cope with colinear vertices or concave faces - we could use polygonNormal() from
+	// PolygonAlgo.h to deal with that, but currently we'd prefer to avoid the overhead.
+	V3fVectorDataPtr faceNormalsData = new V3fVectorData;
+	faceNormalsData->setInterpretation( GeometricData::Normal );
+	auto &faceNormals = faceNormalsData->writable();
+	faceNormals.resize( verticesPerFace.size() );
 
-		if( interpolation == PrimitiveVariable::Uniform )
-		{
-			normals.push_back( normal );
-			vertId += numVerts;
-		}
-		else
+	Detail::parallelFor(
+		verticesPerFace.size(), canceller,
+		[&]( const tbb::blocked_range<size_t> &range )
 		{
-			// accumulate the face normal onto each of the vertices for this face.
-			for( int i=0; i < numVerts; ++i )
+			for( size_t face = range.begin(); face != range.end(); ++face )
 			{
-				normals[*vertId] += normal;
-				++vertId;
+				const int *vertId = &(vertIds[faceOffsets[face]]);
+				const V3f &p0 = points[*vertId];
+				const V3f &p1 = points[*(vertId+1)];
+				const V3f &p2 = points[*(vertId+2)];
+
+				V3f normal = ( p2 - p1 ).cross( p0 - p1 );
+				normal.normalize();
+				faceNormals[face] = normal;
 			}
 		}
-	}
+	);
 
-	// normalize each of the vertex normals
-	if( interpolation == PrimitiveVariable::Vertex )
+	if( interpolation == PrimitiveVariable::Uniform )
 	{
-		for( Imath::V3f &n : normals )
+		return PrimitiveVariable( interpolation, faceNormalsData );
+	}
+
+	// accumulate the face normals onto each of their vertices, and normalize.
+	// we gather rather than scatter so that each vertex can be computed
+	// independently, visiting the faces in the same order as a serial
+	// accumulation would.
+	// the inverse mapping depends only on the topology, so is shared between calls.
+	const Detail::InverseFaceVertexIndices vertexFacesData = Detail::vertexFaces( mesh, points.size() );
+	const std::vector<int> &vertexFaceOffsets = vertexFacesData.offsets->readable();
+	const std::vector<int> &vertexFaces = vertexFacesData.faces->readable();
+
+	V3fVectorDataPtr normalsData = new V3fVectorData;
+	normalsData->setInterpretation( GeometricData::Normal );
+	auto &normals = normalsData->writable();
+	normals.resize( points.size() );
+
+	Detail::parallelFor(
+		points.size(), canceller,
+		[&]( const tbb::blocked_range<size_t> &range )
 		{
-			n.normalize();
+			for( size_t vertex = range.begin(); vertex != range.end(); ++vertex )
+			{
+				V3f normal( 0 );
+				for( int i = vertexFaceOffsets[vertex], e = vertexFaceOffsets[vertex+1]; i < e; ++i )
+				{
+					normal += faceNormals[vertexFaces[i]];
+				}
+				normal.normalize();
+				normals[vertex] = normal;
+			}
 		}
-	}
+	);
 
 	return PrimitiveVariable( interpolation, normalsData );
 }
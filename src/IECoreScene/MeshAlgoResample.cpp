@@ -34,6 +34,7 @@
 
 #include "IECoreScene/FaceVaryingPromotionOp.h"
 #include "IECoreScene/MeshAlgo.h"
+#include "IECoreScene/private/MeshAlgoUtils.h"
 #include "IECoreScene/private/PrimitiveAlgoUtils.h"
 #include "IECoreScene/private/PrimitiveVariableAlgos.h"
 
@@ -55,7 +56,7 @@ struct MeshVertexToUniform
 {
 	typedef DataPtr ReturnType;
 
-	MeshVertexToUniform( const MeshPrimitive *mesh )	:	m_mesh( mesh )
+	MeshVertexToUniform( const MeshPrimitive *mesh, const Canceller *canceller )	:	m_mesh( mesh ), m_canceller( canceller )
 	{
 	}
 
@@ -65,25 +66,34 @@ struct MeshVertexToUniform
 		typename From::ValueType &trg = result->writable();
 		const typename From::ValueType &src = data->readable();
 
-		// TODO sipmlify this code by using polygon face & vertex iterators
-		trg.reserve( m_mesh->numFaces() );
-
-		std::vector<int>::const_iterator vId = m_mesh->vertexIds()->readable().begin();
+		const std::vector<int> &vertexIds = m_mesh->vertexIds()->readable();
 		const std::vector<int> &verticesPerFace = m_mesh->verticesPerFace()->readable();
-		for( std::vector<int>::const_iterator it = verticesPerFace.begin(); it < verticesPerFace.end(); ++it )
-		{
-			// initialize with the first value to avoid
-			// ambiguitity during default construction
-			typename From::ValueType::value_type total = src[ *vId ];
-			++vId;
+		const std::vector<int> faceOffsets = IECoreScene::Detail::faceVertexOffsets( verticesPerFace );
+
+		trg.resize( verticesPerFace.size() );
 
-			for( int j = 1; j < *it; ++j, ++vId )
+		IECoreScene::Detail::parallelFor(
+			verticesPerFace.size(), m_canceller,
+			[&]( const tbb::blocked_range<size_t> &range )
 			{
-				total += src[ *vId ];
+				for( size_t face = range.begin(); face != range.end(); ++face )
+				{
+					std::vector<int>::const_iterator vId = vertexIds.begin() + faceOffsets[face];
+
+					// initialize with the first value to avoid
+					// ambiguitity during default construction
+					typename From::ValueType::value_type total = src[ *vId ];
+					++vId;
+
+					for( int j = 1; j < verticesPerFace[face]; ++j, ++vId )
+					{
+						total += src[ *vId ];
+					}
+
+					trg[face] = total / verticesPerFace[face];
+				}
 			}
-
-			trg.push_back( total / *it );
-		}
+		);
 
 		IECoreScene::PrimitiveVariableAlgos::GeometricInterpretationCopier<From> copier;
 		copier( data, result.get() );
@@ -92,13 +102,19 @@ struct MeshVertexToUniform
 	}
 
 	const MeshPrimitive *m_mesh;
+	const Canceller *m_canceller;
 };
 
-struct MeshUniformToVertex
+// Averages the values of each face or face-vertex onto the vertices
+// they reference. We gather rather than scatter, so that vertices can
+// be computed in parallel, while accumulating values in the same order
+// as a serial loop over the faces would.
+template<bool FaceVarying>
+struct MeshAnythingToVertex
 {
 	typedef DataPtr ReturnType;
 
-	MeshUniformToVertex( const MeshPrimitive *mesh )	:	m_mesh( mesh )
+	MeshAnythingToVertex( const MeshPrimitive *mesh, const Canceller *canceller )	:	m_mesh( mesh ), m_canceller( canceller )
 	{
 	}
 
@@ -109,27 +125,31 @@ struct MeshUniformToVertex
 		const typename From::ValueType &src = data->readable();
 
 		size_t numVerts = m_mesh->variableSize( PrimitiveVariable::Vertex );
-		std::vector<int> count( numVerts, 0 );
-		trg.resize( numVerts, typename From::ValueType::value_type( 0.0f ) );
-
-		typename From::ValueType::const_iterator srcIt = src.begin();
-		std::vector<int>::const_iterator vId = m_mesh->vertexIds()->readable().begin();
-		const std::vector<int> &verticesPerFace = m_mesh->verticesPerFace()->readable();
-		for( std::vector<int>::const_iterator it = verticesPerFace.begin(); it < verticesPerFace.end(); ++it, ++srcIt )
-		{
-			for( int j = 0; j < *it; ++j, ++vId )
+		trg.resize( numVerts );
+
+		std::vector<int> offsets;
+		std::vector<int> sources;
+		IECoreScene::Detail::invertFaceVertexIndices(
+			m_mesh->verticesPerFace()->readable(), m_mesh->vertexIds()->readable(), numVerts,
+			offsets, FaceVarying ? &sources : nullptr, FaceVarying ? nullptr : &sources
+		);
+
+		IECoreScene::Detail::parallelFor(
+			numVerts, m_canceller,
+			[&]( const tbb::blocked_range<size_t> &range )
 			{
-				trg[ *vId ] += *srcIt;
-				++count[ *vId ];
+				for( size_t vertex = range.begin(); vertex != range.end(); ++vertex )
+				{
+					typename From::ValueType::value_type total( 0.0f );
+					for( int i = offsets[vertex]; i < offsets[vertex+1]; ++i )
+					{
+						total += src[ sources[i] ];
+					}
+					total /= offsets[vertex+1] - offsets[vertex];
+					trg[vertex] = total;
+				}
 			}
-		}
-
-		std::vector<int>::const_iterator cIt = count.begin();
-		typename From::ValueType::iterator trgIt = trg.begin(), trgEnd = trg.end();
-		for( trgIt = trg.begin(); trgIt != trgEnd ; ++trgIt, ++cIt )
-		{
-			*trgIt /= *cIt;
-		}
+		);
 
 		IECoreScene::PrimitiveVariableAlgos::GeometricInterpretationCopier<From> copier;
 		copier( data, result.get() );
@@ -138,57 +158,17 @@ struct MeshUniformToVertex
 	}
 
 	const MeshPrimitive *m_mesh;
+	const Canceller *m_canceller;
 };
 
-struct MeshFaceVaryingToVertex
-{
-	typedef DataPtr ReturnType;
-
-	MeshFaceVaryingToVertex( const MeshPrimitive *mesh )	:	m_mesh( mesh )
-	{
-	}
-
-	template<typename From> ReturnType operator()( const From* data )
-	{
-		typename From::Ptr result = static_cast< From* >( Object::create( data->typeId() ).get() );
-		typename From::ValueType &trg = result->writable();
-		const typename From::ValueType &src = data->readable();
-
-		size_t numVerts = m_mesh->variableSize( PrimitiveVariable::Vertex );
-		std::vector<int> count( numVerts, 0 );
-		trg.resize( numVerts, typename From::ValueType::value_type( 0.0f ) );
-
-		const std::vector<int>& vertexIds = m_mesh->vertexIds()->readable();
-		std::vector<int>::const_iterator vertexIdIt = vertexIds.begin();
-		typename From::ValueType::const_iterator srcIt = src.begin(), srcEnd = src.end();
-
-		for( ; srcIt != srcEnd ; ++srcIt, ++vertexIdIt )
-		{
-			trg[ *vertexIdIt ] += *srcIt;
-			++count[ *vertexIdIt ];
-		}
-
-		std::vector<int>::const_iterator cIt = count.begin();
-		typename From::ValueType::iterator trgIt = trg.begin(), trgEnd = trg.end();
-		for( trgIt = trg.begin(); trgIt != trgEnd ; ++trgIt, ++cIt )
-		{
-			*trgIt /= *cIt;
-		}
-
-		IECoreScene::PrimitiveVariableAlgos::GeometricInterpretationCopier<From> copier;
-		copier( data, result.get() );
-
-		return result;
-	}
-
-	const MeshPrimitive *m_mesh;
-};
+typedef MeshAnythingToVertex<false> MeshUniformToVertex;
+typedef MeshAnythingToVertex<true> MeshFaceVaryingToVertex;
 
 struct MeshFaceVaryingToUniform
 {
 	typedef DataPtr ReturnType;
 
-	MeshFaceVaryingToUniform( const MeshPrimitive *mesh )	:	m_mesh( mesh )
+	MeshFaceVaryingToUniform( const MeshPrimitive *mesh, const Canceller *canceller )	:	m_mesh( mesh ), m_canceller( canceller )
 	{
 	}
 
@@ -198,25 +178,33 @@ struct MeshFaceVaryingToUniform
 		typename From::ValueType &trg = result->writable();
 		const typename From::ValueType &src = data->readable();
 
-		trg.reserve( m_mesh->numFaces() );
-
-		typename From::ValueType::const_iterator srcIt = src.begin();
-
 		const std::vector<int> &verticesPerFace = m_mesh->verticesPerFace()->readable();
-		for( std::vector<int>::const_iterator it = verticesPerFace.begin(); it < verticesPerFace.end(); ++it )
-		{
-			// initialize with the first value to avoid
-			// ambiguity during default construction
-			typename From::ValueType::value_type total = *srcIt;
-			++srcIt;
+		const std::vector<int> faceOffsets = IECoreScene::Detail::faceVertexOffsets( verticesPerFace );
+
+		trg.resize( verticesPerFace.size() );
 
-			for( int j = 1; j < *it; ++j, ++srcIt )
+		IECoreScene::Detail::parallelFor(
+			verticesPerFace.size(), m_canceller,
+			[&]( const tbb::blocked_range<size_t> &range )
 			{
-				total += *srcIt;
+				for( size_t face = range.begin(); face != range.end(); ++face )
+				{
+					typename From::ValueType::const_iterator srcIt = src.begin() + faceOffsets[face];
+
+					// initialize with the first value to avoid
+					// ambiguity during default construction
+					typename From::ValueType::value_type total = *srcIt;
+					++srcIt;
+
+					for( int j = 1; j < verticesPerFace[face]; ++j, ++srcIt )
+					{
+						total += *srcIt;
+					}
+
+					trg[face] = total / verticesPerFace[face];
+				}
 			}
-
-			trg.push_back( total / *it );
-		}
+		);
 
 		IECoreScene::PrimitiveVariableAlgos::GeometricInterpretationCopier<From> copier;
 		copier( data, result.get() );
@@ -225,6 +213,7 @@ struct MeshFaceVaryingToUniform
 	}
 
 	const MeshPrimitive *m_mesh;
+	const Canceller *m_canceller;
 };
 
 struct MeshAnythingToFaceVarying
@@ -262,7 +251,7 @@ struct MeshAnythingToFaceVarying
 
 } // namespace
 
-void IECoreScene::MeshAlgo::resamplePrimitiveVariable( const MeshPrimitive *mesh, PrimitiveVariable& primitiveVariable, PrimitiveVariable::Interpolation interpolation )
+void IECoreScene::MeshAlgo::resamplePrimitiveVariable( const MeshPrimitive *mesh, PrimitiveVariable& primitiveVariable, PrimitiveVariable::Interpolation interpolation, const Canceller *canceller )
 {
 	PrimitiveVariable::Interpolation srcInterpolation = primitiveVariable.interpolation;
 	if ( srcInterpolation == interpolation )
@@ -318,12 +307,12 @@ void IECoreScene::MeshAlgo::resamplePrimitiveVariable( const MeshPrimitive *mesh
 	{
 		if( srcInterpolation == PrimitiveVariable::Varying || srcInterpolation == PrimitiveVariable::Vertex )
 		{
-			MeshVertexToUniform fn( mesh );
+			MeshVertexToUniform fn( mesh, canceller );
 			dstData = despatchTypedData<MeshVertexToUniform, Detail::IsArithmeticVectorTypedData>( srcData.get(), fn );
 		}
 		else if( srcInterpolation == PrimitiveVariable::FaceVarying )
 		{
-			MeshFaceVaryingToUniform fn( mesh );
+			MeshFaceVaryingToUniform fn( mesh, canceller );
 			dstData = despatchTypedData<MeshFaceVaryingToUniform, Detail::IsArithmeticVectorTypedData>( srcData.get(), fn );
 		}
 	}
@@ -331,12 +320,12 @@ void IECoreScene::MeshAlgo::resamplePrimitiveVariable( const MeshPrimitive *mesh
 	{
 		if( srcInterpolation == PrimitiveVariable::Uniform )
 		{
-			MeshUniformToVertex fn( mesh );
+			MeshUniformToVertex fn( mesh, canceller );
 			dstData = despatchTypedData<MeshUniformToVertex, Detail::IsArithmeticVectorTypedData>( srcData.get(), fn );
 		}
 		else if( srcInterpolation == PrimitiveVariable::FaceVarying )
 		{
-			MeshFaceVaryingToVertex fn( mesh );
+			MeshFaceVaryingToVertex fn( mesh, canceller );
 			dstData = despatchTypedData<MeshFaceVaryingToVertex, Detail::IsArithmeticVectorTypedData>( srcData.get(), fn );
 		}
 		else if( srcInterpolation == PrimitiveVariable::Varying || srcInterpolation == PrimitiveVariable::Vertex )
@@ -346,6 +335,7 @@ void IECoreScene::MeshAlgo::resamplePrimitiveVariable( const MeshPrimitive *mesh
 	}
 	else if( interpolation == PrimitiveVariable::FaceVarying )
 	{
+		Canceller::check( canceller );
 		MeshAnythingToFaceVarying fn( mesh, srcInterpolation );
 		dstData = despatchTypedData<MeshAnythingToFaceVarying, Detail::IsArithmeticVectorTypedData>( srcData.get(), fn );
 	}
@@ -47,8 +47,9 @@ using namespace IECore;
 using namespace IECoreScene;
 
 
-std::vector<MeshPrimitivePtr> IECoreScene::MeshAlgo::segment( const MeshPrimitive *mesh, const PrimitiveVariable &primitiveVariable, const IECore::Data *segmentValues )
+std::vector<MeshPrimitivePtr> IECoreScene::MeshAlgo::segment( const MeshPrimitive *mesh, const PrimitiveVariable &primitiveVariable, const IECore::Data *segmentValues, const IECore::Canceller *canceller )
 {
+	IECore::Canceller::check( canceller );
 
 	DataPtr data;
 	if( !segmentValues )
@@ -71,7 +72,10 @@ std::vector<MeshPrimitivePtr> IECoreScene::MeshAlgo::segment( const MeshPrimitiv
 		throw IECore::InvalidArgumentException( "IECoreScene::MeshAlgo::segment : Primitive variable not found on Mesh Primitive " );
 	}
 
-	auto f = MeshAlgo::deleteFaces;
+	auto f = [canceller]( const MeshPrimitive *meshPrimitive, const PrimitiveVariable &facesToDelete, bool invert )
+	{
+		return MeshAlgo::deleteFaces( meshPrimitive, facesToDelete, invert, canceller );
+	};
 
 	IECoreScene::Detail::TaskSegmenter<IECoreScene::MeshPrimitive, decltype(f) > taskSegmenter( mesh, const_cast<IECore::Data*> (segmentValues), primitiveVariableName, f );
 
@@ -33,6 +33,8 @@
 //////////////////////////////////////////////////////////////////////////
 
 #include "IECoreScene/MeshAlgo.h"
+#include "IECoreScene/private/MeshAlgoUtils.h"
+
 #include "IECore/DataAlgo.h"
 
 using namespace Imath;
@@ -76,10 +78,11 @@ std::pair<PrimitiveVariable, PrimitiveVariable> IECoreScene::MeshAlgo::calculate
 	const MeshPrimitive *mesh,
 	const std::string &uvSet, /* = "uv" */
 	bool orthoTangents, /* = true */
-	const std::string &position /* = "P" */
+	const std::string &position, /* = "P" */
+	const Canceller *canceller
 )
 {
-	return calculateTangentsFromUV( mesh, uvSet, position, orthoTangents, false );
+	return calculateTangentsFromUV( mesh, uvSet, position, orthoTangents, false, canceller );
 }
 
 std::pair<PrimitiveVariable, PrimitiveVariable> IECoreScene::MeshAlgo::calculateTangentsFromUV(
@@ -87,7 +90,8 @@ std::pair<PrimitiveVariable, PrimitiveVariable> IECoreScene::MeshAlgo::calculate
 	const std::string &uvSet, /* = "uv" */
 	const std::string &position /* = "P" */,
 	bool orthoTangents, /* = true */
-	bool leftHanded
+	bool leftHanded,
+	const Canceller *canceller
 )
 {
 	const V3fVectorData *positionData = mesh->variableData<V3fVectorData>( position );
@@ -132,12 +136,18 @@ std::pair<PrimitiveVariable, PrimitiveVariable> IECoreScene::MeshAlgo::calculate
 
 		if( uvIt->second.indices )
 		{
-			tmpIndices.reserve( mesh->vertexIds()->readable().size() );
-
-			for( auto vertexId : mesh->vertexIds()->readable() )
-			{
-				tmpIndices.push_back( uvIt->second.indices->readable()[vertexId] );
-			}
+			const std::vector<int> &indices = uvIt->second.indices->readable();
+			tmpIndices.resize( vertIds.size() );
+			Detail::parallelFor(
+				vertIds.size(), canceller,
+				[&]( const tbb::blocked_range<size_t> &range )
+				{
+					for( size_t i = range.begin(); i != range.end(); ++i )
+					{
+						tmpIndices[i] = indices[vertIds[i]];
+					}
+				}
+			);
 
 			uvIndices = &tmpIndices;
 		}
@@ -165,85 +175,148 @@ std::pair<PrimitiveVariable, PrimitiveVariable> IECoreScene::MeshAlgo::calculate
 	std::vector<V3f> vTangents( numUVs, V3f( 0 ) );
 	std::vector<V3f> normals( numUVs, V3f( 0 ) );
 
-	size_t vertStart = 0;
-	for( size_t faceIndex = 0; faceIndex < vertsPerFace.size(); faceIndex++ )
+	ConstIntVectorDataPtr faceOffsetsData = Detail::faceVertexOffsets( mesh );
+	const std::vector<int> &faceOffsets = faceOffsetsData->readable();
+
+	// compute the basis for the *triangle* formed by a face-vertex
+	// and its successors, and accumulate it onto the outputs.
+	auto accumulate = [&]( size_t fvi0, size_t faceIndex, size_t outputIndex )
 	{
-		for ( size_t faceVertIndex = 0; faceVertIndex < (size_t)vertsPerFace[faceIndex]; ++faceVertIndex)
-		{
-			// indices into the facevarying data for this *triangle*
-			size_t fvi0 = vertStart + faceVertIndex;
-			size_t fvi1 = vertStart + (faceVertIndex + 1) % vertsPerFace[faceIndex];
-			size_t fvi2 = vertStart + (faceVertIndex + 2) % vertsPerFace[faceIndex];
+		const size_t vertStart = faceOffsets[faceIndex];
+		const size_t faceVertIndex = fvi0 - vertStart;
 
-			assert( fvi0 < vertIds.size() );
-			assert( fvi0 < uvIndexedView.size() );
+		// indices into the facevarying data for this *triangle*
+		size_t fvi1 = vertStart + (faceVertIndex + 1) % vertsPerFace[faceIndex];
+		size_t fvi2 = vertStart + (faceVertIndex + 2) % vertsPerFace[faceIndex];
 
-			assert( fvi1 < vertIds.size() );
-			assert( fvi1 < uvIndexedView.size() );
+		assert( fvi0 < vertIds.size() );
+		assert( fvi0 < uvIndexedView.size() );
 
-			assert( fvi2 < vertIds.size() );
-			assert( fvi2 < uvIndexedView.size() );
+		assert( fvi1 < vertIds.size() );
+		assert( fvi1 < uvIndexedView.size() );
 
-			// positions for each vertex of this face
-			const V3f &p0 = points[vertIds[fvi0]];
-			const V3f &p1 = points[vertIds[fvi1]];
-			const V3f &p2 = points[vertIds[fvi2]];
+		assert( fvi2 < vertIds.size() );
+		assert( fvi2 < uvIndexedView.size() );
 
-			// uv coordinates for each vertex of this face
-			const V2f &uv0 = uvIndexedView[fvi0];
-			const V2f &uv1 = uvIndexedView[fvi1];
-			const V2f &uv2 = uvIndexedView[fvi2];
+		// positions for each vertex of this face
+		const V3f &p0 = points[vertIds[fvi0]];
+		const V3f &p1 = points[vertIds[fvi1]];
+		const V3f &p2 = points[vertIds[fvi2]];
 
-			Basis basis;
-			calculcateBasis( p0, p1, p2, uv0, uv1, uv2, basis );
+		// uv coordinates for each vertex of this face
+		const V2f &uv0 = uvIndexedView[fvi0];
+		const V2f &uv1 = uvIndexedView[fvi1];
+		const V2f &uv2 = uvIndexedView[fvi2];
 
-			// and accumulate them into the computation so far
-			uTangents[uvIndexedView.index(fvi0)] += basis.tangent;
-			vTangents[uvIndexedView.index(fvi0)] += basis.bitangent;
-			normals[uvIndexedView.index(fvi0)] += basis.normal;
-		}
+		Basis basis;
+		calculcateBasis( p0, p1, p2, uv0, uv1, uv2, basis );
 
-		vertStart += vertsPerFace[faceIndex];
-	}
+		// and accumulate them into the computation so far
+		uTangents[outputIndex] += basis.tangent;
+		vTangents[outputIndex] += basis.bitangent;
+		normals[outputIndex] += basis.normal;
+	};
 
-	// normalize and orthogonalize everything
-	for( size_t i = 0; i < uTangents.size(); i++ )
+	if( uvIndices )
 	{
-		normals[i].normalize();
-
-		uTangents[i].normalize();
-		vTangents[i].normalize();
-
-		// Make uTangent/vTangent orthogonal to normal
-		uTangents[i] -= normals[i] * uTangents[i].dot( normals[i] );
-		vTangents[i] -= normals[i] * vTangents[i].dot( normals[i] );
-
-		uTangents[i].normalize();
-		vTangents[i].normalize();
-
-		if( orthoTangents )
+		// several face-vertices may share a uv, so we gather the
+		// contributions for each uv in turn, in face order. the tables
+		// for this depend only on the topology and the uv indices, so
+		// are shared between calls.
+		Detail::InverseFaceVertexIndices inverse;
+		if( uvIndices == &vertIds )
 		{
-			vTangents[i] -= uTangents[i] * vTangents[i].dot( uTangents[i] );
-			vTangents[i].normalize();
+			inverse = Detail::vertexFaces( mesh, numUVs );
 		}
-
-		// Ensure we have set of basis vectors (n, uT, vT) with the correct handedness.
-		if ( !leftHanded )
+		else
 		{
-			if( uTangents[i].cross( vTangents[i] ).dot( normals[i] ) < 0.0f )
+			MurmurHash key;
+			key.append( "calculateTangentsFromUV" );
+			key.append( (int)uvInterpolation );
+			uvIt->second.indices->hash( key );
+			key.append( (uint64_t)numUVs );
+			inverse = Detail::invertFaceVertexIndices( mesh, key, *uvIndices, numUVs );
+		}
+
+		const std::vector<int> &uvOffsets = inverse.offsets->readable();
+		const std::vector<int> &uvFaceVertices = inverse.faceVertices->readable();
+		const std::vector<int> &uvFaces = inverse.faces->readable();
+
+		Detail::parallelFor(
+			numUVs, canceller,
+			[&]( const tbb::blocked_range<size_t> &range )
 			{
-				uTangents[i] *= -1.0f;
+				for( size_t i = range.begin(); i != range.end(); ++i )
+				{
+					for( int j = uvOffsets[i]; j < uvOffsets[i+1]; ++j )
+					{
+						accumulate( uvFaceVertices[j], uvFaces[j], i );
+					}
+				}
 			}
-		}
-		else
+		);
+	}
+	else
+	{
+		Detail::parallelFor(
+			vertsPerFace.size(), canceller,
+			[&]( const tbb::blocked_range<size_t> &range )
+			{
+				for( size_t faceIndex = range.begin(); faceIndex != range.end(); ++faceIndex )
+				{
+					for( int v = 0; v < vertsPerFace[faceIndex]; ++v )
+					{
+						const size_t fvi0 = faceOffsets[faceIndex] + v;
+						accumulate( fvi0, faceIndex, fvi0 );
+					}
+				}
+			}
+		);
+	}
+
+	// normalize and orthogonalize everything
+	Detail::parallelFor(
+		uTangents.size(), canceller,
+		[&]( const tbb::blocked_range<size_t> &range )
 		{
-			if( uTangents[i].cross( vTangents[i] ).dot( normals[i] ) > 0.0f )
+			for( size_t i = range.begin(); i != range.end(); ++i )
 			{
-				uTangents[i] *= -1.0f;
+				normals[i].normalize();
+
+				uTangents[i].normalize();
+				vTangents[i].normalize();
+
+				// Make uTangent/vTangent orthogonal to normal
+				uTangents[i] -= normals[i] * uTangents[i].dot( normals[i] );
+				vTangents[i] -= normals[i] * vTangents[i].dot( normals[i] );
+
+				uTangents[i].normalize();
+				vTangents[i].normalize();
+
+				if( orthoTangents )
+				{
+					vTangents[i] -= uTangents[i] * vTangents[i].dot( uTangents[i] );
+					vTangents[i].normalize();
+				}
+
+				// Ensure we have set of basis vectors (n, uT, vT) with the correct handedness.
+				if ( !leftHanded )
+				{
+					if( uTangents[i].cross( vTangents[i] ).dot( normals[i] ) < 0.0f )
+					{
+						uTangents[i] *= -1.0f;
+					}
+				}
+				else
+				{
+					if( uTangents[i].cross( vTangents[i] ).dot( normals[i] ) > 0.0f )
+					{
+						uTangents[i] *= -1.0f;
+					}
+				}
 			}
 		}
-
-	}
+	);
 
 	// convert the tangents back to facevarying data and add that to the mesh
 	V3fVectorDataPtr fvUD = new V3fVectorData( uTangents );
@@ -267,7 +340,8 @@ std::pair<PrimitiveVariable, PrimitiveVariable> IECoreScene::MeshAlgo::calculate
 	const std::string &position /* = "P" */,
 	const std::string &normal /* = "N" */,
 	bool orthoTangents,
-	bool leftHanded
+	bool leftHanded,
+	const Canceller *canceller
 )
 {
 	// get point and normal data
@@ -307,39 +381,62 @@ std::pair<PrimitiveVariable, PrimitiveVariable> IECoreScene::MeshAlgo::calculate
 	std::vector<V3f> centroids( vertsPerFace.size(), V3f( 0 ) );
 	std::vector<int> faceIdPerVert( numPoints, -1 );
 
+	ConstIntVectorDataPtr faceOffsetsData = Detail::faceVertexOffsets( mesh );
+	const std::vector<int> &faceOffsets = faceOffsetsData->readable();
+
 	// calculate centroids
 	// TODO: generalize this to MeshAlgo::calculateCentroid
+	Detail::parallelFor(
+		vertsPerFace.size(), canceller,
+		[&]( const tbb::blocked_range<size_t> &range )
+		{
+			for( size_t faceIndex = range.begin(); faceIndex != range.end(); ++faceIndex )
+			{
+				const size_t vertStart = faceOffsets[faceIndex];
+				for ( size_t faceVertIndex = 0; faceVertIndex < (size_t)vertsPerFace[faceIndex]; ++faceVertIndex)
+				{
+					centroids[faceIndex] += points[vertIds[vertStart + faceVertIndex]];
+				}
+				centroids[faceIndex] /= vertsPerFace[faceIndex];
+			}
+		}
+	);
+
+	// each vertex uses the centroid of the last face it belongs to
+	Canceller::check( canceller );
 	size_t vertStart = 0;
 	for( size_t faceIndex = 0; faceIndex < vertsPerFace.size(); ++faceIndex )
 	{
 		for ( size_t faceVertIndex = 0; faceVertIndex < (size_t)vertsPerFace[faceIndex]; ++faceVertIndex)
 		{
-			size_t fvi0 = vertStart + faceVertIndex;
-			centroids[faceIndex] += points[vertIds[fvi0]];
-			faceIdPerVert[vertIds[fvi0]] = faceIndex;
+			faceIdPerVert[vertIds[vertStart + faceVertIndex]] = faceIndex;
 		}
-		centroids[faceIndex] /= vertsPerFace[faceIndex];
-
 		vertStart += vertsPerFace[faceIndex];
 	}
 
 	// calculate per vertex tangents from centroids
-	for ( size_t i = 0; i < (size_t)points.size(); ++i )
-	{
-		tangents[i] = ( centroids[faceIdPerVert[i]] - points[i] ).normalized();
-		biTangents[i] = normals[i].cross( tangents[i] ).normalized();
-		if ( orthoTangents )
+	Detail::parallelFor(
+		points.size(), canceller,
+		[&]( const tbb::blocked_range<size_t> &range )
 		{
-			if ( leftHanded )
-			{
-				tangents[i] = normals[i].cross( biTangents[i] ).normalized();
-			}
-			else
+			for( size_t i = range.begin(); i != range.end(); ++i )
 			{
-				tangents[i] = biTangents[i].cross( normals[i] ).normalized();
+				tangents[i] = ( centroids[faceIdPerVert[i]] - points[i] ).normalized();
+				biTangents[i] = normals[i].cross( tangents[i] ).normalized();
+				if ( orthoTangents )
+				{
+					if ( leftHanded )
+					{
+						tangents[i] = normals[i].cross( biTangents[i] ).normalized();
+					}
+					else
+					{
+						tangents[i] = biTangents[i].cross( normals[i] ).normalized();
+					}
+				}
 			}
 		}
-	}
+	);
 
 	// construct the primvars
 	V3fVectorDataPtr tangentsDataPtr = new V3fVectorData( tangents );
@@ -356,7 +453,8 @@ std::pair<PrimitiveVariable, PrimitiveVariable> IECoreScene::MeshAlgo::calculate
 	const std::string &position /* = "P" */,
 	const std::string &normal /* = "N" */,
 	bool orthoTangents,
-	bool leftHanded
+	bool leftHanded,
+	const Canceller *canceller
 )
 {
 	// get point data
@@ -389,31 +487,37 @@ std::pair<PrimitiveVariable, PrimitiveVariable> IECoreScene::MeshAlgo::calculate
 	std::vector<V3f> biTangents( numPoints, V3f( 0 ) );
 
 	// get neighbors
-	std::pair<IntVectorDataPtr, IntVectorDataPtr> tangentPtr = MeshAlgo::connectedVertices( mesh );
+	std::pair<IntVectorDataPtr, IntVectorDataPtr> tangentPtr = MeshAlgo::connectedVertices( mesh, canceller );
 	IntVectorDataPtr neighborList = tangentPtr.first;
 	IntVectorDataPtr offsets = tangentPtr.second;
 	auto &neighborListR = neighborList->readable();
 	auto &offsetsR = offsets->readable();
 
 	// calculate tangents from first neighbor and biTangents as orthogonal vectors
-	for ( unsigned int i = 0; i < points.size(); ++i )
-	{
-		int firstNeighborIndex = i > 0 ? offsetsR[i - 1] : 0;
-		const V3f &firstNeighbor = points[neighborListR[firstNeighborIndex]];
-		tangents[i] = ( firstNeighbor - points[i] ).normalized();
-		biTangents[i] = normals[i].cross( tangents[i] ).normalized();
-		if ( orthoTangents )
+	Detail::parallelFor(
+		points.size(), canceller,
+		[&]( const tbb::blocked_range<size_t> &range )
 		{
-			if ( leftHanded )
+			for( size_t i = range.begin(); i != range.end(); ++i )
 			{
-				tangents[i] = normals[i].cross( biTangents[i] ).normalized();
-			}
-			else
-			{
-				tangents[i] = biTangents[i].cross( normals[i] ).normalized();
+				int firstNeighborIndex = i > 0 ? offsetsR[i - 1] : 0;
+				const V3f &firstNeighbor = points[neighborListR[firstNeighborIndex]];
+				tangents[i] = ( firstNeighbor - points[i] ).normalized();
+				biTangents[i] = normals[i].cross( tangents[i] ).normalized();
+				if ( orthoTangents )
+				{
+					if ( leftHanded )
+					{
+						tangents[i] = normals[i].cross( biTangents[i] ).normalized();
+					}
+					else
+					{
+						tangents[i] = biTangents[i].cross( normals[i] ).normalized();
+					}
+				}
 			}
 		}
-	}
+	);
 
 	// construct the primvars
 	V3fVectorDataPtr tangentsDataPtr = new V3fVectorData( tangents );
@@ -430,7 +534,8 @@ std::pair<PrimitiveVariable, PrimitiveVariable> IECoreScene::MeshAlgo::calculate
 	const std::string &position /* = "P" */,
 	const std::string &normal /* = "N" */,
 	bool orthoTangents,
-	bool leftHanded
+	bool leftHanded,
+	const Canceller *canceller
 )
 {
 	// get point data
@@ -463,34 +568,40 @@ std::pair<PrimitiveVariable, PrimitiveVariable> IECoreScene::MeshAlgo::calculate
 	std::vector<V3f> biTangents( numPoints, V3f( 0 ) );
 
 	// get neighbors
-	std::pair<IntVectorDataPtr, IntVectorDataPtr> tangentPtr = MeshAlgo::connectedVertices( mesh );
+	std::pair<IntVectorDataPtr, IntVectorDataPtr> tangentPtr = MeshAlgo::connectedVertices( mesh, canceller );
 	IntVectorDataPtr neighborList = tangentPtr.first;
 	IntVectorDataPtr offsets = tangentPtr.second;
 	auto &neighborListR = neighborList->readable();
 	auto &offsetsR = offsets->readable();
 
 	// calculate tangents from first neighbor and biTangents as orthogonal vectors
-	for ( unsigned int i = 0; i < points.size(); ++i )
-	{
-		int firstNeighborIndex = i > 0 ? offsetsR[i - 1] : 0;
-		int lastIndex =  offsetsR[i] > firstNeighborIndex ? firstNeighborIndex + 1 : firstNeighborIndex;  // if we only have one neighbor use the edge, else the next neighbor
-
-		const V3f &firstNeighbor = points[neighborListR[firstNeighborIndex]];
-		const V3f &secondNeighbor = points[neighborListR[lastIndex]];
-		tangents[i] = ( ( firstNeighbor + (secondNeighbor - firstNeighbor ) * 0.5 ) - points[i] ).normalized();
-		biTangents[i] = normals[i].cross( tangents[i] ).normalized();
-		if ( orthoTangents )
+	Detail::parallelFor(
+		points.size(), canceller,
+		[&]( const tbb::blocked_range<size_t> &range )
 		{
-			if ( leftHanded )
+			for( size_t i = range.begin(); i != range.end(); ++i )
 			{
-				tangents[i] = normals[i].cross( biTangents[i] ).normalized();
-			}
-			else
-			{
-				tangents[i] = biTangents[i].cross( normals[i] ).normalized();
+				int firstNeighborIndex = i > 0 ? offsetsR[i - 1] : 0;
+				int lastIndex =  offsetsR[i] > firstNeighborIndex ? firstNeighborIndex + 1 : firstNeighborIndex;  // if we only have one neighbor use the edge, else the next neighbor
+
+				const V3f &firstNeighbor = points[neighborListR[firstNeighborIndex]];
+				const V3f &secondNeighbor = points[neighborListR[lastIndex]];
+				tangents[i] = ( ( firstNeighbor + (secondNeighbor - firstNeighbor ) * 0.5 ) - points[i] ).normalized();
+				biTangents[i] = normals[i].cross( tangents[i] ).normalized();
+				if ( orthoTangents )
+				{
+					if ( leftHanded )
+					{
+						tangents[i] = normals[i].cross( biTangents[i] ).normalized();
+					}
+					else
+					{
+						tangents[i] = biTangents[i].cross( normals[i] ).normalized();
+					}
+				}
 			}
 		}
-	}
+	);
 
 	// construct the primvars
 	V3fVectorDataPtr tangentsDataPtr = new V3fVectorData( tangents );
@@ -0,0 +1,134 @@
+//////////////////////////////////////////////////////////////////////////
+//
+//  Copyright (c) 2019, Image Engine Design Inc. All rights reserved.
+//
+//  Redistribution and use in source and binary forms, with or without
+//  modification, are permitted provided that the following conditions are
+//  met:
+//
+//     * Redistributions of source code must retain the above copyright
+//       notice, this list of conditions and the following disclaimer.
+//
+//     * Redistributions in binary form must reproduce the above copyright
+//       notice, this list of conditions and the following disclaimer in the
+//       documentation and/or other materials provided with the distribution.
+//
+//     * Neither the name of Image Engine Design nor the names of any
+//       other contributors to this software may be used to endorse or
+//       promote products derived from this software without specific prior
+//       written permission.
+//
+//  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS
+//  IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+//  THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+//  PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR
+//  CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+//  EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+//  PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+//  PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+//  LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+//  NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+//  SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+//
+//////////////////////////////////////////////////////////////////////////
+
+
+#include "IECoreScene/MeshAlgo.h"
+#include "IECoreScene/private/MeshAlgoUtils.h"
+
+#include "boost/lexical_cast.hpp"
+
+#include <cstdlib>
+
+using namespace std;
+using namespace IECore;
+using namespace IECoreScene;
+
+ObjectPool *MeshAlgo::topologyCache()
+{
+	static ObjectPoolPtr c = nullptr;
+	if( !c )
+	{
+		const char *m = getenv( "IECORESCENE_MESHTOPOLOGYCACHE_MEMORY" );
+		size_t mi = m ? boost::lexical_cast<size_t>( m ) : 100;
+		c = new ObjectPool( 1024 * 1024 * mi );
+	}
+	return c.get();
+}
+
+/// make sure the cache is created at load time and avoid
+/// running conditions on multi-threaded environments.
+static ObjectPoolPtr g_topologyCacheInitializer = MeshAlgo::topologyCache();
+
+ConstCompoundDataPtr IECoreScene::Detail::cachedTopologyTables( const MeshPrimitive *mesh, const MurmurHash &key, const std::function<CompoundDataPtr ()> &compute )
+{
+	MurmurHash h = key;
+	mesh->topologyHash( h );
+
+	ObjectPool *cache = MeshAlgo::topologyCache();
+	if( ConstObjectPtr cached = cache->retrieve( h ) )
+	{
+		return static_cast<const CompoundData *>( cached.get() );
+	}
+
+	// Several threads may compute the same tables concurrently, but
+	// store() ensures they all end up sharing the first result stored.
+	// We store under our own key rather than the hash of the tables,
+	// so that the lookup above can find them, and so that we never
+	// need to hash the tables themselves.
+	CompoundDataPtr tables = compute();
+	return static_cast<const CompoundData *>( cache->store( tables.get(), h, ObjectPool::StoreReference ).get() );
+}
+
+ConstIntVectorDataPtr IECoreScene::Detail::faceVertexOffsets( const MeshPrimitive *mesh )
+{
+	MurmurHash key;
+	key.append( "faceVertexOffsets" );
+
+	ConstCompoundDataPtr tables = cachedTopologyTables(
+		mesh, key,
+		[mesh] {
+			CompoundDataPtr result = new CompoundData;
+			result->writable()["offsets"] = new IntVectorData( faceVertexOffsets( mesh->verticesPerFace()->readable() ) );
+			return result;
+		}
+	);
+
+	return tables->member<IntVectorData>( "offsets" );
+}
+
+IECoreScene::Detail::InverseFaceVertexIndices IECoreScene::Detail::invertFaceVertexIndices( const MeshPrimitive *mesh, const MurmurHash &key, const std::vector<int> &indices, size_t size )
+{
+	ConstCompoundDataPtr tables = cachedTopologyTables(
+		mesh, key,
+		[mesh, &indices, size] {
+			IntVectorDataPtr offsets = new IntVectorData;
+			IntVectorDataPtr faceVertices = new IntVectorData;
+			IntVectorDataPtr faces = new IntVectorData;
+			invertFaceVertexIndices(
+				mesh->verticesPerFace()->readable(), indices, size,
+				offsets->writable(), &faceVertices->writable(), &faces->writable()
+			);
+
+			CompoundDataPtr result = new CompoundData;
+			result->writable()["offsets"] = offsets;
+			result->writable()["faceVertices"] = faceVertices;
+			result->writable()["faces"] = faces;
+			return result;
+		}
+	);
+
+	InverseFaceVertexIndices result;
+	result.offsets = tables->member<IntVectorData>( "offsets" );
+	result.faceVertices = tables->member<IntVectorData>( "faceVertices" );
+	result.faces = tables->member<IntVectorData>( "faces" );
+	return result;
+}
+
+IECoreScene::Detail::InverseFaceVertexIndices IECoreScene::Detail::vertexFaces( const MeshPrimitive *mesh, size_t numVertices )
+{
+	MurmurHash key;
+	key.append( "vertexFaces" );
+	key.append( (uint64_t)numVertices );
+	return invertFaceVertexIndices( mesh, key, mesh->vertexIds()->readable(), numVertices );
+}
@@ -33,6 +33,7 @@
 //////////////////////////////////////////////////////////////////////////
 
 #include "IECoreScene/MeshAlgo.h"
+#include "IECoreScene/private/MeshAlgoUtils.h"
 
 #include "IECore/DataAlgo.h"
 #include "IECore/DespatchTypedData.h"
@@ -96,114 +97,158 @@ struct TriangleDataRemap
 	}
 };
 
-/// A simple class to allow MeshAlgo::triangulate to operate on either V3fVectorData or V3dVectorData using
-/// despatchTypedData
-struct TriangulateFn
+/// Computes the topology of the triangulated mesh, along with the indices
+/// required to rebuild the FaceVarying and Uniform primitive variables. These
+/// depend only on the topology of the original mesh, so are shared between
+/// calls via MeshAlgo::topologyCache().
+CompoundDataPtr triangulatedTopology( const MeshPrimitive *mesh )
+{
+	const std::vector<int> &verticesPerFaceReadable = mesh->verticesPerFace()->readable();
+	const std::vector<int> &vertexIdsReadable = mesh->vertexIds()->readable();
+
+	IntVectorDataPtr newVertexIds = new IntVectorData();
+	std::vector<int> &newVertexIdsWritable = newVertexIds->writable();
+	newVertexIdsWritable.reserve( vertexIdsReadable.size() );
+
+	IntVectorDataPtr newVerticesPerFace = new IntVectorData();
+	std::vector<int> &newVerticesPerFaceWritable = newVerticesPerFace->writable();
+	newVerticesPerFaceWritable.reserve( verticesPerFaceReadable.size() );
+
+	IntVectorDataPtr faceVaryingIndices = new IntVectorData();
+	std::vector<int> &faceVaryingIndicesWritable = faceVaryingIndices->writable();
+	IntVectorDataPtr uniformIndices = new IntVectorData();
+	std::vector<int> &uniformIndicesWritable = uniformIndices->writable();
+
+	int faceVertexIdStart = 0;
+	int faceIdx = 0;
+	for( IntVectorData::ValueType::const_iterator it = verticesPerFaceReadable.begin(); it != verticesPerFaceReadable.end(); ++it, ++faceIdx )
+	{
+		int numFaceVerts = *it;
+
+		/// For the time being, just do a simple triangle fan.
+		/// Triangles are passed through unchanged.
+		const int i0 = faceVertexIdStart + 0;
+		for( int i = 1; i < numFaceVerts - 1; i++ )
+		{
+			const int i1 = faceVertexIdStart + i;
+			const int i2 = faceVertexIdStart + i + 1;
+
+			/// Create a new triangle
+			newVerticesPerFaceWritable.push_back( 3 );
+
+			/// Triangulate the vertices
+			newVertexIdsWritable.push_back( vertexIdsReadable[i0] );
+			newVertexIdsWritable.push_back( vertexIdsReadable[i1] );
+			newVertexIdsWritable.push_back( vertexIdsReadable[i2] );
+
+			/// Store the indices required to rebuild the facevarying primvars
+			faceVaryingIndicesWritable.push_back( i0 );
+			faceVaryingIndicesWritable.push_back( i1 );
+			faceVaryingIndicesWritable.push_back( i2 );
+
+			uniformIndicesWritable.push_back( faceIdx );
+		}
+
+		faceVertexIdStart += numFaceVerts;
+	}
+
+	CompoundDataPtr result = new CompoundData;
+	result->writable()["verticesPerFace"] = newVerticesPerFace;
+	result->writable()["vertexIds"] = newVertexIds;
+	result->writable()["faceVaryingIndices"] = faceVaryingIndices;
+	result->writable()["uniformIndices"] = uniformIndices;
+	return result;
+}
+
+/// A simple class to allow MeshAlgo::triangulate to validate either V3fVectorData or V3dVectorData using
+/// despatchTypedData. If checkPolygons is true, throws if any polygon is concave or non-planar.
+struct ValidateFn
 {
 	typedef void ReturnType;
 
-	MeshPrimitive *m_mesh;
+	const MeshPrimitive *m_mesh;
 	float m_tolerance;
-	bool m_throwExceptions;
+	bool m_checkPolygons;
 
-	TriangulateFn( MeshPrimitive *mesh, float tolerance, bool throwExceptions ) : m_mesh( mesh ), m_tolerance( tolerance ), m_throwExceptions( throwExceptions )
+	ValidateFn( const MeshPrimitive *mesh, float tolerance, bool checkPolygons ) : m_mesh( mesh ), m_tolerance( tolerance ), m_checkPolygons( checkPolygons )
 	{
 	}
 
 	template<typename T>
-	ReturnType operator()( T *p )
+	ReturnType operator()( const T *p )
 	{
+		if( !m_checkPolygons )
+		{
+			return;
+		}
+
 		typedef typename T::ValueType::value_type Vec;
 
 		const typename T::ValueType &pReadable = p->readable();
 
-		MeshPrimitivePtr meshCopy = m_mesh->copy();
+		const std::vector<int> &verticesPerFaceReadable = m_mesh->verticesPerFace()->readable();
+		const std::vector<int> &vertexIdsReadable = m_mesh->vertexIds()->readable();
 
-		ConstIntVectorDataPtr verticesPerFace = m_mesh->verticesPerFace();
-		const std::vector<int> &verticesPerFaceReadable = verticesPerFace->readable();
-		ConstIntVectorDataPtr vertexIds = m_mesh->vertexIds();
-		const std::vector<int> &vertexIdsReadable = vertexIds->readable();
-
-		IntVectorDataPtr newVertexIds = new IntVectorData();
-		std::vector<int> &newVertexIdsWritable = newVertexIds->writable();
-		newVertexIdsWritable.reserve( vertexIdsReadable.size() );
-
-		IntVectorDataPtr newVerticesPerFace = new IntVectorData();
-		std::vector<int> &newVerticesPerFaceWritable = newVerticesPerFace->writable();
-		newVerticesPerFaceWritable.reserve( verticesPerFaceReadable.size() );
-
-		std::vector<int> faceVaryingIndices;
-		std::vector<int> uniformIndices;
 		int faceVertexIdStart = 0;
-		int faceIdx = 0;
-		for( IntVectorData::ValueType::const_iterator it = verticesPerFaceReadable.begin(); it != verticesPerFaceReadable.end(); ++it, ++faceIdx )
+		for( IntVectorData::ValueType::const_iterator it = verticesPerFaceReadable.begin(); it != verticesPerFaceReadable.end(); ++it )
 		{
 			int numFaceVerts = *it;
 
 			if( numFaceVerts > 3 )
 			{
-				/// For the time being, just do a simple triangle fan.
-
-				const int i0 = faceVertexIdStart + 0;
-				const int v0 = vertexIdsReadable[i0];
-
-				int i1 = faceVertexIdStart + 1;
-				int i2 = faceVertexIdStart + 2;
-				int v1 = vertexIdsReadable[i1];
-				int v2 = vertexIdsReadable[i2];
+				const int v0 = vertexIdsReadable[faceVertexIdStart + 0];
+				const int v1 = vertexIdsReadable[faceVertexIdStart + 1];
+				const int v2 = vertexIdsReadable[faceVertexIdStart + 2];
 
 				const Vec firstTriangleNormal = triangleNormal( pReadable[v0], pReadable[v1], pReadable[v2] );
 
-				if( m_throwExceptions )
+				/// Convexivity test - for each edge, all other vertices must be on the same "side" of it
+				for( int i = 0; i < numFaceVerts - 1; i++ )
 				{
-					/// Convexivity test - for each edge, all other vertices must be on the same "side" of it
-					for( int i = 0; i < numFaceVerts - 1; i++ )
-					{
-						const int edgeStartIndex = faceVertexIdStart + i + 0;
-						const int edgeStart = vertexIdsReadable[edgeStartIndex];
+					const int edgeStartIndex = faceVertexIdStart + i + 0;
+					const int edgeStart = vertexIdsReadable[edgeStartIndex];
 
-						const int edgeEndIndex = faceVertexIdStart + i + 1;
-						const int edgeEnd = vertexIdsReadable[edgeEndIndex];
+					const int edgeEndIndex = faceVertexIdStart + i + 1;
+					const int edgeEnd = vertexIdsReadable[edgeEndIndex];
 
-						const Vec edge = pReadable[edgeEnd] - pReadable[edgeStart];
-						const float edgeLength = edge.length();
+					const Vec edge = pReadable[edgeEnd] - pReadable[edgeStart];
+					const float edgeLength = edge.length();
 
-						if( edgeLength > m_tolerance )
-						{
-							const Vec edgeDirection = edge / edgeLength;
+					if( edgeLength > m_tolerance )
+					{
+						const Vec edgeDirection = edge / edgeLength;
 
-							/// Construct a plane whose normal is perpendicular to both the edge and the polygon's normal
-							const Vec planeNormal = edgeDirection.cross( firstTriangleNormal );
-							const float planeConstant = planeNormal.dot( pReadable[edgeStart] );
+						/// Construct a plane whose normal is perpendicular to both the edge and the polygon's normal
+						const Vec planeNormal = edgeDirection.cross( firstTriangleNormal );
+						const float planeConstant = planeNormal.dot( pReadable[edgeStart] );
+
+						int sign = 0;
+						bool first = true;
+						for( int j = 0; j < numFaceVerts; j++ )
+						{
+							const int testVertexIndex = faceVertexIdStart + j;
+							const int testVertex = vertexIdsReadable[testVertexIndex];
 
-							int sign = 0;
-							bool first = true;
-							for( int j = 0; j < numFaceVerts; j++ )
+							if( testVertex != edgeStart && testVertex != edgeEnd )
 							{
-								const int testVertexIndex = faceVertexIdStart + j;
-								const int testVertex = vertexIdsReadable[testVertexIndex];
+								float signedDistance = planeNormal.dot( pReadable[testVertex] ) - planeConstant;
 
-								if( testVertex != edgeStart && testVertex != edgeEnd )
+								if( fabs( signedDistance ) > m_tolerance )
 								{
-									float signedDistance = planeNormal.dot( pReadable[testVertex] ) - planeConstant;
-
-									if( fabs( signedDistance ) > m_tolerance )
+									int thisSign = 1;
+									if( signedDistance < 0.0 )
+									{
+										thisSign = -1;
+									}
+									if( first )
+									{
+										sign = thisSign;
+										first = false;
+									}
+									else if( thisSign != sign )
 									{
-										int thisSign = 1;
-										if( signedDistance < 0.0 )
-										{
-											thisSign = -1;
-										}
-										if( first )
-										{
-											sign = thisSign;
-											first = false;
-										}
-										else if( thisSign != sign )
-										{
-											assert( sign != 0 );
-											throw InvalidArgumentException( "MeshAlgo::triangulate cannot deal with concave polygons" );
-										}
+										assert( sign != 0 );
+										throw InvalidArgumentException( "MeshAlgo::triangulate cannot deal with concave polygons" );
 									}
 								}
 							}
@@ -211,100 +256,21 @@ struct TriangulateFn
 					}
 				}
 
+				/// Planarity test - each triangle of the fan must face the same way as the first
 				for( int i = 1; i < numFaceVerts - 1; i++ )
 				{
-					i1 = faceVertexIdStart + ( ( i + 0 ) % numFaceVerts );
-					i2 = faceVertexIdStart + ( ( i + 1 ) % numFaceVerts );
-					v1 = vertexIdsReadable[i1];
-					v2 = vertexIdsReadable[i2];
+					const int v1 = vertexIdsReadable[faceVertexIdStart + i];
+					const int v2 = vertexIdsReadable[faceVertexIdStart + i + 1];
 
-					if( m_throwExceptions &&
-						fabs( triangleNormal( pReadable[v0], pReadable[v1], pReadable[v2] ).dot( firstTriangleNormal ) - 1.0 ) > m_tolerance )
+					if( fabs( triangleNormal( pReadable[v0], pReadable[v1], pReadable[v2] ).dot( firstTriangleNormal ) - 1.0 ) > m_tolerance )
 					{
 						throw InvalidArgumentException( "MeshAlgo::triangulate cannot deal with non-planar polygons" );
 					}
-
-					/// Create a new triangle
-					newVerticesPerFaceWritable.push_back( 3 );
-
-					/// Triangulate the vertices
-					newVertexIdsWritable.push_back( v0 );
-					newVertexIdsWritable.push_back( v1 );
-					newVertexIdsWritable.push_back( v2 );
-
-					/// Store the indices required to rebuild the facevarying primvars
-					faceVaryingIndices.push_back( i0 );
-					faceVaryingIndices.push_back( i1 );
-					faceVaryingIndices.push_back( i2 );
-
-					uniformIndices.push_back( faceIdx );
 				}
 			}
-			else
-			{
-				assert( numFaceVerts == 3 );
-
-				int i0 = faceVertexIdStart + 0;
-				int i1 = faceVertexIdStart + 1;
-				int i2 = faceVertexIdStart + 2;
-
-				newVerticesPerFaceWritable.push_back( 3 );
-
-				/// Copy across the vertexId data
-				newVertexIdsWritable.push_back( vertexIdsReadable[i0] );
-				newVertexIdsWritable.push_back( vertexIdsReadable[i1] );
-				newVertexIdsWritable.push_back( vertexIdsReadable[i2] );
-
-				/// Store the indices required to rebuild the facevarying primvars
-				faceVaryingIndices.push_back( i0 );
-				faceVaryingIndices.push_back( i1 );
-				faceVaryingIndices.push_back( i2 );
-
-				uniformIndices.push_back( faceIdx );
-			}
 
 			faceVertexIdStart += numFaceVerts;
 		}
-
-		m_mesh->setTopologyUnchecked( newVerticesPerFace, newVertexIds, pReadable.size(), m_mesh->interpolation() );
-
-		/// Rebuild all the facevarying primvars, using the list of indices into the old data we created above.
-		assert( faceVaryingIndices.size() == newVertexIds->readable().size() );
-		TriangleDataRemap varyingRemap( faceVaryingIndices );
-		TriangleDataRemap uniformRemap( uniformIndices );
-		for( PrimitiveVariableMap::iterator it = m_mesh->variables.begin(); it != m_mesh->variables.end(); ++it )
-		{
-			TriangleDataRemap *remap = nullptr;
-			if( it->second.interpolation == PrimitiveVariable::FaceVarying )
-			{
-				remap = &varyingRemap;
-			}
-			else if( it->second.interpolation == PrimitiveVariable::Uniform )
-			{
-				remap = &uniformRemap;
-			}
-			else
-			{
-				continue;
-			}
-
-			const Data *inputData = it->second.indices ? it->second.indices.get() : it->second.data.get();
-			DataPtr result = inputData->copy();
-			remap->m_other = inputData;
-
-			despatchTypedData<TriangleDataRemap, TypeTraits::IsVectorTypedData>( result.get(), *remap );
-
-			if( it->second.indices )
-			{
-				it->second.indices = runTimeCast<IntVectorData>( result );
-			}
-			else
-			{
-				it->second.data = result;
-			}
-		}
-
-		assert( m_mesh->arePrimitiveVariablesValid() );
 	}
 
 	struct ErrorHandler
@@ -361,17 +327,66 @@ MeshPrimitivePtr MeshAlgo::triangulate(
 	}
 
 	PrimitiveVariableMap::const_iterator pvIt = meshCopy->variables.find( "P" );
-	if( pvIt != meshCopy->variables.end() )
+	if( pvIt == meshCopy->variables.end() )
+	{
+		reportError( "MeshAlgo::triangulate", "MeshPrimitive has no \"P\" data", throwExceptions );
+		return nullptr;
+	}
+
+	// validate the type of "P", and if requested, the shape of the polygons.
+	Data *verticesData = pvIt->second.data.get();
+	ValidateFn fn( mesh, tolerance, throwExceptions );
+	despatchTypedData<ValidateFn, TypeTraits::IsFloatVec3VectorTypedData, ValidateFn::ErrorHandler>( verticesData, fn );
+
+	MurmurHash key;
+	key.append( "triangulate" );
+	ConstCompoundDataPtr topology = IECoreScene::Detail::cachedTopologyTables(
+		mesh, key, [mesh] { return triangulatedTopology( mesh ); }
+	);
+
+	meshCopy->setTopologyUnchecked(
+		topology->member<IntVectorData>( "verticesPerFace" ),
+		topology->member<IntVectorData>( "vertexIds" ),
+		IECore::size( verticesData ),
+		meshCopy->interpolation()
+	);
+
+	/// Rebuild all the facevarying and uniform primvars, using the lists of indices into the old data.
+	TriangleDataRemap varyingRemap( topology->member<IntVectorData>( "faceVaryingIndices" )->readable() );
+	TriangleDataRemap uniformRemap( topology->member<IntVectorData>( "uniformIndices" )->readable() );
+	for( PrimitiveVariableMap::iterator it = meshCopy->variables.begin(); it != meshCopy->variables.end(); ++it )
 	{
-		const DataPtr &verticesData = pvIt->second.data;
+		TriangleDataRemap *remap = nullptr;
+		if( it->second.interpolation == PrimitiveVariable::FaceVarying )
+		{
+			remap = &varyingRemap;
+		}
+		else if( it->second.interpolation == PrimitiveVariable::Uniform )
+		{
+			remap = &uniformRemap;
+		}
+		else
+		{
+			continue;
+		}
 
-		TriangulateFn fn( meshCopy.get(), tolerance, throwExceptions );
+		const Data *inputData = it->second.indices ? it->second.indices.get() : it->second.data.get();
+		DataPtr result = inputData->copy();
+		remap->m_other = inputData;
 
-		despatchTypedData<TriangulateFn, TypeTraits::IsFloatVec3VectorTypedData, TriangulateFn::ErrorHandler>( verticesData.get(), fn );
+		despatchTypedData<TriangleDataRemap, TypeTraits::IsVectorTypedData>( result.get(), *remap );
 
-		return meshCopy;
+		if( it->second.indices )
+		{
+			it->second.indices = runTimeCast<IntVectorData>( result );
+		}
+		else
+		{
+			it->second.data = result;
+		}
 	}
 
-	reportError( "MeshAlgo::triangulate", "MeshPrimitive has no \"P\" data", throwExceptions );
-	return nullptr;
+	assert( meshCopy->arePrimitiveVariablesValid() );
+
+	return meshCopy;
 }
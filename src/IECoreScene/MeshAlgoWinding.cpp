@@ -34,6 +34,7 @@
 
 #include "IECoreScene/MeshAlgo.h"
 #include "IECoreScene/PolygonIterator.h"
+#include "IECoreScene/private/MeshAlgoUtils.h"
 
 #include "IECore/DataAlgo.h"
 
@@ -49,25 +50,47 @@ namespace
 {
 
 template<typename T>
-void reverseWinding( MeshPrimitive *mesh, T &values )
+void reverseWinding( MeshPrimitive *mesh, const std::vector<int> &faceOffsets, T &values, const Canceller *canceller )
 {
-	for( PolygonIterator it = mesh->faceBegin(), eIt = mesh->faceEnd(); it != eIt; ++it )
-	{
-		std::reverse( it.faceVaryingBegin( values.begin() ), it.faceVaryingEnd( values.begin() ) );
-	}
+	const std::vector<int> &verticesPerFace = mesh->verticesPerFace()->readable();
+	const std::vector<int> &vertexIds = mesh->vertexIds()->readable();
+	IECoreScene::Detail::parallelFor(
+		verticesPerFace.size(), canceller,
+		[&]( const tbb::blocked_range<size_t> &range )
+		{
+			for( size_t face = range.begin(); face != range.end(); ++face )
+			{
+				PolygonIterator it( verticesPerFace.begin() + face, vertexIds.begin() + faceOffsets[face], faceOffsets[face] );
+				std::reverse( it.faceVaryingBegin( values.begin() ), it.faceVaryingEnd( values.begin() ) );
+			}
+		}
+	);
 }
 
 struct ReverseWindingFunctor
 {
 
-	ReverseWindingFunctor( MeshPrimitive *mesh ) : m_mesh( mesh )
+	ReverseWindingFunctor( MeshPrimitive *mesh, const std::vector<int> &faceOffsets, const Canceller *canceller )
+		:	m_mesh( mesh ), m_faceOffsets( faceOffsets ), m_canceller( canceller )
 	{
 	}
 
 	template<typename T>
 	void operator()( TypedData<std::vector<T>> *data )
 	{
-		reverseWinding( m_mesh, data->writable() );
+		reverseWinding( m_mesh, m_faceOffsets, data->writable(), m_canceller );
+	}
+
+	void operator()( BoolVectorData *data )
+	{
+		// std::vector<bool> packs its elements into shared words,
+		// so can't be written to from multiple threads.
+		Canceller::check( m_canceller );
+		auto &values = data->writable();
+		for( PolygonIterator it = m_mesh->faceBegin(), eIt = m_mesh->faceEnd(); it != eIt; ++it )
+		{
+			std::reverse( it.faceVaryingBegin( values.begin() ), it.faceVaryingEnd( values.begin() ) );
+		}
 	}
 
 	void operator()( Data *data )
@@ -78,15 +101,19 @@ struct ReverseWindingFunctor
 	private :
 
 		MeshPrimitive *m_mesh;
+		const std::vector<int> &m_faceOffsets;
+		const Canceller *m_canceller;
 
 };
 
 } // namespace
 
-void IECoreScene::MeshAlgo::reverseWinding( MeshPrimitive *mesh )
+void IECoreScene::MeshAlgo::reverseWinding( MeshPrimitive *mesh, const Canceller *canceller )
 {
+	const std::vector<int> faceOffsets = IECoreScene::Detail::faceVertexOffsets( mesh->verticesPerFace()->readable() );
+
 	IntVectorDataPtr vertexIds = mesh->vertexIds()->copy();
-	::reverseWinding( mesh, vertexIds->writable() );
+	::reverseWinding( mesh, faceOffsets, vertexIds->writable(), canceller );
 	mesh->setTopologyUnchecked(
 		mesh->verticesPerFace(),
 		vertexIds,
@@ -94,14 +121,14 @@ void IECoreScene::MeshAlgo::reverseWinding( MeshPrimitive *mesh )
 		mesh->interpolation()
 	);
 
-	ReverseWindingFunctor reverseWindingFunctor( mesh );
+	ReverseWindingFunctor reverseWindingFunctor( mesh, faceOffsets, canceller );
 	for( auto &it : mesh->variables )
 	{
 		if( it.second.interpolation == PrimitiveVariable::FaceVarying )
 		{
 			if( it.second.indices )
 			{
-				::reverseWinding<IntVectorData::ValueType>( mesh, it.second.indices->writable() );
+				::reverseWinding<IntVectorData::ValueType>( mesh, faceOffsets, it.second.indices->writable(), canceller );
 			}
 			else
 			{
@@ -39,6 +39,7 @@
 #include "IECore/BoxOps.h"
 #include "IECore/Exception.h"
 #include "IECore/Export.h"
+#include "IECore/LRUCache.h"
 #include "IECore/SimpleTypedData.h"
 #include "IECore/TriangleAlgo.h"
 
@@ -49,6 +50,10 @@ IECORE_POP_DEFAULT_VISIBILITY
 #include "OpenEXR/ImathBoxAlgo.h"
 #include "OpenEXR/ImathLineAlgo.h"
 
+#include "tbb/blocked_range.h"
+#include "tbb/parallel_for.h"
+
+#include <algorithm>
 #include <cassert>
 
 using namespace IECore;
@@ -59,6 +64,146 @@ IE_CORE_DEFINERUNTIMETYPED( MeshPrimitiveEvaluator );
 
 static PrimitiveEvaluator::Description< MeshPrimitiveEvaluator > g_registraar = PrimitiveEvaluator::Description< MeshPrimitiveEvaluator >();
 
+//////////////////////////////////////////////////////////////////////////
+// Internal utilities
+//////////////////////////////////////////////////////////////////////////
+
+namespace
+{
+
+// Caches hierarchies by topology, so that they can be reused by other evaluators.
+// Hierarchies built for identical bounds are shared directly, and otherwise the
+// structure of the cached hierarchy is refit to the new bounds, which is much
+// quicker than building from scratch. This is particularly beneficial for
+// deforming meshes, where the topology is the same on every frame.
+//
+// Note that a refit hierarchy keeps the layout chosen for the bounds it was
+// first built for, so query performance degrades if the positions have moved
+// far from those. Queries always remain correct.
+template<typename BVH>
+class BVHCache
+{
+
+	public :
+
+		typedef std::vector<typename BVH::Bound> BoundVector;
+
+		BVHCache( size_t maxMemory )
+			:	m_cache( getter, maxMemory )
+		{
+		}
+
+		typename BVH::ConstPtr get( const MurmurHash &topologyHash, const MurmurHash &boundsHash, const BoundVector &bounds )
+		{
+			const CacheEntry entry = m_cache.get( topologyHash );
+			if( entry.bvh )
+			{
+				if( entry.boundsHash == boundsHash )
+				{
+					return entry.bvh;
+				}
+				return new BVH( *entry.bvh, bounds.begin(), bounds.end() );
+			}
+
+			// We build the hierarchy here rather than in the getter, because
+			// the build uses parallel algorithms, and the cache holds a lock on
+			// the item for the duration of the getter. A thread waiting within
+			// the build may take a task from an outer parallel loop, which may
+			// then request the same item, and deadlock on that lock. Concurrent
+			// builds for the same topology are therefore possible, but the last
+			// one to finish simply replaces the others in the cache.
+			CacheEntry result;
+			result.boundsHash = boundsHash;
+			result.bvh = new BVH( bounds.begin(), bounds.end() );
+			m_cache.set( topologyHash, result, result.bvh->memoryUsage() );
+			return result.bvh;
+		}
+
+	private :
+
+		struct CacheEntry
+		{
+			MurmurHash boundsHash;
+			typename BVH::ConstPtr bvh;
+		};
+
+		// Returns an empty entry, signifying that get() must build the
+		// hierarchy and store it with set().
+		static CacheEntry getter( const MurmurHash &, size_t &cost )
+		{
+			cost = 0;
+			return CacheEntry();
+		}
+
+		typedef LRUCache<MurmurHash, CacheEntry, LRUCachePolicy::Parallel> Cache;
+		Cache m_cache;
+
+};
+
+BVHCache<MeshPrimitiveEvaluator::TriangleBVH> &triangleBVHCache()
+{
+	static BVHCache<MeshPrimitiveEvaluator::TriangleBVH> g_cache( 500 * 1024 * 1024 );
+	return g_cache;
+}
+
+BVHCache<MeshPrimitiveEvaluator::UVBVH> &uvBVHCache()
+{
+	static BVHCache<MeshPrimitiveEvaluator::UVBVH> g_cache( 100 * 1024 * 1024 );
+	return g_cache;
+}
+
+// Returns the squared distance from `p` to the closest point in `box`, or 0
+// if `p` is inside. Written without branches, so that it is easily vectorised.
+inline float boxDistanceSquared( const V3f &p, const Box3f &box )
+{
+	float result = 0.0f;
+	for( int i = 0; i < 3; ++i )
+	{
+		const float d = std::max( std::max( box.min[i] - p[i], 0.0f ), p[i] - box.max[i] );
+		result += d * d;
+	}
+	return result;
+}
+
+// Returns true if `ray` intersects `box`, setting `t` to the distance along
+// the ray at which it enters the box (or 0 if the ray starts inside the box).
+// `inverseDirection` is the component-wise reciprocal of the ray direction.
+// Division by zero is intentional : it produces infinities which the slab
+// test handles correctly, and any NaNs are discarded by the order of
+// arguments to min/max.
+inline bool rayBoxIntersection( const Line3f &ray, const V3f &inverseDirection, const Box3f &box, float &t )
+{
+	float tMin = 0.0f;
+	float tMax = limits<float>::max();
+	for( int i = 0; i < 3; ++i )
+	{
+		const float t0 = ( box.min[i] - ray.pos[i] ) * inverseDirection[i];
+		const float t1 = ( box.max[i] - ray.pos[i] ) * inverseDirection[i];
+		tMin = std::max( tMin, std::min( t0, t1 ) );
+		tMax = std::min( tMax, std::max( t0, t1 ) );
+	}
+	t = tMin;
+	return tMin <= tMax;
+}
+
+V3f reciprocal( const V3f &v )
+{
+	return V3f( 1.0f / v[0], 1.0f / v[1], 1.0f / v[2] );
+}
+
+// An entry in the stack used for traversing a hierarchy,
+// recording the distance to the node's bound so that
+// we can skip nodes made irrelevant by subsequent hits.
+struct StackEntry
+{
+	MeshPrimitiveEvaluator::TriangleBVH::NodeIndex nodeIndex;
+	float distance;
+};
+
+typedef StackEntry Stack[MeshPrimitiveEvaluator::TriangleBVH::maxDepth + 1];
+
+} // namespace
+
 MeshPrimitiveEvaluator::Result::Result()
 {
 }
@@ -211,7 +356,7 @@ const V3i &MeshPrimitiveEvaluator::Result::vertexIds() const
 	return m_vertexIds;
 }
 
-MeshPrimitiveEvaluator::MeshPrimitiveEvaluator( ConstMeshPrimitivePtr mesh ) : m_uvTree(nullptr), m_haveMassProperties( false ), m_haveSurfaceArea( false ), m_haveAverageNormals( false )
+MeshPrimitiveEvaluator::MeshPrimitiveEvaluator( ConstMeshPrimitivePtr mesh ) : m_tree( nullptr ), m_uvTree( nullptr ), m_haveMassProperties( false ), m_haveSurfaceArea( false ), m_haveAverageNormals( false )
 {
 	if (! mesh )
 	{
@@ -248,62 +393,20 @@ MeshPrimitiveEvaluator::MeshPrimitiveEvaluator( ConstMeshPrimitivePtr mesh ) : m
 		m_uv = primVarIt->second;
 	}
 
+	m_haveTriangleBVH = false;
+	m_haveUVBVH = false;
+
 	const std::vector<int> &verticesPerFace = m_mesh->verticesPerFace()->readable();
-	m_triangles.reserve( verticesPerFace.size() );
-	m_uvTriangles.reserve( verticesPerFace.size() );
-	unsigned int triangleIdx = 0;
-	IntVectorData::ValueType::const_iterator vertexIdIt = m_meshVertexIds->begin();
-	for ( IntVectorData::ValueType::const_iterator it = verticesPerFace.begin();
-		it != verticesPerFace.end(); ++it, ++triangleIdx)
+	for( std::vector<int>::const_iterator it = verticesPerFace.begin(); it != verticesPerFace.end(); ++it )
 	{
-
-		if (*it != 3 )
+		if( *it != 3 )
 		{
 			throw InvalidArgumentException( "Non-triangular mesh given to MeshPrimitiveEvaluator");
 		}
-
-		Imath::V3i triangleVertexIds;
-
-		triangleVertexIds[0] = *vertexIdIt++;
-		assert( triangleVertexIds[0] < (int)( m_verts->readable().size() ) );
-		triangleVertexIds[1] = *vertexIdIt++;
-		assert( triangleVertexIds[1] < (int)( m_verts->readable().size() ) );
-		triangleVertexIds[2] = *vertexIdIt++;
-		assert( triangleVertexIds[2] < (int)( m_verts->readable().size() ) );
-
-		const V3f &p0 = m_verts->readable()[ triangleVertexIds[0] ];
-		const V3f &p1 = m_verts->readable()[ triangleVertexIds[1] ];
-		const V3f &p2 = m_verts->readable()[ triangleVertexIds[2] ];
-
-		Box3f bound( p0 );
-		bound.extendBy( p1 );
-		bound.extendBy( p2 );
-
-		m_triangles.push_back( bound );
-
-		if( m_uv.interpolation != PrimitiveVariable::Invalid )
-		{
-			Imath::V2f uv[3];
-			triangleUVs( triangleIdx, triangleVertexIds, uv );
-
-			Box2f uvBound( uv[0] );
-			uvBound.extendBy( uv[1] );
-			uvBound.extendBy( uv[2] );
-
-			m_uvTriangles.push_back( uvBound );
-		}
 	}
 
-	m_tree = new TriangleBoundTree( m_triangles.begin(), m_triangles.end() );
-
-	if( m_uv.interpolation != PrimitiveVariable::Invalid )
-	{
-		m_uvTree = new UVBoundTree( m_uvTriangles.begin(), m_uvTriangles.end() );
-	}
-	else
-	{
-		m_uvTree = nullptr;
-	}
+	// The acceleration structures are built lazily, the
+	// first time a query needs them.
 }
 
 PrimitiveEvaluatorPtr MeshPrimitiveEvaluator::create( ConstPrimitivePtr primitive )
@@ -316,8 +419,6 @@ PrimitiveEvaluatorPtr MeshPrimitiveEvaluator::create( ConstPrimitivePtr primitiv
 
 MeshPrimitiveEvaluator::~MeshPrimitiveEvaluator()
 {
-	assert( m_tree );
-
 	delete m_tree;
 	m_tree = nullptr;
 
@@ -749,6 +850,24 @@ PrimitiveEvaluator::ResultPtr MeshPrimitiveEvaluator::createResult() const
       return new Result();
 }
 
+PrimitiveEvaluator::BatchResultFunction MeshPrimitiveEvaluator::batchResultFunction( CompoundData *batchResult, size_t size ) const
+{
+	IntVectorDataPtr triangleIndexData = new IntVectorData( std::vector<int>( size, 0 ) );
+	V3fVectorDataPtr barycentricCoordinatesData = new V3fVectorData( std::vector<V3f>( size, V3f( 0 ) ) );
+	batchResult->writable()["triangleIndex"] = triangleIndexData;
+	batchResult->writable()["barycentricCoordinates"] = barycentricCoordinatesData;
+
+	const BatchResultFunction baseFunction = PrimitiveEvaluator::batchResultFunction( batchResult, size );
+	std::vector<int> *triangleIndices = &triangleIndexData->writable();
+	std::vector<V3f> *barycentricCoordinates = &barycentricCoordinatesData->writable();
+	return [baseFunction, triangleIndices, barycentricCoordinates]( const PrimitiveEvaluator::Result *result, size_t index ) {
+		baseFunction( result, index );
+		const Result *meshResult = static_cast<const Result *>( result );
+		(*triangleIndices)[index] = meshResult->triangleIndex();
+		(*barycentricCoordinates)[index] = meshResult->barycentricCoordinates();
+	};
+}
+
 void MeshPrimitiveEvaluator::validateResult( PrimitiveEvaluator::Result *result ) const
 {
 	if (! dynamic_cast<MeshPrimitiveEvaluator::Result *>( result ) )
@@ -761,18 +880,16 @@ bool MeshPrimitiveEvaluator::closestPoint( const V3f &p, PrimitiveEvaluator::Res
 {
 	assert( dynamic_cast<Result *>( result ) );
 
-	if ( m_triangles.size() == 0)
+	if ( m_mesh->numFaces() == 0 )
 	{
 		return false;
 	}
 
-	assert( m_tree );
-
 	Result *mr = static_cast<Result *>( result );
 
 	float maxDistSqrd = limits<float>::max();
 
-	closestPointWalk( m_tree->rootIndex(), p, maxDistSqrd, mr );
+	closestPointWalk( p, maxDistSqrd, mr );
 
 	return true;
 }
@@ -781,15 +898,14 @@ bool MeshPrimitiveEvaluator::pointAtUV( const Imath::V2f &uv, PrimitiveEvaluator
 {
 	assert( dynamic_cast<Result *>( result ) );
 
-	if ( ! m_uvTriangles.size() )
+	if ( m_uv.interpolation == PrimitiveVariable::Invalid || m_mesh->numFaces() == 0 )
 	{
 		throw Exception("No uvs available for pointAtUV");
 	}
 
-	assert( m_uvTree );
 	Result *mr = static_cast<Result *>( result );
 
-	return pointAtUVWalk( m_uvTree->rootIndex(), uv, mr );
+	return pointAtUVWalk( uv, mr );
 }
 
 bool MeshPrimitiveEvaluator::intersectionPoint( const Imath::V3f &origin, const Imath::V3f &direction,
@@ -797,13 +913,11 @@ bool MeshPrimitiveEvaluator::intersectionPoint( const Imath::V3f &origin, const
 {
 	assert( dynamic_cast<Result *>( result ) );
 
-	if ( m_triangles.size() == 0)
+	if ( m_mesh->numFaces() == 0 )
 	{
 		return false;
 	}
 
-	assert( m_tree );
-
 	Result *mr = static_cast<Result *>( result );
 
 	float maxDistSqrd = maxDistance * maxDistance;
@@ -812,10 +926,7 @@ bool MeshPrimitiveEvaluator::intersectionPoint( const Imath::V3f &origin, const
 	ray.pos = origin;
 	ray.dir = direction.normalized();
 
-	bool hit = false;
-
-	intersectionPointWalk( m_tree->rootIndex(), ray, maxDistSqrd, mr, hit );
-	return hit;
+	return intersectionPointWalk( ray, maxDistSqrd, mr );
 }
 
 int MeshPrimitiveEvaluator::intersectionPoints( const Imath::V3f &origin, const Imath::V3f &direction,
@@ -823,27 +934,25 @@ int MeshPrimitiveEvaluator::intersectionPoints( const Imath::V3f &origin, const
 {
 	results.clear();
 
-	if ( m_triangles.size() == 0)
+	if ( m_mesh->numFaces() == 0 )
 	{
 		return 0;
 	}
 
-	assert( m_tree );
-
 	float maxDistSqrd = maxDistance * maxDistance;
 
 	Imath::Line3f ray;
 	ray.pos = origin;
 	ray.dir = direction.normalized();
 
-	intersectionPointsWalk( m_tree->rootIndex(), ray, maxDistSqrd, results );
+	intersectionPointsWalk( ray, maxDistSqrd, results );
 
 	return results.size();
 }
 
 bool MeshPrimitiveEvaluator::barycentricPosition( unsigned int triangleIndex, const Imath::V3f &barycentricCoordinates, PrimitiveEvaluator::Result *result ) const
 {
-	if( triangleIndex >= m_triangles.size() )
+	if( triangleIndex >= m_mesh->numFaces() )
 	{
 		return false;
 	}
@@ -872,115 +981,125 @@ bool MeshPrimitiveEvaluator::barycentricPosition( unsigned int triangleIndex, co
 	return true;
 }
 
-void MeshPrimitiveEvaluator::closestPointWalk( TriangleBoundTree::NodeIndex nodeIndex, const V3f &p, float &closestDistanceSqrd, Result *result ) const
+void MeshPrimitiveEvaluator::closestPointWalk( const V3f &p, float &closestDistanceSqrd, Result *result ) const
 {
-	assert( m_tree );
+	const TriangleBVH *bvh = triangleBVH();
+	const TriangleBVH::PrimitiveIndices &primitiveIndices = bvh->primitiveIndices();
+	const std::vector<V3f> &verts = m_verts->readable();
 
-	const TriangleBoundTree::Node &node = m_tree->node( nodeIndex );
-	if( node.isLeaf() )
+	Stack stack;
+	unsigned stackSize = 0;
+	stack[stackSize++] = { TriangleBVH::rootIndex(), boxDistanceSquared( p, bvh->node( TriangleBVH::rootIndex() ).bound() ) };
+
+	while( stackSize )
 	{
-		TriangleBoundTree::Iterator *permLast = node.permLast();
-		for( TriangleBoundTree::Iterator *perm = node.permFirst(); perm!=permLast; perm++ )
+		const StackEntry entry = stack[--stackSize];
+		if( entry.distance >= closestDistanceSqrd )
 		{
-			size_t triangleIndex = *perm - m_triangles.begin(); // triangle index is just the distance of the triangle from the beginning of the vector
-			size_t vertIdOffset = triangleIndex * 3;
-			Imath::V3i vertexIds( (*m_meshVertexIds)[vertIdOffset], (*m_meshVertexIds)[vertIdOffset+1], (*m_meshVertexIds)[vertIdOffset+2] );
-
-			assert( vertexIds[0] < (int)( m_verts->readable().size() ) );
-			assert( vertexIds[1] < (int)( m_verts->readable().size() ) );
-			assert( vertexIds[2] < (int)( m_verts->readable().size() ) );
-
-			V3f bary;
-			float dSqrd = triangleClosestBarycentric(
-				m_verts->readable()[vertexIds[0]],
-				m_verts->readable()[vertexIds[1]],
-				m_verts->readable()[vertexIds[2]],
-				p,
-				bary );
+			// We've found something closer since this
+			// node was pushed.
+			continue;
+		}
 
-			if (dSqrd < closestDistanceSqrd)
+		const TriangleBVH::Node &node = bvh->node( entry.nodeIndex );
+		if( node.isLeaf() )
+		{
+			for( uint32_t i = node.primitivesBegin(); i != node.primitivesEnd(); ++i )
 			{
-				closestDistanceSqrd = dSqrd;
-
-				result->m_bary = bary;
-				result->m_vertexIds = vertexIds;
-				result->m_triangleIdx = triangleIndex;
-
-				if( m_uv.interpolation != PrimitiveVariable::Invalid )
-				{
-					result->m_uv = result->vec2PrimVar( m_uv );
-				}
+				const size_t triangleIndex = primitiveIndices[i];
+				const size_t vertIdOffset = triangleIndex * 3;
+				Imath::V3i vertexIds( (*m_meshVertexIds)[vertIdOffset], (*m_meshVertexIds)[vertIdOffset+1], (*m_meshVertexIds)[vertIdOffset+2] );
 
-				const Imath::V3f &p0 = m_verts->readable()[vertexIds[0]];
-				const Imath::V3f &p1 = m_verts->readable()[vertexIds[1]];
-				const Imath::V3f &p2 = m_verts->readable()[vertexIds[2]];
+				assert( vertexIds[0] < (int)( verts.size() ) );
+				assert( vertexIds[1] < (int)( verts.size() ) );
+				assert( vertexIds[2] < (int)( verts.size() ) );
 
-				result->m_p = trianglePoint( p0, p1, p2, result->m_bary );
+				const Imath::V3f &p0 = verts[vertexIds[0]];
+				const Imath::V3f &p1 = verts[vertexIds[1]];
+				const Imath::V3f &p2 = verts[vertexIds[2]];
 
-				result->m_n = triangleNormal( p0, p1, p2 );
-			}
-		}
-	}
-	else
-	{
-		/// Descend into the closest box first
+				V3f bary;
+				float dSqrd = triangleClosestBarycentric( p0, p1, p2, p, bary );
 
-		float dHigh = vecDistance(
-			closestPointInBox( p, m_tree->node( TriangleBoundTree::highChildIndex( nodeIndex ) ).bound() ),
-			p
-		);
+				if( dSqrd < closestDistanceSqrd )
+				{
+					closestDistanceSqrd = dSqrd;
 
-		float dLow = vecDistance(
-			closestPointInBox( p, m_tree->node( TriangleBoundTree::lowChildIndex( nodeIndex ) ).bound() ),
-			p
-		);
+					result->m_bary = bary;
+					result->m_vertexIds = vertexIds;
+					result->m_triangleIdx = triangleIndex;
 
-		TriangleBoundTree::NodeIndex firstChild, secondChild;
+					if( m_uv.interpolation != PrimitiveVariable::Invalid )
+					{
+						result->m_uv = result->vec2PrimVar( m_uv );
+					}
 
-		float dSecond;
+					result->m_p = trianglePoint( p0, p1, p2, result->m_bary );
 
-		if (dHigh < dLow)
-		{
-			firstChild = TriangleBoundTree::highChildIndex( nodeIndex );
-			secondChild = TriangleBoundTree::lowChildIndex( nodeIndex );
-			dSecond = dLow;
+					result->m_n = triangleNormal( p0, p1, p2 );
+				}
+			}
 		}
 		else
 		{
-			firstChild = TriangleBoundTree::lowChildIndex( nodeIndex );
-			secondChild = TriangleBoundTree::highChildIndex( nodeIndex );
-			dSecond = dHigh;
-		}
-
-		closestPointWalk( firstChild, p, closestDistanceSqrd, result );
+			/// Push the closest child last, so that we descend into it first
+			TriangleBVH::NodeIndex firstChild = node.firstChildIndex();
+			TriangleBVH::NodeIndex secondChild = node.secondChildIndex();
+			float dFirst = boxDistanceSquared( p, bvh->node( firstChild ).bound() );
+			float dSecond = boxDistanceSquared( p, bvh->node( secondChild ).bound() );
+			if( dFirst < dSecond )
+			{
+				std::swap( firstChild, secondChild );
+				std::swap( dFirst, dSecond );
+			}
 
-		if (dSecond * dSecond < closestDistanceSqrd )
-		{
-			closestPointWalk( secondChild, p, closestDistanceSqrd, result );
+			if( dFirst < closestDistanceSqrd )
+			{
+				stack[stackSize++] = { firstChild, dFirst };
+			}
+			if( dSecond < closestDistanceSqrd )
+			{
+				stack[stackSize++] = { secondChild, dSecond };
+			}
 		}
 	}
 }
 
-bool MeshPrimitiveEvaluator::pointAtUVWalk( UVBoundTree::NodeIndex nodeIndex, const Imath::V2f &targetUV, Result *result ) const
+bool MeshPrimitiveEvaluator::pointAtUVWalk( const Imath::V2f &targetUV, Result *result ) const
 {
 	assert( m_uv.interpolation != PrimitiveVariable::Invalid );
-	assert( m_uvTree );
 
-	const UVBoundTree::Node &node = m_uvTree->node( nodeIndex );
+	const UVBVH *bvh = uvBVH();
+	const UVBVH::PrimitiveIndices &primitiveIndices = bvh->primitiveIndices();
 
-	if( !node.bound().intersects( targetUV ) )
-	{
-		return false;
-	}
+	UVBVH::NodeIndex stack[UVBVH::maxDepth + 1];
+	unsigned stackSize = 0;
+	stack[stackSize++] = UVBVH::rootIndex();
 
-	if( node.isLeaf() )
+	while( stackSize )
 	{
+		const UVBVH::Node &node = bvh->node( stack[--stackSize] );
+		if( !node.bound().intersects( targetUV ) )
+		{
+			continue;
+		}
+
+		if( node.isBranch() )
+		{
+			stack[stackSize++] = node.secondChildIndex();
+			stack[stackSize++] = node.firstChildIndex();
+			continue;
+		}
 
-		UVBoundTree::Iterator *permLast = node.permLast();
-		for( UVBoundTree::Iterator *perm = node.permFirst(); perm!=permLast; perm++ )
+		for( uint32_t i = node.primitivesBegin(); i != node.primitivesEnd(); ++i )
 		{
-			size_t triangleIndex = *perm - m_uvTriangles.begin(); // triangle index is just the distance of the triangle from the beginning of the vector
-			size_t vertIdOffset = triangleIndex * 3;
+			const size_t triangleIndex = primitiveIndices[i];
+			if( !m_uvTriangles[triangleIndex].intersects( targetUV ) )
+			{
+				continue;
+			}
+
+			const size_t vertIdOffset = triangleIndex * 3;
 			Imath::V3i vertexIds( (*m_meshVertexIds)[vertIdOffset], (*m_meshVertexIds)[vertIdOffset+1], (*m_meshVertexIds)[vertIdOffset+2] );
 
 			Imath::V2f uv[3];
@@ -1009,207 +1128,154 @@ bool MeshPrimitiveEvaluator::pointAtUVWalk( UVBoundTree::NodeIndex nodeIndex, co
 				return true;
 			}
 		}
-
-		return false;
-	}
-	else
-	{
-		if( pointAtUVWalk( UVBoundTree::lowChildIndex( nodeIndex ), targetUV, result ) )
-		{
-			return true;
-		}
-
-		if( pointAtUVWalk( UVBoundTree::highChildIndex( nodeIndex ), targetUV, result ) )
-		{
-			return true;
-		}
-
-		return false;
 	}
 
+	return false;
 }
 
-
-bool MeshPrimitiveEvaluator::intersectionPointWalk( TriangleBoundTree::NodeIndex nodeIndex, const Imath::Line3f &ray, float &maxDistSqrd, Result *result, bool &hit ) const
+bool MeshPrimitiveEvaluator::intersectionPointWalk( const Imath::Line3f &ray, float &maxDistSqrd, Result *result ) const
 {
-	assert( m_tree );
+	const TriangleBVH *bvh = triangleBVH();
+	const TriangleBVH::PrimitiveIndices &primitiveIndices = bvh->primitiveIndices();
+	const std::vector<V3f> &verts = m_verts->readable();
+	const V3f inverseDirection = reciprocal( ray.dir );
 
-	const TriangleBoundTree::Node &node = m_tree->node( nodeIndex );
+	bool hit = false;
 
-	if( node.isLeaf() )
+	Stack stack;
+	unsigned stackSize = 0;
+	float t;
+	if( !rayBoxIntersection( ray, inverseDirection, bvh->node( TriangleBVH::rootIndex() ).bound(), t ) )
 	{
-		TriangleBoundTree::Iterator *permLast = node.permLast();
-		bool intersects = false;
+		return false;
+	}
+	stack[stackSize++] = { TriangleBVH::rootIndex(), t * t };
 
-		for( TriangleBoundTree::Iterator *perm = node.permFirst(); perm!=permLast; perm++ )
+	while( stackSize )
+	{
+		const StackEntry entry = stack[--stackSize];
+		if( entry.distance > maxDistSqrd )
 		{
-			size_t triangleIndex = *perm - m_triangles.begin(); // triangle index is just the distance of the triangle from the beginning of the vector
-			size_t vertIdOffset = triangleIndex * 3;
-			Imath::V3i vertexIds( (*m_meshVertexIds)[vertIdOffset], (*m_meshVertexIds)[vertIdOffset+1], (*m_meshVertexIds)[vertIdOffset+2] );
+			// We've found a closer hit since this
+			// node was pushed.
+			continue;
+		}
 
-			assert( vertexIds[0] < (int)( m_verts->readable().size() ) );
-			assert( vertexIds[1] < (int)( m_verts->readable().size() ) );
-			assert( vertexIds[2] < (int)( m_verts->readable().size() ) );
+		const TriangleBVH::Node &node = bvh->node( entry.nodeIndex );
+		if( node.isLeaf() )
+		{
+			for( uint32_t i = node.primitivesBegin(); i != node.primitivesEnd(); ++i )
+			{
+				const size_t triangleIndex = primitiveIndices[i];
+				const size_t vertIdOffset = triangleIndex * 3;
+				Imath::V3i vertexIds( (*m_meshVertexIds)[vertIdOffset], (*m_meshVertexIds)[vertIdOffset+1], (*m_meshVertexIds)[vertIdOffset+2] );
 
-			const Imath::V3f &p0 = m_verts->readable()[ vertexIds[0] ];
-			const Imath::V3f &p1 = m_verts->readable()[ vertexIds[1] ];
-			const Imath::V3f &p2 = m_verts->readable()[ vertexIds[2] ];
+				assert( vertexIds[0] < (int)( verts.size() ) );
+				assert( vertexIds[1] < (int)( verts.size() ) );
+				assert( vertexIds[2] < (int)( verts.size() ) );
 
-			V3f hitPoint, bary;
-			bool front;
+				const Imath::V3f &p0 = verts[ vertexIds[0] ];
+				const Imath::V3f &p1 = verts[ vertexIds[1] ];
+				const Imath::V3f &p2 = verts[ vertexIds[2] ];
 
-			if ( triangleRayIntersection( p0, p1, p2, ray.pos, ray.dir, hitPoint, bary, front ) )
-			{
-				float dSqrd = vecDistance2( hitPoint, ray.pos );
+				V3f hitPoint, bary;
+				bool front;
 
-				if (dSqrd < maxDistSqrd)
+				if ( triangleRayIntersection( p0, p1, p2, ray.pos, ray.dir, hitPoint, bary, front ) )
 				{
-					maxDistSqrd = dSqrd;
+					float dSqrd = vecDistance2( hitPoint, ray.pos );
 
-					result->m_bary = bary;
-					result->m_vertexIds = vertexIds;
-					result->m_triangleIdx = triangleIndex;
+					if (dSqrd < maxDistSqrd)
+					{
+						maxDistSqrd = dSqrd;
 
-					result->m_p = hitPoint;
+						result->m_bary = bary;
+						result->m_vertexIds = vertexIds;
+						result->m_triangleIdx = triangleIndex;
 
-					if( m_uv.interpolation != PrimitiveVariable::Invalid )
-					{
-						result->m_uv = result->vec2PrimVar( m_uv );
-					}
+						result->m_p = hitPoint;
 
-					result->m_n = triangleNormal( p0, p1, p2 );
+						if( m_uv.interpolation != PrimitiveVariable::Invalid )
+						{
+							result->m_uv = result->vec2PrimVar( m_uv );
+						}
 
-					intersects = true;
-					hit = true;
-				}
-			}
-		}
+						result->m_n = triangleNormal( p0, p1, p2 );
 
-		return intersects;
-	}
-	else
-	{
-		V3f highHitPoint;
-		bool highHit = boxIntersects(
-			m_tree->node( TriangleBoundTree::highChildIndex( nodeIndex ) ).bound(),
-			ray.pos,
-			ray.dir,
-			highHitPoint
-		);
-
-		V3f lowHitPoint;
-		bool lowHit = boxIntersects(
-			m_tree->node( TriangleBoundTree::lowChildIndex( nodeIndex ) ).bound(),
-			ray.pos,
-			ray.dir,
-			lowHitPoint
-		);
-
-		float dHigh = -1;
-		if ( highHit )
-		{
-			float distSqrd = vecDistance2( highHitPoint, ray.pos );
-			if ( distSqrd > maxDistSqrd )
-			{
-				highHit = false;
-			}
-			else
-			{
-				dHigh = distSqrd;
+						hit = true;
+					}
+				}
 			}
 		}
-
-		float dLow = -1;
-		if ( lowHit )
+		else
 		{
-			float distSqrd = vecDistance2( lowHitPoint, ray.pos );
-			if ( distSqrd > maxDistSqrd )
+			/// Push the closest intersection last, so that we descend into it first
+			TriangleBVH::NodeIndex firstChild = node.firstChildIndex();
+			TriangleBVH::NodeIndex secondChild = node.secondChildIndex();
+			float tFirst, tSecond;
+			bool firstHit = rayBoxIntersection( ray, inverseDirection, bvh->node( firstChild ).bound(), tFirst );
+			bool secondHit = rayBoxIntersection( ray, inverseDirection, bvh->node( secondChild ).bound(), tSecond );
+			if( firstHit && secondHit && tFirst < tSecond )
 			{
-				lowHit = false;
+				std::swap( firstChild, secondChild );
+				std::swap( tFirst, tSecond );
 			}
-			else
-			{
-				dLow = distSqrd;
-			}
-		}
 
-		if (lowHit)
-		{
-			if (highHit)
+			if( firstHit && tFirst * tFirst <= maxDistSqrd )
 			{
-				/// Descend into the closest intersection first
-
-				TriangleBoundTree::NodeIndex firstChild, secondChild;
-				float dSecond;
-				if (dHigh < dLow)
-				{
-					firstChild = TriangleBoundTree::highChildIndex( nodeIndex );
-					secondChild = TriangleBoundTree::lowChildIndex( nodeIndex );
-					dSecond = dLow;
-				}
-				else
-				{
-					firstChild = TriangleBoundTree::lowChildIndex( nodeIndex );
-					secondChild = TriangleBoundTree::highChildIndex( nodeIndex );
-					dSecond = dHigh;
-				}
-
-				bool intersection = intersectionPointWalk( firstChild, ray, maxDistSqrd, result, hit );
-
-				if (intersection)
-				{
-					if ( dSecond < maxDistSqrd )
-					{
-						intersectionPointWalk( secondChild, ray, maxDistSqrd, result, hit );
-					}
-
-					return true;
-				}
-				else
-				{
-					return intersectionPointWalk( secondChild, ray, maxDistSqrd, result, hit );
-				}
+				stack[stackSize++] = { firstChild, tFirst * tFirst };
 			}
-			else
+			if( secondHit && tSecond * tSecond <= maxDistSqrd )
 			{
-				return intersectionPointWalk( TriangleBoundTree::lowChildIndex( nodeIndex ), ray, maxDistSqrd, result, hit );
+				stack[stackSize++] = { secondChild, tSecond * tSecond };
 			}
-
-		}
-		else if (highHit)
-		{
-			return intersectionPointWalk( TriangleBoundTree::highChildIndex( nodeIndex ), ray, maxDistSqrd, result, hit );
 		}
-
-
-		return false;
 	}
 
+	return hit;
 }
 
-void MeshPrimitiveEvaluator::intersectionPointsWalk( TriangleBoundTree::NodeIndex nodeIndex, const Imath::Line3f &ray, float maxDistSqrd, std::vector<PrimitiveEvaluator::ResultPtr> &results ) const
+void MeshPrimitiveEvaluator::intersectionPointsWalk( const Imath::Line3f &ray, float maxDistSqrd, std::vector<PrimitiveEvaluator::ResultPtr> &results ) const
 {
-	assert( m_tree );
+	const TriangleBVH *bvh = triangleBVH();
+	const TriangleBVH::PrimitiveIndices &primitiveIndices = bvh->primitiveIndices();
+	const std::vector<V3f> &verts = m_verts->readable();
+	const V3f inverseDirection = reciprocal( ray.dir );
 
-	const TriangleBoundTree::Node &node = m_tree->node( nodeIndex );
+	TriangleBVH::NodeIndex stack[TriangleBVH::maxDepth + 1];
+	unsigned stackSize = 0;
+	stack[stackSize++] = TriangleBVH::rootIndex();
 
-	if( node.isLeaf() )
+	while( stackSize )
 	{
-		TriangleBoundTree::Iterator *permLast = node.permLast();
+		const TriangleBVH::Node &node = bvh->node( stack[--stackSize] );
+
+		float t;
+		if( !rayBoxIntersection( ray, inverseDirection, node.bound(), t ) || t * t >= maxDistSqrd )
+		{
+			continue;
+		}
 
-		for( TriangleBoundTree::Iterator *perm = node.permFirst(); perm!=permLast; perm++ )
+		if( node.isBranch() )
 		{
-			size_t triangleIndex = *perm - m_triangles.begin(); // triangle index is just the distance of the triangle from the beginning of the vector
-			size_t vertIdOffset = triangleIndex * 3;
+			stack[stackSize++] = node.secondChildIndex();
+			stack[stackSize++] = node.firstChildIndex();
+			continue;
+		}
+
+		for( uint32_t i = node.primitivesBegin(); i != node.primitivesEnd(); ++i )
+		{
+			const size_t triangleIndex = primitiveIndices[i];
+			const size_t vertIdOffset = triangleIndex * 3;
 			Imath::V3i vertexIds( (*m_meshVertexIds)[vertIdOffset], (*m_meshVertexIds)[vertIdOffset+1], (*m_meshVertexIds)[vertIdOffset+2] );
 
-			assert( vertexIds[0] < (int)( m_verts->readable().size() ) );
-			assert( vertexIds[1] < (int)( m_verts->readable().size() ) );
-			assert( vertexIds[2] < (int)( m_verts->readable().size() ) );
+			assert( vertexIds[0] < (int)( verts.size() ) );
+			assert( vertexIds[1] < (int)( verts.size() ) );
+			assert( vertexIds[2] < (int)( verts.size() ) );
 
-			const Imath::V3f &p0 =  m_verts->readable()[ vertexIds[0] ];
-			const Imath::V3f &p1 =  m_verts->readable()[ vertexIds[1] ];
-			const Imath::V3f &p2 =  m_verts->readable()[ vertexIds[2] ];
+			const Imath::V3f &p0 = verts[ vertexIds[0] ];
+			const Imath::V3f &p1 = verts[ vertexIds[1] ];
+			const Imath::V3f &p2 = verts[ vertexIds[2] ];
 
 			V3f hitPoint, bary;
 			bool front;
@@ -1240,65 +1306,175 @@ void MeshPrimitiveEvaluator::intersectionPointsWalk( TriangleBoundTree::NodeInde
 			}
 		}
 	}
-	else
+}
+
+const Imath::Box2f MeshPrimitiveEvaluator::uvBound() const
+{
+	const UVBVH *bvh = uvBVH();
+	if( !bvh )
 	{
-		V3f hitPoint;
+		return Imath::Box2f();
+	}
+	return bvh->node( UVBVH::rootIndex() ).bound();
+}
 
-		/// Test highChild bound for intersection, descending into children if necessary
-		bool hit = boxIntersects(
-			m_tree->node( TriangleBoundTree::highChildIndex( nodeIndex ) ).bound(),
-			ray.pos,
-			ray.dir,
-			hitPoint
-		);
+const MeshPrimitiveEvaluator::TriangleBoundVector *MeshPrimitiveEvaluator::triangleBounds() const
+{
+	triangleBVH();
+	return &m_triangles;
+}
 
-		if ( hit && vecDistance2( hitPoint, ray.pos ) < maxDistSqrd )
+const MeshPrimitiveEvaluator::TriangleBVH *MeshPrimitiveEvaluator::triangleBVH() const
+{
+	if( !m_haveTriangleBVH )
+	{
+		// We build outside the lock, because the build uses parallel
+		// algorithms. A thread waiting within them may take a task from
+		// an outer parallel loop which then calls back into this function,
+		// and would deadlock if we held the lock. Concurrent callers may
+		// therefore duplicate the build, but only the first result is kept.
+		TriangleBoundVector triangles;
+		TriangleBVH::ConstPtr bvh = buildTriangleBVH( triangles );
+
+		TreeMutex::scoped_lock lock( m_triangleBVHMutex );
+		if( !m_haveTriangleBVH )
 		{
-			intersectionPointsWalk( TriangleBoundTree::highChildIndex( nodeIndex ), ray, maxDistSqrd, results );
+			m_triangles.swap( triangles );
+			m_triangleBVH = bvh;
+			m_haveTriangleBVH = true;
 		}
+	}
+	return m_triangleBVH.get();
+}
+
+const MeshPrimitiveEvaluator::UVBoundVector *MeshPrimitiveEvaluator::uvBounds() const
+{
+	return uvBVH() ? &m_uvTriangles : nullptr;
+}
 
-		/// Test lowChild bound for intersection, descending into children if necessary
-		hit = boxIntersects(
-			m_tree->node( TriangleBoundTree::lowChildIndex( nodeIndex ) ).bound(),
-			ray.pos,
-			ray.dir,
-			hitPoint
-		);
+const MeshPrimitiveEvaluator::UVBVH *MeshPrimitiveEvaluator::uvBVH() const
+{
+	if( m_uv.interpolation == PrimitiveVariable::Invalid )
+	{
+		return nullptr;
+	}
 
-		if ( hit && vecDistance2( hitPoint, ray.pos ) < maxDistSqrd )
+	if( !m_haveUVBVH )
+	{
+		// See comments in triangleBVH().
+		UVBoundVector uvTriangles;
+		UVBVH::ConstPtr bvh = buildUVBVH( uvTriangles );
+
+		TreeMutex::scoped_lock lock( m_uvBVHMutex );
+		if( !m_haveUVBVH )
 		{
-			intersectionPointsWalk( TriangleBoundTree::lowChildIndex( nodeIndex ), ray, maxDistSqrd, results );
+			m_uvTriangles.swap( uvTriangles );
+			m_uvBVH = bvh;
+			m_haveUVBVH = true;
 		}
 	}
+	return m_uvBVH.get();
 }
 
-const Imath::Box2f MeshPrimitiveEvaluator::uvBound() const
+const MeshPrimitiveEvaluator::TriangleBoundTree *MeshPrimitiveEvaluator::triangleBoundTree() const
 {
-	if( !m_uvTree )
+	triangleBounds();
+
+	TreeMutex::scoped_lock lock( m_triangleBVHMutex );
+	if( !m_tree )
 	{
-		return Imath::Box2f();
+		m_tree = new TriangleBoundTree( m_triangles.begin(), m_triangles.end() );
 	}
-	return m_uvTree->node( m_uvTree->rootIndex() ).bound();
+	return m_tree;
 }
 
-const MeshPrimitiveEvaluator::TriangleBoundVector *MeshPrimitiveEvaluator::triangleBounds() const
+const MeshPrimitiveEvaluator::UVBoundTree *MeshPrimitiveEvaluator::uvBoundTree() const
 {
-	return &m_triangles;
-}
+	if( !uvBVH() )
+	{
+		return nullptr;
+	}
 
-const MeshPrimitiveEvaluator::TriangleBoundTree *MeshPrimitiveEvaluator::triangleBoundTree() const
-{
-	return m_tree;
+	TreeMutex::scoped_lock lock( m_uvBVHMutex );
+	if( !m_uvTree )
+	{
+		m_uvTree = new UVBoundTree( m_uvTriangles.begin(), m_uvTriangles.end() );
+	}
+	return m_uvTree;
 }
 
-const MeshPrimitiveEvaluator::UVBoundVector *MeshPrimitiveEvaluator::uvBounds() const
+MeshPrimitiveEvaluator::TriangleBVH::ConstPtr MeshPrimitiveEvaluator::buildTriangleBVH( TriangleBoundVector &triangles ) const
 {
-	return m_uvTree ? &m_uvTriangles : nullptr;
+	const std::vector<V3f> &verts = m_verts->readable();
+	const std::vector<int> &vertexIds = *m_meshVertexIds;
+
+	triangles.resize( m_mesh->numFaces() );
+
+	tbb::task_group_context taskGroupContext( tbb::task_group_context::isolated );
+	tbb::parallel_for(
+		tbb::blocked_range<size_t>( 0, triangles.size(), 1000 ),
+		[&triangles, &verts, &vertexIds]( const tbb::blocked_range<size_t> &range )
+		{
+			for( size_t i = range.begin(); i != range.end(); ++i )
+			{
+				const size_t vertIdOffset = i * 3;
+				Box3f &bound = triangles[i];
+				bound = Box3f( verts[vertexIds[vertIdOffset]] );
+				bound.extendBy( verts[vertexIds[vertIdOffset+1]] );
+				bound.extendBy( verts[vertexIds[vertIdOffset+2]] );
+			}
+		},
+		taskGroupContext
+	);
+
+	MurmurHash topologyHash;
+	m_mesh->topologyHash( topologyHash );
+
+	MurmurHash boundsHash;
+	m_verts->hash( boundsHash );
+
+	return triangleBVHCache().get( topologyHash, boundsHash, triangles );
 }
 
-const MeshPrimitiveEvaluator::UVBoundTree *MeshPrimitiveEvaluator::uvBoundTree() const
+MeshPrimitiveEvaluator::UVBVH::ConstPtr MeshPrimitiveEvaluator::buildUVBVH( UVBoundVector &uvTriangles ) const
 {
-	return m_uvTree;
+	const std::vector<int> &vertexIds = *m_meshVertexIds;
+
+	uvTriangles.resize( m_mesh->numFaces() );
+
+	tbb::task_group_context taskGroupContext( tbb::task_group_context::isolated );
+	tbb::parallel_for(
+		tbb::blocked_range<size_t>( 0, uvTriangles.size(), 1000 ),
+		[this, &uvTriangles, &vertexIds]( const tbb::blocked_range<size_t> &range )
+		{
+			for( size_t i = range.begin(); i != range.end(); ++i )
+			{
+				const size_t vertIdOffset = i * 3;
+				Imath::V2f uv[3];
+				triangleUVs( i, V3i( vertexIds[vertIdOffset], vertexIds[vertIdOffset+1], vertexIds[vertIdOffset+2] ), uv );
+
+				Box2f &bound = uvTriangles[i];
+				bound = Box2f( uv[0] );
+				bound.extendBy( uv[1] );
+				bound.extendBy( uv[2] );
+			}
+		},
+		taskGroupContext
+	);
+
+	// The uv bounds depend on the uvs as well as the topology, so
+	// we include them in the topology hash, so that the hierarchy
+	// can be shared directly.
+	MurmurHash hash;
+	m_mesh->topologyHash( hash );
+	m_uv.data->hash( hash );
+	if( m_uv.indices )
+	{
+		m_uv.indices->hash( hash );
+	}
+	hash.append( m_uv.interpolation );
+
+	return uvBVHCache().get( hash, hash, uvTriangles );
 }
 
 void MeshPrimitiveEvaluator::triangleUVs( size_t triangleIndex, const Imath::V3i &vertexIds, Imath::V2f uv[3] ) const
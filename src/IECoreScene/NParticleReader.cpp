@@ -45,9 +45,15 @@
 #include "OpenEXR/ImathRandom.h"
 
 #include "boost/algorithm/string/predicate.hpp"
+#include "boost/iostreams/device/mapped_file.hpp"
+
+#include "tbb/blocked_range.h"
+#include "tbb/parallel_for.h"
+#include "tbb/task_group.h"
 
 #include <algorithm>
 #include <cassert>
+#include <cstring>
 #include <fstream>
 
 using namespace IECore;
@@ -56,6 +62,24 @@ using namespace boost;
 using namespace Imath;
 using namespace std;
 
+namespace
+{
+
+const size_t g_grainSize = 65536;
+
+// nCache data is always big endian.
+template<typename T>
+void copyFromBigEndian( const char *source, T *destination, size_t n )
+{
+	memcpy( destination, source, n * sizeof( T ) );
+	if( littleEndian() )
+	{
+		reverseBytes( destination, n );
+	}
+}
+
+} // namespace
+
 IE_CORE_DEFINERUNTIMETYPED( NParticleReader );
 
 const Reader::ReaderDescription<NParticleReader> NParticleReader::m_readerDescription( "mc" );
@@ -104,6 +128,7 @@ bool NParticleReader::open()
 	if( !m_iffFile || m_iffFileName!=fileName() )
 	{
 		m_iffFile = new IFFFile( fileName().c_str() );
+		m_frameIndices.clear();
 
 		IFFFile::Chunk *root = m_iffFile->root();
 		IFFFile::Chunk::ChunkIterator headerIt = root->childrenBegin();
@@ -131,6 +156,17 @@ bool NParticleReader::open()
 			}
 		}
 
+		try
+		{
+			m_file.reset( new boost::iostreams::mapped_file_source( fileName() ) );
+		}
+		catch( const std::exception & )
+		{
+			m_file.reset();
+			m_header.valid = false;
+			return false;
+		}
+
 		m_frames->writable().clear();
 		frameToRootChildren.clear();
 
@@ -174,66 +210,73 @@ bool NParticleReader::open()
 	return m_header.valid && m_iffFileName == fileName();
 }
 
-unsigned long NParticleReader::numParticles()
+const NParticleReader::FrameIndex *NParticleReader::frameIndex( const char *context )
 {
-	if( !open() )
+	int frameIndex = m_frameParameter->getNumericValue();
+	int frame = m_frames->readable()[frameIndex];
+
+	std::map<int, FrameIndex>::const_iterator indexIt = m_frameIndices.find( frame );
+	if( indexIt != m_frameIndices.end() )
 	{
-		return 0;
+		return &indexIt->second;
 	}
 
-	int numParticles = 0;
-	int frameIndex = m_frameParameter->getNumericValue();
-	int frame = m_frames->readable()[frameIndex];
 	std::map<int, IFFFile::Chunk::ChunkIterator>::const_iterator frameIt = frameToRootChildren.find( frame );
 	if( frameIt == frameToRootChildren.end() )
 	{
-		msg( Msg::Warning, "NParticleReader::attributeNames()", boost::format( "Frame '%d' (index '%d') does not exist in '%s'." ) % frame % frameIndex % m_iffFileName );
-		return 0;
+		msg( Msg::Warning, context, boost::format( "Frame '%d' (index '%d') does not exist in '%s'." ) % frame % frameIndex % m_iffFileName );
+		return nullptr;
 	}
 
+	// Walk the frame's chunks once, so that subsequent queries
+	// don't need to seek around the file reading channel names.
+	FrameIndex &index = m_frameIndices[frame];
+	index.numParticles = 0;
+	bool foundSize = false;
+
 	IFFFile::Chunk::ChunkIterator child = frameIt->second;
 	IFFFile::Chunk::ChunkIterator it = child->childrenBegin();
-
 	for ( ; it != child->childrenEnd(); it++ )
 	{
-		if ( it->type().id() == kSIZE )
+		if ( it->type().id() == kCHNM )
 		{
-			it->read( numParticles );
-			break;
+			std::string channelName;
+			it->read( channelName );
+			index.names.push_back( channelName );
+			index.channels.insert( std::make_pair( channelName, it ) );
+		}
+		else if ( it->type().id() == kSIZE && !foundSize )
+		{
+			it->read( index.numParticles );
+			foundSize = true;
 		}
 	}
 
-	return numParticles;
+	return &index;
 }
 
-void NParticleReader::attributeNames( std::vector<std::string> &names )
+unsigned long NParticleReader::numParticles()
 {
-	names.clear();
 	if( !open() )
 	{
-		return;
+		return 0;
 	}
 
-	int frameIndex = m_frameParameter->getNumericValue();
-	int frame = m_frames->readable()[frameIndex];
-	std::map<int, IFFFile::Chunk::ChunkIterator>::const_iterator frameIt = frameToRootChildren.find( frame );
-	if( frameIt == frameToRootChildren.end() )
+	const FrameIndex *index = frameIndex( "NParticleReader::numParticles()" );
+	return index ? index->numParticles : 0;
+}
+
+void NParticleReader::attributeNames( std::vector<std::string> &names )
+{
+	names.clear();
+	if( !open() )
 	{
-		msg( Msg::Warning, "NParticleReader::attributeNames()", boost::format( "Frame '%d' (index '%d') does not exist in '%s'." ) % frame % frameIndex % m_iffFileName );
 		return;
 	}
 
-	IFFFile::Chunk::ChunkIterator child = frameIt->second;
-	IFFFile::Chunk::ChunkIterator it = child->childrenBegin();
-
-	for ( ; it != child->childrenEnd(); it++ )
+	if( const FrameIndex *index = frameIndex( "NParticleReader::attributeNames()" ) )
 	{
-		if ( it->type().id() == kCHNM )
-		{
-			std::string channelName;
-			it->read( channelName );
-			names.push_back( channelName );
-		}
+		names = index->names;
 	}
 }
 
@@ -277,8 +320,7 @@ typename T::Ptr NParticleReader::filterAttr( const F *attr, float percentage )
 		typename T::Ptr result( new T );
 		const typename F::ValueType &in = attr->readable();
 		typename T::ValueType &out = result->writable();
-		out.resize( in.size() );
-		copy( in.begin(), in.end(), out.begin() );
+		out.assign( in.begin(), in.end() );
 		return result;
 	}
 
@@ -293,41 +335,23 @@ DataPtr NParticleReader::readAttribute( const std::string &name )
 		return nullptr;
 	}
 
-	int frameIndex = m_frameParameter->getNumericValue();
-	int frame = m_frames->readable()[frameIndex];
-	std::map<int, IFFFile::Chunk::ChunkIterator>::const_iterator frameIt = frameToRootChildren.find( frame );
-	if( frameIt == frameToRootChildren.end() )
+	const FrameIndex *index = frameIndex( "NParticleReader::readAttribute()" );
+	if( !index )
 	{
-		msg( Msg::Warning, "NParticleReader::readAttribute()", boost::format( "Frame '%d' (index '%d') does not exist in '%s'." ) % frame % frameIndex % m_iffFileName );
 		return nullptr;
 	}
 
-	bool foundAttr = false;
-	std::string channelName;
-	IFFFile::Chunk::ChunkIterator attrIt;
-	IFFFile::Chunk::ChunkIterator cache = frameIt->second;
-	IFFFile::Chunk::ChunkIterator it = cache->childrenBegin();
-
-	for ( ; it != cache->childrenEnd(); it++ )
-	{
-		if ( it->type().id() == kCHNM )
-		{
-			it->read( channelName );
-
-			if ( name.compare( channelName ) == 0 )
-			{
-				attrIt = it;
-				foundAttr = true;
-				break;
-			}
-		}
-	}
-
-	if ( !foundAttr )
+	std::map<std::string, IFFFile::Chunk::ChunkIterator>::const_iterator channelIt = index->channels.find( name );
+	if ( channelIt == index->channels.end() )
 	{
 		return nullptr;
 	}
 
+	int frame = m_frames->readable()[m_frameParameter->getNumericValue()];
+	IFFFile::Chunk::ChunkIterator cache = frameToRootChildren.find( frame )->second;
+	IFFFile::Chunk::ChunkIterator attrIt = channelIt->second;
+	IFFFile::Chunk::ChunkIterator it = attrIt;
+
 	for ( it++; it < attrIt+2 && it != cache->childrenEnd(); it++ )
 	{
 		int id = it->type().id();
@@ -349,7 +373,10 @@ DataPtr NParticleReader::readAttribute( const std::string &name )
 			{
 				DoubleVectorDataPtr d( new DoubleVectorData );
 				d->writable().resize( numParticles );
-				(attrIt+2)->read( d->writable() );
+				if( !readElements( *(attrIt+2), d->writable().data(), numParticles ) )
+				{
+					return nullptr;
+				}
 				switch( realType() )
 				{
 					case Native :
@@ -365,11 +392,11 @@ DataPtr NParticleReader::readAttribute( const std::string &name )
 		case kDVCA :
 			{
 				V3dVectorDataPtr d( new V3dVectorData );
-				/// \todo: by all accounts the line below should be this :
-				/// d->writable().resize( numParticles() );
-				/// see PDCParticleReader for an explanation
-				d->writable().resize( numParticles, V3d( 0 ) );
-				(attrIt+2)->read( d->writable() );
+				d->writable().resize( numParticles );
+				if( !readElements( *(attrIt+2), (double *)d->writable().data(), numParticles * 3 ) )
+				{
+					return nullptr;
+				}
 				switch( realType() )
 				{
 					case Native :
@@ -385,11 +412,11 @@ DataPtr NParticleReader::readAttribute( const std::string &name )
 		case kFVCA :
 			{
 				V3fVectorDataPtr d( new V3fVectorData );
-				/// \todo: by all accounts the line below should be this :
-				/// d->writable().resize( numParticles() );
-				/// see PDCParticleReader for an explanation
-				d->writable().resize( numParticles, V3f( 0 ) );
-				(attrIt+2)->read( d->writable() );
+				d->writable().resize( numParticles );
+				if( !readElements( *(attrIt+2), (float *)d->writable().data(), numParticles * 3 ) )
+				{
+					return nullptr;
+				}
 				switch( realType() )
 				{
 					case Native :
@@ -409,6 +436,38 @@ DataPtr NParticleReader::readAttribute( const std::string &name )
 	return result;
 }
 
+template<typename T>
+bool NParticleReader::readElements( IFFFile::Chunk &chunk, T *buffer, size_t n ) const
+{
+	const size_t position = chunk.filePosition();
+	const size_t size = n * sizeof( T );
+	if( chunk.dataSize() < size || position + size > m_file->size() )
+	{
+		msg( Msg::Error, "NParticleReader::readAttribute()", boost::format( "Attempting to read '%d' pieces of data of size '%d' for a Chunk '%s' with dataSize '%d'." ) % n % sizeof(T) % chunk.type().name() % chunk.dataSize() );
+		return false;
+	}
+
+	const char *source = m_file->data() + position;
+	if( n < 2 * g_grainSize )
+	{
+		copyFromBigEndian( source, buffer, n );
+		return true;
+	}
+
+	// Channels can easily run to hundreds of megabytes, so we
+	// split the copy across threads.
+	tbb::task_group_context taskGroupContext( tbb::task_group_context::isolated );
+	tbb::parallel_for(
+		tbb::blocked_range<size_t>( 0, n, g_grainSize ),
+		[source, buffer]( const tbb::blocked_range<size_t> &range ) {
+			copyFromBigEndian( source + range.begin() * sizeof( T ), buffer + range.begin(), range.size() );
+		},
+		taskGroupContext
+	);
+
+	return true;
+}
+
 std::string NParticleReader::positionPrimVarName()
 {
 	std::vector<std::string> names;
@@ -39,6 +39,7 @@
 
 #include "IECore/CompoundData.h"
 #include "IECore/CompoundParameter.h"
+#include "IECore/Exception.h"
 #include "IECore/FileNameParameter.h"
 #include "IECore/MessageHandler.h"
 #include "IECore/NullObject.h"
@@ -49,6 +50,9 @@
 #include "IECore/VectorTypedData.h"
 
 #include "boost/bind.hpp"
+#include "boost/filesystem/operations.hpp"
+#include "boost/format.hpp"
+#include "boost/iostreams/device/mapped_file.hpp"
 #include "boost/version.hpp"
 
 #if BOOST_VERSION >= 103600
@@ -58,9 +62,18 @@
 #include "boost/spirit.hpp"
 #endif
 
+#include "tbb/blocked_range.h"
+#include "tbb/parallel_for.h"
+#include "tbb/task_group.h"
+
+#include <cmath>
+#include <cstdint>
+#include <cstdlib>
+#include <cstring>
 #include <fstream>
 #include <iostream>
 #include <iterator>
+#include <stdexcept>
 
 using namespace std;
 using namespace IECore;
@@ -74,6 +87,577 @@ IE_CORE_DEFINERUNTIMETYPED(OBJReader);
 // syntactic sugar for specifying our grammar
 typedef boost::spirit::rule<boost::spirit::phrase_scanner_t> srule;
 
+//////////////////////////////////////////////////////////////////////////
+// Parallel parser
+//////////////////////////////////////////////////////////////////////////
+
+namespace
+{
+
+// The file is divided into chunks of approximately this size,
+// aligned to line boundaries, and the chunks are parsed in parallel.
+const size_t g_chunkSize = 1024 * 1024;
+
+// Thrown when the parallel parser encounters a statement it doesn't
+// support, so that we can fall back to the legacy parser.
+struct UnsupportedStatement : public std::runtime_error
+{
+	UnsupportedStatement( const std::string &what ) : std::runtime_error( what ) {}
+};
+
+enum Statement
+{
+	OtherStatement,
+	VertexStatement,
+	TextureCoordinateStatement,
+	NormalStatement,
+	FaceStatement
+};
+
+inline bool isBlank( char c )
+{
+	return c == ' ' || c == '\t' || c == '\r';
+}
+
+inline bool isDigit( char c )
+{
+	return c >= '0' && c <= '9';
+}
+
+inline void skipBlanks( const char *&p, const char *end )
+{
+	while( p != end && isBlank( *p ) )
+	{
+		++p;
+	}
+}
+
+// Identifies the statement in the line starting at `p`, leaving
+// `p` pointing to the first character after its keyword.
+Statement statement( const char *&p, const char *end )
+{
+	skipBlanks( p, end );
+	const char *k = p;
+	while( p != end && !isBlank( *p ) )
+	{
+		++p;
+	}
+
+	switch( p - k )
+	{
+		case 1 :
+			if( k[0] == 'v' )
+			{
+				return VertexStatement;
+			}
+			else if( k[0] == 'f' )
+			{
+				return FaceStatement;
+			}
+			break;
+		case 2 :
+			if( k[0] == 'v' && k[1] == 't' )
+			{
+				return TextureCoordinateStatement;
+			}
+			else if( k[0] == 'v' && k[1] == 'n' )
+			{
+				return NormalStatement;
+			}
+			break;
+		default :
+			break;
+	}
+
+	return OtherStatement;
+}
+
+// Returns the end of the line starting at `p`, excluding the newline.
+inline const char *lineEnd( const char *p, const char *end )
+{
+	const char *e = static_cast<const char *>( memchr( p, '\n', end - p ) );
+	return e ? e : end;
+}
+
+// Parses a float, using an exact integer mantissa and a single scaling
+// by a power of ten. This is accurate to well within the precision of
+// a float, and much quicker than `strtod()`, which we use only for the
+// unusual cases we don't handle ourselves.
+bool parseFloat( const char *&p, const char *end, float &result )
+{
+	static const double g_powersOfTen[] = {
+		1e0, 1e1, 1e2, 1e3, 1e4, 1e5, 1e6, 1e7, 1e8, 1e9, 1e10,
+		1e11, 1e12, 1e13, 1e14, 1e15, 1e16, 1e17, 1e18, 1e19, 1e20, 1e21, 1e22
+	};
+
+	skipBlanks( p, end );
+
+	const char *s = p;
+	bool negative = false;
+	if( s != end && ( *s == '-' || *s == '+' ) )
+	{
+		negative = *s == '-';
+		++s;
+	}
+
+	uint64_t mantissa = 0;
+	int exponent = 0;
+	bool haveDigits = false;
+	for( ; s != end && isDigit( *s ); ++s )
+	{
+		if( mantissa < 100000000000000000ULL )
+		{
+			mantissa = mantissa * 10 + ( *s - '0' );
+		}
+		else
+		{
+			exponent++;
+		}
+		haveDigits = true;
+	}
+
+	if( s != end && *s == '.' )
+	{
+		for( ++s; s != end && isDigit( *s ); ++s )
+		{
+			if( mantissa < 100000000000000000ULL )
+			{
+				mantissa = mantissa * 10 + ( *s - '0' );
+				exponent--;
+			}
+			haveDigits = true;
+		}
+	}
+
+	bool fast = haveDigits;
+	if( fast && s != end && ( *s == 'e' || *s == 'E' ) )
+	{
+		++s;
+		bool negativeExponent = false;
+		if( s != end && ( *s == '-' || *s == '+' ) )
+		{
+			negativeExponent = *s == '-';
+			++s;
+		}
+		int e = 0;
+		const char *exponentBegin = s;
+		for( ; s != end && isDigit( *s ); ++s )
+		{
+			e = std::min( e * 10 + ( *s - '0' ), 1000 );
+		}
+		fast = s != exponentBegin;
+		exponent += negativeExponent ? -e : e;
+	}
+
+	fast = fast && ( s == end || isBlank( *s ) ) && exponent >= -22 && exponent <= 22;
+	if( fast )
+	{
+		double value = mantissa;
+		value = exponent < 0 ? value / g_powersOfTen[-exponent] : value * g_powersOfTen[exponent];
+		result = negative ? -value : value;
+		p = s;
+		return true;
+	}
+
+	// Slow path. The file isn't null terminated, so
+	// we must copy the token before using `strtod()`.
+	char token[64];
+	size_t length = 0;
+	for( s = p; s != end && !isBlank( *s ) && length < sizeof( token ) - 1; ++s )
+	{
+		token[length++] = *s;
+	}
+	token[length] = '\0';
+
+	char *tokenEnd = nullptr;
+	const double value = strtod( token, &tokenEnd );
+	if( tokenEnd == token || tokenEnd != token + length )
+	{
+		return false;
+	}
+
+	result = value;
+	p = s;
+	return true;
+}
+
+inline bool parseInt( const char *&p, const char *end, int &result )
+{
+	const char *s = p;
+	bool negative = false;
+	if( s != end && ( *s == '-' || *s == '+' ) )
+	{
+		negative = *s == '-';
+		++s;
+	}
+
+	if( s == end || !isDigit( *s ) )
+	{
+		return false;
+	}
+
+	int value = 0;
+	for( ; s != end && isDigit( *s ); ++s )
+	{
+		value = value * 10 + ( *s - '0' );
+	}
+
+	result = negative ? -value : value;
+	p = s;
+	return true;
+}
+
+struct ChunkCounts
+{
+	size_t vertices = 0;
+	size_t textureCoordinates = 0;
+	size_t normals = 0;
+};
+
+// Faces parsed from a single chunk. The texture coordinate and
+// normal indices are empty if no faces in the chunk specify them,
+// and otherwise have an entry per face-vertex, with -1 used for
+// faces without them.
+struct ChunkFaces
+{
+	vector<int> verticesPerFace;
+	vector<int> vertexIds;
+	vector<int> textureCoordinateIds;
+	vector<int> normalIds;
+};
+
+// Converts an OBJ index, which is 1-based or negative to indicate
+// a position relative to the current end of the list, to a 0-based
+// index.
+inline int resolveIndex( int index, size_t current, size_t total, const char *type )
+{
+	const int result = index > 0 ? index - 1 : (int)current + index;
+	if( index == 0 || result < 0 || result >= (int)total )
+	{
+		throw IECore::Exception( boost::str( boost::format( "OBJReader : Invalid %s index %d" ) % type % index ) );
+	}
+	return result;
+}
+
+class ParallelParser
+{
+
+	public :
+
+		ParallelParser( const char *data, size_t size )
+			:	m_data( data ), m_size( size )
+		{
+			// Divide into line aligned chunks.
+			m_chunkBegins.push_back( 0 );
+			for( size_t i = 1, n = m_size / g_chunkSize; i < n; ++i )
+			{
+				const char *p = lineEnd( m_data + std::max( i * g_chunkSize, m_chunkBegins.back() ), m_data + m_size );
+				const size_t begin = p - m_data + 1;
+				if( begin < m_size && begin != m_chunkBegins.back() )
+				{
+					m_chunkBegins.push_back( begin );
+				}
+			}
+			m_chunkBegins.push_back( m_size );
+		}
+
+		MeshPrimitivePtr parse()
+		{
+			const size_t numChunks = m_chunkBegins.size() - 1;
+
+			// First pass : count the vertices, texture coordinates and normals
+			// in each chunk, so that the second pass knows where to put them,
+			// and can resolve indices without waiting for the preceding chunks.
+
+			vector<ChunkCounts> counts( numChunks + 1 );
+			parallelForEachChunk(
+				[this, &counts]( size_t chunk ) {
+					ChunkCounts &c = counts[chunk+1];
+					forEachLine(
+						chunk,
+						[&c]( const char *p, const char *end ) {
+							switch( statement( p, end ) )
+							{
+								case VertexStatement : c.vertices++; break;
+								case TextureCoordinateStatement : c.textureCoordinates++; break;
+								case NormalStatement : c.normals++; break;
+								default : break;
+							}
+						}
+					);
+				}
+			);
+
+			// Convert the counts to offsets.
+			for( size_t i = 1; i <= numChunks; ++i )
+			{
+				counts[i].vertices += counts[i-1].vertices;
+				counts[i].textureCoordinates += counts[i-1].textureCoordinates;
+				counts[i].normals += counts[i-1].normals;
+			}
+			const ChunkCounts &totals = counts.back();
+
+			// Second pass : parse everything, writing vertices directly into their
+			// final location and faces into temporary storage for each chunk.
+
+			V3fVectorDataPtr pData = new V3fVectorData;
+			vector<V3f> &p = pData->writable();
+			p.resize( totals.vertices );
+			vector<V2f> textureCoordinates( totals.textureCoordinates );
+			vector<V3f> normals( totals.normals );
+			vector<ChunkFaces> faces( numChunks );
+
+			parallelForEachChunk(
+				[&]( size_t chunk ) {
+					ChunkCounts c = counts[chunk];
+					ChunkFaces &f = faces[chunk];
+					forEachLine(
+						chunk,
+						[&]( const char *s, const char *end ) {
+							switch( statement( s, end ) )
+							{
+								case VertexStatement :
+									parseFloats( s, end, 3, p[c.vertices++].getValue() );
+									break;
+								case TextureCoordinateStatement :
+									parseFloats( s, end, 2, textureCoordinates[c.textureCoordinates++].getValue() );
+									break;
+								case NormalStatement :
+									parseFloats( s, end, 3, normals[c.normals++].getValue() );
+									break;
+								case FaceStatement :
+									parseFace( s, end, c, totals, f );
+									break;
+								default :
+									break;
+							}
+						}
+					);
+				}
+			);
+
+			// Stitch the faces together.
+
+			vector<size_t> faceOffsets( numChunks + 1, 0 );
+			vector<size_t> faceVertexOffsets( numChunks + 1, 0 );
+			bool haveTextureCoordinates = false;
+			bool haveNormals = false;
+			for( size_t i = 0; i < numChunks; ++i )
+			{
+				faceOffsets[i+1] = faceOffsets[i] + faces[i].verticesPerFace.size();
+				faceVertexOffsets[i+1] = faceVertexOffsets[i] + faces[i].vertexIds.size();
+				haveTextureCoordinates = haveTextureCoordinates || faces[i].textureCoordinateIds.size();
+				haveNormals = haveNormals || faces[i].normalIds.size();
+			}
+
+			IntVectorDataPtr verticesPerFaceData = new IntVectorData;
+			vector<int> &verticesPerFace = verticesPerFaceData->writable();
+			verticesPerFace.resize( faceOffsets.back() );
+
+			IntVectorDataPtr vertexIdsData = new IntVectorData;
+			vector<int> &vertexIds = vertexIdsData->writable();
+			vertexIds.resize( faceVertexOffsets.back() );
+
+			FloatVectorDataPtr sData = new FloatVectorData;
+			FloatVectorDataPtr tData = new FloatVectorData;
+			if( haveTextureCoordinates )
+			{
+				sData->writable().resize( vertexIds.size() );
+				tData->writable().resize( vertexIds.size() );
+			}
+
+			V3fVectorDataPtr nData = new V3fVectorData;
+			if( haveNormals )
+			{
+				nData->writable().resize( vertexIds.size() );
+			}
+
+			parallelForEachChunk(
+				[&]( size_t chunk ) {
+					const ChunkFaces &f = faces[chunk];
+					std::copy( f.verticesPerFace.begin(), f.verticesPerFace.end(), verticesPerFace.begin() + faceOffsets[chunk] );
+					std::copy( f.vertexIds.begin(), f.vertexIds.end(), vertexIds.begin() + faceVertexOffsets[chunk] );
+
+					const size_t offset = faceVertexOffsets[chunk];
+					if( haveTextureCoordinates )
+					{
+						float *s = sData->writable().data() + offset;
+						float *t = tData->writable().data() + offset;
+						for( size_t i = 0, e = f.vertexIds.size(); i < e; ++i )
+						{
+							const int id = f.textureCoordinateIds.size() ? f.textureCoordinateIds[i] : -1;
+							s[i] = id >= 0 ? textureCoordinates[id][0] : 0.0f;
+							t[i] = id >= 0 ? textureCoordinates[id][1] : 0.0f;
+						}
+					}
+
+					if( haveNormals )
+					{
+						V3f *n = nData->writable().data() + offset;
+						for( size_t i = 0, e = f.vertexIds.size(); i < e; ++i )
+						{
+							const int id = f.normalIds.size() ? f.normalIds[i] : -1;
+							n[i] = id >= 0 ? normals[id] : V3f( 0.0f );
+						}
+					}
+				}
+			);
+
+			MeshPrimitivePtr mesh = new MeshPrimitive( verticesPerFaceData, vertexIdsData, "linear", pData );
+			if( haveTextureCoordinates )
+			{
+				mesh->variables["s"] = PrimitiveVariable( PrimitiveVariable::FaceVarying, sData );
+				mesh->variables["t"] = PrimitiveVariable( PrimitiveVariable::FaceVarying, tData );
+			}
+			if( haveNormals )
+			{
+				mesh->variables["N"] = PrimitiveVariable( PrimitiveVariable::FaceVarying, nData );
+			}
+
+			return mesh;
+		}
+
+	private :
+
+		template<typename F>
+		void parallelForEachChunk( F &&f )
+		{
+			tbb::task_group_context taskGroupContext( tbb::task_group_context::isolated );
+			tbb::parallel_for(
+				tbb::blocked_range<size_t>( 0, m_chunkBegins.size() - 1, 1 ),
+				[&f]( const tbb::blocked_range<size_t> &range ) {
+					for( size_t chunk = range.begin(); chunk != range.end(); ++chunk )
+					{
+						f( chunk );
+					}
+				},
+				taskGroupContext
+			);
+		}
+
+		template<typename F>
+		void forEachLine( size_t chunk, F &&f ) const
+		{
+			const char *p = m_data + m_chunkBegins[chunk];
+			const char *end = m_data + m_chunkBegins[chunk+1];
+			while( p < end )
+			{
+				const char *e = lineEnd( p, end );
+				f( p, e );
+				p = e + 1;
+			}
+		}
+
+		// Parses `n` floats, ignoring any which follow.
+		static void parseFloats( const char *p, const char *end, int n, float *result )
+		{
+			for( int i = 0; i < n; ++i )
+			{
+				if( !parseFloat( p, end, result[i] ) )
+				{
+					throw UnsupportedStatement( string( p, end ) );
+				}
+			}
+		}
+
+		static void parseFace( const char *p, const char *end, const ChunkCounts &current, const ChunkCounts &totals, ChunkFaces &faces )
+		{
+			const size_t firstId = faces.vertexIds.size();
+			int numVertices = 0;
+			bool hasTextureCoordinates = false;
+			bool hasNormals = false;
+
+			while( true )
+			{
+				skipBlanks( p, end );
+				if( p == end )
+				{
+					break;
+				}
+
+				int v, vt = 0, vn = 0;
+				if( !parseInt( p, end, v ) )
+				{
+					throw UnsupportedStatement( string( p, end ) );
+				}
+				if( p != end && *p == '/' )
+				{
+					++p;
+					parseInt( p, end, vt );
+					if( p != end && *p == '/' )
+					{
+						++p;
+						if( !parseInt( p, end, vn ) )
+						{
+							throw UnsupportedStatement( string( p, end ) );
+						}
+					}
+				}
+				if( p != end && !isBlank( *p ) )
+				{
+					throw UnsupportedStatement( string( p, end ) );
+				}
+
+				// The OBJ format requires each face to consistently use one of the
+				// v, v/vt, v//vn or v/vt/vn forms for all its vertices.
+				if( numVertices == 0 )
+				{
+					hasTextureCoordinates = vt != 0;
+					hasNormals = vn != 0;
+				}
+				else if( hasTextureCoordinates != ( vt != 0 ) || hasNormals != ( vn != 0 ) )
+				{
+					throw IECore::Exception( "invalid face specification" );
+				}
+
+				faces.vertexIds.push_back( resolveIndex( v, current.vertices, totals.vertices, "vertex" ) );
+				if( hasTextureCoordinates )
+				{
+					if( faces.textureCoordinateIds.size() < firstId )
+					{
+						faces.textureCoordinateIds.resize( firstId, -1 );
+					}
+					faces.textureCoordinateIds.push_back( resolveIndex( vt, current.textureCoordinates, totals.textureCoordinates, "texture coordinate" ) );
+				}
+				if( hasNormals )
+				{
+					if( faces.normalIds.size() < firstId )
+					{
+						faces.normalIds.resize( firstId, -1 );
+					}
+					faces.normalIds.push_back( resolveIndex( vn, current.normals, totals.normals, "normal" ) );
+				}
+				numVertices++;
+			}
+
+			if( numVertices < 3 )
+			{
+				throw UnsupportedStatement( "Face with fewer than 3 vertices" );
+			}
+
+			faces.verticesPerFace.push_back( numVertices );
+			if( !hasTextureCoordinates && faces.textureCoordinateIds.size() )
+			{
+				faces.textureCoordinateIds.resize( faces.vertexIds.size(), -1 );
+			}
+			if( !hasNormals && faces.normalIds.size() )
+			{
+				faces.normalIds.resize( faces.vertexIds.size(), -1 );
+			}
+		}
+
+		const char *m_data;
+		const size_t m_size;
+		vector<size_t> m_chunkBegins;
+
+};
+
+} // namespace
+
+//////////////////////////////////////////////////////////////////////////
+// OBJReader
+//////////////////////////////////////////////////////////////////////////
+
 const Reader::ReaderDescription<OBJReader> OBJReader::m_readerDescription("obj");
 
 OBJReader::OBJReader( const std::string &fileName )
@@ -81,6 +665,13 @@ OBJReader::OBJReader( const std::string &fileName )
 	NullObject, MeshPrimitive::staticTypeId()))
 {
 	m_fileNameParameter->setTypedValue( fileName );
+
+	m_useLegacyParserParameter = new BoolParameter(
+		"useLegacyParser",
+		"Uses the original line-by-line parser rather than the parallel one.",
+		false
+	);
+	parameters()->addParameter( m_useLegacyParserParameter );
 }
 
 bool OBJReader::canRead( const string &fileName )
@@ -97,11 +688,51 @@ bool OBJReader::canRead( const string &fileName )
 }
 
 ObjectPtr OBJReader::doOperation(const CompoundObject * operands)
+{
+	if( m_useLegacyParserParameter->getTypedValue() )
+	{
+		return readLegacy();
+	}
+
+	const std::string &fileName = this->fileName();
+	boost::iostreams::mapped_file_source file;
+	try
+	{
+		if( boost::filesystem::file_size( fileName ) == 0 )
+		{
+			return new MeshPrimitive;
+		}
+		file.open( fileName );
+	}
+	catch( const std::exception &e )
+	{
+		throw IOException( boost::str( boost::format( "OBJReader : Unable to map file \"%s\" (%s)" ) % fileName % e.what() ) );
+	}
+
+	try
+	{
+		return ParallelParser( file.data(), file.size() ).parse();
+	}
+	catch( const UnsupportedStatement &e )
+	{
+		msg(
+			Msg::Warning, "OBJReader",
+			boost::format( "Using legacy parser for \"%s\" due to unsupported statement \"%s\"" ) % fileName % e.what()
+		);
+	}
+
+	return readLegacy();
+}
+
+MeshPrimitivePtr OBJReader::readLegacy()
 {
 	// for now we are going to retrieve vertex, texture, normal coordinates, faces.
 	// later (when we have the primitives), we will handle a larger subset of the
 	// OBJ format
 
+	m_introducedNormals.clear();
+	m_introducedTextureCoordinates.clear();
+
 	IntVectorDataPtr vpf = new IntVectorData();
 	m_vpf = &vpf->writable();
 
@@ -43,8 +43,15 @@
 #include "IECore/Timer.h"
 #include "IECore/VectorTypedData.h"
 
+#include "boost/iostreams/device/mapped_file.hpp"
+
+#include "tbb/blocked_range.h"
+#include "tbb/parallel_for.h"
+#include "tbb/task_group.h"
+
 #include <algorithm>
 #include <cassert>
+#include <cstring>
 #include <fstream>
 
 using namespace IECore;
@@ -53,24 +60,87 @@ using namespace boost;
 using namespace Imath;
 using namespace std;
 
+namespace
+{
+
+// Reads values sequentially from the mapped file, keeping
+// track of whether or not we have run off the end of it.
+class MemoryReader
+{
+
+	public :
+
+		MemoryReader( const char *data, size_t size )
+			:	m_data( data ), m_size( size ), m_offset( 0 ), m_good( true )
+		{
+		}
+
+		template<typename T>
+		void read( T &value )
+		{
+			read( (char *)&value, sizeof( T ) );
+		}
+
+		void read( char *buffer, size_t n )
+		{
+			if( const char *source = skip( n ) )
+			{
+				memcpy( buffer, source, n );
+			}
+		}
+
+		// Advances by n bytes, returning a pointer to the bytes
+		// skipped, or nullptr if there were not enough left.
+		const char *skip( size_t n )
+		{
+			if( !m_good || n > m_size - m_offset )
+			{
+				m_good = false;
+				return nullptr;
+			}
+			const char *result = m_data + m_offset;
+			m_offset += n;
+			return result;
+		}
+
+		size_t offset() const
+		{
+			return m_offset;
+		}
+
+		bool good() const
+		{
+			return m_good;
+		}
+
+	private :
+
+		const char *m_data;
+		size_t m_size;
+		size_t m_offset;
+		bool m_good;
+
+};
+
+} // namespace
+
 IE_CORE_DEFINERUNTIMETYPED( PDCParticleReader );
 
 const Reader::ReaderDescription<PDCParticleReader> PDCParticleReader::m_readerDescription( "pdc" );
 
 PDCParticleReader::PDCParticleReader( )
-	:	ParticleReader( "Reads Maya .pdc format particle caches" ), m_iStream( nullptr ), m_idAttribute( nullptr )
+	:	ParticleReader( "Reads Maya .pdc format particle caches" ), m_idAttribute( nullptr )
 {
 }
 
 PDCParticleReader::PDCParticleReader( const std::string &fileName )
-	:	ParticleReader( "Reads Maya .pdc format particle caches" ), m_iStream( nullptr ), m_idAttribute( nullptr )
+	:	ParticleReader( "Reads Maya .pdc format particle caches" ), m_idAttribute( nullptr )
 {
 	m_fileNameParameter->setTypedValue( fileName );
 }
 
 PDCParticleReader::~PDCParticleReader()
 {
-	delete m_iStream;
 }
 
 bool PDCParticleReader::canRead( const std::string &fileName )
@@ -91,27 +161,37 @@ bool PDCParticleReader::canRead( const std::string &fileName )
 
 bool PDCParticleReader::open()
 {
-	if( !m_iStream || m_streamFileName!=fileName() )
+	if( !m_file || m_streamFileName!=fileName() )
 	{
-		delete m_iStream;
-		m_iStream = new ifstream( fileName().c_str() );
-		if( !m_iStream->is_open() || !m_iStream->good() )
+		m_file.reset();
+		m_header.valid = false;
+		m_header.attributes.clear();
+		m_streamFileName = fileName();
+		m_idAttribute = nullptr;
+
+		try
 		{
+			m_file.reset( new boost::iostreams::mapped_file_source( fileName() ) );
+		}
+		catch( const std::exception & )
+		{
+			m_file.reset();
 			return false;
 		}
 
+		MemoryReader in( m_file->data(), m_file->size() );
+
 		char pdc[4];
-		m_iStream->read( pdc, 4 );
-		if( strncmp( "PDC ", pdc, 4 ) )
+		in.read( pdc, 4 );
+		if( !in.good() || strncmp( "PDC ", pdc, 4 ) )
 		{
-			m_header.valid = false;
 			return false;
 		}
 
-		m_iStream->read( (char *)&m_header.version, sizeof( m_header.version ) );
+		in.read( m_header.version );
 
 		int endian = 0;
-		m_iStream->read( (char *)&endian, sizeof( endian ) );
+		in.read( endian );
 		if( endian!=1 )
 		{
 			m_header.reverseBytes = true;
@@ -128,35 +208,46 @@ bool PDCParticleReader::open()
 		}
 
 		int unused = 0;
-		m_iStream->read( (char *)&unused, sizeof( unused ) );
-		m_iStream->read( (char *)&unused, sizeof( unused ) );
+		in.read( unused );
+		in.read( unused );
 
-		m_iStream->read( (char *)&m_header.numParticles, sizeof( m_header.numParticles ) );
+		in.read( m_header.numParticles );
 		if( m_header.reverseBytes )
 		{
 			m_header.numParticles = reverseBytes( m_header.numParticles );
 		}
 
-		int numAttributes;
-		m_iStream->read( (char *)&numAttributes, sizeof( numAttributes ) );
+		int numAttributes = 0;
+		in.read( numAttributes );
 		if( m_header.reverseBytes )
 		{
 			numAttributes = reverseBytes( numAttributes );
 		}
-		for( int i=0; i<numAttributes; i++ )
+
+		if( m_header.numParticles < 0 )
 		{
-			int nameLength;
-			m_iStream->read( (char *)&nameLength, sizeof( nameLength ) );
+			return false;
+		}
+		const size_t numParticles = m_header.numParticles;
+
+		for( int i=0; i<numAttributes && in.good(); i++ )
+		{
+			int nameLength = 0;
+			in.read( nameLength );
 			if( m_header.reverseBytes )
 			{
 				nameLength = reverseBytes( nameLength );
 			}
-			string attrName; char c;
-			for( int j=0; j<nameLength; j++ )
+			if( nameLength < 0 )
+			{
+				return false;
+			}
+			const char *name = in.skip( nameLength );
+			if( !name )
 			{
-				m_iStream->read( &c, 1 );
-				attrName += c;
+				return false;
 			}
+			string attrName( name, nameLength );
 			if( attrName=="ghostFrames" )
 			{
 				// alias' own pdc files don't match their own spec.
@@ -168,32 +259,32 @@ bool PDCParticleReader::open()
 				continue;
 			}
 			Record r;
-			m_iStream->read( (char *)&r.type, sizeof( r.type ) );
+			in.read( r.type );
 			if( m_header.reverseBytes )
 			{
 				r.type = reverseBytes( r.type );
 			}
-			r.position = m_iStream->tellg();
+			r.offset = in.offset();
 			m_header.attributes[attrName] = r;
 			switch( r.type )
 			{
 				case Integer :
-					m_iStream->seekg( sizeof( int ), ios_base::cur );
+					in.skip( sizeof( int ) );
 					break;
 				case IntegerArray :
-					m_iStream->seekg( sizeof( int ) * m_header.numParticles, ios_base::cur );
+					in.skip( sizeof( int ) * numParticles );
 					break;
 				case Double :
-					m_iStream->seekg( sizeof( double ), ios_base::cur );
+					in.skip( sizeof( double ) );
 					break;
 				case DoubleArray :
-					m_iStream->seekg( sizeof( double ) * m_header.numParticles, ios_base::cur );
+					in.skip( sizeof( double ) * numParticles );
 					break;
 				case Vector :
-					m_iStream->seekg( sizeof( double ) * 3, ios_base::cur );
+					in.skip( sizeof( double ) * 3 );
 					break;
 				case VectorArray :
-					m_iStream->seekg( sizeof( double ) * 3 * m_header.numParticles, ios_base::cur );
+					in.skip( sizeof( double ) * 3 * numParticles );
 					break;
 				default :
 					assert( r.type < 6 ); // unknown type
@@ -201,11 +292,11 @@ bool PDCParticleReader::open()
 
 		}
 
-		m_header.valid = m_iStream->good();
-		m_streamFileName = fileName();
-		m_idAttribute = nullptr;
+		// Every attribute must lie entirely within the file, as
+		// readElements() copies straight from the mapped memory.
+		m_header.valid = in.good();
 	}
-	return m_iStream->good() && m_header.valid;
+	return m_file && m_header.valid;
 }
 
 unsigned long PDCParticleReader::numParticles()
@@ -231,19 +322,38 @@ void PDCParticleReader::attributeNames( std::vector<std::string> &names )
 }
 
 template<typename T>
-void PDCParticleReader::readElements( T *buffer, std::streampos pos, unsigned long n ) const
+void PDCParticleReader::readElements( T *buffer, size_t offset, unsigned long n ) const
 {
-	m_iStream->seekg( pos );
-	m_iStream->read( (char *)buffer, n * sizeof( T ) );
-	if( m_header.reverseBytes )
+	assert( offset + n * sizeof( T ) <= m_file->size() );
+	const char *source = m_file->data() + offset;
+	const bool reverse = m_header.reverseBytes;
+
+	// Large attributes are copied and byte swapped in parallel
+	// chunks, so that each chunk is swapped while it is still
+	// in cache.
+	const size_t grainSize = 65536;
+	if( n < 2 * grainSize )
 	{
-		for( unsigned long i=0; i<n; i++ )
+		memcpy( buffer, source, n * sizeof( T ) );
+		if( reverse )
 		{
-			*buffer = reverseBytes( *buffer );
-			buffer++;
+			reverseBytes( buffer, n );
 		}
+		return;
 	}
-	assert( m_iStream->good() );
+
+	tbb::task_group_context taskGroupContext( tbb::task_group_context::isolated );
+	tbb::parallel_for(
+		tbb::blocked_range<size_t>( 0, n, grainSize ),
+		[buffer, source, reverse]( const tbb::blocked_range<size_t> &range ) {
+			memcpy( buffer + range.begin(), source + range.begin() * sizeof( T ), range.size() * sizeof( T ) );
+			if( reverse )
+			{
+				reverseBytes( buffer + range.begin(), range.size() );
+			}
+		},
+		taskGroupContext
+	);
 }
 
 DataPtr PDCParticleReader::readAttribute( const std::string &name )
@@ -271,7 +381,7 @@ DataPtr PDCParticleReader::readAttribute( const std::string &name )
 		case Integer :
 			{
 				IntDataPtr d( new IntData );
-				readElements( &d->writable(), it->second.position, 1 );
+				readElements( &d->writable(), it->second.offset, 1 );
 				result = d;
 			}
 			break;
@@ -279,14 +389,14 @@ DataPtr PDCParticleReader::readAttribute( const std::string &name )
 			{
 				IntVectorDataPtr d( new IntVectorData );
 				d->writable().resize( numParticles() );
-				readElements( &d->writable()[0], it->second.position, numParticles() );
+				readElements( &d->writable()[0], it->second.offset, numParticles() );
 				result = filterAttr<IntVectorData, IntVectorData>( d.get(), particlePercentage(), idAttr );
 			}
 			break;
 		case Double :
 			{
 				DoubleDataPtr d( new DoubleData );
-				readElements( &d->writable(), it->second.position, 1 );
+				readElements( &d->writable(), it->second.offset, 1 );
 				switch( realType() )
 				{
 					case PDCParticleReader::RealType::Native :
@@ -303,7 +413,7 @@ DataPtr PDCParticleReader::readAttribute( const std::string &name )
 			{
 				DoubleVectorDataPtr d( new DoubleVectorData );
 				d->writable().resize( numParticles() );
-				readElements( &d->writable()[0], it->second.position, numParticles() );
+				readElements( &d->writable()[0], it->second.offset, numParticles() );
 				switch( realType() )
 				{
 					case PDCParticleReader::RealType::Native :
@@ -319,7 +429,7 @@ DataPtr PDCParticleReader::readAttribute( const std::string &name )
 		case Vector :
 			{
 				V3dDataPtr d( new V3dData );
-				readElements( (double *)&d->writable(), it->second.position, 3 );
+				readElements( (double *)&d->writable(), it->second.offset, 3 );
 				switch( realType() )
 				{
 					case PDCParticleReader::RealType::Native :
@@ -335,22 +445,8 @@ DataPtr PDCParticleReader::readAttribute( const std::string &name )
 		case VectorArray :
 			{
 				V3dVectorDataPtr d( new V3dVectorData );
-				/// \todo
-				/// by all accounts the line below should be this :
-				///
-				/// d->writable().resize( numParticles() );
-				///
-				/// ie it shouldn't initialize the memory. but for some reason
-				/// that runs far far slower for us (at least an order of magnitude
-				/// slower) when we're in maya or python. we don't know why but it seems
-				/// to be related to libstdc++ (maya has it's own). so we're opting for
-				/// the initialized version - this seems slightly (~10%) slower when the planets
-				/// are aligned correctly, but so much faster when the planets are aligned against
-				/// us, as they seem to be whenever we're coding in maya. testing seems to show that
-				/// this resize problem only occurs with V3d, and not with V3f, or double, or even
-				/// a struct with 3 doubles in, or even a template struct with 3 doubles in.
-				d->writable().resize( numParticles(), V3d( 0 ) );
-				readElements( (double *)&d->writable()[0], it->second.position, numParticles() * 3 );
+				d->writable().resize( numParticles() );
+				readElements( (double *)&d->writable()[0], it->second.offset, numParticles() * 3 );
 				switch( realType() )
 				{
 					case PDCParticleReader::RealType::Native :
@@ -390,14 +486,14 @@ const Data * PDCParticleReader::idAttribute()
 			{
 				DoubleVectorDataPtr doubleVec = new DoubleVectorData;
 				doubleVec->writable().resize( numParticles() );
-				readElements( &doubleVec->writable()[0], it->second.position, numParticles() );
+				readElements( &doubleVec->writable()[0], it->second.offset, numParticles() );
 				m_idAttribute = doubleVec;
 			}
 			if( it->second.type==IntegerArray )
 			{
 				IntVectorDataPtr intVec = new IntVectorData;
 				intVec->writable().resize( numParticles() );
-				readElements( &intVec->writable()[0], it->second.position, numParticles() );
+				readElements( &intVec->writable()[0], it->second.offset, numParticles() );
 				m_idAttribute = intVec;
 			}
 		}
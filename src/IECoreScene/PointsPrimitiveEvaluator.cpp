@@ -191,6 +191,19 @@ PrimitiveEvaluator::ResultPtr PointsPrimitiveEvaluator::createResult() const
 	return new Result( this );
 }
 
+PrimitiveEvaluator::BatchResultFunction PointsPrimitiveEvaluator::batchResultFunction( CompoundData *batchResult, size_t size ) const
+{
+	// We don't call the base class implementation, because our
+	// results don't provide normals or uvs.
+	IntVectorDataPtr pointIndexData = new IntVectorData( std::vector<int>( size, 0 ) );
+	batchResult->writable()["pointIndex"] = pointIndexData;
+
+	std::vector<int> *pointIndices = &pointIndexData->writable();
+	return [pointIndices]( const PrimitiveEvaluator::Result *result, size_t index ) {
+		(*pointIndices)[index] = static_cast<const Result *>( result )->pointIndex();
+	};
+}
+
 void PointsPrimitiveEvaluator::validateResult( PrimitiveEvaluator::Result *result ) const
 {
 	if( ! dynamic_cast<PointsPrimitiveEvaluator::Result *>( result ) )
@@ -41,6 +41,7 @@
 
 #include "boost/algorithm/string.hpp"
 
+#include <algorithm>
 #include <cassert>
 
 using namespace IECore;
@@ -56,6 +57,7 @@ using namespace Imath;
 static IndexedIO::EntryID g_variablesEntry("variables");
 static IndexedIO::EntryID g_interpolationEntry("interpolation");
 static IndexedIO::EntryID g_dataEntry("data");
+static IndexedIO::EntryID g_typeEntry("type");
 static IndexedIO::EntryID g_indicesEntry("indices");
 const unsigned int Primitive::m_ioVersion = 2;
 IE_CORE_DEFINEOBJECTTYPEDESCRIPTION( Primitive );
@@ -330,6 +332,41 @@ void convertLegacyVariables( PrimitiveVariableMap &variables )
 	}
 }
 
+// Used by Primitive::loadWithPrimitiveVariables() to restrict the
+// primitive variables loaded by Primitive::load() for a particular
+// LoadContext. Loads of any nested objects use their own contexts, so
+// are unaffected.
+struct LoadFilter
+{
+	const Object::LoadContext *context;
+	const IndexedIO::EntryIDList *primVarNames;
+};
+
+thread_local LoadFilter g_loadFilter = { nullptr, nullptr };
+
+class LoadFilterScope
+{
+
+	public :
+
+		LoadFilterScope( const Object::LoadContext *context, const IndexedIO::EntryIDList *primVarNames )
+			:	m_previous( g_loadFilter )
+		{
+			g_loadFilter.context = context;
+			g_loadFilter.primVarNames = primVarNames;
+		}
+
+		~LoadFilterScope()
+		{
+			g_loadFilter = m_previous;
+		}
+
+	private :
+
+		const LoadFilter m_previous;
+
+};
+
 } // namespace
 
 void Primitive::load( IECore::Object::LoadContextPtr context )
@@ -352,6 +389,31 @@ void Primitive::load( IECore::Object::LoadContextPtr context )
 	variables.clear();
 	IndexedIO::EntryIDList names;
 	ioVariables->entryIds( names, IndexedIO::Directory );
+
+	if( g_loadFilter.context == context.get() )
+	{
+		// we're being loaded by loadWithPrimitiveVariables(), so
+		// must only load the variables it requested.
+		IndexedIO::EntryIDList requested;
+		if( v < 2 )
+		{
+			remapToLegacyVariableNames( *g_loadFilter.primVarNames, names, requested );
+		}
+		else
+		{
+			requested = *g_loadFilter.primVarNames;
+		}
+
+		names.erase(
+			std::remove_if(
+				names.begin(), names.end(),
+				[&requested]( const IndexedIO::EntryID &name ) {
+					return std::find( requested.begin(), requested.end(), name ) == requested.end();
+				}
+			),
+			names.end()
+		);
+	}
 	IndexedIO::EntryIDList::const_iterator it;
 	for( it=names.begin(); it!=names.end(); it++ )
 	{
@@ -430,6 +492,27 @@ PrimitiveVariableMap Primitive::loadPrimitiveVariables( const IndexedIO *ioInter
 	return variables;
 }
 
+ObjectPtr Primitive::loadWithPrimitiveVariables( const IndexedIO *ioInterface, const IndexedIO::EntryID &name, const IndexedIO::EntryIDList &primVarNames )
+{
+	ConstIndexedIOPtr container = ioInterface->subdirectory( name );
+
+	std::string type;
+	container->read( g_typeEntry, type );
+	ObjectPtr result = Object::create( type );
+	if( !runTimeCast<Primitive>( result.get() ) )
+	{
+		return Object::load( ioInterface, name );
+	}
+
+	// this mirrors the loading performed by Object::load(), but
+	// filtering the variables loaded by Primitive::load().
+	Object::LoadContextPtr context = new Object::LoadContext( container->subdirectory( g_dataEntry ) );
+	LoadFilterScope loadFilterScope( context.get(), &primVarNames );
+	result->load( context );
+
+	return result;
+}
+
 bool Primitive::isEqualTo( const Object *other ) const
 {
 	if( !VisibleRenderable::isEqualTo( other ) )
@@ -38,8 +38,81 @@
 #include "IECoreScene/MeshPrimitiveEvaluator.h"
 #include "IECoreScene/SpherePrimitiveEvaluator.h"
 
+#include "IECore/Exception.h"
+#include "IECore/SimpleTypedData.h"
+
+#include "boost/format.hpp"
+
+#include "tbb/blocked_range.h"
+#include "tbb/parallel_for.h"
+#include "tbb/task_group.h"
+
 using namespace IECore;
 using namespace IECoreScene;
+using namespace Imath;
+
+//////////////////////////////////////////////////////////////////////////
+// Internal utilities
+//////////////////////////////////////////////////////////////////////////
+
+namespace
+{
+
+typedef std::function<void ( const PrimitiveEvaluator::Result *result, size_t index )> OutputFunction;
+
+template<typename T>
+std::vector<T> *addOutput( CompoundData *batchResult, const std::string &name, size_t size, const T &defaultValue )
+{
+	typedef TypedData<std::vector<T> > DataType;
+	typename DataType::Ptr data = new DataType;
+	data->writable().resize( size, defaultValue );
+	batchResult->writable()[name] = data;
+	return &data->writable();
+}
+
+OutputFunction primitiveVariableOutput( const std::string &name, const PrimitiveVariable &primitiveVariable, CompoundData *batchResult, size_t size )
+{
+	const PrimitiveVariable *pv = &primitiveVariable;
+	switch( primitiveVariable.data->typeId() )
+	{
+		case V3fDataTypeId :
+		case V3fVectorDataTypeId :
+		{
+			std::vector<V3f> *output = addOutput( batchResult, name, size, V3f( 0 ) );
+			return [output, pv]( const PrimitiveEvaluator::Result *result, size_t index ) { (*output)[index] = result->vectorPrimVar( *pv ); };
+		}
+		case V2fDataTypeId :
+		case V2fVectorDataTypeId :
+		{
+			std::vector<V2f> *output = addOutput( batchResult, name, size, V2f( 0 ) );
+			return [output, pv]( const PrimitiveEvaluator::Result *result, size_t index ) { (*output)[index] = result->vec2PrimVar( *pv ); };
+		}
+		case FloatDataTypeId :
+		case FloatVectorDataTypeId :
+		{
+			std::vector<float> *output = addOutput( batchResult, name, size, 0.0f );
+			return [output, pv]( const PrimitiveEvaluator::Result *result, size_t index ) { (*output)[index] = result->floatPrimVar( *pv ); };
+		}
+		case IntDataTypeId :
+		case IntVectorDataTypeId :
+		{
+			std::vector<int> *output = addOutput( batchResult, name, size, 0 );
+			return [output, pv]( const PrimitiveEvaluator::Result *result, size_t index ) { (*output)[index] = result->intPrimVar( *pv ); };
+		}
+		case Color3fDataTypeId :
+		case Color3fVectorDataTypeId :
+		{
+			std::vector<Color3f> *output = addOutput( batchResult, name, size, Color3f( 0 ) );
+			return [output, pv]( const PrimitiveEvaluator::Result *result, size_t index ) { (*output)[index] = result->colorPrimVar( *pv ); };
+		}
+		default :
+			throw InvalidArgumentException(
+				boost::str( boost::format( "Primitive variable \"%s\" has unsupported type \"%s\"" ) % name % primitiveVariable.data->typeName() )
+			);
+	}
+}
+
+} // namespace
 
 IE_CORE_DEFINERUNTIMETYPED( PrimitiveEvaluator );
 
@@ -81,6 +154,115 @@ PrimitiveEvaluator::~PrimitiveEvaluator()
 {
 }
 
+PrimitiveEvaluator::BatchResultFunction PrimitiveEvaluator::batchResultFunction( CompoundData *batchResult, size_t size ) const
+{
+	std::vector<V3f> *normals = addOutput( batchResult, "normal", size, V3f( 0 ) );
+	std::vector<V2f> *uvs = addOutput( batchResult, "uv", size, V2f( 0 ) );
+	return [normals, uvs]( const Result *result, size_t index ) {
+		(*normals)[index] = result->normal();
+		(*uvs)[index] = result->uv();
+	};
+}
+
+template<typename Query>
+CompoundDataPtr PrimitiveEvaluator::batchQuery( size_t size, const std::vector<std::string> &primitiveVariables, Query &&query ) const
+{
+	CompoundDataPtr batchResult = new CompoundData;
+
+	// Make the outputs. We can't write to a std::vector<bool> concurrently,
+	// so we collect the hits separately and convert them at the end.
+
+	std::vector<unsigned char> hits( size, 0 );
+	std::vector<V3f> *points = addOutput( batchResult.get(), "point", size, V3f( 0 ) );
+
+	std::vector<OutputFunction> outputs;
+	if( BatchResultFunction f = batchResultFunction( batchResult.get(), size ) )
+	{
+		outputs.push_back( f );
+	}
+
+	ConstPrimitivePtr prim = primitive();
+	for( std::vector<std::string>::const_iterator it = primitiveVariables.begin(), eIt = primitiveVariables.end(); it != eIt; ++it )
+	{
+		PrimitiveVariableMap::const_iterator pvIt = prim->variables.find( *it );
+		if( pvIt == prim->variables.end() )
+		{
+			throw InvalidArgumentException( boost::str( boost::format( "Primitive variable \"%s\" does not exist" ) % *it ) );
+		}
+		outputs.push_back( primitiveVariableOutput( *it, pvIt->second, batchResult.get(), size ) );
+	}
+
+	// Perform the queries, using one Result per task.
+
+	tbb::task_group_context taskGroupContext( tbb::task_group_context::isolated );
+	tbb::parallel_for(
+		tbb::blocked_range<size_t>( 0, size, 1000 ),
+		[this, &query, &hits, points, &outputs]( const tbb::blocked_range<size_t> &range )
+		{
+			ResultPtr result = createResult();
+			for( size_t i = range.begin(); i != range.end(); ++i )
+			{
+				if( !query( i, result.get() ) )
+				{
+					continue;
+				}
+				hits[i] = 1;
+				(*points)[i] = result->point();
+				for( std::vector<OutputFunction>::const_iterator it = outputs.begin(), eIt = outputs.end(); it != eIt; ++it )
+				{
+					(*it)( result.get(), i );
+				}
+			}
+		},
+		taskGroupContext
+	);
+
+	BoolVectorDataPtr hitData = new BoolVectorData;
+	hitData->writable().assign( hits.begin(), hits.end() );
+	batchResult->writable()["hit"] = hitData;
+
+	return batchResult;
+}
+
+CompoundDataPtr PrimitiveEvaluator::batchClosestPoint( const V3fVectorData *points, const std::vector<std::string> &primitiveVariables ) const
+{
+	const std::vector<V3f> &p = points->readable();
+	return batchQuery(
+		p.size(), primitiveVariables,
+		[this, &p]( size_t i, Result *result ) {
+			return closestPoint( p[i], result );
+		}
+	);
+}
+
+CompoundDataPtr PrimitiveEvaluator::batchPointAtUV( const V2fVectorData *uvs, const std::vector<std::string> &primitiveVariables ) const
+{
+	const std::vector<V2f> &uv = uvs->readable();
+	return batchQuery(
+		uv.size(), primitiveVariables,
+		[this, &uv]( size_t i, Result *result ) {
+			return pointAtUV( uv[i], result );
+		}
+	);
+}
+
+CompoundDataPtr PrimitiveEvaluator::batchIntersectionPoint( const V3fVectorData *origins, const V3fVectorData *directions, float maxDistance, const std::vector<std::string> &primitiveVariables ) const
+{
+	const std::vector<V3f> &o = origins->readable();
+	const std::vector<V3f> &d = directions->readable();
+	if( o.size() != d.size() )
+	{
+		throw InvalidArgumentException( "Origins and directions must have the same length" );
+	}
+
+	return batchQuery(
+		o.size(), primitiveVariables,
+		[this, &o, &d, maxDistance]( size_t i, Result *result ) {
+			return intersectionPoint( o[i], d[i], result, maxDistance );
+		}
+	);
+}
+
 PrimitiveEvaluator::Result::~Result()
 {
 }
@@ -39,6 +39,9 @@
 #include "IECoreScene/PointsPrimitive.h"
 #include "IECoreScene/SceneInterface.h"
 
+#include "IECore/ObjectPool.h"
+
+#include "tbb/parallel_for.h"
 #include "tbb/task.h"
 
 #include <atomic>
@@ -232,6 +235,29 @@ void copy( const SceneInterface *src, SceneInterface *dst, double time, unsigned
 	}
 }
 
+void prefetchLocations( const SceneInterface *scene, SceneInterface::Path &path, const PathMatcher &locations, std::vector<ConstSceneInterfacePtr> &result )
+{
+	const unsigned match = locations.match( path );
+	if( match & PathMatcher::ExactMatch )
+	{
+		result.push_back( scene );
+	}
+
+	if( !( match & PathMatcher::DescendantMatch ) )
+	{
+		return;
+	}
+
+	SceneInterface::NameList childNames;
+	scene->childNames( childNames );
+	for( const auto &childName : childNames )
+	{
+		path.push_back( childName );
+		prefetchLocations( scene->child( childName ).get(), path, locations, result );
+		path.pop_back();
+	}
+}
+
 } // namespace
 
 namespace IECoreScene
@@ -291,6 +317,67 @@ void copy( const SceneInterface *src, SceneInterface *dst, int startFrame, int e
 	}
 }
 
+size_t prefetch( const SceneInterface *src, const PathMatcher &locations, const std::vector<double> &times, unsigned int flags, size_t maxMemory )
+{
+	if( !maxMemory )
+	{
+		maxMemory = ObjectPool::defaultObjectPool()->getMaxMemoryUsage();
+	}
+
+	std::vector<ConstSceneInterfacePtr> scenes;
+	SceneInterface::Path path;
+	::prefetchLocations( src, path, locations, scenes );
+
+	const size_t numLocations = scenes.size();
+	const size_t numItems = numLocations * times.size();
+
+	std::atomic<size_t> nextItem( 0 );
+	std::atomic<size_t> memoryUsage( 0 );
+
+	// Each iteration takes the next item from `nextItem` rather than using
+	// its own index, so that items are started in time order regardless of
+	// how the range is divided between threads. This makes sure the earliest
+	// times are read first, should the memory limit be reached.
+	tbb::task_group_context taskGroupContext( tbb::task_group_context::isolated );
+	tbb::parallel_for(
+		size_t( 0 ), numItems,
+		[&]( size_t )
+		{
+			if( memoryUsage >= maxMemory )
+			{
+				return;
+			}
+
+			const size_t item = nextItem++;
+			const size_t timeIndex = item / numLocations;
+			const SceneInterface *scene = scenes[item % numLocations].get();
+			const double time = times[timeIndex];
+
+			// sets are read from the root only, and aren't cached, so
+			// there's no benefit to prefetching them. Tags don't vary
+			// with time, so are only read once.
+			unsigned int locationFlags = flags & ~( Sets | Objects );
+			if( timeIndex )
+			{
+				locationFlags &= ~Tags;
+			}
+			::handleLocation( scene, nullptr, time, locationFlags );
+
+			if( flags & Objects && scene->hasObject() )
+			{
+				ConstObjectPtr object = scene->readObject( time );
+				if( object )
+				{
+					memoryUsage += object->memoryUsage();
+				}
+			}
+		},
+		taskGroupContext
+	);
+
+	return memoryUsage;
+}
+
 } // SceneAlgo
 
 } // IECoreScene
\ No newline at end of file
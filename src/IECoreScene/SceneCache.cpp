@@ -55,6 +55,9 @@
 #include "boost/tuple/tuple.hpp"
 
 #include "tbb/concurrent_hash_map.h"
+#include "tbb/parallel_for.h"
+
+#include <atomic>
 
 using namespace IECore;
 using namespace IECoreScene;
@@ -323,7 +326,7 @@ class SceneCache::ReaderImplementation : public SceneCache::Implementation
 
 		IE_CORE_DECLAREPTR( ReaderImplementation )
 
-		ReaderImplementation( IndexedIOPtr io, SceneCache::Implementation *parent = nullptr) : SceneCache::Implementation( io ), m_parent(static_cast< ReaderImplementation* >( parent )), m_sharedData(nullptr), m_boundSampleTimes(nullptr), m_transformSampleTimes(nullptr), m_objectSampleTimes(nullptr)
+		ReaderImplementation( IndexedIOPtr io, SceneCache::Implementation *parent = nullptr) : SceneCache::Implementation( io ), m_parent(static_cast< ReaderImplementation* >( parent )), m_sharedData(nullptr), m_boundSampleTimes(nullptr), m_transformSampleTimes(nullptr), m_objectSampleTimes(nullptr), m_objectPrefetched( false )
 		{
 			if ( m_parent )
 			{
@@ -587,6 +590,64 @@ class SceneCache::ReaderImplementation : public SceneCache::Implementation
 			return m_sharedData->readObjectAtSample( this, sampleIndex );
 		}
 
+		CompoundDataPtr cacheStatistics() const
+		{
+			CompoundDataPtr result = new CompoundData;
+			result->writable()["object"] = cacheStatistics( m_sharedData->objectCache.get() );
+			result->writable()["attribute"] = cacheStatistics( m_sharedData->attributeCache.get() );
+			result->writable()["transform"] = cacheStatistics( m_sharedData->transformCache.get() );
+			return result;
+		}
+
+		void resetCacheStatistics()
+		{
+			m_sharedData->objectCache->resetStatistics();
+			m_sharedData->attributeCache->resetStatistics();
+			m_sharedData->transformCache->resetStatistics();
+		}
+
+		size_t cacheMemoryUsage() const
+		{
+			return
+				m_sharedData->objectCache->memoryUsage() +
+				m_sharedData->attributeCache->memoryUsage() +
+				m_sharedData->transformCache->memoryUsage()
+			;
+		}
+
+		size_t getCacheLimit( SceneCache::CacheType cache ) const
+		{
+			switch( cache )
+			{
+				case SceneCache::ObjectSampleCache :
+					return m_sharedData->objectCache->getMaxComputations();
+				case SceneCache::AttributeSampleCache :
+					return m_sharedData->attributeCache->getMaxComputations();
+				case SceneCache::TransformSampleCache :
+					return m_sharedData->transformCache->getMaxComputations();
+				default :
+					throw InvalidArgumentException( "SceneCache::getCacheLimit : Invalid cache type" );
+			}
+		}
+
+		void setCacheLimit( SceneCache::CacheType cache, size_t maxSamples )
+		{
+			switch( cache )
+			{
+				case SceneCache::ObjectSampleCache :
+					m_sharedData->objectCache->setMaxComputations( maxSamples );
+					break;
+				case SceneCache::AttributeSampleCache :
+					m_sharedData->attributeCache->setMaxComputations( maxSamples );
+					break;
+				case SceneCache::TransformSampleCache :
+					m_sharedData->transformCache->setMaxComputations( maxSamples );
+					break;
+				default :
+					throw InvalidArgumentException( "SceneCache::setCacheLimit : Invalid cache type" );
+			}
+		}
+
 		static PrimitiveVariableMap readObjectPrimitiveVariablesAtSample( const IndexedIOPtr &io, const std::vector<InternedString> &primVarNames, size_t sample )
 		{
 			return Primitive::loadPrimitiveVariables( io->subdirectory( objectEntry ).get(), sampleEntry(sample), primVarNames );
@@ -622,6 +683,41 @@ class SceneCache::ReaderImplementation : public SceneCache::Implementation
 			return map1;
 		}
 
+		ConstObjectPtr readObjectWithPrimitiveVariablesAtSample( const std::vector<InternedString> &primVarNames, size_t sample ) const
+		{
+			// partially loaded objects are not stored in the object cache, as they
+			// would otherwise be mistaken for the complete object.
+			IndexedIOPtr objectIO = m_indexedIO->subdirectory( objectEntry );
+			return Primitive::loadWithPrimitiveVariables( objectIO.get(), sampleEntry( sample ), primVarNames );
+		}
+
+		ConstObjectPtr readObjectWithPrimitiveVariables( const std::vector<InternedString> &primVarNames, double time ) const
+		{
+			size_t sample1, sample2;
+			double x = objectSampleInterval( time, sample1, sample2 );
+
+			if ( x == 0 )
+			{
+				return readObjectWithPrimitiveVariablesAtSample( primVarNames, sample1 );
+			}
+			if ( x == 1 )
+			{
+				return readObjectWithPrimitiveVariablesAtSample( primVarNames, sample2 );
+			}
+
+			ConstObjectPtr object1 = readObjectWithPrimitiveVariablesAtSample( primVarNames, sample1 );
+			ConstObjectPtr object2 = readObjectWithPrimitiveVariablesAtSample( primVarNames, sample2 );
+
+			ObjectPtr object = linearObjectInterpolation( object1.get(), object2.get(), x );
+			if( !object )
+			{
+				// failed to interpolate, return the closest one
+				return ( x >= 0.5 ? object2 : object1 );
+			}
+
+			return object;
+		}
+
 		ReaderImplementationPtr child( const Name &name, MissingBehaviour missingBehaviour )
 		{
 			IndexedIOPtr children = m_indexedIO->subdirectory( childrenEntry, (IndexedIO::MissingBehaviour)missingBehaviour );
@@ -833,6 +929,22 @@ class SceneCache::ReaderImplementation : public SceneCache::Implementation
 
 	private :
 
+		template<typename Cache>
+		static CompoundDataPtr cacheStatistics( const Cache *cache )
+		{
+			const typename Cache::Statistics statistics = cache->statistics();
+
+			CompoundDataPtr result = new CompoundData;
+			result->writable()["hits"] = new UInt64Data( statistics.hits );
+			result->writable()["misses"] = new UInt64Data( statistics.misses );
+			result->writable()["evictions"] = new UInt64Data( statistics.evictions );
+			result->writable()["cachedComputations"] = new UInt64Data( cache->cachedComputations() );
+			result->writable()["maxComputations"] = new UInt64Data( cache->getMaxComputations() );
+			result->writable()["memoryUsage"] = new UInt64Data( cache->memoryUsage() );
+			result->writable()["computeTime"] = new DoubleData( statistics.computeTime );
+			return result;
+		}
+
 		/// read a set set explicitly defined at this location
 		PathMatcherDataPtr readLocalSet( const Name &name ) const
 		{
@@ -975,6 +1087,9 @@ class SceneCache::ReaderImplementation : public SceneCache::Implementation
 		mutable AttributeSamplesMap m_attributeSampleTimes;
 		mutable AttributeMapMutex m_attributeMutex;
 		mutable const SampleTimes *m_objectSampleTimes;
+		/// Set once the first object sample has been read, so that
+		/// we only prefetch for that read. See doReadObjectAtSample().
+		mutable std::atomic_bool m_objectPrefetched;
 
 		IndexedIOPtr globalSampleTimes() const
 		{
@@ -1104,7 +1219,17 @@ class SceneCache::ReaderImplementation : public SceneCache::Implementation
 		// static function used by the cache mechanism to actually load the object data from file.
 		static ObjectPtr doReadObjectAtSample( const SimpleCacheKey &key )
 		{
-			return Object::load( key.first->m_indexedIO->subdirectory( objectEntry ), sampleEntry(key.second) );
+			IndexedIOPtr io = key.first->m_indexedIO->subdirectory( objectEntry );
+			// On the first read from this location, start reading all the object's
+			// data (primitive variables etc) so the IO overlaps with the deserialisation
+			// of the first entries. We don't repeat this for subsequent samples, as
+			// the recursive walk of the sample's entries isn't free, and the blocks
+			// for neighbouring samples are often already cached by then.
+			if( !key.first->m_objectPrefetched.exchange( true ) )
+			{
+				io->prefetch( { sampleEntry(key.second) } );
+			}
+			return Object::load( io, sampleEntry(key.second) );
 		}
 
 		static MurmurHash attributeHash( const AttributeCacheKey &key )
@@ -1422,13 +1547,34 @@ class SceneCache::WriterImplementation : public SceneCache::Implementation
 						m_animatedObjectTopology.second = true;
 					}
 
+					// Hashing large primitive variables can cost as much as saving
+					// them, so we hash them in parallel.
+					std::vector<PrimitiveVariableMap::const_iterator> primVars;
+					primVars.reserve( primitive->variables.size() );
 					for ( PrimitiveVariableMap::const_iterator it = primitive->variables.begin(); it != primitive->variables.end(); ++it )
 					{
-						Name primVarName = Name( it->first );
+						primVars.push_back( it );
+					}
+
+					std::vector<MurmurHash> primVarHashes( primVars.size() );
+					tbb::task_group_context taskGroupContext( tbb::task_group_context::isolated );
+					tbb::parallel_for(
+						tbb::blocked_range<size_t>( 0, primVars.size() ),
+						[&primVars, &primVarHashes]( const tbb::blocked_range<size_t> &range )
+						{
+							for( size_t i = range.begin(); i != range.end(); ++i )
+							{
+								primVars[i]->second.data->hash( primVarHashes[i] );
+								primVarHashes[i].append( primVars[i]->second.interpolation );
+							}
+						},
+						taskGroupContext
+					);
 
-						MurmurHash hash;
-						it->second.data->hash( hash );
-						hash.append( it->second.interpolation );
+					for ( size_t i = 0; i < primVars.size(); ++i )
+					{
+						Name primVarName = Name( primVars[i]->first );
+						const MurmurHash &hash = primVarHashes[i];
 
 						AnimatedPrimVarMap::iterator pIt = m_animatedObjectPrimVars.find( primVarName );
 						if ( pIt == m_animatedObjectPrimVars.end() )
@@ -2175,13 +2321,13 @@ class SceneCache::WriterImplementation : public SceneCache::Implementation
 // SceneCache
 //////////////////////////////////////////////////////////////////////////
 
-SceneCache::SceneCache( const std::string &fileName, IndexedIO::OpenMode mode )
+SceneCache::SceneCache( const std::string &fileName, IndexedIO::OpenMode mode, const CompoundData *options )
 {
 	if( mode & IndexedIO::Append )
 	{
 		throw InvalidArgumentException( "Append mode not supported" );
 	}
-	IndexedIOPtr indexedIO = IndexedIO::create( fileName, IndexedIO::rootPath, mode );
+	IndexedIOPtr indexedIO = IndexedIO::create( fileName, IndexedIO::rootPath, mode, options );
 
 	if( indexedIO->openMode() & IndexedIO::Write )
 	{
@@ -2505,6 +2651,12 @@ PrimitiveVariableMap SceneCache::readObjectPrimitiveVariables( const std::vector
 	return reader->readObjectPrimitiveVariables( primVarNames, time );
 }
 
+ConstObjectPtr SceneCache::readObjectWithPrimitiveVariables( const std::vector<InternedString> &primVarNames, double time ) const
+{
+	ReaderImplementation *reader = ReaderImplementation::reader( m_implementation.get() );
+	return reader->readObjectWithPrimitiveVariables( primVarNames, time );
+}
+
 void SceneCache::writeObject( const Object *object, double time )
 {
 	WriterImplementation *writer = WriterImplementation::writer( m_implementation.get() );
@@ -2617,3 +2769,33 @@ bool SceneCache::readOnly() const
 {
 	return dynamic_cast< const ReaderImplementation* >( m_implementation.get() ) != nullptr;
 }
+
+CompoundDataPtr SceneCache::cacheStatistics() const
+{
+	ReaderImplementation *reader = ReaderImplementation::reader( m_implementation.get() );
+	return reader->cacheStatistics();
+}
+
+void SceneCache::resetCacheStatistics()
+{
+	ReaderImplementation *reader = ReaderImplementation::reader( m_implementation.get() );
+	reader->resetCacheStatistics();
+}
+
+size_t SceneCache::cacheMemoryUsage() const
+{
+	ReaderImplementation *reader = ReaderImplementation::reader( m_implementation.get() );
+	return reader->cacheMemoryUsage();
+}
+
+size_t SceneCache::getCacheLimit( CacheType cache ) const
+{
+	ReaderImplementation *reader = ReaderImplementation::reader( m_implementation.get() );
+	return reader->getCacheLimit( cache );
+}
+
+void SceneCache::setCacheLimit( CacheType cache, size_t maxSamples )
+{
+	ReaderImplementation *reader = ReaderImplementation::reader( m_implementation.get() );
+	reader->setCacheLimit( cache, maxSamples );
+}
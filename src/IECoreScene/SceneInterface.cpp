@@ -34,10 +34,14 @@
 
 #include "IECoreScene/SceneInterface.h"
 
+#include "IECoreScene/Primitive.h"
+
 #include "boost/filesystem/convenience.hpp"
 #include "boost/tokenizer.hpp"
 #include "boost/algorithm/string.hpp"
 
+#include <algorithm>
+
 using namespace IECore;
 using namespace IECoreScene;
 
@@ -139,6 +143,31 @@ void SceneInterface::hash( HashType hashType, double time, MurmurHash &h ) const
 	h.append( typeId() );
 }
 
+ConstObjectPtr SceneInterface::readObjectWithPrimitiveVariables( const std::vector<InternedString> &primVarNames, double time ) const
+{
+	ConstObjectPtr object = readObject( time );
+	const Primitive *primitive = runTimeCast<const Primitive>( object.get() );
+	if( !primitive )
+	{
+		return object;
+	}
+
+	PrimitivePtr result = primitive->copy();
+	for( PrimitiveVariableMap::iterator it = result->variables.begin(); it != result->variables.end(); )
+	{
+		if( std::find( primVarNames.begin(), primVarNames.end(), InternedString( it->first ) ) == primVarNames.end() )
+		{
+			it = result->variables.erase( it );
+		}
+		else
+		{
+			++it;
+		}
+	}
+
+	return result;
+}
+
 void SceneInterface::pathToString( const SceneInterface::Path &p, std::string &path )
 {
 	if ( !p.size() )
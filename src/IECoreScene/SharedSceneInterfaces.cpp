@@ -34,7 +34,18 @@
 
 #include "IECoreScene/SharedSceneInterfaces.h"
 
-#include "IECore/LRUCache.h"
+#include "IECoreScene/SceneCache.h"
+
+#include "IECore/SimpleTypedData.h"
+
+#include "tbb/mutex.h"
+
+#include <chrono>
+#include <list>
+#include <vector>
+#include <unordered_map>
+
+#include <sys/stat.h>
 
 using namespace IECore;
 using namespace IECoreScene;
@@ -46,30 +57,344 @@ using namespace IECoreScene;
 namespace
 {
 
-typedef IECore::LRUCache< std::string, IECoreScene::ConstSceneInterfacePtr > SceneLRUCache;
+// An estimate of the memory held by an open scene in addition to
+// its read caches - the file index, string table and so on.
+const size_t g_sceneOverhead = 1024 * 1024;
+
+// Identifies a particular version of a file on disk, so that we
+// can tell when a cached scene has been rewritten. Where possible
+// we use the full resolution of the modification time, so that a
+// file rewritten within the same second is still detected.
+struct FileStamp
+{
+
+	FileStamp()
+		:	modificationTime( 0 ), size( 0 ), inode( 0 )
+	{
+	}
+
+	FileStamp( const std::string &fileName )
+		:	modificationTime( 0 ), size( 0 ), inode( 0 )
+	{
+		struct stat s;
+		if( stat( fileName.c_str(), &s ) == 0 )
+		{
+#if defined( __APPLE__ )
+			modificationTime = int64_t( s.st_mtimespec.tv_sec ) * 1000000000 + s.st_mtimespec.tv_nsec;
+#elif defined( _MSC_VER )
+			modificationTime = int64_t( s.st_mtime ) * 1000000000;
+#else
+			modificationTime = int64_t( s.st_mtim.tv_sec ) * 1000000000 + s.st_mtim.tv_nsec;
+#endif
+			size = s.st_size;
+			inode = s.st_ino;
+		}
+	}
+
+	bool operator == ( const FileStamp &other ) const
+	{
+		return modificationTime == other.modificationTime && size == other.size && inode == other.inode;
+	}
+
+	bool operator != ( const FileStamp &other ) const
+	{
+		return !( *this == other );
+	}
+
+	// In nanoseconds.
+	int64_t modificationTime;
+	int64_t size;
+	uint64_t inode;
+
+};
+
+size_t memoryCost( const SceneInterface *scene )
+{
+	size_t result = g_sceneOverhead;
+	if( const SceneCache *sceneCache = runTimeCast<const SceneCache>( scene ) )
+	{
+		result += sceneCache->cacheMemoryUsage();
+	}
+	return result;
+}
 
-class Cache : public SceneLRUCache
+// We don't use LRUCache because scenes are limited both by number and by
+// memory, and because the memory used by a scene grows after it has been
+// cached, as its own read caches are populated.
+class Cache
 {
+
 	public :
 
-		Cache( SceneLRUCache::Cost maxCost )
-			: SceneLRUCache( fileCacheGetter, maxCost )
+		Cache()
+			:	m_maxScenes( 200 ), m_maxMemory( size_t( 4 ) * 1024 * 1024 * 1024 ), m_memoryUsage( 0 ),
+				m_checkInterval( std::chrono::seconds( 1 ) ),
+				m_hits( 0 ), m_misses( 0 ), m_evictions( 0 ), m_staleReloads( 0 )
+		{
+		}
+
+		ConstSceneInterfacePtr get( const std::string &fileName )
+		{
+			const Clock::time_point now = Clock::now();
+
+			{
+				Mutex::scoped_lock lock( m_mutex );
+				Map::iterator it = m_map.find( fileName );
+				if( it != m_map.end() && now - it->second.checkTime < m_checkInterval )
+				{
+					return hit( it );
+				}
+			}
+
+			// Either the file isn't cached, or it is time to check that it
+			// hasn't been rewritten since it was opened. We stat() it without
+			// holding the lock, so that we don't block other threads.
+			const FileStamp stamp( fileName );
+
+			{
+				Mutex::scoped_lock lock( m_mutex );
+				Map::iterator it = m_map.find( fileName );
+				if( it != m_map.end() )
+				{
+					if( it->second.stamp == stamp )
+					{
+						it->second.checkTime = now;
+						return hit( it );
+					}
+					// The file has been rewritten since we opened it.
+					m_staleReloads++;
+					remove( it );
+				}
+				m_misses++;
+			}
+
+			// Open the file without holding the lock, so that we don't block
+			// other threads retrieving scenes which are already cached.
+			ConstSceneInterfacePtr result = SceneInterface::create( fileName, IndexedIO::Read );
+
+			Mutex::scoped_lock lock( m_mutex );
+			Map::iterator it = m_map.find( fileName );
+			if( it != m_map.end() )
+			{
+				if( it->second.stamp == stamp )
+				{
+					// Another thread opened the same file concurrently.
+					// Use theirs so that everyone shares a single scene.
+					return it->second.scene;
+				}
+				remove( it );
+			}
+
+			m_list.push_front( fileName );
+			Entry &entry = m_map[fileName];
+			entry.scene = result;
+			entry.stamp = stamp;
+			entry.checkTime = now;
+			entry.cost = 0;
+			entry.listIterator = m_list.begin();
+			updateCost( entry );
+			limit();
+
+			return result;
+		}
+
+		void erase( const std::string &fileName )
+		{
+			Mutex::scoped_lock lock( m_mutex );
+			Map::iterator it = m_map.find( fileName );
+			if( it != m_map.end() )
+			{
+				remove( it );
+			}
+		}
+
+		void clear()
+		{
+			Mutex::scoped_lock lock( m_mutex );
+			m_map.clear();
+			m_list.clear();
+			m_memoryUsage = 0;
+		}
+
+		void setMaxScenes( size_t maxScenes )
+		{
+			Mutex::scoped_lock lock( m_mutex );
+			m_maxScenes = maxScenes;
+			limit();
+		}
+
+		size_t getMaxScenes()
+		{
+			Mutex::scoped_lock lock( m_mutex );
+			return m_maxScenes;
+		}
+
+		size_t numScenes()
+		{
+			Mutex::scoped_lock lock( m_mutex );
+			return m_map.size();
+		}
+
+		void setMaxMemory( size_t maxMemory )
+		{
+			Mutex::scoped_lock lock( m_mutex );
+			m_maxMemory = maxMemory;
+			updateCosts();
+			limit();
+		}
+
+		size_t getMaxMemory()
+		{
+			Mutex::scoped_lock lock( m_mutex );
+			return m_maxMemory;
+		}
+
+		size_t memoryUsage()
+		{
+			Mutex::scoped_lock lock( m_mutex );
+			updateCosts();
+			return m_memoryUsage;
+		}
+
+		void setCheckInterval( float seconds )
+		{
+			Mutex::scoped_lock lock( m_mutex );
+			m_checkInterval = std::chrono::duration_cast<Clock::duration>( std::chrono::duration<float>( seconds ) );
+		}
+
+		float getCheckInterval()
+		{
+			Mutex::scoped_lock lock( m_mutex );
+			return std::chrono::duration_cast<std::chrono::duration<float>>( m_checkInterval ).count();
+		}
+
+		CompoundDataPtr statistics()
+		{
+			std::vector<std::pair<std::string, FileStamp>> stamps;
+			CompoundDataPtr result = new CompoundData;
+
+			{
+				Mutex::scoped_lock lock( m_mutex );
+				updateCosts();
+				for( const auto &e : m_map )
+				{
+					stamps.push_back( std::make_pair( e.first, e.second.stamp ) );
+				}
+				result->writable()["hits"] = new UInt64Data( m_hits );
+				result->writable()["misses"] = new UInt64Data( m_misses );
+				result->writable()["evictions"] = new UInt64Data( m_evictions );
+				result->writable()["staleReloads"] = new UInt64Data( m_staleReloads );
+				result->writable()["numScenes"] = new UInt64Data( m_map.size() );
+				result->writable()["maxScenes"] = new UInt64Data( m_maxScenes );
+				result->writable()["memoryUsage"] = new UInt64Data( m_memoryUsage );
+				result->writable()["maxMemory"] = new UInt64Data( m_maxMemory );
+			}
+
+			// Scenes whose files have been rewritten, and which will be
+			// reloaded the next time they are requested.
+			size_t numStale = 0;
+			for( const auto &s : stamps )
+			{
+				if( FileStamp( s.first ) != s.second )
+				{
+					numStale++;
+				}
+			}
+			result->writable()["staleScenes"] = new UInt64Data( numStale );
+
+			return result;
+		}
+
+		void resetStatistics()
 		{
+			Mutex::scoped_lock lock( m_mutex );
+			m_hits = m_misses = m_evictions = m_staleReloads = 0;
 		}
 
 	private :
 
-		static SceneInterfacePtr fileCacheGetter( const std::string &fileName, size_t &cost )
+		typedef std::list<std::string> List;
+		typedef std::chrono::steady_clock Clock;
+
+		struct Entry
 		{
-			SceneInterfacePtr result = SceneInterface::create( fileName, IECore::IndexedIO::Read );
-			cost = 1;
+			ConstSceneInterfacePtr scene;
+			FileStamp stamp;
+			// When `stamp` was last compared against the file.
+			Clock::time_point checkTime;
+			size_t cost;
+			List::iterator listIterator;
+		};
+
+		typedef std::unordered_map<std::string, Entry> Map;
+		typedef tbb::mutex Mutex;
+
+		// All private methods must be called with m_mutex held.
+
+		ConstSceneInterfacePtr hit( Map::iterator it )
+		{
+			m_hits++;
+			ConstSceneInterfacePtr result = it->second.scene;
+			m_list.splice( m_list.begin(), m_list, it->second.listIterator );
+			updateCost( it->second );
+			limit();
 			return result;
 		}
+
+		void updateCost( Entry &entry )
+		{
+			const size_t cost = memoryCost( entry.scene.get() );
+			m_memoryUsage = m_memoryUsage - entry.cost + cost;
+			entry.cost = cost;
+		}
+
+		void updateCosts()
+		{
+			for( auto &e : m_map )
+			{
+				updateCost( e.second );
+			}
+		}
+
+		void remove( Map::iterator it )
+		{
+			m_memoryUsage -= it->second.cost;
+			m_list.erase( it->second.listIterator );
+			m_map.erase( it );
+		}
+
+		// Evicts the least recently used scenes until we are within both limits.
+		// The most recently used scene is never evicted for exceeding the memory
+		// limit, because it is the one we are about to use, and evicting it
+		// would just cause it to be reopened on every access.
+		void limit()
+		{
+			while( !m_list.empty() && ( m_map.size() > m_maxScenes || ( m_memoryUsage > m_maxMemory && m_list.size() > 1 ) ) )
+			{
+				remove( m_map.find( m_list.back() ) );
+				m_evictions++;
+			}
+		}
+
+		Mutex m_mutex;
+		List m_list;
+		Map m_map;
+
+		size_t m_maxScenes;
+		size_t m_maxMemory;
+		size_t m_memoryUsage;
+		Clock::duration m_checkInterval;
+
+		uint64_t m_hits;
+		uint64_t m_misses;
+		uint64_t m_evictions;
+		uint64_t m_staleReloads;
+
 };
 
 Cache &cache()
 {
-	static Cache *cache = new Cache( 200 );
+	static Cache *cache = new Cache();
 	return *cache;
 }
 
@@ -96,15 +421,50 @@ void SharedSceneInterfaces::clear()
 
 void SharedSceneInterfaces::setMaxScenes( size_t numScenes )
 {
-	cache().setMaxCost( numScenes );
+	cache().setMaxScenes( numScenes );
 }
 
 size_t SharedSceneInterfaces::getMaxScenes()
 {
-	return cache().getMaxCost();
+	return cache().getMaxScenes();
 }
 
 size_t SharedSceneInterfaces::numScenes()
 {
-	return cache().currentCost();
+	return cache().numScenes();
+}
+
+void SharedSceneInterfaces::setMaxMemory( size_t bytes )
+{
+	cache().setMaxMemory( bytes );
+}
+
+size_t SharedSceneInterfaces::getMaxMemory()
+{
+	return cache().getMaxMemory();
+}
+
+size_t SharedSceneInterfaces::memoryUsage()
+{
+	return cache().memoryUsage();
+}
+
+void SharedSceneInterfaces::setCheckInterval( float seconds )
+{
+	cache().setCheckInterval( seconds );
+}
+
+float SharedSceneInterfaces::getCheckInterval()
+{
+	return cache().getCheckInterval();
+}
+
+CompoundDataPtr SharedSceneInterfaces::statistics()
+{
+	return cache().statistics();
+}
+
+void SharedSceneInterfaces::resetStatistics()
+{
+	cache().resetStatistics();
 }
@@ -39,6 +39,9 @@
 #include "IECoreScene/PrimitiveEvaluator.h"
 
 #include "IECorePython/RunTimeTypedBinding.h"
+#include "IECorePython/ScopedGILRelease.h"
+
+#include "boost/python/stl_iterator.hpp"
 
 using namespace IECore;
 using namespace IECorePython;
@@ -131,6 +134,35 @@ struct PrimitiveEvaluatorHelper
 		return result;
 	}
 
+	static std::vector<std::string> primitiveVariableNames( object primitiveVariables )
+	{
+		return std::vector<std::string>(
+			stl_input_iterator<std::string>( primitiveVariables ),
+			stl_input_iterator<std::string>()
+		);
+	}
+
+	static CompoundDataPtr batchClosestPoint( PrimitiveEvaluator &evaluator, const V3fVectorData *points, object primitiveVariables )
+	{
+		const std::vector<std::string> names = primitiveVariableNames( primitiveVariables );
+		IECorePython::ScopedGILRelease gilRelease;
+		return evaluator.batchClosestPoint( points, names );
+	}
+
+	static CompoundDataPtr batchPointAtUV( PrimitiveEvaluator &evaluator, const V2fVectorData *uvs, object primitiveVariables )
+	{
+		const std::vector<std::string> names = primitiveVariableNames( primitiveVariables );
+		IECorePython::ScopedGILRelease gilRelease;
+		return evaluator.batchPointAtUV( uvs, names );
+	}
+
+	static CompoundDataPtr batchIntersectionPoint( PrimitiveEvaluator &evaluator, const V3fVectorData *origins, const V3fVectorData *directions, float maxDistance, object primitiveVariables )
+	{
+		const std::vector<std::string> names = primitiveVariableNames( primitiveVariables );
+		IECorePython::ScopedGILRelease gilRelease;
+		return evaluator.batchIntersectionPoint( origins, directions, maxDistance, names );
+	}
+
 	static PrimitivePtr primitive( PrimitiveEvaluator &evaluator )
 	{
 		return evaluator.primitive()->copy();
@@ -184,6 +216,9 @@ void bindPrimitiveEvaluator()
 		.def( "intersectionPoint", intersectionPointMaxDist )
 		.def( "intersectionPoints", intersectionPoints )
 		.def( "intersectionPoints", intersectionPointsMaxDist )
+		.def( "batchClosestPoint", &PrimitiveEvaluatorHelper::batchClosestPoint, ( arg( "points" ), arg( "primitiveVariables" ) = list() ) )
+		.def( "batchPointAtUV", &PrimitiveEvaluatorHelper::batchPointAtUV, ( arg( "uvs" ), arg( "primitiveVariables" ) = list() ) )
+		.def( "batchIntersectionPoint", &PrimitiveEvaluatorHelper::batchIntersectionPoint, ( arg( "origins" ), arg( "directions" ), arg( "maxDistance" ) = Imath::limits<float>::max(), arg( "primitiveVariables" ) = list() ) )
 		.def( "primitive", &PrimitiveEvaluatorHelper::primitive )
 		.def( "volume", &PrimitiveEvaluator::volume )
 		.def( "centerOfGravity", &PrimitiveEvaluator::centerOfGravity )
@@ -40,6 +40,7 @@
 
 #include "IECorePython/ScopedGILRelease.h"
 
+#include "boost/python/suite/indexing/container_utils.hpp"
 
 using namespace boost::python;
 using namespace IECore;
@@ -65,6 +66,15 @@ dict parallelReadAll( const SceneInterface *src, int startFrame, int endFrame, f
 	return result;
 }
 
+size_t prefetch( const SceneInterface *src, const PathMatcher &locations, object pythonTimes, unsigned int flags, size_t maxMemory )
+{
+	std::vector<double> times;
+	container_utils::extend_container( times, pythonTimes );
+
+	IECorePython::ScopedGILRelease scopedGILRelease;
+	return SceneAlgo::prefetch( src, locations, times, flags, maxMemory );
+}
+
 } // namespace
 
 namespace IECoreSceneModule
@@ -92,6 +102,7 @@ void bindSceneAlgo()
 	def( "copy", &SceneAlgo::copy );
 
 	def( "parallelReadAll", &::parallelReadAll);
+	def( "prefetch", &::prefetch, ( arg( "src" ), arg( "locations" ), arg( "times" ), arg( "flags" ) = SceneAlgo::All, arg( "maxMemory" ) = 0 ) );
 }
 
 } // namespace IECoreSceneModule
@@ -41,7 +41,10 @@
 #include "IECoreScene/SceneCache.h"
 #include "IECoreScene/SharedSceneInterfaces.h"
 
+#include "IECore/CompoundData.h"
+
 #include "IECorePython/RunTimeTypedBinding.h"
+#include "IECorePython/ScopedGILRelease.h"
 
 #include "tbb/tbb.h"
 
@@ -58,13 +61,15 @@ using namespace IECoreScene;
 namespace
 {
 
-SceneCachePtr constructor( const std::string &fileName, IndexedIO::OpenMode mode )
+SceneCachePtr constructor( const std::string &fileName, IndexedIO::OpenMode mode, IECore::CompoundDataPtr options )
 {
-	return new SceneCache( fileName, mode );
+	IECorePython::ScopedGILRelease gilRelease;
+	return new SceneCache( fileName, mode, options.get() );
 }
 
 SceneCachePtr constructor2( IECore::IndexedIOPtr indexedIO )
 {
+	IECorePython::ScopedGILRelease gilRelease;
 	return new SceneCache( indexedIO );
 }
 
@@ -166,10 +171,23 @@ namespace IECoreSceneModule
 
 void bindSceneCache()
 {
-	RunTimeTypedClass<SceneCache>()
-		.def( "__init__", make_constructor( &constructor ), "Opens a scene file for read or write." )
-		.def( "__init__", make_constructor( &constructor2 ), "Opens a scene from a previously opened file handle." )
-	;
+	{
+		scope s = RunTimeTypedClass<SceneCache>()
+			.def( "__init__", make_constructor( &constructor, default_call_policies(), ( arg( "fileName" ), arg( "mode" ), arg( "options" ) = object() ) ), "Opens a scene file for read or write." )
+			.def( "__init__", make_constructor( &constructor2 ), "Opens a scene from a previously opened file handle." )
+			.def( "cacheStatistics", &SceneCache::cacheStatistics )
+			.def( "resetCacheStatistics", &SceneCache::resetCacheStatistics )
+			.def( "cacheMemoryUsage", &SceneCache::cacheMemoryUsage )
+			.def( "getCacheLimit", &SceneCache::getCacheLimit )
+			.def( "setCacheLimit", &SceneCache::setCacheLimit )
+		;
+
+		enum_<SceneCache::CacheType>( "CacheType" )
+			.value( "ObjectSampleCache", SceneCache::ObjectSampleCache )
+			.value( "AttributeSampleCache", SceneCache::AttributeSampleCache )
+			.value( "TransformSampleCache", SceneCache::TransformSampleCache )
+		;
+	}
 
 	def( "testSceneCacheParallelAttributeRead", &testSceneCacheParallelAttributeRead );
 	def( "testSceneCacheParallelFakeAttributeRead", &testSceneCacheParallelFakeAttributeRead );
@@ -41,6 +41,7 @@
 
 #include "IECorePython/IECoreBinding.h"
 #include "IECorePython/RunTimeTypedBinding.h"
+#include "IECorePython/ScopedGILRelease.h"
 
 #include "boost/python/suite/indexing/container_utils.hpp"
 
@@ -132,7 +133,11 @@ static dict readObjectPrimitiveVariables( const SceneInterface &m, list varNameL
 	SceneInterface::NameList v;
 	container_utils::extend_container( v, varNameList );
 
-	PrimitiveVariableMap varMap = m.readObjectPrimitiveVariables( v, time );
+	PrimitiveVariableMap varMap;
+	{
+		IECorePython::ScopedGILRelease gilRelease;
+		varMap = m.readObjectPrimitiveVariables( v, time );
+	}
 	dict result;
 	for( PrimitiveVariableMap::const_iterator it = varMap.begin(); it != varMap.end(); it++ )
 	{
@@ -160,8 +165,21 @@ void writeTags( SceneInterface &m, list tagList )
 	m.writeTags( v );
 }
 
+Imath::Box3d readBound( const SceneInterface &m, double time )
+{
+	IECorePython::ScopedGILRelease gilRelease;
+	return m.readBound( time );
+}
+
+void writeBound( SceneInterface &m, const Imath::Box3d &bound, double time )
+{
+	IECorePython::ScopedGILRelease gilRelease;
+	m.writeBound( bound, time );
+}
+
 DataPtr readTransform( SceneInterface &m, double time )
 {
+	IECorePython::ScopedGILRelease gilRelease;
 	ConstDataPtr t = m.readTransform( time );
 	if( t )
 	{
@@ -170,8 +188,21 @@ DataPtr readTransform( SceneInterface &m, double time )
 	return nullptr;
 }
 
+Imath::M44d readTransformAsMatrix( const SceneInterface &m, double time )
+{
+	IECorePython::ScopedGILRelease gilRelease;
+	return m.readTransformAsMatrix( time );
+}
+
+void writeTransform( SceneInterface &m, const Data *transform, double time )
+{
+	IECorePython::ScopedGILRelease gilRelease;
+	m.writeTransform( transform, time );
+}
+
 ObjectPtr readAttribute( SceneInterface &m, const SceneInterface::Name &name, double time )
 {
+	IECorePython::ScopedGILRelease gilRelease;
 	ConstObjectPtr o = m.readAttribute( name, time );
 	if( o )
 	{
@@ -180,8 +211,15 @@ ObjectPtr readAttribute( SceneInterface &m, const SceneInterface::Name &name, do
 	return nullptr;
 }
 
+void writeAttribute( SceneInterface &m, const SceneInterface::Name &name, const Object *attribute, double time )
+{
+	IECorePython::ScopedGILRelease gilRelease;
+	m.writeAttribute( name, attribute, time );
+}
+
 ObjectPtr readObject( SceneInterface &m, double time )
 {
+	IECorePython::ScopedGILRelease gilRelease;
 	ConstObjectPtr o = m.readObject( time );
 	if( o )
 	{
@@ -190,13 +228,52 @@ ObjectPtr readObject( SceneInterface &m, double time )
 	return nullptr;
 }
 
+ObjectPtr readObjectWithPrimitiveVariables( const SceneInterface &m, list varNameList, double time )
+{
+	SceneInterface::NameList v;
+	container_utils::extend_container( v, varNameList );
+
+	IECorePython::ScopedGILRelease gilRelease;
+	ConstObjectPtr o = m.readObjectWithPrimitiveVariables( v, time );
+	if( o )
+	{
+		return o->copy();
+	}
+	return nullptr;
+}
+
+void writeObject( SceneInterface &m, const Object *object, double time )
+{
+	IECorePython::ScopedGILRelease gilRelease;
+	m.writeObject( object, time );
+}
+
+PathMatcher readSet( const SceneInterface &m, const SceneInterface::Name &name, bool includeDescendantSets )
+{
+	IECorePython::ScopedGILRelease gilRelease;
+	return m.readSet( name, includeDescendantSets );
+}
+
+void writeSet( SceneInterface &m, const SceneInterface::Name &name, const PathMatcher &set )
+{
+	IECorePython::ScopedGILRelease gilRelease;
+	m.writeSet( name, set );
+}
+
 static MurmurHash sceneHash( SceneInterface &m, SceneInterface::HashType hashType, double time )
 {
+	IECorePython::ScopedGILRelease gilRelease;
 	MurmurHash h;
 	m.hash( hashType, time, h );
 	return h;
 }
 
+static SceneInterfacePtr create( const std::string &path, IndexedIO::OpenMode mode )
+{
+	IECorePython::ScopedGILRelease gilRelease;
+	return SceneInterface::create( path, mode );
+}
+
 static  list setNames( const SceneInterface &m, bool includeDescendantSets = true   )
 {
 	SceneInterface::NameList a = m.setNames( includeDescendantSets );
@@ -205,6 +282,7 @@ static  list setNames( const SceneInterface &m, bool includeDescendantSets = tru
 
 static MurmurHash hashSet( SceneInterface &m, const SceneInterface::Name &name)
 {
+	IECorePython::ScopedGILRelease gilRelease;
 	MurmurHash h;
 	m.hashSet( name,  h );
 	return h;
@@ -257,25 +335,26 @@ void bindSceneInterface()
 		.def( "pathAsString", pathAsString )
 		.def( "name", &SceneInterface::name )
 		.def( "hasBound", &SceneInterface::hasBound )
-		.def( "readBound", &SceneInterface::readBound )
-		.def( "writeBound", &SceneInterface::writeBound )
+		.def( "readBound", &readBound )
+		.def( "writeBound", &writeBound )
 		.def( "readTransform", &readTransform )
-		.def( "readTransformAsMatrix", &SceneInterface::readTransformAsMatrix )
-		.def( "writeTransform", &SceneInterface::writeTransform )
+		.def( "readTransformAsMatrix", &readTransformAsMatrix )
+		.def( "writeTransform", &writeTransform )
 		.def( "hasAttribute", &SceneInterface::hasAttribute )
 		.def( "attributeNames", attributeNames )
 		.def( "readAttribute", &readAttribute )
-		.def( "writeAttribute", &SceneInterface::writeAttribute )
+		.def( "writeAttribute", &writeAttribute )
 		.def( "hasTag", &SceneInterface::hasTag, ( arg( "name" ), arg( "filter" ) = SceneInterface::LocalTag ) )
 		.def( "readTags", readTags, ( arg( "filter" ) = SceneInterface::LocalTag ) )
 		.def( "writeTags", writeTags )
 		.def( "setNames", &setNames, ( arg_( "includeDescendantSets" ) = true ) )
-		.def( "writeSet", &SceneInterface::writeSet )
+		.def( "writeSet", &writeSet )
 		.def( "hashSet", &hashSet )
-		.def( "readSet", &SceneInterface::readSet, ( arg_("name"), arg_( "includeDescendantSets" ) = true ) )
+		.def( "readSet", &readSet, ( arg_("name"), arg_( "includeDescendantSets" ) = true ) )
 		.def( "readObject", &readObject )
 		.def( "readObjectPrimitiveVariables", &readObjectPrimitiveVariables )
-		.def( "writeObject", &SceneInterface::writeObject )
+		.def( "readObjectWithPrimitiveVariables", &readObjectWithPrimitiveVariables )
+		.def( "writeObject", &writeObject )
 		.def( "hasObject", &SceneInterface::hasObject )
 		.def( "hasChild", &SceneInterface::hasChild )
 		.def( "childNames", &childNames )
@@ -286,7 +365,7 @@ void bindSceneInterface()
 
 		.def( "pathToString", pathToString ).staticmethod("pathToString")
 		.def( "stringToPath", stringToPath ).staticmethod("stringToPath")
-		.def( "create", SceneInterface::create ).staticmethod( "create" )
+		.def( "create", &create ).staticmethod( "create" )
 		.def( "supportedExtensions", supportedExtensions, ( arg("modes") = IndexedIO::Read|IndexedIO::Write|IndexedIO::Append ) ).staticmethod( "supportedExtensions" )
 
 		.def_readonly("visibilityName", &SceneInterface::visibilityName )
@@ -59,6 +59,13 @@ void bindSharedSceneInterfaces()
 		.def( "setMaxScenes", SharedSceneInterfaces::setMaxScenes ).staticmethod( "setMaxScenes" )
 		.def( "getMaxScenes", SharedSceneInterfaces::getMaxScenes ).staticmethod( "getMaxScenes" )
 		.def( "numScenes", SharedSceneInterfaces::numScenes ).staticmethod( "numScenes" )
+		.def( "setMaxMemory", SharedSceneInterfaces::setMaxMemory ).staticmethod( "setMaxMemory" )
+		.def( "getMaxMemory", SharedSceneInterfaces::getMaxMemory ).staticmethod( "getMaxMemory" )
+		.def( "memoryUsage", SharedSceneInterfaces::memoryUsage ).staticmethod( "memoryUsage" )
+		.def( "setCheckInterval", SharedSceneInterfaces::setCheckInterval ).staticmethod( "setCheckInterval" )
+		.def( "getCheckInterval", SharedSceneInterfaces::getCheckInterval ).staticmethod( "getCheckInterval" )
+		.def( "statistics", SharedSceneInterfaces::statistics ).staticmethod( "statistics" )
+		.def( "resetStatistics", SharedSceneInterfaces::resetStatistics ).staticmethod( "resetStatistics" )
 	;
 }
 
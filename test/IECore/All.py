@@ -52,6 +52,7 @@ from IndexedIO import *
 from IndexedIOAlgo import *
 from KDTree import *
 from BoundedKDTree import *
+from BoundingVolumeHierarchy import *
 from MessageHandler import *
 from ObjectIO import *
 from Object import *
@@ -153,6 +154,7 @@ from ReprTest import ReprTest
 from StringAlgoTest import StringAlgoTest
 from PathMatcherTest import PathMatcherTest
 from PathMatcherDataTest import PathMatcherDataTest
+from FlatPathMatcherTest import FlatPathMatcherTest
 from CancellerTest import CancellerTest
 
 unittest.TestProgram(
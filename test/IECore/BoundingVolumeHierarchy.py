@@ -0,0 +1,158 @@
+##########################################################################
+#
+#  Copyright (c) 2019, Image Engine Design Inc. All rights reserved.
+#
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are
+#  met:
+#
+#     * Redistributions of source code must retain the above copyright
+#       notice, this list of conditions and the following disclaimer.
+#
+#     * Redistributions in binary form must reproduce the above copyright
+#       notice, this list of conditions and the following disclaimer in the
+#       documentation and/or other materials provided with the distribution.
+#
+#     * Neither the name of Image Engine Design nor the names of any
+#       other contributors to this software may be used to endorse or
+#       promote products derived from this software without specific prior
+#       written permission.
+#
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS
+#  IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+#  THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+#  PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR
+#  CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+#  EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+#  PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+#  PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+#  LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+#  NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+#  SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+##########################################################################
+
+
+import os
+import random
+import unittest
+import imath
+import IECore
+
+class BoundingVolumeHierarchyTest( unittest.TestCase ) :
+
+	def __randomBounds( self, numBounds, boundType, vectorType, vectorDataType ) :
+
+		dimensions = 3 if vectorType in ( imath.V3f, imath.V3d ) else 2
+
+		result = vectorDataType()
+		for i in range( 0, numBounds ) :
+			p = vectorType( *[ random.random() for j in range( 0, dimensions ) ] )
+			b = boundType( p )
+			b.extendBy( p + vectorType( *[ random.random() * 0.1 for j in range( 0, dimensions ) ] ) )
+			result.append( b )
+
+		return result
+
+	def __bruteForceIntersectingBounds( self, bounds, bound ) :
+
+		return set( [ i for i, b in enumerate( bounds ) if b.intersects( bound ) ] )
+
+	def __testIntersectingBounds( self, bvhType, boundType, vectorType, vectorDataType ) :
+
+		for numBounds in [ 0, 1, 10, 50, 5000 ] :
+
+			random.seed( 100 + 5 * numBounds )
+			bounds = self.__randomBounds( numBounds, boundType, vectorType, vectorDataType )
+			bvh = bvhType( bounds )
+
+			queries = self.__randomBounds( 25, boundType, vectorType, vectorDataType )
+			for query in queries :
+				self.assertEqual(
+					set( bvh.intersectingBounds( query ) ),
+					self.__bruteForceIntersectingBounds( bounds, query )
+				)
+
+			for query in queries :
+				self.assertEqual(
+					set( bvh.intersectingBounds( query.center() ) ),
+					self.__bruteForceIntersectingBounds( bounds, boundType( query.center() ) )
+				)
+
+	def testBox3f( self ) :
+
+		self.__testIntersectingBounds( IECore.Box3fBVH, imath.Box3f, imath.V3f, IECore.Box3fVectorData )
+
+	def testBox3d( self ) :
+
+		self.__testIntersectingBounds( IECore.Box3dBVH, imath.Box3d, imath.V3d, IECore.Box3dVectorData )
+
+	def testBox2f( self ) :
+
+		self.__testIntersectingBounds( IECore.Box2fBVH, imath.Box2f, imath.V2f, IECore.Box2fVectorData )
+
+	def testBox2d( self ) :
+
+		self.__testIntersectingBounds( IECore.Box2dBVH, imath.Box2d, imath.V2d, IECore.Box2dVectorData )
+
+	def testCoincidentBounds( self ) :
+
+		bounds = IECore.Box3fVectorData( [ imath.Box3f( imath.V3f( 0 ), imath.V3f( 1 ) ) ] * 1000 )
+		bvh = IECore.Box3fBVH( bounds, maxLeafSize = 4 )
+
+		self.assertEqual( len( bvh.intersectingBounds( imath.V3f( 0.5 ) ) ), 1000 )
+		self.assertEqual( len( bvh.intersectingBounds( imath.V3f( 2 ) ) ), 0 )
+
+	def testRefit( self ) :
+
+		random.seed( 0 )
+		bounds = self.__randomBounds( 1000, imath.Box3f, imath.V3f, IECore.Box3fVectorData )
+		bvh = IECore.Box3fBVH( bounds )
+		numNodes = bvh.numNodes()
+
+		movedBounds = IECore.Box3fVectorData( [ imath.Box3f( b.min() + imath.V3f( 10 ), b.max() + imath.V3f( 10 ) ) for b in bounds ] )
+		bvh.refit( movedBounds )
+		self.assertEqual( bvh.numNodes(), numNodes )
+
+		for query in self.__randomBounds( 25, imath.Box3f, imath.V3f, IECore.Box3fVectorData ) :
+			self.assertEqual( len( bvh.intersectingBounds( query ) ), 0 )
+			query = imath.Box3f( query.min() + imath.V3f( 10 ), query.max() + imath.V3f( 10 ) )
+			self.assertEqual(
+				set( bvh.intersectingBounds( query ) ),
+				self.__bruteForceIntersectingBounds( movedBounds, query )
+			)
+
+		self.assertRaises( Exception, bvh.refit, IECore.Box3fVectorData() )
+
+	@unittest.skipUnless( os.environ.get( "CORTEX_PERFORMANCE_TEST", False ), "'CORTEX_PERFORMANCE_TEST' env var not set" )
+	def testPerformance( self ) :
+
+		# Compare against BoundedKDTree, using the triangle bounds
+		# of a large mesh-like set of bounds.
+
+		random.seed( 0 )
+		bounds = IECore.Box3fVectorData()
+		for i in range( 0, 1000000 ) :
+			p = imath.V3f( random.random() - 0.5, random.random() - 0.5, random.random() - 0.5 ).normalized()
+			b = imath.Box3f( p )
+			b.extendBy( p + imath.V3f( random.random(), random.random(), random.random() ) * 0.003 )
+			bounds.append( b )
+
+		queries = self.__randomBounds( 100000, imath.Box3f, imath.V3f, IECore.Box3fVectorData )
+		queries = [ imath.Box3f( q.min() * 2 - imath.V3f( 1 ), q.min() * 2 - imath.V3f( 0.99 ) ) for q in queries ]
+
+		for treeType in ( IECore.Box3fTree, IECore.Box3fBVH ) :
+
+			t = IECore.Timer( True, IECore.Timer.WallClock )
+			tree = treeType( bounds )
+			buildTime = t.stop()
+
+			t = IECore.Timer( True, IECore.Timer.WallClock )
+			for q in queries :
+				tree.intersectingBounds( q )
+			queryTime = t.stop()
+
+			print "{0} : build {1}s, query {2}s".format( treeType.__name__, buildTime, queryTime )
+
+if __name__ == "__main__":
+	unittest.main()
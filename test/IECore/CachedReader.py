@@ -35,8 +35,11 @@
 import unittest
 import threading
 
+import imath
 import IECore
 import os
+import shutil
+import tempfile
 
 class CachedReaderTest( unittest.TestCase ) :
 
@@ -277,5 +280,255 @@ class CachedReaderTest( unittest.TestCase ) :
 		t2.join()
 		t3.join()
 
+	def testStatistics( self ) :
+
+		r = IECore.CachedReader( IECore.SearchPath( "./test/IECore/data/cobFiles" ), IECore.ObjectPool( 100 * 1024 * 1024 ) )
+
+		r.read( "intDataTen.cob" )
+		r.read( "intDataTen.cob" )
+		r.read( "compoundData.cob" )
+
+		s = r.statistics()
+		self.assertEqual( s.hits, 1 )
+		self.assertEqual( s.misses, 2 )
+		self.assertEqual( s.diskCacheHits, 0 )
+		self.assertEqual( s.diskCacheMisses, 0 )
+		self.assertGreater( s.loadTime, 0 )
+
+		r.resetStatistics()
+		s = r.statistics()
+		self.assertEqual( s.hits, 0 )
+		self.assertEqual( s.misses, 0 )
+		self.assertEqual( s.loadTime, 0 )
+
+	def testDiskCache( self ) :
+
+		r = IECore.CachedReader( IECore.SearchPath( "./test/IECore/data/cobFiles" ), IECore.ObjectPool( 100 * 1024 * 1024 ) )
+		self.assertEqual( r.getDiskCacheDirectory(), "" )
+
+		r.setDiskCache( self.__diskCacheDirectory, 100 * 1024 * 1024 )
+		self.assertEqual( r.getDiskCacheDirectory(), self.__diskCacheDirectory )
+		self.assertEqual( r.getDiskCacheMaxSize(), 100 * 1024 * 1024 )
+
+		o = r.read( "compoundData.cob" )
+		s = r.statistics()
+		self.assertEqual( s.diskCacheHits, 0 )
+		self.assertEqual( s.diskCacheMisses, 1 )
+		self.assertEqual( len( os.listdir( self.__diskCacheDirectory ) ), 1 )
+
+		# Clearing the memory cache should cause the
+		# next read to come from the disk cache.
+
+		r.clear()
+		self.assertEqual( r.read( "compoundData.cob" ), o )
+		s = r.statistics()
+		self.assertEqual( s.diskCacheHits, 1 )
+		self.assertEqual( s.diskCacheMisses, 1 )
+
+		# As should reading from a new CachedReader,
+		# as if from another process.
+
+		r2 = IECore.CachedReader( IECore.SearchPath( "./test/IECore/data/cobFiles" ), IECore.ObjectPool( 100 * 1024 * 1024 ) )
+		r2.setDiskCache( self.__diskCacheDirectory, 100 * 1024 * 1024 )
+		self.assertEqual( r2.read( "compoundData.cob" ), o )
+		self.assertEqual( r2.statistics().diskCacheHits, 1 )
+
+		r.clearDiskCache()
+		self.assertEqual( len( os.listdir( self.__diskCacheDirectory ) ), 0 )
+
+		r.setDiskCache( "", 0 )
+		self.assertEqual( r.getDiskCacheDirectory(), "" )
+
+	def testDiskCachePostProcessing( self ) :
+
+		class PostProcessor( IECore.ModifyOp ) :
+
+			def __init__( self ) :
+
+				IECore.ModifyOp.__init__( self, "", IECore.IntParameter( "result", "" ), IECore.IntParameter( "input", "" ) )
+				self.parameters().addParameter( IECore.IntParameter( "multiplier", "", 2 ) )
+
+			def modify( self, obj, args ) :
+
+				obj.value *= args["multiplier"].value
+
+		p = PostProcessor()
+		r = IECore.CachedReader( IECore.SearchPath( "./test/IECore/data/cobFiles" ), p, IECore.ObjectPool( 100 * 1024 * 1024 ) )
+		r.setDiskCache( self.__diskCacheDirectory, 100 * 1024 * 1024 )
+		self.assertEqual( r.read( "intDataTen.cob" ).value, 20 )
+
+		# Changing the post processor parameters should
+		# prevent us from reusing the previous result.
+
+		p["multiplier"].setNumericValue( 3 )
+		r.clear()
+		self.assertEqual( r.read( "intDataTen.cob" ).value, 30 )
+		self.assertEqual( r.statistics().diskCacheHits, 0 )
+		self.assertEqual( r.statistics().diskCacheMisses, 2 )
+
+		p["multiplier"].setNumericValue( 2 )
+		r.clear()
+		self.assertEqual( r.read( "intDataTen.cob" ).value, 20 )
+		self.assertEqual( r.statistics().diskCacheHits, 1 )
+
+	def testDiskCacheMaxSize( self ) :
+
+		r = IECore.CachedReader( IECore.SearchPath( "./test/IECore/data/cobFiles" ), IECore.ObjectPool( 100 * 1024 * 1024 ) )
+		r.setDiskCache( self.__diskCacheDirectory, 0 )
+
+		r.read( "compoundData.cob" )
+		r.read( "intDataTen.cob" )
+		self.assertEqual( os.listdir( self.__diskCacheDirectory ), [] )
+
+	def testDiskCacheRewrittenFile( self ) :
+
+		directory = tempfile.mkdtemp()
+		self.addCleanup( shutil.rmtree, directory )
+		fileName = os.path.join( directory, "a.cob" )
+
+		IECore.ObjectWriter( IECore.IntData( 1 ), fileName ).write()
+		stat = os.stat( fileName )
+
+		r = IECore.CachedReader( IECore.SearchPath( directory ), IECore.ObjectPool( 100 * 1024 * 1024 ) )
+		r.setDiskCache( self.__diskCacheDirectory, 100 * 1024 * 1024 )
+		self.assertEqual( r.read( "a.cob" ), IECore.IntData( 1 ) )
+
+		# Rewrite the file with the same size and a modification
+		# time within the same second. The disk cache entry must
+		# still be invalidated.
+
+		IECore.ObjectWriter( IECore.IntData( 2 ), fileName ).write()
+		self.assertEqual( os.path.getsize( fileName ), stat.st_size )
+		second = int( stat.st_mtime )
+		fraction = 0.25 if stat.st_mtime - second >= 0.5 else 0.75
+		os.utime( fileName, ( stat.st_atime, second + fraction ) )
+
+		r.clear()
+		self.assertEqual( r.read( "a.cob" ), IECore.IntData( 2 ) )
+		self.assertEqual( r.statistics().diskCacheHits, 0 )
+
+	def __writeVectorFiles( self, numFiles, numPoints ) :
+
+		directory = tempfile.mkdtemp()
+		self.addCleanup( shutil.rmtree, directory )
+
+		for i in range( 0, numFiles ) :
+			d = IECore.V3fVectorData( [ imath.V3f( i, j, 0 ) for j in range( 0, numPoints ) ], IECore.GeometricData.Interpretation.Point )
+			IECore.ObjectWriter( d, os.path.join( directory, "%d.cob" % i ) ).write()
+
+		return directory
+
+	def testThreadSafePostProcessing( self ) :
+
+		self.assertFalse( IECore.VectorDataFilterOp().threadSafe() )
+
+		directory = self.__writeVectorFiles( 20, 10 )
+
+		op = IECore.MatrixMultiplyOp()
+		self.assertTrue( op.threadSafe() )
+		op["matrix"].setValue( IECore.M44fData( imath.M44f().scale( imath.V3f( 2 ) ) ) )
+
+		r = IECore.CachedReader( IECore.SearchPath( directory ), op, IECore.ObjectPool( 100 * 1024 * 1024 ) )
+
+		def read( fileNames ) :
+			for f in fileNames :
+				r.read( f )
+
+		fileNames = [ "%d.cob" % i for i in range( 0, 20 ) ]
+		threads = [ threading.Thread( target = read, args = ( fileNames, ) ) for i in range( 0, 8 ) ]
+		for t in threads :
+			t.start()
+		for t in threads :
+			t.join()
+
+		for i, f in enumerate( fileNames ) :
+			d = r.read( f )
+			self.assertEqual( d, IECore.V3fVectorData( [ imath.V3f( i * 2, j * 2, 0 ) for j in range( 0, 10 ) ], IECore.GeometricData.Interpretation.Point ) )
+
+		# The op itself should not have been modified.
+		self.assertEqual( op["copyInput"].getTypedValue(), True )
+		self.assertEqual( op.resultParameter().getValue(), op.resultParameter().defaultValue )
+
+	def testThreadSafePythonPostProcessing( self ) :
+
+		class PostProcessor( IECore.ModifyOp ) :
+
+			def __init__( self ) :
+
+				IECore.ModifyOp.__init__(
+					self, "",
+					IECore.V3fVectorParameter( "result", "", IECore.V3fVectorData() ),
+					IECore.V3fVectorParameter( "input", "", IECore.V3fVectorData() )
+				)
+
+			def threadSafe( self ) :
+
+				return True
+
+			def modify( self, obj, args ) :
+
+				for i in range( 0, len( obj ) ) :
+					obj[i] *= 2
+
+		directory = self.__writeVectorFiles( 20, 10 )
+
+		op = PostProcessor()
+		r = IECore.CachedReader( IECore.SearchPath( directory ), op, IECore.ObjectPool( 100 * 1024 * 1024 ) )
+
+		def read( fileNames ) :
+			for f in fileNames :
+				r.read( f )
+
+		fileNames = [ "%d.cob" % i for i in range( 0, 20 ) ]
+		threads = [ threading.Thread( target = read, args = ( fileNames, ) ) for i in range( 0, 8 ) ]
+		for t in threads :
+			t.start()
+		for t in threads :
+			t.join()
+
+		for i, f in enumerate( fileNames ) :
+			d = r.read( f )
+			self.assertEqual( d, IECore.V3fVectorData( [ imath.V3f( i * 2, j * 2, 0 ) for j in range( 0, 10 ) ], IECore.GeometricData.Interpretation.Point ) )
+
+		# Because the Op declared itself thread safe, the reader
+		# should have used operateConcurrently(), leaving the Op
+		# itself unmodified.
+		self.assertEqual( op["input"].getValue(), op["input"].defaultValue )
+		self.assertEqual( op["copyInput"].getTypedValue(), True )
+
+	@unittest.skipUnless( os.environ.get( "CORTEX_PERFORMANCE_TEST", False ), "'CORTEX_PERFORMANCE_TEST' env var not set" )
+	def testThreadedPostProcessingPerformance( self ) :
+
+		numFiles = 32
+		directory = self.__writeVectorFiles( numFiles, 200000 )
+		fileNames = [ "%d.cob" % i for i in range( 0, numFiles ) ]
+
+		op = IECore.MatrixMultiplyOp()
+		op["matrix"].setValue( IECore.M44fData( imath.M44f().scale( imath.V3f( 2 ) ) ) )
+
+		for numThreads in ( 1, 2, 4, 8 ) :
+
+			r = IECore.CachedReader( IECore.SearchPath( directory ), op, IECore.ObjectPool( 2 * 1024 * 1024 * 1024 ) )
+
+			def read( threadIndex ) :
+				for f in fileNames[threadIndex::numThreads] :
+					r.read( f )
+
+			threads = [ threading.Thread( target = read, args = ( i, ) ) for i in range( 0, numThreads ) ]
+			t = IECore.Timer( True, IECore.Timer.WallClock )
+			for thread in threads :
+				thread.start()
+			for thread in threads :
+				thread.join()
+
+			print "CachedReader with post processor, {0} threads : {1}s".format( numThreads, t.stop() )
+
+	__diskCacheDirectory = "test/IECore/cachedReaderDiskCache"
+
+	def tearDown( self ) :
+
+		if os.path.isdir( self.__diskCacheDirectory ) :
+			shutil.rmtree( self.__diskCacheDirectory )
+
 if __name__ == "__main__":
     unittest.main()
@@ -161,6 +161,54 @@ struct ComputationCacheTest
 		BOOST_CHECK_EQUAL( c2, c3 );
 	}
 
+	void testStatistics()
+	{
+		IntDataPtr v = new IntData( 1 );
+		ObjectPoolPtr pool = new ObjectPool( v->Object::memoryUsage() * 10 );
+		Cache cache( get, hash, 2, pool );
+
+		Cache::Statistics statistics = cache.statistics();
+		BOOST_CHECK_EQUAL( size_t(0), statistics.hits );
+		BOOST_CHECK_EQUAL( size_t(0), statistics.misses );
+		BOOST_CHECK_EQUAL( size_t(0), statistics.evictions );
+		BOOST_CHECK_EQUAL( size_t(0), cache.memoryUsage() );
+
+		/// queries that don't compute are neither hits nor misses
+		BOOST_CHECK( !cache.get( ComputationParams(1), Cache::NullIfMissing ) );
+		BOOST_CHECK_EQUAL( size_t(0), cache.statistics().misses );
+
+		cache.get( ComputationParams(1) );
+		cache.get( ComputationParams(1) );
+		cache.get( ComputationParams(2) );
+		statistics = cache.statistics();
+		BOOST_CHECK_EQUAL( size_t(1), statistics.hits );
+		BOOST_CHECK_EQUAL( size_t(2), statistics.misses );
+		BOOST_CHECK_EQUAL( size_t(0), statistics.evictions );
+		BOOST_CHECK( statistics.computeTime >= 0.0 );
+		BOOST_CHECK_EQUAL( v->Object::memoryUsage() * 2, cache.memoryUsage() );
+
+		/// replacing a result isn't an eviction
+		cache.set( ComputationParams(2), v.get(), ObjectPool::StoreReference );
+		BOOST_CHECK_EQUAL( size_t(0), cache.statistics().evictions );
+		BOOST_CHECK_EQUAL( v->Object::memoryUsage() * 2, cache.memoryUsage() );
+
+		/// exceeding the limit is
+		cache.get( ComputationParams(3) );
+		BOOST_CHECK_EQUAL( size_t(1), cache.statistics().evictions );
+		BOOST_CHECK_EQUAL( v->Object::memoryUsage() * 2, cache.memoryUsage() );
+
+		cache.clear();
+		BOOST_CHECK_EQUAL( size_t(3), cache.statistics().evictions );
+		BOOST_CHECK_EQUAL( size_t(0), cache.memoryUsage() );
+
+		cache.resetStatistics();
+		statistics = cache.statistics();
+		BOOST_CHECK_EQUAL( size_t(0), statistics.hits );
+		BOOST_CHECK_EQUAL( size_t(0), statistics.misses );
+		BOOST_CHECK_EQUAL( size_t(0), statistics.evictions );
+		BOOST_CHECK_EQUAL( 0.0, statistics.computeTime );
+	}
+
 	struct GetFromCache
 	{
 		public :
@@ -213,6 +261,7 @@ struct ComputationCacheTestSuite : public boost::unit_test::test_suite
 
 		add( BOOST_CLASS_TEST_CASE( &ComputationCacheTest::test, instance ) );
 		add( BOOST_CLASS_TEST_CASE( &ComputationCacheTest::testThreadedGet, instance ) );
+		add( BOOST_CLASS_TEST_CASE( &ComputationCacheTest::testStatistics, instance ) );
 	}
 };
 
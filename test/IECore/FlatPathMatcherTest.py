@@ -0,0 +1,235 @@
+##########################################################################
+#
+#  Copyright (c) 2019, Image Engine Design Inc. All rights reserved.
+#
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are
+#  met:
+#
+#      * Redistributions of source code must retain the above
+#        copyright notice, this list of conditions and the following
+#        disclaimer.
+#
+#      * Redistributions in binary form must reproduce the above
+#        copyright notice, this list of conditions and the following
+#        disclaimer in the documentation and/or other materials provided with
+#        the distribution.
+#
+#      * Neither the name of John Haddon nor the names of
+#        any other contributors to this software may be used to endorse or
+#        promote products derived from this software without specific prior
+#        written permission.
+#
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS
+#  IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+#  THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+#  PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR
+#  CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+#  EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+#  PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+#  PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+#  LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+#  NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+#  SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+
+import os
+import random
+import unittest
+
+import IECore
+
+import PathMatcherTest
+
+class FlatPathMatcherTest( unittest.TestCase ) :
+
+	def testDefaultConstructor( self ) :
+
+		m = IECore.FlatPathMatcher()
+		self.assertTrue( m.isEmpty() )
+		self.assertEqual( m.size(), 0 )
+		self.assertEqual( m.paths(), [] )
+		self.assertEqual( m.match( "/a" ), IECore.PathMatcher.Result.NoMatch )
+		self.assertEqual( m.pathMatcher(), IECore.PathMatcher() )
+
+	def testConstructors( self ) :
+
+		paths = [ "/a/b", "/a", "/c/d/e", "/a/b", "" ]
+		p = IECore.PathMatcher( paths )
+
+		for m in [
+			IECore.FlatPathMatcher( paths ),
+			IECore.FlatPathMatcher( IECore.StringVectorData( paths ) ),
+			IECore.FlatPathMatcher( [ IECore.InternedStringVectorData( [ "a", "b" ] ), "/a", "/c/d/e" ] ),
+			IECore.FlatPathMatcher( p ),
+		] :
+			self.assertEqual( m.size(), 3 )
+			self.assertFalse( m.isEmpty() )
+			self.assertEqual( m.paths(), [ "/a", "/a/b", "/c/d/e" ] )
+			self.assertEqual( m.pathMatcher(), p )
+			self.assertEqual( m, IECore.FlatPathMatcher( p ) )
+			self.assertEqual( IECore.FlatPathMatcher( m ), m )
+
+	def testRoot( self ) :
+
+		m = IECore.FlatPathMatcher( [ "/" ] )
+		self.assertEqual( m.size(), 1 )
+		self.assertEqual( m.paths(), [ "/" ] )
+		self.assertEqual( m.match( "/" ), IECore.PathMatcher.Result.ExactMatch )
+		self.assertEqual( m.match( "/a" ), IECore.PathMatcher.Result.AncestorMatch )
+		self.assertEqual( m.pathMatcher(), IECore.PathMatcher( [ "/" ] ) )
+
+		# Converting to a PathMatcher must give us something
+		# we can edit safely.
+		p = m.pathMatcher()
+		p.addPath( "/a" )
+		self.assertEqual( m.pathMatcher(), IECore.PathMatcher( [ "/" ] ) )
+
+	def testMatch( self ) :
+
+		paths = [ "/a", "/red", "/b/c/d", "/e/*", "/f/.../g", "/h/...", "/i/[xy]z" ]
+		m = IECore.FlatPathMatcher( paths )
+		p = IECore.PathMatcher( paths )
+
+		for path in [
+			"/", "/a", "/red", "/re", "/redThing", "/b/c/d", "/c", "/a/b", "/b/c",
+			"/e", "/e/x", "/e/x/y", "/f", "/f/g", "/f/x/y/g", "/f/x/y", "/h", "/h/x/y",
+			"/i", "/i/xz", "/i/yz", "/i/zz", "/i/xz/w",
+		] :
+			self.assertEqual( m.match( path ), p.match( path ), path )
+			self.assertEqual( m.match( IECore.InternedStringVectorData( path[1:].split( "/" ) if path != "/" else [] ) ), p.match( path ), path )
+
+	def testMatchRandomPaths( self ) :
+
+		paths = PathMatcherTest.PathMatcherTest.generatePaths( seed = 10, depthRange = ( 3, 8 ), numChildrenRange = ( 2, 6 ) )
+		m = IECore.FlatPathMatcher( paths )
+		p = IECore.PathMatcher( paths )
+		self.assertEqual( m.size(), p.size() )
+		self.assertEqual( m.pathMatcher(), p )
+
+		for path in paths :
+			self.assertEqual( m.match( path ), p.match( path ) )
+			self.assertEqual( m.match( path[:-1] ), p.match( path[:-1] ) )
+
+	def testSetOperations( self ) :
+
+		r = random.Random( 0 )
+		names = [ "a", "b", "c", "d*", "..." ]
+
+		def randomPaths() :
+			return [
+				"/" + "/".join( r.choice( names ) for i in range( 0, r.randint( 0, 4 ) ) )
+				for j in range( 0, r.randint( 0, 30 ) )
+			]
+
+		for i in range( 0, 100 ) :
+
+			p1 = IECore.PathMatcher( randomPaths() )
+			p2 = IECore.PathMatcher( randomPaths() )
+			m1 = IECore.FlatPathMatcher( p1 )
+			m2 = IECore.FlatPathMatcher( p2 )
+
+			union = IECore.PathMatcher( p1 )
+			union.addPaths( p2 )
+			self.assertEqual( m1.unionWith( m2 ).pathMatcher(), union )
+			self.assertEqual( m1.unionWith( m2 ), IECore.FlatPathMatcher( union ) )
+
+			self.assertEqual( m1.intersection( m2 ).pathMatcher(), p1.intersection( p2 ) )
+
+			difference = IECore.PathMatcher( p1 )
+			difference.removePaths( p2 )
+			self.assertEqual( m1.difference( m2 ).pathMatcher(), difference )
+			self.assertEqual( m1.difference( m2 ).size(), difference.size() )
+
+			self.assertEqual( m1.unionWith( m1 ), m1 )
+			self.assertEqual( m1.intersection( m1 ), m1 )
+			self.assertTrue( m1.difference( m1 ).isEmpty() )
+
+	def testSetOperationsPruneEmptyLocations( self ) :
+
+		m1 = IECore.FlatPathMatcher( [ "/a/b/c", "/d" ] )
+		m2 = IECore.FlatPathMatcher( [ "/a/b/c" ] )
+
+		d = m1.difference( m2 )
+		self.assertEqual( d.paths(), [ "/d" ] )
+		self.assertEqual( d.match( "/a" ), IECore.PathMatcher.Result.NoMatch )
+
+		i = m1.intersection( IECore.FlatPathMatcher( [ "/a/b" ] ) )
+		self.assertTrue( i.isEmpty() )
+		self.assertEqual( i.match( "/a" ), IECore.PathMatcher.Result.NoMatch )
+
+	def testEquality( self ) :
+
+		m1 = IECore.FlatPathMatcher( [ "/a", "/b/c" ] )
+		m2 = IECore.FlatPathMatcher( [ "/b/c", "/a" ] )
+		m3 = IECore.FlatPathMatcher( [ "/a", "/b" ] )
+
+		self.assertEqual( m1, m2 )
+		self.assertNotEqual( m1, m3 )
+		self.assertNotEqual( m1, IECore.FlatPathMatcher() )
+
+	def testRepr( self ) :
+
+		m = IECore.FlatPathMatcher( [ "/a/b", "/a/*" ] )
+		self.assertEqual( eval( repr( m ) ), m )
+
+	def testSaveAndLoadUsesConsistentOrder( self ) :
+
+		# PathMatcherData is serialised via FlatPathMatcher, so
+		# files should be identical regardless of the order in
+		# which the paths were added.
+
+		paths = [ "/z/y", "/a/b", "/m", "/a/*", "/a/b/c" ]
+
+		buffers = []
+		for p in ( paths, list( reversed( paths ) ) ) :
+			saveIO = IECore.MemoryIndexedIO( IECore.CharVectorData(), IECore.IndexedIO.OpenMode.Write )
+			IECore.PathMatcherData( IECore.PathMatcher( p ) ).save( saveIO, "d" )
+			buffers.append( saveIO.buffer() )
+
+			loadIO = IECore.MemoryIndexedIO( saveIO.buffer(), IECore.IndexedIO.OpenMode.Read )
+			self.assertEqual( IECore.Object.load( loadIO, "d" ).value, IECore.PathMatcher( paths ) )
+
+		self.assertEqual( buffers[0], buffers[1] )
+
+	@unittest.skipUnless( os.environ.get( "CORTEX_PERFORMANCE_TEST", False ), "'CORTEX_PERFORMANCE_TEST' env var not set" )
+	def testPerformance( self ) :
+
+		paths = PathMatcherTest.PathMatcherTest.generatePaths( seed = 10, depthRange = ( 2, 2 ), numChildrenRange = ( 500, 1000 ) )
+		paths = IECore.StringVectorData( [ "/" + "/".join( str( n ) for n in p ) for p in paths ] )
+
+		t = IECore.Timer()
+		p = IECore.PathMatcher( paths )
+		print "\nBUILD PathMatcher", t.stop()
+
+		t = IECore.Timer()
+		m = IECore.FlatPathMatcher( paths )
+		print "BUILD FlatPathMatcher", t.stop()
+
+		t = IECore.Timer()
+		IECore.FlatPathMatcher( p ).pathMatcher()
+		print "CONVERT", t.stop()
+
+		t = IECore.Timer()
+		for path in paths :
+			p.match( path )
+		print "MATCH PathMatcher", t.stop()
+
+		t = IECore.Timer()
+		for path in paths :
+			m.match( path )
+		print "MATCH FlatPathMatcher", t.stop()
+
+		d = IECore.PathMatcherData( p )
+		saveIO = IECore.MemoryIndexedIO( IECore.CharVectorData(), IECore.IndexedIO.OpenMode.Write )
+		d.save( saveIO, "d" )
+		loadIO = IECore.MemoryIndexedIO( saveIO.buffer(), IECore.IndexedIO.OpenMode.Read )
+
+		t = IECore.Timer()
+		d2 = IECore.Object.load( loadIO, "d" )
+		print "LOAD PathMatcherData", t.stop()
+
+		self.assertEqual( d, d2 )
+
+if __name__ == "__main__":
+	unittest.main()
@@ -670,6 +670,83 @@ class TestFileIndexedIO(unittest.TestCase):
 		self.assertEqual( f.metadata(),
 			IECore.CompoundData( { "compressor" : "lz4", "compressionLevel" : 0, 'version': IECore.IntData( 7 ), "compressionThreadCount" : 1, "decompressionThreadCount" : 1 } ) )
 
+	def testMemoryMappedRead( self ):
+
+		filePath = "./test/FileIndexedIO.fio"
+
+		for compressionLevel in ( 0, 9 ) :
+
+			options = IECore.CompoundData( { "compressor" : "lz4", "compressionLevel" : compressionLevel } )
+			f = IECore.IndexedIO.create( filePath, [], IECore.IndexedIO.OpenMode.Write, options = options )
+			g = f.subdirectory( "sub1", IECore.IndexedIO.MissingBehaviour.CreateIfMissing )
+			g.write( "ints", IECore.IntVectorData( range( 100000 ) ) )
+			g.write( "floats", IECore.FloatVectorData( [ x * 0.5 for x in range( 10 ) ] ) )
+			g.write( "string", "hello" )
+			g.write( "int", 10 )
+			IECore.StringVectorData( [ "a", "b", "c" ] ).save( g, "strings" )
+			g.commit()
+			del g, f
+
+			f = IECore.IndexedIO.create( filePath, [], IECore.IndexedIO.OpenMode.Read, options = IECore.CompoundData( { "memoryMapped" : True } ) )
+			g = f.subdirectory( "sub1" )
+			self.assertEqual( g.read( "ints" ), IECore.IntVectorData( range( 100000 ) ) )
+			self.assertEqual( g.read( "floats" ), IECore.FloatVectorData( [ x * 0.5 for x in range( 10 ) ] ) )
+			self.assertEqual( g.read( "string" ), IECore.StringData( "hello" ) )
+			self.assertEqual( g.read( "int" ), IECore.IntData( 10 ) )
+			self.assertEqual( IECore.Object.load( g, "strings" ), IECore.StringVectorData( [ "a", "b", "c" ] ) )
+			del g, f
+
+	def testAsyncCompression( self ):
+
+		filePath = "./test/FileIndexedIO.fio"
+
+		options = IECore.CompoundData( { "compressor" : "lz4", "compressionLevel" : 9, "asyncCompression" : True } )
+		f = IECore.IndexedIO.create( filePath, [], IECore.IndexedIO.OpenMode.Write, options = options )
+		for i in range( 0, 20 ) :
+			g = f.subdirectory( "sub%d" % i, IECore.IndexedIO.MissingBehaviour.CreateIfMissing )
+			g.write( "ints", IECore.IntVectorData( range( i, 100000 + i ) ) )
+			g.write( "sharedInts", IECore.IntVectorData( range( 100000 ) ) )
+			g.write( "small", IECore.IntVectorData( range( i ) ) )
+			if i % 2 :
+				g.commit()
+
+		# Data must be readable even before its compression has completed.
+		self.assertEqual( g.read( "ints" ), IECore.IntVectorData( range( 19, 100019 ) ) )
+		del g, f
+
+		f = IECore.IndexedIO.create( filePath, [], IECore.IndexedIO.OpenMode.Read )
+		for i in range( 0, 20 ) :
+			g = f.subdirectory( "sub%d" % i )
+			self.assertEqual( g.read( "ints" ), IECore.IntVectorData( range( i, 100000 + i ) ) )
+			self.assertEqual( g.read( "sharedInts" ), IECore.IntVectorData( range( 100000 ) ) )
+			self.assertEqual( g.read( "small" ), IECore.IntVectorData( range( i ) ) )
+
+	def testPrefetch( self ):
+
+		filePath = "./test/FileIndexedIO.fio"
+
+		# small blocks so that the data is split into several compressed blocks
+		options = IECore.CompoundData( { "compressor" : "lz4", "compressionLevel" : 9, "maxCompressedBlockSize" : IECore.UIntData( 4096 ) } )
+		f = IECore.IndexedIO.create( filePath, [], IECore.IndexedIO.OpenMode.Write, options = options )
+		g = f.subdirectory( "sub1", IECore.IndexedIO.MissingBehaviour.CreateIfMissing )
+		g.write( "ints", IECore.IntVectorData( range( 100000 ) ) )
+		h = g.subdirectory( "sub2", IECore.IndexedIO.MissingBehaviour.CreateIfMissing )
+		h.write( "floats", IECore.FloatVectorData( [ x * 0.5 for x in range( 10000 ) ] ) )
+		h.write( "int", 10 )
+		del h, g, f
+
+		for memoryMapped in ( False, True ) :
+
+			f = IECore.IndexedIO.create( filePath, [], IECore.IndexedIO.OpenMode.Read, options = IECore.CompoundData( { "memoryMapped" : memoryMapped } ) )
+			f.prefetch( [ "sub1", "missing" ] )
+			g = f.subdirectory( "sub1" )
+			g.prefetch( [ "ints", "sub2" ] )
+			self.assertEqual( g.read( "ints" ), IECore.IntVectorData( range( 100000 ) ) )
+			h = g.subdirectory( "sub2" )
+			self.assertEqual( h.read( "floats" ), IECore.FloatVectorData( [ x * 0.5 for x in range( 10000 ) ] ) )
+			self.assertEqual( h.read( "int" ), IECore.IntData( 10 ) )
+			del h, g, f
+
 	def setUp( self ):
 
 		if os.path.isfile("./test/FileIndexedIO.fio") :
@@ -42,7 +42,11 @@
 
 #include "tbb/tbb.h"
 
+#include <chrono>
+#include <cstdlib>
+#include <functional>
 #include <iostream>
+#include <unordered_set>
 
 using namespace boost;
 using namespace boost::unit_test;
@@ -81,6 +85,105 @@ struct InternedStringTest
 		parallel_for( blocked_range<size_t>( 0, numIterations ), Constructor(), taskGroupContext );
 	}
 
+	// Interns a set of strings which are new to the table, checking that
+	// every thread gets the same unique string for each value.
+	void testConcurrentUniqueness()
+	{
+		const size_t numStrings = 100000;
+		const size_t originalSize = InternedString::numUniqueStrings();
+
+		std::vector<std::string> strings;
+		for( size_t i = 0; i < numStrings; ++i )
+		{
+			strings.push_back( "testConcurrentUniqueness" + lexical_cast<std::string>( i ) );
+		}
+
+		const size_t numPasses = 8;
+		std::vector<const char *> results( numStrings * numPasses );
+
+		tbb::task_group_context taskGroupContext( tbb::task_group_context::isolated );
+		parallel_for(
+			blocked_range<size_t>( 0, results.size() ),
+			[&strings, &results]( const blocked_range<size_t> &r ) {
+				for( size_t i = r.begin(); i != r.end(); ++i )
+				{
+					// Visit the strings in a different order for each pass.
+					const size_t pass = i / strings.size();
+					const size_t index = ( i * ( 2 * pass + 1 ) ) % strings.size();
+					results[i] = InternedString( strings[index] ).c_str();
+				}
+			},
+			taskGroupContext
+		);
+
+		BOOST_CHECK_EQUAL( InternedString::numUniqueStrings(), originalSize + numStrings );
+		for( size_t i = 0; i < results.size(); ++i )
+		{
+			const size_t pass = i / strings.size();
+			const size_t index = ( i * ( 2 * pass + 1 ) ) % strings.size();
+			BOOST_CHECK_EQUAL( results[i], InternedString( strings[index] ).c_str() );
+			BOOST_CHECK_EQUAL( std::string( results[i] ), strings[index] );
+		}
+	}
+
+	// Compares the throughput of InternedString with that of a single hash
+	// set guarded by a reader-writer lock, which is how it used to be
+	// implemented. Only run when CORTEX_PERFORMANCE_TEST is set.
+	void testConcurrentConstructionPerformance()
+	{
+		if( !getenv( "CORTEX_PERFORMANCE_TEST" ) )
+		{
+			return;
+		}
+
+		const size_t numIterations = 20000000;
+		std::vector<std::string> strings;
+		for( size_t i = 0; i < 10000; ++i )
+		{
+			strings.push_back( "testConcurrentConstructionPerformance" + lexical_cast<std::string>( i ) );
+		}
+
+		typedef std::unordered_set<std::string> ReferenceSet;
+		ReferenceSet referenceSet;
+		spin_rw_mutex referenceMutex;
+
+		auto reference = [&strings, &referenceSet, &referenceMutex]( const blocked_range<size_t> &r ) {
+			for( size_t i = r.begin(); i != r.end(); ++i )
+			{
+				const std::string &s = strings[i % strings.size()];
+				spin_rw_mutex::scoped_lock lock( referenceMutex, false );
+				ReferenceSet::const_iterator it = referenceSet.find( s );
+				if( it == referenceSet.end() )
+				{
+					lock.upgrade_to_writer();
+					referenceSet.insert( s );
+				}
+			}
+		};
+
+		auto interned = [&strings]( const blocked_range<size_t> &r ) {
+			for( size_t i = r.begin(); i != r.end(); ++i )
+			{
+				InternedString s( strings[i % strings.size()] );
+			}
+		};
+
+		auto time = [numIterations]( const std::function<void ( const blocked_range<size_t> & )> &f ) {
+			tbb::task_group_context taskGroupContext( tbb::task_group_context::isolated );
+			const auto start = std::chrono::steady_clock::now();
+			parallel_for( blocked_range<size_t>( 0, numIterations ), f, taskGroupContext );
+			const std::chrono::duration<double> duration = std::chrono::steady_clock::now() - start;
+			return numIterations / duration.count();
+		};
+
+		const double referenceThroughput = time( reference );
+		const double internedThroughput = time( interned );
+
+		std::cout << std::endl;
+		std::cout << "Locked hash set : " << referenceThroughput / 1e6 << " million strings/s" << std::endl;
+		std::cout << "InternedString : " << internedThroughput / 1e6 << " million strings/s" << std::endl;
+	}
+
 	void testRangeConstruction()
 	{
 
@@ -108,6 +211,8 @@ struct InternedStringTestSuite : public boost::unit_test::test_suite
 
 		add( BOOST_CLASS_TEST_CASE( &InternedStringTest::testConcurrentConstruction, instance ) );
 		add( BOOST_CLASS_TEST_CASE( &InternedStringTest::testRangeConstruction, instance ) );
+		add( BOOST_CLASS_TEST_CASE( &InternedStringTest::testConcurrentUniqueness, instance ) );
+		add( BOOST_CLASS_TEST_CASE( &InternedStringTest::testConcurrentConstructionPerformance, instance ) );
 
 	}
 };
@@ -78,6 +78,22 @@ class ObjectPoolTest( unittest.TestCase ) :
 		self.assertFalse( b.isSame( p.store( b, IECore.ObjectPool.StoreCopy ) ) )
 		self.assertEqual( b, p.retrieve(b.hash(),_copy=False) )
 
+	def testStoreWithHash( self ) :
+
+		p = IECore.ObjectPool( 500 )
+		b = IECore.IntData( 10 )
+
+		h = IECore.MurmurHash()
+		h.append( "key" )
+
+		self.assertTrue( b.isSame( p.store( b, h, IECore.ObjectPool.StoreReference ) ) )
+		self.assertTrue( p.contains( h ) )
+		self.assertFalse( p.contains( b.hash() ) )
+		self.assertTrue( b.isSame( p.retrieve( h, _copy = False ) ) )
+
+		# The first object stored under a hash wins.
+		self.assertTrue( b.isSame( p.store( IECore.IntData( 20 ), h, IECore.ObjectPool.StoreReference ) ) )
+
 	def testRemoval( self ) :
 
 		p = IECore.ObjectPool(500)
@@ -112,5 +128,97 @@ class ObjectPoolTest( unittest.TestCase ) :
 			p.contains( b.hash() )
 		)
 
+	def testSharedMemoryAccounting( self ) :
+
+		p = IECore.ObjectPool( 10 * 1024 * 1024 )
+
+		d = IECore.IntVectorData( range( 0, 10000 ) )
+		a = p.store( IECore.CompoundObject( { "a" : d } ), IECore.ObjectPool.StoreReference )
+		b = p.store( IECore.CompoundObject( { "b" : d } ), IECore.ObjectPool.StoreReference )
+
+		s = p.statistics()
+		self.assertEqual( s.objects, 2 )
+		self.assertGreaterEqual( s.sharedMemoryUsage, 10000 * 4 )
+		self.assertEqual( s.memoryUsage, p.memoryUsage() )
+		self.assertEqual( p.memoryUsage(), a.memoryUsage() + b.memoryUsage() - s.sharedMemoryUsage )
+
+		p.erase( a.hash() )
+		self.assertEqual( p.statistics().sharedMemoryUsage, 0 )
+		self.assertEqual( p.memoryUsage(), b.memoryUsage() )
+
+		p.clear()
+		self.assertEqual( p.memoryUsage(), 0 )
+		self.assertEqual( p.statistics().objects, 0 )
+
+	def testStatistics( self ) :
+
+		p = IECore.ObjectPool( 500 )
+		a = p.store( IECore.IntData( 1 ), IECore.ObjectPool.StoreReference )
+
+		p.retrieve( a.hash() )
+		p.retrieve( a.hash() )
+		p.retrieve( IECore.IntData( 2 ).hash() )
+
+		s = p.statistics()
+		self.assertEqual( s.hits, 2 )
+		self.assertEqual( s.misses, 1 )
+		self.assertEqual( s.evictions, 0 )
+		self.assertEqual( s.objects, 1 )
+
+		p.setMaxMemoryUsage( 0 )
+		s = p.statistics()
+		self.assertEqual( s.evictions, 1 )
+		self.assertEqual( s.objects, 0 )
+
+		p.resetStatistics()
+		s = p.statistics()
+		self.assertEqual( s.hits, 0 )
+		self.assertEqual( s.misses, 0 )
+		self.assertEqual( s.evictions, 0 )
+
+	def testEvictionPolicy( self ) :
+
+		p = IECore.ObjectPool( 500 )
+		self.assertEqual( p.getEvictionPolicy(), IECore.ObjectPool.EvictionPolicy.LRU )
+		p.setEvictionPolicy( IECore.ObjectPool.EvictionPolicy.GreedyDualSize )
+		self.assertEqual( p.getEvictionPolicy(), IECore.ObjectPool.EvictionPolicy.GreedyDualSize )
+
+		p = IECore.ObjectPool( 500, IECore.ObjectPool.EvictionPolicy.PinSmallObjects )
+		self.assertEqual( p.getEvictionPolicy(), IECore.ObjectPool.EvictionPolicy.PinSmallObjects )
+
+		# values are also exported into the ObjectPool scope
+		self.assertEqual( IECore.ObjectPool.GreedyDualSize, IECore.ObjectPool.EvictionPolicy.GreedyDualSize )
+
+	def testGreedyDualSize( self ) :
+
+		p = IECore.ObjectPool( 10 * 1024 * 1024, IECore.ObjectPool.EvictionPolicy.GreedyDualSize )
+
+		large = p.store( IECore.IntVectorData( 100000 ), IECore.ObjectPool.StoreReference )
+		small = [ p.store( IECore.IntData( i ), IECore.ObjectPool.StoreReference ) for i in range( 0, 10 ) ]
+
+		# The large object should be evicted in preference
+		# to any of the small ones.
+		p.setMaxMemoryUsage( p.memoryUsage() - 1 )
+		self.assertFalse( p.contains( large.hash() ) )
+		for s in small :
+			self.assertTrue( p.contains( s.hash() ) )
+
+	def testPinSmallObjects( self ) :
+
+		p = IECore.ObjectPool( 10 * 1024 * 1024, IECore.ObjectPool.EvictionPolicy.PinSmallObjects )
+		p.setPinnedObjectSize( 1024 )
+		self.assertEqual( p.getPinnedObjectSize(), 1024 )
+
+		small = [ p.store( IECore.IntData( i ), IECore.ObjectPool.StoreReference ) for i in range( 0, 10 ) ]
+		large = p.store( IECore.IntVectorData( 100000 ), IECore.ObjectPool.StoreReference )
+
+		p.setMaxMemoryUsage( 0 )
+		self.assertFalse( p.contains( large.hash() ) )
+		for s in small :
+			self.assertTrue( p.contains( s.hash() ) )
+
+		self.assertEqual( p.statistics().evictions, 1 )
+		self.assertEqual( p.memoryUsage(), sum( [ s.memoryUsage() for s in small ] ) )
+
 if __name__ == "__main__":
     unittest.main()
@@ -34,6 +34,7 @@
 
 """Unit test for VectorData binding"""
 
+import io
 import math
 import os
 import unittest
@@ -1266,6 +1267,152 @@ class TestVectorDataToString( unittest.TestCase ) :
 		for i in range( 0, 255 ) :
 			self.assertEqual( s[i], chr( i ) )
 
+class TestVectorDataBuffer( unittest.TestCase ) :
+
+	def testMemoryView( self ) :
+
+		d = IECore.FloatVectorData( [ 1, 2, 3 ] )
+		m = memoryview( d )
+		self.assertEqual( m.format, "f" )
+		self.assertEqual( m.itemsize, 4 )
+		self.assertEqual( m.shape, ( 3, ) )
+		self.assertEqual( m.tobytes(), d.toString() )
+
+		d = IECore.V3fVectorData( [ imath.V3f( 1, 2, 3 ), imath.V3f( 4, 5, 6 ) ] )
+		m = memoryview( d )
+		self.assertEqual( m.format, "f" )
+		self.assertEqual( m.shape, ( 2, 3 ) )
+		self.assertEqual( m.strides, ( 12, 4 ) )
+
+		d = IECore.M44fVectorData( [ imath.M44f() ] )
+		self.assertEqual( memoryview( d ).shape, ( 1, 16 ) )
+
+	def testUnsupportedTypes( self ) :
+
+		for d in (
+			IECore.StringVectorData( [ "a" ] ),
+			IECore.InternedStringVectorData( [ "a" ] ),
+			IECore.BoolVectorData( [ True ] ),
+		) :
+			self.assertRaises( TypeError, memoryview, d )
+			self.assertFalse( hasattr( d, "__array_interface__" ) )
+
+	def testConstructFromBuffer( self ) :
+
+		d = IECore.IntVectorData( range( 0, 1000 ) )
+		d2 = IECore.IntVectorData( memoryview( d ) )
+		self.assertEqual( d, d2 )
+
+		d = IECore.V3fVectorData( [ imath.V3f( i ) for i in range( 0, 10 ) ] )
+		d2 = IECore.V3fVectorData( memoryview( d ) )
+		self.assertEqual( d, d2 )
+
+		# a flat buffer of floats is also accepted
+		f = IECore.FloatVectorData( [ 0, 1, 2, 3, 4, 5 ] )
+		d = IECore.V3fVectorData( memoryview( f ) )
+		self.assertEqual( d, IECore.V3fVectorData( [ imath.V3f( 0, 1, 2 ), imath.V3f( 3, 4, 5 ) ] ) )
+
+	def testConstructFromIncompatibleBuffer( self ) :
+
+		# partial elements can't be converted
+		f = IECore.FloatVectorData( [ 0, 1, 2, 3 ] )
+		self.assertRaises( Exception, IECore.V3fVectorData, memoryview( f ) )
+
+	def testArrayInterface( self ) :
+
+		d = IECore.V3fVectorData( [ imath.V3f( 1, 2, 3 ), imath.V3f( 4, 5, 6 ) ] )
+		a = d.__array_interface__
+		self.assertEqual( a["version"], 3 )
+		self.assertEqual( a["shape"], ( 2, 3 ) )
+		self.assertEqual( a["typestr"], "<f4" )
+		self.assertEqual( a["data"][1], True )
+
+		d = IECore.UShortVectorData( [ 1 ] )
+		self.assertEqual( d.__array_interface__["shape"], ( 1, ) )
+		self.assertEqual( d.__array_interface__["typestr"], "<u2" )
+
+	def testArrayInterfaceDoesntUnshareData( self ) :
+
+		d = IECore.FloatVectorData( [ 1, 2, 3 ] )
+		d2 = d.copy()
+		self.assertEqual( d.__array_interface__["data"][0], d2.__array_interface__["data"][0] )
+
+	def testWritableBufferInvalidatesHash( self ) :
+
+		d = IECore.FloatVectorData( [ 1, 2, 3 ] )
+		h = d.hash()
+		d2 = d.copy()
+
+		f = IECore.FloatVectorData( [ 4, 5, 6 ] )
+		io.BytesIO( f.toString() ).readinto( d )
+
+		self.assertEqual( d, f )
+		self.assertEqual( d.hash(), f.hash() )
+		self.assertNotEqual( d.hash(), h )
+		self.assertEqual( d2.hash(), h )
+
+	def testCopyWhileWritableBufferExported( self ) :
+
+		try :
+			import numpy
+		except ImportError :
+			raise unittest.SkipTest( "numpy not available" )
+
+		d = IECore.FloatVectorData( [ 1, 2, 3 ] )
+		h = d.hash()
+
+		# The buffer is writable, and remains exported
+		# for the lifetime of the array.
+		self.assertFalse( memoryview( d ).readonly )
+		a = numpy.asarray( d )
+		self.assertTrue( a.flags.writeable )
+
+		a[0] = 10
+		self.assertEqual( d, IECore.FloatVectorData( [ 10, 2, 3 ] ) )
+		self.assertNotEqual( d.hash(), h )
+
+		# Copies must not share data with the array.
+		d2 = d.copy()
+		c = IECore.CompoundData( { "d" : d } ).copy()
+
+		a[1] = 20
+		self.assertEqual( d, IECore.FloatVectorData( [ 10, 20, 3 ] ) )
+		self.assertEqual( d2, IECore.FloatVectorData( [ 10, 2, 3 ] ) )
+		self.assertEqual( c["d"], IECore.FloatVectorData( [ 10, 2, 3 ] ) )
+
+		# Hashes must reflect writes while the array is alive.
+		self.assertEqual( d.hash(), IECore.FloatVectorData( [ 10, 20, 3 ] ).hash() )
+		self.assertEqual( d2.hash(), IECore.FloatVectorData( [ 10, 2, 3 ] ).hash() )
+
+		del a
+		self.assertEqual( d.hash(), IECore.FloatVectorData( [ 10, 20, 3 ] ).hash() )
+
+		# Once the array is gone, copies share data again.
+		d3 = d.copy()
+		self.assertEqual( d3.__array_interface__["data"][0], d.__array_interface__["data"][0] )
+
+	def testResizeWhileExported( self ) :
+
+		d = IECore.IntVectorData( [ 1, 2, 3 ] )
+		m = memoryview( d )
+
+		self.assertRaises( BufferError, d.append, 4 )
+		self.assertRaises( BufferError, d.extend, [ 4 ] )
+		self.assertRaises( BufferError, d.insert, 0, 4 )
+		self.assertRaises( BufferError, d.resize, 10 )
+		self.assertRaises( BufferError, d.__delitem__, 0 )
+		self.assertRaises( BufferError, d.__setitem__, slice( 0, 1 ), [ 4, 5 ] )
+		self.assertEqual( d, IECore.IntVectorData( [ 1, 2, 3 ] ) )
+
+		# changes which don't reallocate are still allowed
+		d[0] = 4
+		d[1:3] = [ 5, 6 ]
+		self.assertEqual( d, IECore.IntVectorData( [ 4, 5, 6 ] ) )
+
+		del m
+		d.append( 7 )
+		self.assertEqual( d, IECore.IntVectorData( [ 4, 5, 6, 7 ] ) )
+
 class TestVectorDataHashOptimisation( unittest.TestCase ) :
 
 	@unittest.skipIf( os.environ.get("TRAVIS", False), "'TRAVIS' env var defined - skipping unreliable test" )
@@ -1320,6 +1467,56 @@ class TestVectorDataHashOptimisation( unittest.TestCase ) :
 		# should be slow this time, as the hash is being recomputed
 		self.assertGreaterEqual( secondTime, 0.8 * firstTime )
 
+	def testLargeBuffers( self ) :
+
+		# Large buffers are hashed in parallel chunks, so check that
+		# the result is still deterministic and sensitive to changes
+		# anywhere in the data.
+
+		d = IECore.IntVectorData( range( 0, 4 * 1024 * 1024 ) )
+		h = d.hash()
+		self.assertEqual( d.copy().hash(), h )
+		self.assertEqual( IECore.IntVectorData( range( 0, 4 * 1024 * 1024 ) ).hash(), h )
+
+		hashes = set( [ h ] )
+		for i in ( 0, 262143, 262144, len( d ) - 1 ) :
+			d2 = d.copy()
+			d2[i] = -1
+			hashes.add( d2.hash() )
+
+		self.assertEqual( len( hashes ), 5 )
+
+		d2 = d.copy()
+		d2.append( 0 )
+		self.assertNotEqual( d2.hash(), h )
+
+class TestVectorDataLoad( unittest.TestCase ) :
+
+	def testSizesAndContents( self ) :
+
+		# Check that every element of a loaded array ends up with the
+		# right value, whatever the element type and size.
+
+		for size in ( 0, 1, 3, 1000, 100000 ) :
+			for d in (
+				IECore.UCharVectorData( [ i % 256 for i in range( 0, size ) ] ),
+				IECore.IntVectorData( range( 0, size ) ),
+				IECore.FloatVectorData( [ i * 0.5 for i in range( 0, size ) ] ),
+				IECore.DoubleVectorData( [ -i for i in range( 0, size ) ] ),
+				IECore.V3fVectorData( [ imath.V3f( i, i + 1, i + 2 ) for i in range( 0, size ) ] ),
+				IECore.Color4fVectorData( [ imath.Color4f( i, 0, 1, -i ) for i in range( 0, size ) ] ),
+				IECore.M44fVectorData( [ imath.M44f().translate( imath.V3f( i ) ) for i in range( 0, size ) ] ),
+				IECore.StringVectorData( [ str( i ) for i in range( 0, size ) ] ),
+				IECore.InternedStringVectorData( [ str( i ) for i in range( 0, size ) ] ),
+			) :
+
+				m = IECore.MemoryIndexedIO( IECore.CharVectorData(), [], IECore.IndexedIO.OpenMode.Append )
+				d.save( m, "d" )
+				d2 = IECore.Object.load( m, "d" )
+
+				self.assertEqual( len( d2 ), size )
+				self.assertEqual( d2, d )
+
 class TestInternedStringVectorData( unittest.TestCase ) :
 
 	def test( self ) :
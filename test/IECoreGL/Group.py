@@ -32,6 +32,8 @@
 #
 ##########################################################################
 
+import os
+import inspect
 import unittest
 import imath
 
@@ -69,6 +71,122 @@ class TestGroup( unittest.TestCase ) :
 		g.clearChildren()
 		self.assertEqual( g.children(), [] )
 
+	def testBound( self ) :
+
+		def points( p ) :
+
+			result = IECoreGL.PointsPrimitive( IECoreGL.PointsPrimitive.Type.Point )
+			setPoints( result, p )
+			return result
+
+		def setPoints( primitive, p ) :
+
+			primitive.addPrimitiveVariable(
+				"P",
+				IECoreScene.PrimitiveVariable(
+					IECoreScene.PrimitiveVariable.Interpolation.Vertex,
+					IECore.V3fVectorData( p )
+				)
+			)
+			primitive.addPrimitiveVariable(
+				"constantwidth",
+				IECoreScene.PrimitiveVariable(
+					IECoreScene.PrimitiveVariable.Interpolation.Constant,
+					IECore.FloatData( 0 )
+				)
+			)
+
+		g = IECoreGL.Group()
+		self.assertTrue( g.bound().isEmpty() )
+
+		g2 = IECoreGL.Group()
+		p = points( [ imath.V3f( -1 ), imath.V3f( 1 ) ] )
+		g2.addChild( p )
+		g.addChild( g2 )
+		self.assertEqual( g.bound(), imath.Box3f( imath.V3f( -1 ), imath.V3f( 1 ) ) )
+
+		# Modifications to descendants must be reflected in
+		# the cached bound.
+
+		g2.setTransform( imath.M44f().translate( imath.V3f( 1, 0, 0 ) ) )
+		self.assertEqual( g.bound(), imath.Box3f( imath.V3f( 0, -1, -1 ), imath.V3f( 2, 1, 1 ) ) )
+
+		g2.addChild( points( [ imath.V3f( -2 ), imath.V3f( 2 ) ] ) )
+		self.assertEqual( g.bound(), imath.Box3f( imath.V3f( -1, -2, -2 ), imath.V3f( 3, 2, 2 ) ) )
+
+		g.setTransform( imath.M44f().scale( imath.V3f( 2 ) ) )
+		self.assertEqual( g.bound(), imath.Box3f( imath.V3f( -2, -4, -4 ), imath.V3f( 6, 4, 4 ) ) )
+
+		g2.removeChild( g2.children()[1] )
+		self.assertEqual( g.bound(), imath.Box3f( imath.V3f( 0, -2, -2 ), imath.V3f( 4, 2, 2 ) ) )
+
+		setPoints( p, [ imath.V3f( 0 ), imath.V3f( 1 ) ] )
+		self.assertEqual( g.bound(), imath.Box3f( imath.V3f( 2, 0, 0 ), imath.V3f( 4, 2, 2 ) ) )
+
+		g2.clearChildren()
+		self.assertTrue( g.bound().isEmpty() )
+
+	def testFrustumCulling( self ) :
+
+		# The "offset" sphere is placed well outside the frustum, but
+		# its vertex shader moves it back into view. So it is only
+		# selectable if the group containing it isn't culled.
+
+		offsetVertexSource = inspect.cleandoc( """
+
+			#version 120
+			#if __VERSION__ <= 120
+				#define in attribute
+			#endif
+
+			uniform vec3 offset;
+
+			in vec3 vertexP;
+			void main()
+			{
+				vec4 pCam = gl_ModelViewMatrix * vec4( vertexP + offset, 1 );
+				gl_Position = gl_ProjectionMatrix * pCam;
+			}
+
+		""" )
+
+		def selectedNames( frustumCulling ) :
+
+			r = IECoreGL.Renderer()
+			r.setOption( "gl:mode", IECore.StringData( "deferred" ) )
+			r.setOption( "gl:searchPath:shader", IECore.StringData( os.path.dirname( __file__ ) + "/shaders" ) )
+
+			with IECoreScene.WorldBlock( r ) :
+
+				r.concatTransform( imath.M44f().translate( imath.V3f( 0, 0, -5 ) ) )
+				r.setAttribute( "gl:frustumCulling", IECore.BoolData( frustumCulling ) )
+
+				with IECoreScene.AttributeBlock( r ) :
+					r.concatTransform( imath.M44f().translate( imath.V3f( -2, 0, 0 ) ) )
+					r.setAttribute( "name", IECore.StringData( "visible" ) )
+					r.sphere( 1, -1, 1, 360, {} )
+
+				with IECoreScene.AttributeBlock( r ) :
+					r.concatTransform( imath.M44f().translate( imath.V3f( 100, 0, 0 ) ) )
+					r.shader(
+						"surface", "test",
+						{
+							"gl:vertexSource" : IECore.StringData( offsetVertexSource ),
+							"offset" : IECore.V3fData( imath.V3f( -100, 0, 0 ) ),
+						}
+					)
+					r.setAttribute( "name", IECore.StringData( "offset" ) )
+					r.sphere( 1, -1, 1, 360, {} )
+
+			s = r.scene()
+			s.setCamera( IECoreGL.Camera( imath.M44f(), False ) )
+
+			ss = s.select( IECoreGL.Selector.Mode.GLSelect, imath.Box2f( imath.V2f( 0 ), imath.V2f( 1 ) ) )
+			return { IECoreGL.NameStateComponent.nameFromGLName( x.name ) for x in ss }
+
+		self.assertEqual( selectedNames( frustumCulling = False ), { "visible", "offset" } )
+		self.assertEqual( selectedNames( frustumCulling = True ), { "visible" } )
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -262,6 +262,88 @@ class ClientServerDisplayDriverTest(unittest.TestCase):
 		i = IECoreImage.ImageDisplayDriver.removeStoredImage( "myHandle" )
 		self.assertEqual( i["Y"], y )
 
+	def __transfer( self, img, parameters ) :
+
+		red = img['R']
+		green = img['G']
+		blue = img['B']
+		width = img.dataWindow.max().x - img.dataWindow.min().x + 1
+
+		params = IECore.CompoundData( {
+			"displayHost" : "localhost",
+			"displayPort" : "1559",
+			"remoteDisplayType" : "ImageDisplayDriver",
+			"handle" : "myHandle",
+		} )
+		params.update( parameters )
+		idd = IECoreImage.ClientDisplayDriver( img.displayWindow, img.dataWindow, list( img.channelNames() ), params )
+
+		buf = IECore.FloatVectorData( width * 3 )
+		for i in xrange( 0, img.dataWindow.max().y - img.dataWindow.min().y + 1 ):
+			self.__prepareBuf( buf, width, i*width, red, green, blue )
+			idd.imageData( imath.Box2i( imath.V2i( img.dataWindow.min().x, i + img.dataWindow.min().y ), imath.V2i( img.dataWindow.max().x, i + img.dataWindow.min().y) ), buf )
+		idd.imageClose()
+
+		newImg = IECoreImage.ImageDisplayDriver.removeStoredImage( "myHandle" )
+		newImg.blindData().clear()
+		img.blindData().clear()
+
+		return newImg
+
+	def testTransferCompressed( self ) :
+
+		img = IECore.Reader.create( "test/IECoreImage/data/tiff/bluegreen_noise.400x300.tif" )()
+		newImg = self.__transfer( img, { "displayCompression" : IECore.BoolData( True ) } )
+		self.assertEqual( newImg, img )
+
+	def testTransferHalfFloat( self ) :
+
+		img = IECore.Reader.create( "test/IECoreImage/data/tiff/bluegreen_noise.400x300.tif" )()
+		for parameters in [
+			{ "displayHalfFloat" : IECore.BoolData( True ) },
+			{ "displayHalfFloat" : IECore.BoolData( True ), "displayCompression" : IECore.BoolData( True ) },
+		] :
+			newImg = self.__transfer( img, parameters )
+			self.assertEqual( newImg.keys(), img.keys() )
+			self.assertEqual( newImg.dataWindow, img.dataWindow )
+			for channel in img.keys() :
+				for a, b in zip( newImg[channel], img[channel] ) :
+					self.assertAlmostEqual( a, b, delta = 1e-3 )
+
+	@unittest.skipUnless( os.environ.get( "CORTEX_PERFORMANCE_TEST", False ), "'CORTEX_PERFORMANCE_TEST' env var not set" )
+	def testLoopbackThroughput( self ) :
+
+		window = imath.Box2i( imath.V2i( 0 ), imath.V2i( 2047 ) )
+		bucketSize = 64
+		bucketData = IECore.FloatVectorData( [ ( i % 251 ) / 251.0 for i in xrange( 0, bucketSize * bucketSize * 4 ) ] )
+		numBytes = ( window.size().x + 1 ) * ( window.size().y + 1 ) * 4 * 4
+
+		for parameters in [
+			{},
+			{ "displayCompression" : IECore.BoolData( True ) },
+			{ "displayHalfFloat" : IECore.BoolData( True ) },
+			{ "displayCompression" : IECore.BoolData( True ), "displayHalfFloat" : IECore.BoolData( True ) },
+		] :
+
+			params = IECore.CompoundData( {
+				"displayHost" : "localhost",
+				"displayPort" : "1559",
+				"remoteDisplayType" : "ImageDisplayDriver",
+				"handle" : "myHandle",
+			} )
+			params.update( parameters )
+
+			t = time.time()
+			dd = IECoreImage.ClientDisplayDriver( window, window, [ "R", "G", "B", "A" ], params )
+			for y in xrange( 0, window.size().y + 1, bucketSize ) :
+				for x in xrange( 0, window.size().x + 1, bucketSize ) :
+					dd.imageData( imath.Box2i( imath.V2i( x, y ), imath.V2i( x + bucketSize - 1, y + bucketSize - 1 ) ), bucketData )
+			dd.imageClose()
+			t = time.time() - t
+
+			IECoreImage.ImageDisplayDriver.removeStoredImage( "myHandle" )
+			sys.stderr.write( "\n%s : %.1f MB/s" % ( parameters.keys() or "uncompressed", numBytes / t / ( 1024 * 1024 ) ) )
+
 	def tearDown( self ):
 
 		self.server = None
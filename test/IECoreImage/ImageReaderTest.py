@@ -192,6 +192,65 @@ class ImageReaderTest( unittest.TestCase ) :
 			cd = r.readChannel( c )
 			self.assertEqual( i[c], cd )
 
+	def testReadChannels( self ) :
+
+		r = IECoreImage.ImageReader( "test/IECoreImage/data/exr/uvMap.256x256.exr" )
+		i = r.read()
+
+		channels = r.readChannels( [ "B", "R" ] )
+		self.assertEqual( sorted( channels.keys() ), [ "B", "R" ] )
+		for c in channels.keys() :
+			self.assertEqual( channels[c], i[c] )
+
+		for raw in ( False, True ) :
+			channels = r.readChannels( [ "R", "G" ], raw = raw )
+			for c in channels.keys() :
+				self.assertEqual( channels[c], r.readChannel( c, raw = raw ) )
+
+		self.assertEqual( r.readChannels( [] ), IECore.CompoundData() )
+		self.assertRaises( RuntimeError, r.readChannels, [ "R", "Q" ] )
+
+	def testReadChannelsRegion( self ) :
+
+		r = IECoreImage.ImageReader( "test/IECoreImage/data/exr/uvMap.256x256.exr" )
+		i = r.read()
+
+		region = imath.Box2i( imath.V2i( 10, 20 ), imath.V2i( 49, 99 ) )
+		channels = r.readChannels( [ "R", "G" ], region )
+
+		width = region.size().x + 1
+		for c in [ "R", "G" ] :
+			self.assertEqual( len( channels[c] ), width * ( region.size().y + 1 ) )
+			for y in range( region.min().y, region.max().y + 1 ) :
+				for x in ( region.min().x, region.max().x ) :
+					self.assertEqual(
+						channels[c][(y-region.min().y)*width + x - region.min().x],
+						i[c][y*256 + x]
+					)
+
+	def testSharedCache( self ) :
+
+		r = IECoreImage.ImageReader( "test/IECoreImage/data/exr/uvMap.256x256.exr" )
+		i = r.read()
+
+		r["sharedCache"].setTypedValue( True )
+		self.assertEqual( r.read(), i )
+
+		r2 = IECoreImage.ImageReader( "test/IECoreImage/data/exr/uvMap.256x256.exr" )
+		r2["sharedCache"].setTypedValue( True )
+		self.assertEqual( r2.read(), i )
+
+		r2["fileName"].setTypedValue( "test/IECoreImage/data/exr/uvMapWithDataWindow.100x100.exr" )
+		self.assertEqual( r2.read(), IECoreImage.ImageReader( "test/IECoreImage/data/exr/uvMapWithDataWindow.100x100.exr" ).read() )
+
+		limit = IECoreImage.ImageReader.getSharedCacheMemoryLimit()
+		try :
+			IECoreImage.ImageReader.setSharedCacheMemoryLimit( 10 )
+			self.assertEqual( IECoreImage.ImageReader.getSharedCacheMemoryLimit(), 10 )
+			self.assertEqual( r.read(), i )
+		finally :
+			IECoreImage.ImageReader.setSharedCacheMemoryLimit( limit )
+
 	def testNonZeroDataWindowOrigin( self ) :
 
 		r = IECoreImage.ImageReader( "test/IECoreImage/data/exr/uvMapWithDataWindow.100x100.exr" )
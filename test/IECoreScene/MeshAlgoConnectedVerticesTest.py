@@ -79,6 +79,34 @@ class MeshAlgoConnectedVerticesTest( unittest.TestCase ) :
 
 		self.assertEqual( neighbors, result)
 
+	def testSharedTopology( self ) :
+
+		m = IECoreScene.MeshPrimitive.createPlane( imath.Box2f( imath.V2f( -1 ), imath.V2f( 1 ) ), imath.V2i( 3 ) )
+		m2 = m.copy()
+		m2["P"] = IECoreScene.PrimitiveVariable( IECoreScene.PrimitiveVariable.Interpolation.Vertex, IECore.V3fVectorData( [ p * 2 for p in m["P"].data ] ) )
+
+		neighborList, offsets = IECoreScene.MeshAlgo.connectedVertices( m )
+		expectedNeighborList = neighborList.copy()
+		expectedOffsets = offsets.copy()
+
+		# Modifying the results must not affect those for
+		# other meshes sharing the same topology.
+		neighborList[0] = -1
+		offsets.insert( 0, 0 )
+
+		neighborList2, offsets2 = IECoreScene.MeshAlgo.connectedVertices( m2 )
+		self.assertEqual( neighborList2, expectedNeighborList )
+		self.assertEqual( offsets2, expectedOffsets )
+
+	def testCancellation( self ) :
+
+		m = IECoreScene.MeshPrimitive.createPlane( imath.Box2f( imath.V2f( -1 ), imath.V2f( 1 ) ), imath.V2i( 10 ) )
+
+		canceller = IECore.Canceller()
+		canceller.cancel()
+
+		with self.assertRaises( IECore.Cancelled ) :
+			IECoreScene.MeshAlgo.connectedVertices( m, canceller )
 
 if __name__ == "__main__":
     unittest.main()
@@ -361,5 +361,20 @@ class MeshAlgoDeleteFacesTest( unittest.TestCase ) :
 
 		self.assertRaises( RuntimeError, IECoreScene.MeshAlgo.deleteFaces, planeMesh, primvarDelete  )
 
+	def testCancellation( self ) :
+
+		m = IECoreScene.MeshPrimitive.createPlane( imath.Box2f( imath.V2f( 0 ), imath.V2f( 1 ) ), imath.V2i( 10 ) )
+		m["delete"] = IECoreScene.PrimitiveVariable( IECoreScene.PrimitiveVariable.Interpolation.Uniform, IECore.IntVectorData( [ i % 2 for i in range( 0, m.numFaces() ) ] ) )
+
+		canceller = IECore.Canceller()
+		self.assertEqual( IECoreScene.MeshAlgo.deleteFaces( m, m["delete"], canceller = canceller ).numFaces(), 50 )
+
+		canceller.cancel()
+		with self.assertRaises( IECore.Cancelled ) :
+			IECoreScene.MeshAlgo.deleteFaces( m, m["delete"], canceller = canceller )
+
+		with self.assertRaises( IECore.Cancelled ) :
+			IECoreScene.MeshAlgo.segment( m, m["delete"], canceller = canceller )
+
 if __name__ == "__main__":
 	unittest.main()
@@ -230,5 +230,16 @@ class MeshAlgoMergeTest( unittest.TestCase ) :
 		self.assertEqual( merged.creaseIds(), IECore.IntVectorData( [ 1, 2, 3, 4, 5, 9, 10, 11, 12, 13, 14, 15 ] ) )
 		self.assertEqual( merged.creaseSharpnesses(), IECore.FloatVectorData( [ 1, 5, 3, 2, 0.5 ] ) )
 
+	def testCancellation( self ) :
+
+		a = IECoreScene.MeshPrimitive.createPlane( imath.Box2f( imath.V2f( -1 ), imath.V2f( 0 ) ) )
+		b = IECoreScene.MeshPrimitive.createPlane( imath.Box2f( imath.V2f( 0 ), imath.V2f( 1 ) ) )
+
+		canceller = IECore.Canceller()
+		canceller.cancel()
+
+		with self.assertRaises( IECore.Cancelled ) :
+			IECoreScene.MeshAlgo.merge( [ a, b ], canceller = canceller )
+
 if __name__ == "__main__" :
 	unittest.main()
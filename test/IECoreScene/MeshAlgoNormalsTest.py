@@ -91,5 +91,27 @@ class MeshAlgoNormalsTest( unittest.TestCase ) :
 		for n in normals.data :
 			self.assertEqual( n, imath.V3f( 0, 0, 1 ) )
 
+	def testLargeMesh( self ) :
+
+		m = IECoreScene.MeshPrimitive.createPlane( imath.Box2f( imath.V2f( -1 ), imath.V2f( 1 ) ), imath.V2i( 500 ) )
+		del m["N"]
+
+		normals = IECoreScene.MeshAlgo.calculateNormals( m )
+		self.assertEqual( len( normals.data ), m.variableSize( IECoreScene.PrimitiveVariable.Interpolation.Vertex ) )
+		for n in normals.data :
+			self.assertEqual( n, imath.V3f( 0, 0, 1 ) )
+
+	def testCancellation( self ) :
+
+		m = IECoreScene.MeshPrimitive.createPlane( imath.Box2f( imath.V2f( -1 ), imath.V2f( 1 ) ), imath.V2i( 10 ) )
+
+		canceller = IECore.Canceller()
+		IECoreScene.MeshAlgo.calculateNormals( m, canceller = canceller )
+
+		canceller.cancel()
+		for interpolation in ( IECoreScene.PrimitiveVariable.Interpolation.Vertex, IECoreScene.PrimitiveVariable.Interpolation.Uniform ) :
+			with self.assertRaises( IECore.Cancelled ) :
+				IECoreScene.MeshAlgo.calculateNormals( m, interpolation, canceller = canceller )
+
 if __name__ == "__main__":
 	unittest.main()
@@ -403,5 +403,18 @@ class MeshAlgoResampleTest( unittest.TestCase ) :
 				for v in pv.data :
 					self.assertEqual( v, imath.V2f( 0 ) )
 
+	def testCancellation( self ) :
+
+		m = IECoreScene.MeshPrimitive.createPlane( imath.Box2f( imath.V2f( -1 ), imath.V2f( 1 ) ), imath.V2i( 10 ) )
+		p = m["P"]
+
+		canceller = IECore.Canceller()
+		canceller.cancel()
+
+		with self.assertRaises( IECore.Cancelled ) :
+			IECoreScene.MeshAlgo.resamplePrimitiveVariable( m, p, IECoreScene.PrimitiveVariable.Interpolation.Uniform, canceller )
+
+		self.assertEqual( p.interpolation, IECoreScene.PrimitiveVariable.Interpolation.Vertex )
+
 if __name__ == "__main__":
 	unittest.main()
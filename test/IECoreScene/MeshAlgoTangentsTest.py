@@ -345,7 +345,21 @@ class MeshAlgoTangentsTest( unittest.TestCase ) :
 		self.assertArrayEqual( tRes, tangent.data )
 		self.assertArrayEqual( btRes, biTangent.data )
 
+	def testCancellation( self ) :
 
+		m = IECoreScene.MeshPrimitive.createPlane( imath.Box2f( imath.V2f( -1 ), imath.V2f( 1 ) ), imath.V2i( 10 ) )
+
+		canceller = IECore.Canceller()
+		canceller.cancel()
+
+		with self.assertRaises( IECore.Cancelled ) :
+			IECoreScene.MeshAlgo.calculateTangentsFromUV( m, canceller = canceller )
+
+		with self.assertRaises( IECore.Cancelled ) :
+			IECoreScene.MeshAlgo.calculateTangentsFromFirstEdge( m, canceller = canceller )
+
+		with self.assertRaises( IECore.Cancelled ) :
+			IECoreScene.MeshAlgo.calculateTangentsFromPrimitiveCentroid( m, canceller = canceller )
 
 if __name__ == "__main__":
 	unittest.main()
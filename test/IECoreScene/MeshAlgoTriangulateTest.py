@@ -284,6 +284,35 @@ class MeshAlgoTriangulateTest( unittest.TestCase ) :
 		self.assertEqual( m2.creaseIds(), m.creaseIds() )
 		self.assertEqual( m2.creaseSharpnesses(), m.creaseSharpnesses() )
 
+	def testSharedTopology( self ) :
+
+		m = IECoreScene.MeshPrimitive.createPlane( imath.Box2f( imath.V2f( -1 ), imath.V2f( 1 ) ), divisions = imath.V2i( 3, 2 ) )
+		m2 = m.copy()
+		m2["P"] = IECoreScene.PrimitiveVariable( IECoreScene.PrimitiveVariable.Interpolation.Vertex, IECore.V3fVectorData( [ p * 2 for p in m["P"].data ] ) )
+
+		cache = IECoreScene.MeshAlgo.topologyCache()
+		cache.clear()
+		cache.resetStatistics()
+
+		t = IECoreScene.MeshAlgo.triangulate( m )
+		t2 = IECoreScene.MeshAlgo.triangulate( m2, throwExceptions = True )
+
+		self.assertEqual( cache.statistics().hits, 1 )
+		self.assertTrue( t2.arePrimitiveVariablesValid() )
+		self.assertEqual( t2.verticesPerFace, t.verticesPerFace )
+		self.assertEqual( t2.vertexIds, t.vertexIds )
+		self.assertEqual( t2["uv"], t["uv"] )
+		self.assertEqual( t2["P"].data, IECore.V3fVectorData( [ p * 2 for p in t["P"].data ] ) )
+
+		# Modifying the result must not affect the cached topology.
+		t.vertexIds[0] = 1
+		t3 = IECoreScene.MeshAlgo.triangulate( m )
+		self.assertEqual( t3.vertexIds, t2.vertexIds )
+
+		# Nor should bad geometry on a shared topology go undetected.
+		m2["P"].data[0] = imath.V3f( 0.5, 0.5, 0.5 )
+		self.assertRaises( RuntimeError, IECoreScene.MeshAlgo.triangulate, m2, throwExceptions = True )
+
 	@unittest.skipUnless( os.environ.get("CORTEX_PERFORMANCE_TEST", False), "'CORTEX_PERFORMANCE_TEST' env var not set" )
 	def testTriangulatePerformance( self ):
 
@@ -33,6 +33,7 @@
 ##########################################################################
 
 import math
+import os
 import unittest
 import random
 import imath
@@ -436,6 +437,214 @@ class TestMeshPrimitiveEvaluator( unittest.TestCase ) :
 					m["faceVarying"].data[m["faceVarying"].indices[triangleIndex*3+corner]]
 				)
 
+	def testBatchClosestPoint( self ) :
+
+		m = IECore.Reader.create( "test/IECore/data/cobFiles/pSphereShape1.cob" ).read()
+		m["Cs"] = IECoreScene.PrimitiveVariable(
+			IECoreScene.PrimitiveVariable.Interpolation.Vertex,
+			IECore.Color3fVectorData( [ imath.Color3f( p.x, p.y, p.z ) for p in m["P"].data ] )
+		)
+
+		evaluator = IECoreScene.PrimitiveEvaluator.create( m )
+		result = evaluator.createResult()
+
+		random.seed( 1 )
+		points = IECore.V3fVectorData( [ imath.V3f( random.uniform( -2, 2 ), random.uniform( -2, 2 ), random.uniform( -2, 2 ) ) for i in range( 0, 5000 ) ] )
+		batch = evaluator.batchClosestPoint( points, [ "Cs" ] )
+
+		for name in ( "hit", "point", "normal", "uv", "triangleIndex", "barycentricCoordinates", "Cs" ) :
+			self.assertEqual( len( batch[name] ), len( points ) )
+
+		for i, p in enumerate( points ) :
+			self.assertTrue( evaluator.closestPoint( p, result ) )
+			self.assertTrue( batch["hit"][i] )
+			self.assertEqual( batch["point"][i], result.point() )
+			self.assertEqual( batch["normal"][i], result.normal() )
+			self.assertEqual( batch["uv"][i], result.uv() )
+			self.assertEqual( batch["triangleIndex"][i], result.triangleIndex() )
+			self.assertEqual( batch["barycentricCoordinates"][i], result.barycentricCoordinates() )
+			self.assertEqual( batch["Cs"][i], result.colorPrimVar( m["Cs"] ) )
+
+		self.assertRaises( RuntimeError, evaluator.batchClosestPoint, points, [ "notAPrimitiveVariable" ] )
+
+	def testBatchIntersectionPoint( self ) :
+
+		m = IECore.Reader.create( "test/IECore/data/cobFiles/pSphereShape1.cob" ).read()
+		evaluator = IECoreScene.PrimitiveEvaluator.create( m )
+		result = evaluator.createResult()
+
+		origins = IECore.V3fVectorData( [ imath.V3f( 0 ) ] * 2 + [ imath.V3f( 0, 0, 10 ) ] )
+		directions = IECore.V3fVectorData( [ imath.V3f( 1, 0, 0 ), imath.V3f( 0, -1, 0 ), imath.V3f( 0, 0, 1 ) ] )
+
+		batch = evaluator.batchIntersectionPoint( origins, directions )
+		self.assertEqual( batch["hit"], IECore.BoolVectorData( [ True, True, False ] ) )
+
+		for i in range( 0, 2 ) :
+			self.assertTrue( evaluator.intersectionPoint( origins[i], directions[i], result ) )
+			self.assertEqual( batch["point"][i], result.point() )
+			self.assertEqual( batch["triangleIndex"][i], result.triangleIndex() )
+
+		batch = evaluator.batchIntersectionPoint( origins, directions, maxDistance = 0.1 )
+		self.assertEqual( batch["hit"], IECore.BoolVectorData( [ False, False, False ] ) )
+
+		self.assertRaises( RuntimeError, evaluator.batchIntersectionPoint, origins, IECore.V3fVectorData() )
+
+	def testBatchPointAtUV( self ) :
+
+		m = IECore.Reader.create( "test/IECore/data/cobFiles/pSphereShape1.cob" ).read()
+		evaluator = IECoreScene.PrimitiveEvaluator.create( m )
+		result = evaluator.createResult()
+
+		uvs = IECore.V2fVectorData( [ imath.V2f( u / 10.0, v / 10.0 ) for u in range( 1, 10 ) for v in range( 1, 10 ) ] )
+		batch = evaluator.batchPointAtUV( uvs )
+
+		for i, uv in enumerate( uvs ) :
+			hit = evaluator.pointAtUV( uv, result )
+			self.assertEqual( batch["hit"][i], hit )
+			if hit :
+				self.assertEqual( batch["point"][i], result.point() )
+
+	def testBatchClosestPointOnPoints( self ) :
+
+		p = IECoreScene.PointsPrimitive( IECore.V3fVectorData( [ imath.V3f( x, 0, 0 ) for x in range( 0, 5 ) ] ) )
+		p["Cs"] = IECoreScene.PrimitiveVariable( IECoreScene.PrimitiveVariable.Interpolation.Vertex, IECore.Color3fVectorData( [ imath.Color3f( r, 0, 0 ) for r in range( 5, 10 ) ] ) )
+
+		evaluator = IECoreScene.PrimitiveEvaluator.create( p )
+		result = evaluator.createResult()
+
+		random.seed( 1 )
+		points = IECore.V3fVectorData( [ imath.V3f( random.uniform( -1, 5 ), random.uniform( -1, 1 ), random.uniform( -1, 1 ) ) for i in range( 0, 5000 ) ] )
+		batch = evaluator.batchClosestPoint( points, [ "Cs" ] )
+
+		# Points don't provide normals or uvs, so they are omitted.
+		self.assertEqual( set( batch.keys() ), { "hit", "point", "pointIndex", "Cs" } )
+
+		for i, q in enumerate( points ) :
+			self.assertTrue( evaluator.closestPoint( q, result ) )
+			self.assertTrue( batch["hit"][i] )
+			self.assertEqual( batch["point"][i], result.point() )
+			self.assertEqual( batch["pointIndex"][i], result.pointIndex() )
+			self.assertEqual( batch["Cs"][i], result.colorPrimVar( p["Cs"] ) )
+
+	def testBatchQueriesOnCurves( self ) :
+
+		c = IECoreScene.CurvesPrimitive(
+			IECore.IntVectorData( [ 4, 4 ] ), IECore.CubicBasisf.bSpline(), False,
+			IECore.V3fVectorData( [ imath.V3f( 0, y, 0 ) for y in range( 0, 4 ) ] + [ imath.V3f( 2, y, 0 ) for y in range( 0, 4 ) ] )
+		)
+
+		evaluator = IECoreScene.PrimitiveEvaluator.create( c )
+		result = evaluator.createResult()
+
+		# Curves don't provide normals, so they are omitted.
+
+		random.seed( 1 )
+		points = IECore.V3fVectorData( [ imath.V3f( random.uniform( -1, 3 ), random.uniform( 0, 3 ), random.uniform( -1, 1 ) ) for i in range( 0, 1000 ) ] )
+		batch = evaluator.batchClosestPoint( points )
+		self.assertEqual( set( batch.keys() ), { "hit", "point", "uv", "curveIndex" } )
+
+		for i, q in enumerate( points ) :
+			self.assertTrue( evaluator.closestPoint( q, result ) )
+			self.assertTrue( batch["hit"][i] )
+			self.assertEqual( batch["point"][i], result.point() )
+			self.assertEqual( batch["uv"][i], result.uv() )
+			self.assertEqual( batch["curveIndex"][i], result.curveIndex() )
+
+		uvs = IECore.V2fVectorData( [ imath.V2f( 0, v / 10.0 ) for v in range( 0, 11 ) ] )
+		batch = evaluator.batchPointAtUV( uvs )
+		self.assertEqual( set( batch.keys() ), { "hit", "point", "uv", "curveIndex" } )
+
+		for i, uv in enumerate( uvs ) :
+			self.assertTrue( evaluator.pointAtUV( uv, result ) )
+			self.assertTrue( batch["hit"][i] )
+			self.assertEqual( batch["point"][i], result.point() )
+			self.assertEqual( batch["uv"][i], result.uv() )
+
+	def testSharedTopology( self ) :
+
+		m1 = IECore.Reader.create( "test/IECore/data/cobFiles/pSphereShape1.cob" ).read()
+		offset = imath.V3f( 10, 0, 0 )
+		m2 = m1.copy()
+		m2["P"] = IECoreScene.PrimitiveVariable(
+			IECoreScene.PrimitiveVariable.Interpolation.Vertex,
+			IECore.V3fVectorData( [ p * 2 + offset for p in m1["P"].data ] )
+		)
+
+		# Evaluators for meshes with the same topology share
+		# the structure of their acceleration structures, but
+		# must still give the correct results for their own
+		# positions.
+
+		e1 = IECoreScene.MeshPrimitiveEvaluator( m1 )
+		e2 = IECoreScene.MeshPrimitiveEvaluator( m2 )
+		e3 = IECoreScene.MeshPrimitiveEvaluator( m1 )
+
+		r1 = e1.createResult()
+		r2 = e2.createResult()
+		r3 = e3.createResult()
+
+		random.seed( 2 )
+		for i in range( 0, 1000 ) :
+
+			p = imath.V3f( random.uniform( -2, 2 ), random.uniform( -2, 2 ), random.uniform( -2, 2 ) )
+
+			self.assertTrue( e1.closestPoint( p, r1 ) )
+			self.assertTrue( e2.closestPoint( p * 2 + offset, r2 ) )
+			self.assertTrue( e3.closestPoint( p, r3 ) )
+
+			self.assertTrue( r2.point().equalWithAbsError( r1.point() * 2 + offset, 0.0001 ) )
+			self.assertEqual( r3.point(), r1.point() )
+
+			d = p.normalized()
+			self.assertEqual( e1.intersectionPoint( imath.V3f( 0 ), d, r1 ), e2.intersectionPoint( offset, d, r2 ) )
+			self.assertTrue( r2.point().equalWithAbsError( r1.point() * 2 + offset, 0.0001 ) )
+
+	def testUVBound( self ) :
+
+		m = IECoreScene.MeshPrimitive.createPlane( imath.Box2f( imath.V2f( -1 ), imath.V2f( 1 ) ), imath.V2i( 4 ) )
+		m = IECoreScene.MeshAlgo.triangulate( m )
+
+		e = IECoreScene.MeshPrimitiveEvaluator( m )
+		self.assertEqual( e.uvBound(), imath.Box2f( imath.V2f( 0 ), imath.V2f( 1 ) ) )
+
+		del m["uv"]
+		e = IECoreScene.MeshPrimitiveEvaluator( m )
+		self.assertEqual( e.uvBound(), imath.Box2f() )
+		self.assertRaises( RuntimeError, e.pointAtUV, imath.V2f( 0.5 ), e.createResult() )
+
+	@unittest.skipUnless( os.environ.get( "CORTEX_PERFORMANCE_TEST", False ), "'CORTEX_PERFORMANCE_TEST' env var not set" )
+	def testPerformance( self ) :
+
+		m = IECoreScene.MeshPrimitive.createPlane( imath.Box2f( imath.V2f( -1 ), imath.V2f( 1 ) ), imath.V2i( 1000 ) )
+		m = IECoreScene.MeshAlgo.triangulate( m )
+
+		random.seed( 0 )
+		points = IECore.V3fVectorData( [ imath.V3f( random.uniform( -1, 1 ), random.uniform( -1, 1 ), random.uniform( -1, 1 ) ) for i in range( 0, 100000 ) ] )
+
+		def timeQueries( mesh, description ) :
+
+			t = IECore.Timer( True, IECore.Timer.WallClock )
+			e = IECoreScene.MeshPrimitiveEvaluator( mesh )
+			e.closestPoint( imath.V3f( 0 ), e.createResult() )
+			buildTime = t.stop()
+
+			t = IECore.Timer( True, IECore.Timer.WallClock )
+			e.batchClosestPoint( points )
+			queryTime = t.stop()
+
+			print "MeshPrimitiveEvaluator {0} : build {1}s, query {2}s".format( description, buildTime, queryTime )
+
+		timeQueries( m, "first topology" )
+
+		# Same topology with different positions,
+		# reusing the cached hierarchy structure.
+		m2 = m.copy()
+		m2["P"] = IECoreScene.PrimitiveVariable(
+			IECoreScene.PrimitiveVariable.Interpolation.Vertex,
+			IECore.V3fVectorData( [ imath.V3f( p.x, p.y, math.sin( p.x * 10 ) * 0.1 ) for p in m["P"].data ] )
+		)
+		timeQueries( m2, "shared topology" )
+
 if __name__ == "__main__":
 	unittest.main()
 
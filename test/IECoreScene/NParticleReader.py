@@ -184,6 +184,26 @@ class TestNParticleReader( unittest.TestCase ) :
 			self.assert_( abs( p.y ) < 0.145 )
 			self.assert_( abs( p.z ) < 0.138 )
 
+	def testChangingFrames( self ) :
+
+		r = IECoreScene.NParticleReader( "test/IECore/data/iffFiles/nParticleMultipleFrames.mc" )
+
+		results = {}
+		for frameIndex in [ 5, 9, 5, 0, 9 ] :
+			r["frameIndex"].setValue( frameIndex )
+			c = r.read()
+			if frameIndex in results :
+				self.assertEqual( c, results[frameIndex] )
+			else :
+				results[frameIndex] = c
+
+			r2 = IECoreScene.NParticleReader( "test/IECore/data/iffFiles/nParticleMultipleFrames.mc" )
+			r2["frameIndex"].setValue( frameIndex )
+			self.assertEqual( r2.read(), c )
+			self.assertEqual( r2.attributeNames(), r.attributeNames() )
+
+		self.assertNotEqual( results[5], results[9] )
+
 	def testFiltering( self ) :
 
 		r = IECore.Reader.create( "test/IECore/data/iffFiles/nParticleMultipleFrames.mc" )
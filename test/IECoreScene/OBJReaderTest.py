@@ -32,6 +32,7 @@
 #
 ##########################################################################
 
+import os
 import unittest
 import sys
 import IECore
@@ -97,6 +98,96 @@ class TestOBJReader( unittest.TestCase ) :
 		self.failUnless( mesh.isInstanceOf( IECoreScene.MeshPrimitive.staticTypeId() ) )
 		self.failUnless( mesh.arePrimitiveVariablesValid() )
 
+	def testParsersMatch( self ) :
+
+		for fileName in [ "triangle.obj", "triangle_normals.obj", "triangle_no_texture.obj", "groups.obj" ] :
+
+			r = IECoreScene.OBJReader( "test/IECore/data/obj/" + fileName )
+			mesh = r.read()
+			r["useLegacyParser"].setTypedValue( True )
+			self.assertEqual( mesh, r.read() )
+
+	def testNegativeIndices( self ) :
+
+		mesh = IECoreScene.OBJReader( "test/IECore/data/obj/groups.obj" ).read()
+		self.assertEqual( mesh.verticesPerFace, IECore.IntVectorData( [ 3, 3, 3 ] ) )
+		self.assertEqual( mesh.vertexIds, IECore.IntVectorData( range( 0, 9 ) ) )
+
+	def testMixedFaces( self ) :
+
+		# Faces without texture coordinates are given zeroes,
+		# so the primitive variables remain valid.
+
+		with open( "test/mixedFaces.obj", "w" ) as f :
+			f.write( "v 0 0 0\nv 1 0 0\nv 1 1 0\nvt 0.5 0.25\nvn 0 0 1\n" )
+			f.write( "f 1 2 3\nf 1/1 2/1 3/1\nf 1//1 2//1 3//1\n" )
+
+		mesh = IECoreScene.OBJReader( "test/mixedFaces.obj" ).read()
+		self.assertTrue( mesh.arePrimitiveVariablesValid() )
+		self.assertEqual( mesh["s"].data, IECore.FloatVectorData( [ 0 ] * 3 + [ 0.5 ] * 3 + [ 0 ] * 3 ) )
+		self.assertEqual( mesh["t"].data, IECore.FloatVectorData( [ 0 ] * 3 + [ 0.25 ] * 3 + [ 0 ] * 3 ) )
+		self.assertEqual( mesh["N"].data, IECore.V3fVectorData( [ IECore.V3f( 0 ) ] * 6 + [ IECore.V3f( 0, 0, 1 ) ] * 3 ) )
+
+	def testInvalidIndex( self ) :
+
+		with open( "test/invalidIndex.obj", "w" ) as f :
+			f.write( "v 0 0 0\nv 1 0 0\nf 1 2 3\n" )
+
+		self.assertRaisesRegexp( RuntimeError, "Invalid vertex index 3", IECoreScene.OBJReader( "test/invalidIndex.obj" ).read )
+
+	def testLegacyFallback( self ) :
+
+		# The legacy parser ignores vertices with too few coordinates.
+		# The parallel parser doesn't support them, so should fall back.
+
+		with open( "test/unsupported.obj", "w" ) as f :
+			f.write( "v 0 0 0\nv 1 0 0\nv 1 1 0\nv 2 2\nf 1 2 3\n" )
+
+		r = IECoreScene.OBJReader( "test/unsupported.obj" )
+		with IECore.CapturingMessageHandler() as mh :
+			mesh = r.read()
+
+		self.assertEqual( len( mh.messages ), 1 )
+		self.assertEqual( mh.messages[0].level, IECore.Msg.Level.Warning )
+		self.assertEqual( len( mesh["P"].data ), 3 )
+
+		r["useLegacyParser"].setTypedValue( True )
+		self.assertEqual( mesh, r.read() )
+
+	@unittest.skipUnless( os.environ.get( "CORTEX_PERFORMANCE_TEST", False ), "'CORTEX_PERFORMANCE_TEST' env var not set" )
+	def testReadPerformance( self ) :
+
+		# Write a grid with texture coordinates and normals.
+
+		n = 1000
+		with open( "test/grid.obj", "w" ) as f :
+			for y in range( 0, n + 1 ) :
+				for x in range( 0, n + 1 ) :
+					f.write( "v %f %f 0\nvt %f %f\nvn 0 0 1\n" % ( x / 10.0, y / 10.0, x / float( n ), y / float( n ) ) )
+			for y in range( 0, n ) :
+				for x in range( 0, n ) :
+					i = y * ( n + 1 ) + x + 1
+					f.write( "f %d/%d/%d %d/%d/%d %d/%d/%d %d/%d/%d\n" % ( ( i, ) * 3 + ( i + 1, ) * 3 + ( i + n + 2, ) * 3 + ( i + n + 1, ) * 3 ) )
+
+		numMegabytes = os.path.getsize( "test/grid.obj" ) / ( 1024.0 * 1024.0 )
+		r = IECoreScene.OBJReader( "test/grid.obj" )
+		for useLegacyParser in ( False, True ) :
+			r["useLegacyParser"].setTypedValue( useLegacyParser )
+			for i in range( 3 ) :
+				t = IECore.Timer( True, IECore.Timer.Mode.WallClock )
+				mesh = r.read()
+				elapsed = t.stop()
+				print "OBJ read ({0}) : {1:.3f}s ({2:.1f} MB/s)".format(
+					"legacy" if useLegacyParser else "parallel", elapsed, numMegabytes / elapsed
+				)
+				self.assertEqual( mesh.numFaces(), n * n )
+
+	def tearDown( self ) :
+
+		for f in [ "test/mixedFaces.obj", "test/invalidIndex.obj", "test/unsupported.obj", "test/grid.obj" ] :
+			if os.path.isfile( f ) :
+				os.remove( f )
+
 if __name__ == "__main__":
 
 	unittest.main()
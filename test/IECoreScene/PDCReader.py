@@ -37,6 +37,7 @@ from __future__ import with_statement
 import unittest
 import sys
 import os
+import imath
 
 import IECore
 import IECoreScene
@@ -338,6 +339,63 @@ class TestPDCReader( unittest.TestCase ) :
 		self.assertEqual( len( c.messages ), 1 )
 		self.assertEqual( c.messages[0].level, IECore.Msg.Level.Warning )
 
+	def testLargeAttributes( self ) :
+
+		# Enough particles for the attributes to be copied in parallel.
+		numParticles = 300000
+		p = IECoreScene.PointsPrimitive( IECore.V3fVectorData( [ imath.V3f( i, i + 1, i + 2 ) for i in range( numParticles ) ] ) )
+		p["d"] = IECoreScene.PrimitiveVariable( IECoreScene.PrimitiveVariable.Interpolation.Vertex, IECore.DoubleVectorData( [ i * 0.5 for i in range( numParticles ) ] ) )
+		p["i"] = IECoreScene.PrimitiveVariable( IECoreScene.PrimitiveVariable.Interpolation.Vertex, IECore.IntVectorData( range( numParticles ) ) )
+		IECore.Writer.create( p, "test/particleShape1.250.pdc" ).write()
+
+		r = IECoreScene.PDCParticleReader( "test/particleShape1.250.pdc" )
+		r["realType"].setValue( "native" )
+		self.assertEqual( r.numParticles(), numParticles )
+
+		d = r.readAttribute( "d" )
+		self.assertEqual( len( d ), numParticles )
+		self.assertEqual( d[0], 0 )
+		self.assertEqual( d[-1], ( numParticles - 1 ) * 0.5 )
+		self.assertEqual( r.readAttribute( "i" ), p["i"].data )
+
+		position = r.readAttribute( "position" )
+		self.assertEqual( position[1000], imath.V3d( 1000, 1001, 1002 ) )
+		self.assertEqual( position[-1], imath.V3d( numParticles - 1, numParticles, numParticles + 1 ) )
+
+	def testTruncatedFile( self ) :
+
+		p = IECoreScene.PointsPrimitive( 100 )
+		p["d"] = IECoreScene.PrimitiveVariable( IECoreScene.PrimitiveVariable.Interpolation.Vertex, IECore.DoubleVectorData( [ 1 ] * 100 ) )
+		IECore.Writer.create( p, "test/particleShape1.250.pdc" ).write()
+
+		with open( "test/particleShape1.250.pdc", "rb" ) as f :
+			data = f.read()
+		with open( "test/particleShape1.250.pdc", "wb" ) as f :
+			f.write( data[:-8] )
+
+		r = IECoreScene.PDCParticleReader( "test/particleShape1.250.pdc" )
+		self.assertEqual( r.numParticles(), 0 )
+		self.assertEqual( r.attributeNames(), [] )
+		self.assertEqual( r.readAttribute( "d" ), None )
+
+	@unittest.skipUnless( os.environ.get( "CORTEX_PERFORMANCE_TEST", False ), "'CORTEX_PERFORMANCE_TEST' env var not set" )
+	def testReadPerformance( self ) :
+
+		numParticles = 10 * 1024 * 1024
+		p = IECoreScene.PointsPrimitive( IECore.V3fVectorData( numParticles ) )
+		p["d"] = IECoreScene.PrimitiveVariable( IECoreScene.PrimitiveVariable.Interpolation.Vertex, IECore.DoubleVectorData( numParticles ) )
+		IECore.Writer.create( p, "test/particleShape1.250.pdc" ).write()
+
+		r = IECoreScene.PDCParticleReader( "test/particleShape1.250.pdc" )
+		r["realType"].setValue( "native" )
+
+		numMegabytes = os.path.getsize( "test/particleShape1.250.pdc" ) / ( 1024.0 * 1024.0 )
+		for i in range( 5 ) :
+			t = IECore.Timer( True, IECore.Timer.Mode.WallClock )
+			r.read()
+			elapsed = t.stop()
+			print "PDC read : {0:.3f}s ({1:.1f} MB/s)".format( elapsed, numMegabytes / elapsed )
+
 	def tearDown( self ) :
 
 		if os.path.isfile( "test/particleShape1.250.pdc" ) :
@@ -168,6 +168,49 @@ class SceneAlgoTest( unittest.TestCase ) :
 				self.assertEqual(stats["attributes"], 4096 * 2 )  # default attribute & custom attribute 'foo'
 
 
+	def testPrefetch( self ) :
+
+		m = IECoreScene.SceneCache( SceneAlgoTest.__testFile, IECore.IndexedIO.OpenMode.Write )
+		for i in range( 3 ) :
+			c = m.createChild( "c{0}".format( i ) )
+			for t in range( 4 ) :
+				c.writeObject( IECoreScene.MeshPrimitive.createBox( imath.Box3f( imath.V3f( 0 ), imath.V3f( i + t + 1 ) ) ), t )
+
+		del m, c
+
+		def misses( scene ) :
+			return scene.cacheStatistics()["object"]["misses"].value
+
+		src = IECoreScene.SceneCache( SceneAlgoTest.__testFile, IECore.IndexedIO.OpenMode.Read )
+		memoryUsage = IECoreScene.SceneAlgo.prefetch( src, IECore.PathMatcher( [ "/c0", "/c2" ] ), [ 0, 1, 2 ] )
+		self.assertGreater( memoryUsage, 0 )
+
+		# Everything prefetched should now be read from the cache.
+		numMisses = misses( src )
+		for name in ( "c0", "c2" ) :
+			for t in ( 0, 1, 2 ) :
+				src.child( name ).readObject( t )
+		self.assertEqual( misses( src ), numMisses )
+
+		# But not anything else.
+		src.child( "c1" ).readObject( 0 )
+		self.assertGreater( misses( src ), numMisses )
+
+		# Prefetching should stop once the memory limit is reached,
+		# having read the earliest times first.
+		src = IECoreScene.SceneCache( SceneAlgoTest.__testFile, IECore.IndexedIO.OpenMode.Read )
+		with IECore.tbb_task_scheduler_init( max_threads = 1 ) as taskScheduler :
+			limitedMemoryUsage = IECoreScene.SceneAlgo.prefetch( src, IECore.PathMatcher( [ "/..." ] ), [ 0, 1, 2, 3 ], maxMemory = 1 )
+
+		self.assertGreater( limitedMemoryUsage, 0 )
+		self.assertLess( limitedMemoryUsage, memoryUsage )
+
+		numMisses = misses( src )
+		src.child( "c0" ).readObject( 0 )
+		self.assertEqual( misses( src ), numMisses )
+		src.child( "c1" ).readObject( 0 )
+		self.assertGreater( misses( src ), numMisses )
+
 
 if __name__ == "__main__" :
 	unittest.main()
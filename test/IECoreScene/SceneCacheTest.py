@@ -37,6 +37,8 @@ import sys
 import math
 import unittest
 import shutil
+import threading
+import time
 
 import IECore
 import IECoreScene
@@ -414,6 +416,72 @@ class SceneCacheTest( unittest.TestCase ) :
 		# looks like an early version crashes here:
 		c.writeObject( IECoreScene.Camera(), 0.0 )
 
+	def testWriteWithAsyncCompression( self ) :
+
+		options = IECore.CompoundData( { "compressionLevel" : 9, "asyncCompression" : True } )
+		sc = IECoreScene.SceneCache( "/tmp/test.scc", IECore.IndexedIO.OpenMode.Write, options )
+
+		meshes = {}
+		for i in range( 0, 10 ) :
+			mesh = IECoreScene.MeshPrimitive.createPlane( imath.Box2f( imath.V2f( -i - 1 ), imath.V2f( i + 1 ) ), imath.V2i( 100 ) )
+			meshes["mesh%d" % i] = mesh
+			c = sc.createChild( "mesh%d" % i )
+			c.writeObject( mesh, 0.0 )
+
+		del c, sc
+
+		sc = IECoreScene.SceneCache( "/tmp/test.scc", IECore.IndexedIO.OpenMode.Read )
+		self.assertEqual( set( sc.childNames() ), set( meshes.keys() ) )
+		for name, mesh in meshes.items() :
+			self.assertEqual( sc.child( name ).readObject( 0.0 ), mesh )
+
+	def testCacheStatistics( self ) :
+
+		sc = IECoreScene.SceneCache( "/tmp/test.scc", IECore.IndexedIO.OpenMode.Write )
+		c = sc.createChild( "data" )
+		c.writeObject( IECore.IntVectorData( range( 0, 1000 ) ), 0.0 )
+		c.writeObject( IECore.IntVectorData( range( 1, 1001 ) ), 1.0 )
+		del c, sc
+
+		sc = IECoreScene.SceneCache( "/tmp/test.scc", IECore.IndexedIO.OpenMode.Read )
+		self.assertEqual( sc.getCacheLimit( IECoreScene.SceneCache.CacheType.ObjectSampleCache ), 10000 )
+		self.assertEqual( sc.getCacheLimit( IECoreScene.SceneCache.CacheType.AttributeSampleCache ), 1000 )
+		self.assertEqual( sc.getCacheLimit( IECoreScene.SceneCache.CacheType.TransformSampleCache ), 1000 )
+
+		statistics = sc.cacheStatistics()
+		self.assertEqual( set( statistics.keys() ), { "object", "attribute", "transform" } )
+		self.assertEqual( statistics["object"]["hits"].value, 0 )
+		self.assertEqual( statistics["object"]["misses"].value, 0 )
+
+		c = sc.child( "data" )
+		c.readObjectAtSample( 0 )
+		c.readObjectAtSample( 0 )
+		c.readObjectAtSample( 1 )
+
+		statistics = sc.cacheStatistics()["object"]
+		self.assertEqual( statistics["hits"].value, 1 )
+		self.assertEqual( statistics["misses"].value, 2 )
+		self.assertEqual( statistics["evictions"].value, 0 )
+		self.assertEqual( statistics["cachedComputations"].value, 2 )
+		self.assertGreater( statistics["memoryUsage"].value, 0 )
+		self.assertGreaterEqual( statistics["computeTime"].value, 0 )
+
+		# Statistics and limits are shared by all locations in the file.
+		c.setCacheLimit( IECoreScene.SceneCache.CacheType.ObjectSampleCache, 1 )
+		self.assertEqual( sc.getCacheLimit( IECoreScene.SceneCache.CacheType.ObjectSampleCache ), 1 )
+		statistics = sc.cacheStatistics()["object"]
+		self.assertEqual( statistics["evictions"].value, 1 )
+		self.assertEqual( statistics["cachedComputations"].value, 1 )
+
+		sc.resetCacheStatistics()
+		statistics = c.cacheStatistics()["object"]
+		self.assertEqual( statistics["hits"].value, 0 )
+		self.assertEqual( statistics["misses"].value, 0 )
+		self.assertEqual( statistics["evictions"].value, 0 )
+
+		sc = IECoreScene.SceneCache( "/tmp/test.scc", IECore.IndexedIO.OpenMode.Write )
+		self.assertRaises( RuntimeError, sc.cacheStatistics )
+
 	def testWriteNullPointers( self ) :
 
 		sc = IECoreScene.SceneCache( "/tmp/test.scc", IECore.IndexedIO.OpenMode.Write )
@@ -676,6 +744,47 @@ class SceneCacheTest( unittest.TestCase ) :
 		self.assertEqual( b.readObject(1)['P'], b.readObjectPrimitiveVariables(['P','Cs'], 1)['P'] )
 		self.assertEqual( b.readObject(1)['Cs'], b.readObjectPrimitiveVariables(['P','Cs'], 1)['Cs'] )
 
+	def testReadObjectWithPrimitiveVariables( self ) :
+
+		box = IECoreScene.MeshPrimitive.createBox( imath.Box3f( imath.V3f( 0 ), imath.V3f( 1 ) ) )
+		box["Cs"] = IECoreScene.PrimitiveVariable( IECoreScene.PrimitiveVariable.Interpolation.Uniform, IECore.Color3fVectorData( [ imath.Color3f( 1, 0, 0 ) ] * box.variableSize( IECoreScene.PrimitiveVariable.Interpolation.Uniform ) ) )
+		box2 = box.copy()
+		box2["P"] = IECoreScene.PrimitiveVariable( IECoreScene.PrimitiveVariable.Interpolation.Vertex, IECore.V3fVectorData( [ p * 2 for p in box["P"].data ] ) )
+
+		s = IECoreScene.SceneCache( "/tmp/test.scc", IECore.IndexedIO.OpenMode.Write )
+		b = s.createChild( "b" )
+		b.writeObject( box, 0 )
+		b.writeObject( box2, 1 )
+		c = s.createChild( "c" )
+		c.writeObject( IECore.CompoundObject( { "a" : IECore.IntData( 1 ) } ), 0 )
+
+		del s, b, c
+
+		s = IECoreScene.SceneCache( "/tmp/test.scc", IECore.IndexedIO.OpenMode.Read )
+		b = s.child( "b" )
+
+		for t in ( 0, 0.5, 1 ) :
+
+			full = b.readObject( t )
+
+			partial = b.readObjectWithPrimitiveVariables( [ "P" ], t )
+			self.assertTrue( isinstance( partial, IECoreScene.MeshPrimitive ) )
+			self.assertEqual( partial.keys(), [ "P" ] )
+			self.assertEqual( partial["P"], full["P"] )
+			self.assertEqual( partial.verticesPerFace, full.verticesPerFace )
+			self.assertEqual( partial.vertexIds, full.vertexIds )
+
+			# The remaining variables can be loaded on demand.
+			for name, value in b.readObjectPrimitiveVariables( [ "Cs", "uv" ], t ).items() :
+				partial[name] = value
+			self.assertEqual( partial, full )
+
+		self.assertEqual( set( b.readObjectWithPrimitiveVariables( [ "P", "uv", "notThere" ], 0 ).keys() ), set( [ "P", "uv" ] ) )
+		self.assertEqual( b.readObjectWithPrimitiveVariables( [], 0 ).keys(), [] )
+
+		# Objects other than Primitives are loaded in full.
+		self.assertEqual( s.child( "c" ).readObjectWithPrimitiveVariables( [], 0 ), IECore.CompoundObject( { "a" : IECore.IntData( 1 ) } ) )
+
 	def testTags( self ) :
 
 		sphere = IECoreScene.SpherePrimitive( 1 )
@@ -1125,6 +1234,57 @@ class SceneCacheTest( unittest.TestCase ) :
 
 		IECoreScene.testSceneCacheParallelFakeAttributeRead()
 
+	def testReadsReleaseGIL( self ) :
+
+		m = IECoreScene.SceneCache( "/tmp/test.scc", IECore.IndexedIO.OpenMode.Write )
+		for i in range( 0, 20 ) :
+			plane = IECoreScene.MeshPrimitive.createPlane( imath.Box2f( imath.V2f( 0 ), imath.V2f( 1 ) ), imath.V2i( 300 ) )
+			plane["P"].data += imath.V3f( i )
+			m.createChild( str( i ) ).writeObject( plane, 0 )
+		del m
+
+		# A thread which makes progress only when it can get the GIL.
+		# It sleeps after each step, giving the GIL back immediately.
+		progress = [ 0 ]
+		stop = threading.Event()
+		def count() :
+			while not stop.is_set() :
+				progress[0] += 1
+				time.sleep( 0 )
+
+		# Stop the interpreter switching threads of its own accord, so
+		# that the counting thread can only run while the main thread
+		# is blocked or has released the GIL.
+		if hasattr( sys, "setswitchinterval" ) :
+			oldInterval = sys.getswitchinterval()
+			sys.setswitchinterval( 1000 )
+		else :
+			oldInterval = sys.getcheckinterval()
+			sys.setcheckinterval( 2 ** 30 )
+
+		thread = threading.Thread( target = count )
+		thread.start()
+		try :
+			scene = IECoreScene.SceneCache( "/tmp/test.scc", IECore.IndexedIO.OpenMode.Read )
+			madeProgress = False
+			for name in scene.childNames() :
+				child = scene.child( name )
+				before = progress[0]
+				child.readObject( 0 )
+				child.readBound( 0 )
+				madeProgress = madeProgress or progress[0] > before
+		finally :
+			stop.set()
+			thread.join()
+			if hasattr( sys, "setswitchinterval" ) :
+				sys.setswitchinterval( oldInterval )
+			else :
+				sys.setcheckinterval( oldInterval )
+
+		# The only way the counting thread can have run during the
+		# reads is if they released the GIL.
+		self.assertTrue( madeProgress )
+
 	def testCanReadV6SceneCache( self ):
 
 		r = IECore.IndexedIO.create("test/IECore/data/sccFiles/cube_v6.scc", IECore.IndexedIO.OpenMode.Read)
@@ -36,7 +36,11 @@
 
 import unittest
 import functools
+import os
+import shutil
+import tempfile
 
+import IECore
 import IECoreScene
 
 class SharedSceneInterfacesTest( unittest.TestCase ) :
@@ -46,6 +50,15 @@ class SharedSceneInterfacesTest( unittest.TestCase ) :
 		maxScenes = IECoreScene.SharedSceneInterfaces.getMaxScenes()
 		self.addCleanup( functools.partial( IECoreScene.SharedSceneInterfaces.setMaxScenes ), maxScenes )
 
+		maxMemory = IECoreScene.SharedSceneInterfaces.getMaxMemory()
+		self.addCleanup( functools.partial( IECoreScene.SharedSceneInterfaces.setMaxMemory ), maxMemory )
+
+		checkInterval = IECoreScene.SharedSceneInterfaces.getCheckInterval()
+		self.addCleanup( functools.partial( IECoreScene.SharedSceneInterfaces.setCheckInterval ), checkInterval )
+
+		self.tempDir = tempfile.mkdtemp()
+		self.addCleanup( functools.partial( shutil.rmtree, self.tempDir ) )
+
 	def testLimits( self ) :
 
 		IECoreScene.SharedSceneInterfaces.clear()
@@ -78,5 +91,136 @@ class SharedSceneInterfacesTest( unittest.TestCase ) :
 
 		self.assertGreater( len( scenes ), len( files ) )
 
+	def testMemoryLimit( self ) :
+
+		IECoreScene.SharedSceneInterfaces.clear()
+		self.assertEqual( IECoreScene.SharedSceneInterfaces.memoryUsage(), 0 )
+
+		files = [
+			"test/IECore/data/sccFiles/animatedSpheres.scc",
+			"test/IECore/data/sccFiles/attributeAtRoot.scc",
+			"test/IECore/data/sccFiles/cube_v6.scc",
+		]
+
+		for f in files :
+			IECoreScene.SharedSceneInterfaces.get( f )
+
+		self.assertEqual( IECoreScene.SharedSceneInterfaces.numScenes(), len( files ) )
+		memoryUsage = IECoreScene.SharedSceneInterfaces.memoryUsage()
+		self.assertGreater( memoryUsage, 0 )
+
+		# Reading from a scene populates its caches, which
+		# should be reflected in the memory usage.
+
+		def readObjects( scene ) :
+			if scene.hasObject() :
+				scene.readObject( 0 )
+			for name in scene.childNames() :
+				readObjects( scene.child( name ) )
+
+		readObjects( IECoreScene.SharedSceneInterfaces.get( files[0] ) )
+
+		self.assertGreater( IECoreScene.SharedSceneInterfaces.memoryUsage(), memoryUsage )
+
+		# Reducing the memory limit should evict scenes.
+
+		IECoreScene.SharedSceneInterfaces.setMaxMemory( IECoreScene.SharedSceneInterfaces.memoryUsage() - 1 )
+		self.assertLess( IECoreScene.SharedSceneInterfaces.numScenes(), len( files ) )
+		self.assertLessEqual( IECoreScene.SharedSceneInterfaces.memoryUsage(), IECoreScene.SharedSceneInterfaces.getMaxMemory() )
+
+		# But the most recently used scene should always be kept,
+		# even if it exceeds the limit on its own.
+
+		IECoreScene.SharedSceneInterfaces.setMaxMemory( 0 )
+		self.assertEqual( IECoreScene.SharedSceneInterfaces.numScenes(), 1 )
+
+		s = IECoreScene.SharedSceneInterfaces.get( files[1] )
+		self.assertEqual( IECoreScene.SharedSceneInterfaces.numScenes(), 1 )
+		self.assertTrue( IECoreScene.SharedSceneInterfaces.get( files[1] ).isSame( s ) )
+
+	def testStaleFiles( self ) :
+
+		IECoreScene.SharedSceneInterfaces.clear()
+		IECoreScene.SharedSceneInterfaces.resetStatistics()
+		IECoreScene.SharedSceneInterfaces.setCheckInterval( 0 )
+
+		fileName = os.path.join( self.tempDir, "test.scc" )
+		shutil.copy( "test/IECore/data/sccFiles/animatedSpheres.scc", fileName )
+
+		s1 = IECoreScene.SharedSceneInterfaces.get( fileName )
+		self.assertTrue( IECoreScene.SharedSceneInterfaces.get( fileName ).isSame( s1 ) )
+
+		statistics = IECoreScene.SharedSceneInterfaces.statistics()
+		self.assertEqual( statistics["hits"].value, 1 )
+		self.assertEqual( statistics["misses"].value, 1 )
+		self.assertEqual( statistics["staleScenes"].value, 0 )
+		self.assertEqual( statistics["staleReloads"].value, 0 )
+
+		# Rewrite the file, and check that we don't get the
+		# old scene back.
+
+		shutil.copy( "test/IECore/data/sccFiles/attributeAtRoot.scc", fileName )
+		self.assertEqual( IECoreScene.SharedSceneInterfaces.statistics()["staleScenes"].value, 1 )
+
+		s2 = IECoreScene.SharedSceneInterfaces.get( fileName )
+		self.assertFalse( s2.isSame( s1 ) )
+		self.assertEqual( s2.childNames(), IECoreScene.SceneCache( "test/IECore/data/sccFiles/attributeAtRoot.scc", IECore.IndexedIO.OpenMode.Read ).childNames() )
+
+		statistics = IECoreScene.SharedSceneInterfaces.statistics()
+		self.assertEqual( statistics["hits"].value, 1 )
+		self.assertEqual( statistics["misses"].value, 2 )
+		self.assertEqual( statistics["staleScenes"].value, 0 )
+		self.assertEqual( statistics["staleReloads"].value, 1 )
+		self.assertEqual( statistics["numScenes"].value, 1 )
+
+	def testStaleFilesWithinSameSecond( self ) :
+
+		IECoreScene.SharedSceneInterfaces.clear()
+		IECoreScene.SharedSceneInterfaces.resetStatistics()
+		IECoreScene.SharedSceneInterfaces.setCheckInterval( 0 )
+
+		fileName = os.path.join( self.tempDir, "test.scc" )
+		shutil.copy( "test/IECore/data/sccFiles/animatedSpheres.scc", fileName )
+		stat = os.stat( fileName )
+
+		s1 = IECoreScene.SharedSceneInterfaces.get( fileName )
+
+		# Change only the fractional part of the modification time,
+		# leaving the size and inode alone. This must still be detected.
+
+		second = int( stat.st_mtime )
+		fraction = 0.25 if stat.st_mtime - second >= 0.5 else 0.75
+		os.utime( fileName, ( stat.st_atime, second + fraction ) )
+
+		s2 = IECoreScene.SharedSceneInterfaces.get( fileName )
+		self.assertFalse( s2.isSame( s1 ) )
+		self.assertEqual( IECoreScene.SharedSceneInterfaces.statistics()["staleReloads"].value, 1 )
+
+	def testCheckInterval( self ) :
+
+		IECoreScene.SharedSceneInterfaces.clear()
+		IECoreScene.SharedSceneInterfaces.resetStatistics()
+
+		IECoreScene.SharedSceneInterfaces.setCheckInterval( 1000 )
+		self.assertEqual( IECoreScene.SharedSceneInterfaces.getCheckInterval(), 1000 )
+
+		fileName = os.path.join( self.tempDir, "test.scc" )
+		shutil.copy( "test/IECore/data/sccFiles/animatedSpheres.scc", fileName )
+
+		s1 = IECoreScene.SharedSceneInterfaces.get( fileName )
+
+		# We're within the check interval, so the rewritten
+		# file isn't noticed.
+
+		shutil.copy( "test/IECore/data/sccFiles/attributeAtRoot.scc", fileName )
+		self.assertTrue( IECoreScene.SharedSceneInterfaces.get( fileName ).isSame( s1 ) )
+		self.assertEqual( IECoreScene.SharedSceneInterfaces.statistics()["staleScenes"].value, 1 )
+
+		# But as soon as the interval has passed it is.
+
+		IECoreScene.SharedSceneInterfaces.setCheckInterval( 0 )
+		self.assertFalse( IECoreScene.SharedSceneInterfaces.get( fileName ).isSame( s1 ) )
+		self.assertEqual( IECoreScene.SharedSceneInterfaces.statistics()["staleReloads"].value, 1 )
+
 if __name__ == "__main__":
 	unittest.main()